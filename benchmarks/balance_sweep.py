@@ -0,0 +1,208 @@
+"""Balance sweeps: seeded bot sessions over a grid of balance knobs.
+
+Reads a JSON config naming knobs from cosmic_runner.balance and the values
+to try, plays every combination with a scripted bot on a number of seeds
+across a process pool, and prints one row per combination: survival
+distance, deaths per run in each biome, missions completed and how many
+sessions hit the frame cap. --output writes the table as CSV (.csv) or
+everything, sessions included, as JSON.
+
+    python benchmarks/balance_sweep.py benchmarks/balance_sweep.json --workers 8 --output sweep.csv
+
+Config keys (all but "grid" optional):
+
+    grid      {knob: [values]}, every combination is a point of the sweep
+    base      {knob: value} applied to every point
+    sessions  seeds per point (seed, seed + 1, ...), default 32
+    seed      first seed, default 1000
+    frames    frame cap per session, default 36000 (10 minutes)
+    bot       {"lead": 8, "jitter": 12, "jetpack": true}: jump when an obstacle
+              is within speed * lead px, give or take jitter px, and hold the
+              jetpack key throughout
+
+Sessions are deterministic: the same config gives the same table on any
+number of workers.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import itertools
+import statistics
+import multiprocessing
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from cosmic_runner.constants import biome_names
+
+DEFAULT_SESSIONS = 32
+DEFAULT_SEED = 1000
+DEFAULT_FRAMES = 36000
+DEFAULT_BOT = {"lead": 8, "jitter": 12, "jetpack": True}
+
+def load_config(path):
+    with open(path) as f:
+        config = json.load(f)
+    if not config.get("grid"):
+        raise ValueError(f"{path}: no \"grid\" to sweep")
+    from cosmic_runner import balance
+    unknown = sorted((set(config["grid"]) | set(config.get("base", {}))) - set(balance.DEFAULTS))
+    if unknown:
+        raise ValueError(f"{path}: unknown balance knobs: {', '.join(unknown)}")
+    return config
+
+def sweep_points(config):
+    """Every combination of the grid, each with the base overrides applied"""
+    names = list(config["grid"])
+    points = []
+    for values in itertools.product(*(config["grid"][name] for name in names)):
+        overrides = dict(config.get("base", {}))
+        overrides.update(zip(names, values))
+        points.append({"knobs": dict(zip(names, values)), "overrides": overrides})
+    return points
+
+# Worker process
+
+def init_worker():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"    # Or SDL swallows the pool's SIGTERM
+    import pygame
+    from cosmic_runner import layout
+    pygame.display.init()
+    pygame.display.set_mode((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+
+def bot_input(game, rng, bot):
+    """Jump when the next obstacle is close, with human-ish timing jitter"""
+    player = game.player
+    for obstacle in game.obstacles:
+        gap = obstacle.rect.left - player.rect.right
+        if 0 <= gap < game.speed * bot["lead"] + rng.randint(-bot["jitter"], bot["jitter"]):
+            game.jump_input()
+            break
+
+def run_session(task):
+    """Play one seeded session to game over or the frame cap"""
+    point, overrides, seed, frames, bot = task
+    from cosmic_runner import Game, balance
+    from cosmic_runner.constants import PLAYING
+
+    balance.configure(**overrides)
+    game = Game()
+    game.seed_course(seed)
+    game.reset_game()
+    game.state = PLAYING
+    game.jetpack_held = bot["jetpack"]
+    rng = random.Random(f"bot-{seed}")      # Separate from the course's random stream
+    deaths = [0] * len(biome_names)
+    while game.state == PLAYING and game.frame_count < frames:
+        bot_input(game, rng, bot)
+        lives, biome = game.lives, game.current_biome
+        game.update()
+        if game.lives < lives:
+            deaths[biome] += 1
+    return {
+        "point": point,
+        "seed": seed,
+        "frames": game.frame_count,
+        "capped": game.state == PLAYING,
+        "distance": round(game.distance, 1),
+        "score": game.score,
+        "biome": game.current_biome,
+        "deaths": deaths,
+        "missions": len(game.completed_missions),
+    }
+
+# Aggregation
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def summarize(point, sessions):
+    distances = [s["distance"] for s in sessions]
+    row = dict(point["knobs"])
+    row.update({
+        "sessions": len(sessions),
+        "distance_mean": round(statistics.fmean(distances), 1),
+        "distance_p50": percentile(distances, 0.5),
+        "distance_p10": percentile(distances, 0.1),
+        "capped_pct": round(100 * sum(s["capped"] for s in sessions) / len(sessions), 1),
+    })
+    for biome, name in enumerate(biome_names):
+        row[f"deaths_{name}"] = round(statistics.fmean(s["deaths"][biome] for s in sessions), 2)
+    row["missions_mean"] = round(statistics.fmean(s["missions"] for s in sessions), 2)
+    row["score_mean"] = round(statistics.fmean(s["score"] for s in sessions), 1)
+    return row
+
+def cell(value):
+    """Table and CSV text; dict knobs (power-up weights) as JSON"""
+    return json.dumps(value, sort_keys=True) if isinstance(value, dict) else str(value)
+
+def format_table(rows):
+    columns = list(rows[0])
+    headers = [column.replace("deaths_", "d:") for column in columns]
+    cells = [[cell(row[column]) for column in columns] for row in rows]
+    widths = [max(len(header), *(len(line[i]) for line in cells)) for i, header in enumerate(headers)]
+    lines = ["  ".join(header.rjust(width) for header, width in zip(headers, widths))]
+    lines += ["  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells]
+    return "\n".join(lines)
+
+def write_output(path, rows, config, sessions):
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows({column: cell(value) for column, value in row.items()} for row in rows)
+    else:
+        with open(path, "w") as f:
+            json.dump({"config": config, "results": rows, "sessions": sessions}, f, indent=2)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep balance knobs with a scripted bot")
+    parser.add_argument("config", help="JSON sweep config")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sessions", type=int, help="Override the config's sessions per point")
+    parser.add_argument("--frames", type=int, help="Override the config's frame cap")
+    parser.add_argument("--output", help="Write results as CSV (.csv) or JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config(args.config)
+    sessions_per_point = args.sessions or config.get("sessions", DEFAULT_SESSIONS)
+    frames = args.frames or config.get("frames", DEFAULT_FRAMES)
+    first_seed = config.get("seed", DEFAULT_SEED)
+    bot = dict(DEFAULT_BOT, **config.get("bot", {}))
+    points = sweep_points(config)
+    tasks = [(index, point["overrides"], first_seed + i, frames, bot)
+             for index, point in enumerate(points) for i in range(sessions_per_point)]
+    print(f"{len(points)} points x {sessions_per_point} sessions on {args.workers} workers", file=sys.stderr)
+
+    started = time.perf_counter()
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers, initializer=init_worker) as pool:
+        for done, result in enumerate(pool.imap_unordered(run_session, tasks, chunksize=4), 1):
+            results.append(result)
+            if done % max(1, len(tasks) // 20) == 0 or done == len(tasks):
+                elapsed = time.perf_counter() - started
+                print(f"{done}/{len(tasks)} sessions, {elapsed:.0f} s", file=sys.stderr)
+
+    results.sort(key=lambda r: (r["point"], r["seed"]))
+    rows = [summarize(point, [r for r in results if r["point"] == index]) for index, point in enumerate(points)]
+    print(format_table(rows))
+    frames_played = sum(r["frames"] for r in results)
+    elapsed = time.perf_counter() - started
+    print(f"{len(results)} sessions, {frames_played} frames in {elapsed:.1f} s "
+          f"({frames_played / elapsed:.0f} frames/s)", file=sys.stderr)
+    if args.output:
+        write_output(args.output, rows, config, results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Cross-version performance comparison for the Cosmic Runner v1.x scripts.
+
+Each version (`Cosmic Runner.py`, v1.1-v1.7 and the v1.4 snapshots) is run
+unmodified in its own process under the dummy video/audio drivers. The
+harness replaces pygame.time.Clock so frames are not throttled, treats every
+clock.tick() as one frame, and feeds the same scripted key sequence to every
+version. Per version it reports:
+
+- frame time (tick-to-tick, after a warm-up)
+- peak RSS of the process
+- tracemalloc peak/current traced memory and live allocation blocks
+  (in a second run, since tracing slows frames down)
+- live pygame.Surface count and pixel bytes
+
+Versions that keep player data (run history, the saved run) are started
+with the flags that turn it off. A comparison never reads, writes or
+deletes the player's own files, and never starts from their saved run.
+
+    python benchmarks/compare_versions.py --frames 1800 --output versions.json
+"""
+import os
+import sys
+import glob
+import json
+import time
+import runpy
+import argparse
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = "HARNESS_RESULT "
+
+DEFAULT_FRAMES = 1800   # 30 seconds of game time at 60 FPS
+WARMUP_FRAMES = 60
+SURFACE_SAMPLE_EVERY = 300
+
+# Scripted input: (every N frames, keys to press). SPACE starts/jumps/restarts
+# in v1.6+, RETURN starts/restarts in v1.1-v1.5 and R restarts the original.
+INPUT_SCRIPT = (
+    (45, ("K_SPACE",)),
+    (120, ("K_RETURN", "K_r")),
+)
+
+# Flags passed to versions that accept them, so benchmarks leave user data alone
+CHILD_FLAGS = ("--no-history", "--no-resume")
+
+# Child process: run one version
+
+class HarnessDone(BaseException):
+    """Raised from Clock.tick once enough frames have run"""
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+def child_argv(script_path):
+    """argv for a version: the script plus whichever CHILD_FLAGS it knows"""
+    with open(script_path, encoding="utf-8", errors="replace") as f:
+        source = f.read()
+    return [script_path] + [flag for flag in CHILD_FLAGS if f'"{flag}"' in source]
+
+def run_child(script_path, frames, trace_allocations):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    sys.path.insert(0, REPO_DIR)
+    sys.argv = child_argv(script_path)
+
+    import pygame
+    from cosmic_runner.telemetry import count_live_surfaces
+
+    tick_times = []
+    surfaces = {"samples": 0, "peak_count": 0, "peak_bytes": 0}
+    script = [(every, [getattr(pygame, key) for key in keys]) for every, keys in INPUT_SCRIPT]
+
+    class FrameClock:
+        """Stand-in for pygame.time.Clock: never sleeps, drives the script"""
+        def __init__(self):
+            self.last_tick = time.perf_counter()
+
+        def tick(self, framerate=0):
+            now = time.perf_counter()
+            frame_ms = (now - self.last_tick) * 1000
+            self.last_tick = now
+            tick_times.append(frame_ms)
+            frame = len(tick_times)
+
+            # Sampled in the game loop, including the last frame: once the
+            # script returns its globals are gone and only the display is left
+            if frame % SURFACE_SAMPLE_EVERY == 0 or frame >= frames:
+                count, pixel_bytes = count_live_surfaces()
+                surfaces["samples"] += 1
+                surfaces["peak_count"] = max(surfaces["peak_count"], count)
+                surfaces["peak_bytes"] = max(surfaces["peak_bytes"], pixel_bytes)
+            if frame >= frames:
+                raise HarnessDone()
+            if pygame.display.get_init():
+                for every, keys in script:
+                    if frame % every == 0:
+                        for key in keys:
+                            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+                            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode=""))
+            return int(frame_ms)
+
+        def get_fps(self):
+            return 0.0
+
+        def get_time(self):
+            return int(tick_times[-1]) if tick_times else 0
+
+    pygame.time.Clock = FrameClock
+
+    if trace_allocations:
+        import tracemalloc
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    error = None
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except (HarnessDone, SystemExit):
+        pass
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall_s = time.perf_counter() - started
+
+    result = {"frames": len(tick_times), "wall_s": round(wall_s, 3), "error": error}
+    if trace_allocations:
+        current, peak = tracemalloc.get_traced_memory()
+        live_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        tracemalloc.stop()
+        result.update({
+            "traced_peak_kb": peak // 1024,
+            "traced_current_kb": current // 1024,
+            "live_blocks": live_blocks
+        })
+    else:
+        measured = sorted(tick_times[WARMUP_FRAMES:]) or sorted(tick_times)
+        sampled = surfaces["samples"] > 0   # None if the script ended before its first sample
+        result.update({
+            "frame_mean_ms": round(statistics.fmean(measured), 4) if measured else None,
+            "frame_p50_ms": round(measured[len(measured) // 2], 4) if measured else None,
+            "frame_p95_ms": round(measured[int(len(measured) * 0.95)], 4) if measured else None,
+            "frame_p99_ms": round(measured[int(len(measured) * 0.99)], 4) if measured else None,
+            "peak_rss_kb": peak_rss_kb(),
+            "surfaces": surfaces["peak_count"] if sampled else None,
+            "surface_kb": surfaces["peak_bytes"] // 1024 if sampled else None
+        })
+
+    # Scripts print freely, so the result goes on its own tagged line
+    sys.stdout.write("\n" + RESULT_PREFIX + json.dumps(result) + "\n")
+    sys.stdout.flush()
+    os._exit(0)  # Skip pygame/atexit teardown of a half-shut-down game
+
+# Parent process: run every version and compare
+
+def find_versions(filters=()):
+    paths = sorted(glob.glob(os.path.join(REPO_DIR, "Cosmic Runner*.py")))
+    versions = []
+    for path in paths:
+        label = os.path.splitext(os.path.basename(path))[0].replace("Cosmic Runner", "").strip() or "original"
+        if not filters or any(f in label for f in filters):
+            versions.append((label, path))
+    return versions
+
+def run_version(path, frames, trace_allocations, timeout):
+    command = [sys.executable, os.path.abspath(__file__), "--child", path, "--frames", str(frames)]
+    if trace_allocations:
+        command.append("--trace-allocations")
+    try:
+        completed = subprocess.run(command, cwd=REPO_DIR, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    stderr = completed.stderr.strip().splitlines()
+    return {"error": stderr[-1] if stderr else f"exit code {completed.returncode}"}
+
+def format_table(results):
+    columns = (
+        ("version", "version", "{}"),
+        ("frames", "frames", "{}"),
+        ("frame_mean_ms", "mean ms", "{:.3f}"),
+        ("frame_p95_ms", "p95 ms", "{:.3f}"),
+        ("frame_p99_ms", "p99 ms", "{:.3f}"),
+        ("peak_rss_kb", "peak RSS MB", "{:.1f}"),
+        ("traced_peak_kb", "traced peak MB", "{:.1f}"),
+        ("live_blocks", "live blocks", "{}"),
+        ("surfaces", "surfaces", "{}"),
+        ("surface_kb", "surface MB", "{:.1f}"),
+    )
+    rows = [[title for _, title, _ in columns]]
+    for result in results:
+        row = []
+        for key, _, fmt in columns:
+            value = result.get(key)
+            if value is None:
+                row.append("-")
+            elif key.endswith("_kb"):
+                row.append(fmt.format(value / 1024))
+            else:
+                row.append(fmt.format(value))
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    lines = []
+    for index, row in enumerate(rows):
+        lines.append("| " + " | ".join(cell.ljust(width) for cell, width in zip(row, widths)) + " |")
+        if index == 0:
+            lines.append("|" + "|".join("-" * (width + 2) for width in widths) + "|")
+    errors = [f"{r['version']}: {r['error']}" for r in results if r.get("error")]
+    if errors:
+        lines.append("")
+        lines.extend("error in " + error for error in errors)
+    return "\n".join(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare performance across Cosmic Runner versions")
+    parser.add_argument("versions", nargs="*",
+                        help="Only run versions whose label contains one of these (e.g. v1.6 v1.7)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Frames to run per version")
+    parser.add_argument("--skip-tracemalloc", action="store_true", help="Skip the allocation-tracing run")
+    parser.add_argument("--timeout", type=int, default=600, help="Seconds allowed per version run")
+    parser.add_argument("--output", "-o", help="Also write the results as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--trace-allocations", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        run_child(args.child, args.frames, args.trace_allocations)
+        return 0
+
+    from run_benchmarks import machine_info
+
+    results = []
+    for label, path in find_versions(args.versions):
+        print(f"Running {label}...", file=sys.stderr)
+        result = {"version": label}
+        result.update(run_version(path, args.frames, False, args.timeout))
+        if not args.skip_tracemalloc and not result.get("error"):
+            traced = run_version(path, args.frames, True, args.timeout)
+            result.update({k: v for k, v in traced.items() if k in ("traced_peak_kb", "traced_current_kb", "live_blocks")})
+            if traced.get("error"):
+                result["error"] = "tracemalloc run: " + traced["error"]
+        results.append(result)
+
+    print(format_table(results))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"machine": machine_info(), "frames": args.frames, "versions": results}, f, indent=2)
+            f.write("\n")
+    return 1 if any(r.get("error") for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Save a game deep into a biome, for benchmarks that start there.
+
+Plays a seeded course with the autopilot, update only (nothing is drawn),
+until it has run --settle frames in the target biome, then writes a
+snapshot with lives topped up to --lives, so a benchmark session started
+from it doesn't end at the first hit. If the run ends first, the next seed
+is tried. The snapshot is then loaded back, and the loaded game has to play
+the next --verify-frames exactly as the original did.
+
+    python benchmarks/make_snapshot.py --biome space --output space.snapshot
+    python benchmarks/run_benchmarks.py --snapshot space.snapshot --skip-micro --skip-biomes
+"""
+import os
+import sys
+import time
+import argparse
+
+# Headless before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pygame
+from cosmic_runner import layout, Game
+from cosmic_runner.constants import PLAYING, FPS, biome_names
+from cosmic_runner.game import biome_index
+from cosmic_runner.autopilot import Autopilot
+from cosmic_runner import snapshot
+
+MAX_SEEDS = 20
+
+def play_to(biome, seed, settle, max_frames):
+    """A game that has run settle frames in biome, or None if the run ended first"""
+    game = Game()
+    game.seed_course(seed)
+    game.reset_game()
+    game.state = PLAYING
+    autopilot = Autopilot()
+    frames_in_biome = 0
+    while game.state == PLAYING and game.frame_count < max_frames:
+        autopilot.control(game)
+        game.update()
+        if game.current_biome >= biome and not game.biome_transition_timer:
+            frames_in_biome += 1
+            if frames_in_biome >= settle:
+                return game
+    return None
+
+def fingerprint(game):
+    player = game.player
+    return (game.frame_count, game.distance, game.score, game.lives, game.current_biome,
+            tuple(player.rect), player.velocity_y, game.total_coins, len(game.completed_missions),
+            tuple(tuple(o.rect) for o in game.obstacles), tuple(tuple(c.rect) for c in game.coins),
+            tuple(tuple(p.rect) for p in game.powerups))
+
+def play_on(game, frames):
+    autopilot = Autopilot()
+    played = []
+    for _ in range(frames):
+        autopilot.control(game)
+        game.update()
+        played.append(fingerprint(game))
+    return played
+
+def first_difference(game, blob, frames):
+    """First frame the game and a copy loaded from blob play differently, or None
+
+    Loading restores the random streams as they were when blob was saved, so
+    the copy can play after the original rather than alongside it.
+    """
+    original = play_on(game, frames)
+    copy = play_on(snapshot.loads(blob), frames)
+    return next((frame for frame, (a, b) in enumerate(zip(original, copy)) if a != b), None)
+
+def loads_ms(blob):
+    started = time.perf_counter()
+    snapshot.loads(blob)
+    return (time.perf_counter() - started) * 1000
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Save a snapshot of a game deep into a biome")
+    parser.add_argument("--biome", type=biome_index, default=len(biome_names) - 1,
+                        help="Biome name or number (default: space)")
+    parser.add_argument("--seed", type=int, default=1, help="First course seed to try")
+    parser.add_argument("--settle", type=int, default=10 * FPS,
+                        help="Frames to play in the biome before saving (default 600)")
+    parser.add_argument("--max-minutes", type=float, default=15,
+                        help="Give up on a seed after this much game time")
+    parser.add_argument("--lives", type=int, default=3, help="Lives in the snapshot (default 3)")
+    parser.add_argument("--verify-frames", type=int, default=600,
+                        help="Frames to play the loaded copy against the original (0 to skip)")
+    parser.add_argument("--output", "-o", default="space.snapshot", help="Snapshot file to write")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    pygame.display.init()
+    pygame.display.set_mode((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+    max_frames = int(args.max_minutes * 60 * FPS)
+
+    started = time.perf_counter()
+    for seed in range(args.seed, args.seed + MAX_SEEDS):
+        game = play_to(args.biome, seed, args.settle, max_frames)
+        if game:
+            break
+        print(f"Seed {seed} didn't reach {biome_names[args.biome]}, trying the next", file=sys.stderr)
+    else:
+        print(f"No run reached {biome_names[args.biome]} in {MAX_SEEDS} seeds", file=sys.stderr)
+        return 1
+    print(f"Seed {seed} reached {biome_names[args.biome]} at {game.distance:.0f} m, frame {game.frame_count} "
+          f"({time.perf_counter() - started:.1f} s)", file=sys.stderr)
+
+    game.lives = max(game.lives, args.lives)
+    snapshot.save(game, args.output)
+    with open(args.output, "rb") as f:
+        blob = f.read()
+    fastest = min(loads_ms(blob) for _ in range(10))
+    print(f"Wrote {args.output}: {len(blob)} bytes, loads in {fastest:.2f} ms", file=sys.stderr)
+
+    if args.verify_frames:
+        frame = first_difference(game, blob, args.verify_frames)
+        if frame is not None:
+            print(f"Loaded game played differently from frame {frame}", file=sys.stderr)
+            return 1
+        print(f"Loaded game played the next {args.verify_frames} frames identically", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
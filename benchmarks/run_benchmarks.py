@@ -0,0 +1,561 @@
+"""Benchmark suite for the Cosmic Runner simulation and render hot paths.
+
+Runs headlessly (dummy SDL video/audio drivers) and writes a JSON report with
+machine info so two runs can be diffed before shipping a new version:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+
+Micro-benchmarks report the best and median time per call over several
+repeats; the macro benchmark plays a seeded 10-minute session (36,000 frames)
+of update + draw and reports frame time percentiles. The biome benchmark
+warps a seeded run straight into each biome (Game.warp) and reports the
+frame cost in each. --snapshot starts the
+session (and every restart) from a saved game instead, e.g. one made in Space
+by benchmarks/make_snapshot.py:
+
+    python benchmarks/make_snapshot.py --biome space --output space.snapshot
+    python benchmarks/run_benchmarks.py --snapshot space.snapshot --skip-micro --skip-biomes
+"""
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+
+# Headless before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")   # Its banner would go to stdout, ahead of the report
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pygame
+from cosmic_runner import layout, Game, Obstacle
+from cosmic_runner.constants import PLAYING, GAME_OVER, FPS, biome_names
+from cosmic_runner import render
+from cosmic_runner import gc_policy
+from cosmic_runner import snapshot
+from cosmic_runner.assets import biome_assets
+from cosmic_runner.particles import particles, ParticleSystem
+from multiplayer import codec
+from multiplayer.protocol import HEADER_SIZE
+
+SEED = 1234
+SESSION_MINUTES = 10
+BIOME_FRAMES = 1800         # 30 seconds of play in each biome
+
+# Entity counts used for the collision and draw benchmarks
+COLLISION_COUNTS = (10, 100, 1000)
+DRAW_DENSITIES = (0, 10, 50, 200)
+# Live particles in the particle benchmarks
+PARTICLE_COUNTS = (100, 600)
+# Entities per list in the multiplayer state snapshot benchmarks
+WIRE_DENSITIES = (0, 10, 50)
+
+# name -> (setup, calls per repeat); setup() returns the callable to time
+BENCHMARKS = {}
+
+def benchmark(name, number=100):
+    """Register a micro-benchmark setup function under name"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+def new_game(biome=0):
+    """A freshly reset game in the given biome with no front end attached"""
+    game = Game()
+    game.reset_game()
+    game.current_biome = biome
+    game.state = PLAYING
+    return game
+
+# Micro-benchmarks
+
+for _biome, _biome_name in enumerate(biome_names):
+    def _setup_obstacle(biome=_biome):
+        return lambda: Obstacle(biome, 5)
+    benchmark(f"obstacle_construction[{_biome_name}]", number=200)(_setup_obstacle)
+
+for _count in COLLISION_COUNTS:
+    def _setup_collision(count=_count):
+        game = new_game()
+        # Everything is ahead of the player, out of reach, so each call does
+        # the full scan without collecting coins or losing a life
+        game.populate(count)
+        player = game.player
+        return lambda: player.update(game.obstacles, game.coins)
+    benchmark(f"player_update_collision[{_count}]", number=200)(_setup_collision)
+
+@benchmark("player_animation", number=5000)
+def _setup_player_animation():
+    game = new_game()
+    player = game.player
+    player.game = game
+    return player.update_animation
+
+@benchmark("spawn_elements", number=2000)
+def _setup_spawn_elements():
+    game = new_game()
+    game.spawn_elements()  # Fill the ground tiles first
+    lists = (game.obstacles, game.coins, game.powerups, game.checkpoints,
+             game.background_elements, game.tiles, game.decorations)
+    sizes = [len(entities) for entities in lists]
+
+    def spawn():
+        game.spawn_elements()
+        # Drop what was spawned so every call sees the same state
+        for entities, size in zip(lists, sizes):
+            del entities[size:]
+        game.has_checkpoint = False
+    return spawn
+
+for _density in DRAW_DENSITIES:
+    def _setup_draw(density=_density):
+        game = new_game()
+        game.spawn_elements()
+        game.populate(density)
+        screen = pygame.display.get_surface()
+        return lambda: render.draw_game(screen, game)
+    benchmark(f"draw_game[{_density}]", number=100)(_setup_draw)
+
+@benchmark("draw_ui", number=500)
+def _setup_draw_ui():
+    game = new_game()
+    game.active_powerups = {"shield": True, "coin_magnet": True}
+    game.powerup_timers = {"shield": 300, "coin_magnet": 300}
+    screen = pygame.display.get_surface()
+    return lambda: render.draw_ui(screen, game)
+
+@benchmark("draw_missions", number=500)
+def _setup_draw_missions():
+    game = new_game()
+    screen = pygame.display.get_surface()
+    return lambda: render.draw_missions(screen, game)
+
+def particle_field(count):
+    """A particle system holding count still, never-ending particles across the screen"""
+    system = ParticleSystem(budget=count)
+    for i in range(count):
+        system.emit("snow", 20 + i * 7 % (layout.SCREEN_WIDTH - 40), 20 + i * 13 % (layout.GROUND_LEVEL - 40), 0, 0)
+    system.add_pending()
+    for i in range(count):
+        system.life[i] = system.lifetime[i] = 10 ** 9
+    return system
+
+for _count in PARTICLE_COUNTS:
+    def _setup_particles_step(count=_count):
+        game = new_game()           # Plateau: no weather to emit
+        game.speed = 0
+        system = particle_field(count)
+        return lambda: system.step(game)
+    benchmark(f"particles_step[{_count}]", number=200)(_setup_particles_step)
+
+    def _setup_particles_draw(count=_count):
+        system = particle_field(count)
+        screen = pygame.display.get_surface()
+        return lambda: system.draw(screen)
+    benchmark(f"particles_draw[{_count}]", number=200)(_setup_particles_draw)
+
+@benchmark("snapshot_dumps", number=50)
+def _setup_snapshot_dumps():
+    game = new_game()
+    game.spawn_elements()
+    game.populate(10)
+    return lambda: snapshot.dumps(game)
+
+@benchmark("snapshot_loads", number=50)
+def _setup_snapshot_loads():
+    game = new_game()
+    game.spawn_elements()
+    game.populate(10)
+    blob = snapshot.dumps(game)
+    target = Game()
+    return lambda: snapshot.loads(blob, target)
+
+# Multiplayer wire format: the JSON path vs the binary codec
+
+def state_snapshot(density):
+    game = new_game()
+    game.spawn_elements()
+    game.populate(density)
+    return codec.state_message(game, tick=3600)
+
+def json_encode(message):
+    return json.dumps(message, separators=(',', ':')).encode('utf-8')
+
+WIRE_CODECS = {
+    "json": (json_encode, json.loads),
+    "binary": (codec.encode, codec.decode),
+}
+
+for _density in WIRE_DENSITIES:
+    for _codec_name in WIRE_CODECS:
+        def _setup_state_encode(density=_density, codec_name=_codec_name):
+            message = state_snapshot(density)
+            encode = WIRE_CODECS[codec_name][0]
+            return lambda: encode(message)
+        benchmark(f"state_encode[{_codec_name},{_density}]", number=2000)(_setup_state_encode)
+
+        def _setup_state_decode(density=_density, codec_name=_codec_name):
+            encode, decode = WIRE_CODECS[codec_name]
+            data = encode(state_snapshot(density))
+            return lambda: decode(data)
+        benchmark(f"state_decode[{_codec_name},{_density}]", number=2000)(_setup_state_decode)
+
+for _codec_name in WIRE_CODECS:
+    def _setup_input_roundtrip(codec_name=_codec_name):
+        encode, decode = WIRE_CODECS[codec_name]
+        message = {'type': 'input', 'tick': 3600, 'buttons': codec.BUTTON_JUMP}
+        return lambda: decode(encode(message))
+    benchmark(f"input_roundtrip[{_codec_name}]", number=5000)(_setup_input_roundtrip)
+
+def wire_sizes():
+    """Framed bytes per tick for each message and codec, and the rate at FPS"""
+    random.seed(SEED)
+    messages = {f"state[{density}]": state_snapshot(density) for density in WIRE_DENSITIES}
+    messages["input"] = {'type': 'input', 'tick': 3600, 'buttons': codec.BUTTON_JUMP}
+    sizes = {}
+    for name, message in messages.items():
+        json_bytes = len(json_encode(message)) + HEADER_SIZE
+        binary_bytes = len(codec.encode(message)) + HEADER_SIZE
+        sizes[name] = {
+            "json_bytes_per_tick": json_bytes,
+            "binary_bytes_per_tick": binary_bytes,
+            "json_kb_per_s": round(json_bytes * FPS / 1024, 2),
+            "binary_kb_per_s": round(binary_bytes * FPS / 1024, 2),
+            "ratio": round(json_bytes / binary_bytes, 2)
+        }
+    return sizes
+
+def time_benchmark(name, repeats):
+    """Time one registered benchmark, returning per-call times in microseconds"""
+    setup, number = BENCHMARKS[name]
+    random.seed(SEED)
+    func = setup()
+    func()  # Warm caches (sprite banks, fonts) outside the timed region
+
+    per_call_us = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call_us.append((time.perf_counter() - started) / number * 1e6)
+    return {
+        "calls_per_repeat": number,
+        "repeats": repeats,
+        "best_us": round(min(per_call_us), 3),
+        "median_us": round(statistics.median(per_call_us), 3)
+    }
+
+# Macro benchmark
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+def scripted_input(game, rng):
+    """Jump when the next obstacle is close, with seeded timing jitter"""
+    player = game.player
+    for obstacle in game.obstacles:
+        gap = obstacle.rect.left - player.rect.right
+        if 0 <= gap < game.speed * 8 + rng.randint(-10, 10):
+            game.jump_input()
+            break
+    game.jetpack_held = rng.random() < 0.3
+
+def snapshot_game(blob):
+    game = snapshot.loads(blob)
+    game.state = PLAYING
+    game.effect_player = particles.burst
+    return game
+
+def run_session(minutes=SESSION_MINUTES, seed=SEED, use_gc_policy=False, snapshot_path=None):
+    """Play a seeded headless session of update + draw at FPS frames a second
+
+    Input comes from scripted_input(); the game restarts on game over so the
+    whole session is spent in PLAYING. With use_gc_policy the game runs under
+    cosmic_runner.gc_policy as the front end does. With snapshot_path every
+    run starts from that saved game rather than a new one.
+    """
+    random.seed(seed)
+    input_rng = random.Random(seed)
+    screen = pygame.display.get_surface()
+    if snapshot_path:
+        with open(snapshot_path, "rb") as f:
+            blob = f.read()
+        game = snapshot_game(blob)
+    else:
+        game = new_game()
+        game.effect_player = particles.burst
+    particles.clear()
+    gc_policy.enable(manage=use_gc_policy)  # Pauses are timed either way
+    if use_gc_policy:
+        gc_policy.freeze_startup_heap()
+
+    frames = int(minutes * 60 * FPS)
+    update_ms = []
+    draw_ms = []
+    runs = 1
+    max_distance = 0
+    biomes_reached = 0
+
+    for _ in range(frames):
+        scripted_input(game, input_rng)
+
+        started = time.perf_counter()
+        game.update()
+        particles.step(game)
+        updated = time.perf_counter()
+        render.draw_game(screen, game)
+        gc_policy.on_frame(game)
+        drawn = time.perf_counter()
+        update_ms.append((updated - started) * 1000)
+        draw_ms.append((drawn - updated) * 1000)
+
+        max_distance = max(max_distance, game.distance)
+        biomes_reached = max(biomes_reached, game.current_biome + 1)
+        if game.state == GAME_OVER:
+            if snapshot_path:
+                game = snapshot_game(blob)
+            else:
+                game.reset_game()
+            runs += 1
+
+    frame_ms = sorted(u + d for u, d in zip(update_ms, draw_ms))
+    gc_pauses = gc_policy.pause_stats()
+    gc_policy.disable()
+    if use_gc_policy:
+        gc.unfreeze()
+    return {
+        "seed": seed,
+        "snapshot": snapshot_path,
+        "frames": frames,
+        "runs": runs,
+        "max_distance": int(max_distance),
+        "biomes_reached": biomes_reached,
+        "total_s": round(sum(frame_ms) / 1000, 3),
+        "update_mean_ms": round(statistics.fmean(update_ms), 4),
+        "draw_mean_ms": round(statistics.fmean(draw_ms), 4),
+        "frame_mean_ms": round(statistics.fmean(frame_ms), 4),
+        "frame_p50_ms": round(percentile(frame_ms, 0.50), 4),
+        "frame_p95_ms": round(percentile(frame_ms, 0.95), 4),
+        "frame_p99_ms": round(percentile(frame_ms, 0.99), 4),
+        "frame_max_ms": round(frame_ms[-1], 4) if frame_ms else 0.0,
+        "gc_policy": use_gc_policy,
+        "gc_pauses": {kind: {"collections": count, "total_ms": round(total, 3), "max_ms": round(longest, 3)}
+                      for kind, (count, total, longest) in gc_pauses.items()}
+    }
+
+def run_biome_sessions(frames=BIOME_FRAMES, seed=SEED, density=0):
+    """Play frames of update + draw warped into each biome; frame cost per biome
+
+    Each biome is a run warped to where it begins (Game.warp, with density
+    extra entities on screen) on the same seeded course, warped again after a
+    game over. Frames are only counted while the runner is still in that biome.
+    Each biome's scenery banks and the surfaces only its entities hold are
+    reported at the end of its frames.
+    """
+    screen = pygame.display.get_surface()
+    input_rng = random.Random(seed)
+    results = {}
+    for biome, name in enumerate(biome_names):
+        game = Game()
+        game.effect_player = particles.burst
+        game.seed_course(seed)
+        game.warp(biome, density=density)
+        particles.clear()
+        update_ms = []
+        draw_ms = []
+        particle_counts = []
+        while len(update_ms) < frames:
+            scripted_input(game, input_rng)
+            started = time.perf_counter()
+            game.update()
+            particles.step(game)
+            updated = time.perf_counter()
+            render.draw_game(screen, game)
+            drawn = time.perf_counter()
+            if game.current_biome == biome:
+                update_ms.append((updated - started) * 1000)
+                draw_ms.append((drawn - updated) * 1000)
+                particle_counts.append(particles.count)
+            if game.state == GAME_OVER or game.current_biome != biome:
+                game.seed_course(seed + len(update_ms))
+                game.warp(biome, density=density)
+        frame_ms = sorted(u + d for u, d in zip(update_ms, draw_ms))
+        footprint = biome_assets.footprint(game).get(name, {})
+        results[name] = {
+            "frames": frames,
+            "update_mean_ms": round(statistics.fmean(update_ms), 4),
+            "draw_mean_ms": round(statistics.fmean(draw_ms), 4),
+            "frame_mean_ms": round(statistics.fmean(frame_ms), 4),
+            "frame_p95_ms": round(percentile(frame_ms, 0.95), 4),
+            "frame_p99_ms": round(percentile(frame_ms, 0.99), 4),
+            "asset_bank_kb": round(footprint.get("bank_bytes", 0) / 1024),
+            "asset_live_kb": round(footprint.get("live_bytes", 0) / 1024),
+            "particles_mean": round(statistics.fmean(particle_counts)),
+        }
+    return {"seed": seed, "density": density, "biomes": results}
+
+# Report
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version()),
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+def compare(baseline, report, threshold):
+    """Print a per-benchmark comparison and return the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':40} {'baseline':>12} {'current':>12} {'change':>9}", file=sys.stderr)
+    for name, result in report["micro"].items():
+        old = baseline.get("micro", {}).get(name)
+        if not old:
+            print(f"{name:40} {'-':>12} {result['best_us']:>10.1f}us {'new':>9}", file=sys.stderr)
+            continue
+        change = result["best_us"] / old["best_us"] - 1 if old["best_us"] else 0.0
+        flag = " !" if change > threshold else ""
+        print(f"{name:40} {old['best_us']:>10.1f}us {result['best_us']:>10.1f}us {change:>+8.1%}{flag}",
+              file=sys.stderr)
+        if change > threshold:
+            regressions.append(name)
+
+    old_biomes = (baseline.get("biomes") or {}).get("biomes", {})
+    for name, result in ((report.get("biomes") or {}).get("biomes") or {}).items():
+        old = old_biomes.get(name)
+        if not old:
+            continue
+        for key in ("frame_mean_ms", "frame_p95_ms"):
+            change = result[key] / old[key] - 1 if old[key] else 0.0
+            flag = " !" if change > threshold else ""
+            print(f"{'biome.' + name + '.' + key:40} {old[key]:>10.3f}ms {result[key]:>10.3f}ms {change:>+8.1%}{flag}",
+                  file=sys.stderr)
+            if change > threshold:
+                regressions.append(f"biome.{name}.{key}")
+
+    old_session = baseline.get("macro")
+    if report.get("macro") and old_session:
+        for key in ("frame_mean_ms", "frame_p95_ms", "frame_p99_ms"):
+            old, new = old_session[key], report["macro"][key]
+            change = new / old - 1 if old else 0.0
+            flag = " !" if change > threshold else ""
+            print(f"{'session.' + key:40} {old:>10.3f}ms {new:>10.3f}ms {change:>+8.1%}{flag}", file=sys.stderr)
+            if change > threshold:
+                regressions.append("session." + key)
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cosmic Runner benchmark suite")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--filter", "-k", default="",
+                        help="Only run micro-benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=5, help="Repeats per micro-benchmark")
+    parser.add_argument("--session-minutes", type=float, default=SESSION_MINUTES,
+                        help="Length of the macro session in game minutes")
+    parser.add_argument("--skip-session", action="store_true", help="Only run the micro-benchmarks")
+    parser.add_argument("--skip-micro", action="store_true", help="Skip the micro-benchmarks")
+    parser.add_argument("--biome-frames", type=int, default=BIOME_FRAMES,
+                        help="Frames played in each biome by the biome benchmark")
+    parser.add_argument("--biome-density", type=int, default=0,
+                        help="Extra obstacles, coins and background elements on screen in the biome benchmark")
+    parser.add_argument("--skip-biomes", action="store_true", help="Skip the biome benchmark")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help="Start the session from this saved game (see make_snapshot.py)")
+    parser.add_argument("--gc-policy", action="store_true",
+                        help="Run the session under the game's GC policy (frozen heap, gameplay thresholds)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Fewer repeats and a 1-minute session, for a fast sanity check")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Compare against an earlier JSON report and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown treated as a regression by --compare (default 0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.quick:
+        args.repeats = min(args.repeats, 3)
+        args.session_minutes = min(args.session_minutes, 1)
+        args.biome_frames = min(args.biome_frames, 300)
+
+    # A bad baseline fails now rather than after every benchmark has run
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: --compare: {e}", file=sys.stderr)
+            return 1
+
+    pygame.display.init()
+    pygame.display.set_mode((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+    render.init_fonts()
+
+    report = {"machine": machine_info(), "seed": SEED, "micro": {}, "wire": wire_sizes(), "biomes": None, "macro": None}
+    for name, sizes in report["wire"].items():
+        print(f"{'wire ' + name:40} {sizes['json_bytes_per_tick']:>6}B json {sizes['binary_bytes_per_tick']:>6}B binary",
+              file=sys.stderr)
+    for name in BENCHMARKS:
+        if args.filter in name and not args.skip_micro:
+            report["micro"][name] = time_benchmark(name, args.repeats)
+            print(f"{name:40} {report['micro'][name]['best_us']:>10.1f}us", file=sys.stderr)
+
+    if not args.skip_biomes:
+        report["biomes"] = run_biome_sessions(args.biome_frames, density=args.biome_density)
+        for name, result in report["biomes"]["biomes"].items():
+            print(f"{'biome ' + name:40} {result['frame_mean_ms']:>10.3f}ms/frame "
+                  f"{result['asset_bank_kb'] + result['asset_live_kb']:>7}KB assets", file=sys.stderr)
+
+    if not args.skip_session:
+        report["macro"] = run_session(args.session_minutes, use_gc_policy=args.gc_policy,
+                                      snapshot_path=args.snapshot)
+        print(f"{'session':40} {report['macro']['frame_mean_ms']:>10.3f}ms/frame", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    pygame.quit()
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}",
+                  file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
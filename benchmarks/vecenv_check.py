@@ -0,0 +1,173 @@
+"""Check the vectorized simulator against Game and measure its throughput.
+
+The same scripted bot (jump when an obstacle is close, hold the jetpack)
+plays a number of seeded Game sessions one frame at a time and a batch of
+VecEnv runs. The two use different random streams, so single runs differ;
+what has to agree is the distribution: for every statistic the report
+gives both means, and a z-score above --max-z fails the check. Then it times
+VecEnv.step for several batch sizes.
+
+    python benchmarks/vecenv_check.py --games 200 --frames 5000
+    python benchmarks/vecenv_check.py --skip-equivalence --batch 1024 4096 16384
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import statistics
+
+# Headless before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pygame
+from cosmic_runner import layout, Game
+from cosmic_runner.constants import PLAYING
+from cosmic_runner import vecenv
+
+STATS = ("frames", "distance", "score", "coins", "lives_lost", "biome", "missions")
+
+def jump_distance(speed):
+    return speed * 8
+
+def game_bot(game):
+    player = game.player
+    for obstacle in game.obstacles:
+        if 0 <= obstacle.rect.left - player.rect.right < jump_distance(game.speed):
+            game.jump_input()
+            break
+
+def vec_bot(env, obs):
+    np = vecenv.np
+    first = vecenv.OBSERVATION_FIELDS.index("obstacle0_dx")
+    gaps = np.rint(obs[:, first:first + 4 * vecenv.NEAREST_OBSTACLES:4] * env.width)
+    close = ((gaps >= 0) & (gaps < jump_distance(env.speed)[:, None])).any(axis=1)
+    return np.where(close, vecenv.JUMP | vecenv.JETPACK, vecenv.JETPACK)
+
+def play_games(games, frames, seed):
+    """One Game session per seed, to game over or the frame cap"""
+    pygame.display.init()
+    pygame.display.set_mode((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+    runs = []
+    for i in range(games):
+        game = Game()
+        game.seed_course(seed + i)
+        game.reset_game()
+        game.state = PLAYING
+        game.jetpack_held = True
+        while game.state == PLAYING and game.frame_count < frames:
+            game_bot(game)
+            game.update()
+        runs.append({
+            "frames": game.frame_count,
+            "distance": game.distance,
+            "score": game.score,
+            "coins": game.total_coins,
+            "lives_lost": 3 - max(0, game.lives),
+            "biome": game.current_biome,
+            "missions": len(game.completed_missions),
+        })
+    return runs
+
+def play_vec(runs, frames, seed):
+    """The first session of every VecEnv run, to game over or the frame cap"""
+    np = vecenv.np
+    env = vecenv.VecEnv(runs)
+    obs = env.reset(seed)
+    results = [None] * runs
+    pending = runs
+    while pending:
+        obs, _, dones, info = env.step(vec_bot(env, obs))
+        for j, row in enumerate(np.flatnonzero(dones)):
+            if results[row] is None:
+                results[row] = {name: info[key][j].item() for name, key in (
+                    ("frames", "frames"), ("distance", "distance"), ("score", "score"), ("coins", "coins"),
+                    ("biome", "biome"), ("missions", "missions"))}
+                results[row]["lives_lost"] = 3
+                pending -= 1
+        for row in np.flatnonzero(env.frame == frames):
+            if results[row] is None:
+                results[row] = {
+                    "frames": frames,
+                    "distance": env.distance[row].item(),
+                    "score": env.score[row].item(),
+                    "coins": env.total_coins[row].item(),
+                    "lives_lost": 3 - env.lives[row].item(),
+                    "biome": env.biome[row].item(),
+                    "missions": env.missions_completed[row].item(),
+                }
+                pending -= 1
+    return results, env.dropped
+
+def compare(game_runs, vec_runs):
+    report = {}
+    for stat in STATS:
+        a = [run[stat] for run in game_runs]
+        b = [run[stat] for run in vec_runs]
+        error = math.sqrt(statistics.pvariance(a) / len(a) + statistics.pvariance(b) / len(b))
+        difference = statistics.fmean(b) - statistics.fmean(a)
+        report[stat] = {
+            "game_mean": round(statistics.fmean(a), 2),
+            "vecenv_mean": round(statistics.fmean(b), 2),
+            "z": round(difference / error, 2) if error else 0.0,
+        }
+    return report
+
+def throughput(batch, steps):
+    env = vecenv.VecEnv(batch)
+    obs = env.reset(0)
+    for _ in range(50):     # Warm up
+        obs, _, _, _ = env.step(vec_bot(env, obs))
+    env.steps = 0
+    started = time.perf_counter()
+    for _ in range(steps):
+        obs, _, _, _ = env.step(vec_bot(env, obs))
+    elapsed = time.perf_counter() - started
+    return {"batch": batch, "steps_per_second": round(env.steps / elapsed), "step_ms": round(elapsed / steps * 1000, 3)}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check VecEnv against Game and time it")
+    parser.add_argument("--games", type=int, default=200, help="Game sessions to play")
+    parser.add_argument("--runs", type=int, default=4096, help="VecEnv runs to compare against")
+    parser.add_argument("--frames", type=int, default=5000, help="Frame cap per session")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--max-z", type=float, default=4.0)
+    parser.add_argument("--batch", type=int, nargs="+", default=[256, 1024, 4096, 16384])
+    parser.add_argument("--steps", type=int, default=300, help="Timed steps per batch size")
+    parser.add_argument("--skip-equivalence", action="store_true")
+    parser.add_argument("--output", help="Write the report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if vecenv.np is None:
+        print("vecenv_check needs numpy")
+        return 1
+    random.seed(args.seed)
+    report = {"width": layout.SCREEN_WIDTH, "ground": layout.GROUND_LEVEL, "problems": []}
+    if not args.skip_equivalence:
+        started = time.perf_counter()
+        game_runs = play_games(args.games, args.frames, args.seed)
+        game_seconds = time.perf_counter() - started
+        vec_runs, dropped = play_vec(args.runs, args.frames, args.seed)
+        report["equivalence"] = compare(game_runs, vec_runs)
+        report["game_frames_per_second"] = round(sum(run["frames"] for run in game_runs) / game_seconds)
+        report["dropped_spawns"] = dropped
+        report["problems"] += [f"{stat}: z = {result['z']}" for stat, result in report["equivalence"].items()
+                               if abs(result["z"]) > args.max_z]
+    report["throughput"] = [throughput(batch, args.steps) for batch in args.batch]
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    return 1 if report["problems"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
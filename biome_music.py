@@ -1,8 +1,7 @@
 import pygame
 import os
-
-# Initialize mixer
-pygame.mixer.init()
+import threading
+from cosmic_runner import tracing
 
 # Get current directory
 current_dir = os.path.dirname(__file__)
@@ -29,31 +28,166 @@ BIOME_MUSIC = {
     SPACE: os.path.join(current_dir, "assets", "music", "Galaxial.mp3")        # Cosmic finale
 }
 
+# Two dedicated mixer channels: the outgoing track fades out on one while the
+# incoming track fades in on the other. Channels 0-4 belong to sound_bank.
+MUSIC_CHANNELS = (5, 6)
+
+# Decoded tracks are raw PCM (~10 MB per minute), so only keep a few around
+MAX_DECODED_TRACKS = 3
+
 # Track current biome and volume
 current_biome_playing = None
 current_volume = 1.0  # Range: 0.0 (mute) to 1.0 (full volume)
 
+# Background decoding state - keyed by file path so a track shared between
+# biomes (Chills.mp3, On.mp3) is only decoded once
+_decoded_tracks = {}   # path -> pygame.mixer.Sound (None if decoding failed)
+_loading_tracks = {}   # path -> threading.Thread
+_tracks_lock = threading.Lock()
+
+# Crossfade state
+_channels = []
+_active_channel = 0
+_pending_biome = None
+_pending_fade_ms = 1000
+
+def _ensure_channels():
+    """Reserve the two music channels the first time they are needed"""
+    global _channels
+
+    if _channels:
+        return True
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if pygame.mixer.get_num_channels() <= MUSIC_CHANNELS[-1]:
+            pygame.mixer.set_num_channels(MUSIC_CHANNELS[-1] + 1)
+        pygame.mixer.set_reserved(MUSIC_CHANNELS[-1] + 1)
+        _channels = [pygame.mixer.Channel(i) for i in MUSIC_CHANNELS]
+    except pygame.error as e:
+        print(f"Warning: Could not reserve music channels: {e}")
+        return False
+    return True
+
+def _decode_track(music_path):
+    """Decode a music file into a Sound (runs on a background thread)"""
+    sound = None
+    try:
+        if os.path.exists(music_path):
+            with tracing.span("decode_music", category="assets", args={"path": os.path.basename(music_path)}):
+                sound = pygame.mixer.Sound(music_path)
+        else:
+            print(f"Warning: Music file not found: {music_path}")
+    except pygame.error as e:
+        print(f"Warning: Could not decode music {music_path}: {e}")
+
+    with _tracks_lock:
+        _decoded_tracks[music_path] = sound
+        _loading_tracks.pop(music_path, None)
+
+def _evict_tracks(keep_paths):
+    """Drop decoded tracks once over the cap, keeping keep_paths and any still loading"""
+    with _tracks_lock:
+        # Copied under the lock: the decode threads change _loading_tracks
+        keep_paths = set(keep_paths) | set(_loading_tracks)
+        for path in list(_decoded_tracks):
+            if len(_decoded_tracks) <= MAX_DECODED_TRACKS:
+                break
+            if path not in keep_paths:
+                del _decoded_tracks[path]
+
+def preload_biome_music(biome):
+    """Start decoding a biome's track in the background (returns immediately)"""
+    music_path = BIOME_MUSIC.get(biome)
+    if not music_path:
+        return
+
+    with _tracks_lock:
+        if music_path in _decoded_tracks or music_path in _loading_tracks:
+            return
+        if not pygame.mixer.get_init():
+            return
+        loader = threading.Thread(target=_decode_track, args=(music_path,), daemon=True)
+        _loading_tracks[music_path] = loader
+    loader.start()
+
+def is_biome_music_ready(biome):
+    """True once the biome's track has finished decoding"""
+    with _tracks_lock:
+        return BIOME_MUSIC.get(biome) in _decoded_tracks
+
+def _crossfade_to(biome, fade_duration_ms):
+    """Fade the active channel out and the new track in on the other channel"""
+    global current_biome_playing, _active_channel
+
+    music_path = BIOME_MUSIC[biome]
+    with _tracks_lock:
+        sound = _decoded_tracks.get(music_path)
+
+    if not _ensure_channels():
+        return
+
+    # Title music is streamed through pygame.mixer.music
+    if pygame.mixer.music.get_busy():
+        pygame.mixer.music.fadeout(fade_duration_ms)
+
+    outgoing = _channels[_active_channel]
+    if outgoing.get_busy():
+        outgoing.fadeout(fade_duration_ms)
+
+    current_biome_playing = biome
+    if sound is None:
+        return
+
+    _active_channel = 1 - _active_channel
+    incoming = _channels[_active_channel]
+    incoming.set_volume(current_volume)
+    incoming.play(sound, loops=-1, fade_ms=fade_duration_ms)
+
+    # Keep the playing track plus whatever is still queued up
+    _evict_tracks({music_path})
+
 def play_biome_music(biome, fade_duration_ms=1000):
-    """Play music for the specified biome with crossfade"""
-    global current_biome_playing
+    """Play music for the specified biome with crossfade
+
+    Never blocks: if the track is still decoding, the current music keeps
+    playing and the crossfade starts from update() once it is ready.
+    """
+    global _pending_biome, _pending_fade_ms
 
-    if biome == current_biome_playing:
+    if biome == current_biome_playing or biome not in BIOME_MUSIC:
+        _pending_biome = None
         return
 
-    pygame.mixer.music.fadeout(fade_duration_ms)
+    if is_biome_music_ready(biome):
+        _pending_biome = None
+        _crossfade_to(biome, fade_duration_ms)
+    else:
+        _pending_biome = biome
+        _pending_fade_ms = fade_duration_ms
+        preload_biome_music(biome)
 
-    music_path = BIOME_MUSIC.get(biome)
-    if music_path:
-        pygame.mixer.music.load(music_path)
-        pygame.mixer.music.set_volume(current_volume)
-        pygame.mixer.music.play(-1, fade_ms=fade_duration_ms)
-        current_biome_playing = biome
+    # Get the following biome's track decoding while this one plays
+    preload_biome_music((biome + 1) % len(BIOME_MUSIC))
+
+def update():
+    """Start any crossfade whose track finished decoding (call once per frame)"""
+    global _pending_biome
+
+    if _pending_biome is not None and is_biome_music_ready(_pending_biome):
+        biome = _pending_biome
+        _pending_biome = None
+        _crossfade_to(biome, _pending_fade_ms)
 
 def stop_music(fade_duration_ms=1000):
     """Stop the currently playing music with fade out"""
-    global current_biome_playing
-    pygame.mixer.music.fadeout(fade_duration_ms)
+    global current_biome_playing, _pending_biome
+    if pygame.mixer.get_init():
+        pygame.mixer.music.fadeout(fade_duration_ms)
+    for channel in _channels:
+        channel.fadeout(fade_duration_ms)
     current_biome_playing = None
+    _pending_biome = None
 
 def set_volume(volume):
     """Set the volume of the music
@@ -62,4 +196,8 @@ def set_volume(volume):
     """
     global current_volume
     current_volume = max(0.0, min(1.0, volume))  # Clamp between 0.0 and 1.0
-    pygame.mixer.music.set_volume(volume)
\ No newline at end of file
+    if not pygame.mixer.get_init():
+        return  # Applied when the next track starts
+    pygame.mixer.music.set_volume(current_volume)
+    for channel in _channels:
+        channel.set_volume(current_volume)
@@ -0,0 +1,23 @@
+"""Cosmic Runner simulation engine.
+
+Importing this package has no display or audio side effects: it holds the
+game state, entities, spawner, missions and player physics. Rendering lives
+in cosmic_runner.render and audio in the top-level biome_music and
+sound_bank modules, which the game front end wires into Game through its
+sound_player/music_player hooks.
+"""
+import os
+
+# Benchmark and simulation workers import this in every process
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from . import layout
+from .constants import *
+from .entities import (
+    Player, Obstacle, Coin, Checkpoint, BackgroundElement, CelestialBody,
+    Decoration, Tile, PowerUp
+)
+from .game import Game
+from .missions import Mission, MissionBoard
+from .spawner import ObstacleSpawner
+from .sprites import TextureCache, scene_texture_cache
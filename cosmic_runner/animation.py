@@ -0,0 +1,83 @@
+"""Runner animation, baked once at load.
+
+build_runner_animation(base_frames) turns the runner's base frames into
+every pose the game shows: the run cycle, jump, fall, the jetpack lean and
+a squash on landing, plus a faded copy of each for the respawn flash. The
+scaling and rotation happen here, once. Every pose sits on one canvas
+size with the runner's feet in the same place, so the runner is always
+drawn at rect.topleft + offset. Player.update_animation only picks an
+index into frames.
+"""
+import pygame
+
+# Poses: (horizontal scale, vertical scale, degrees counter-clockwise)
+# A single runner.png gets a run cycle from bob and tilt; generated frames already move their legs
+RUN_FROM_IMAGE = ((1.0, 1.0, -3), (1.04, 0.96, 0), (1.0, 1.0, 3), (0.97, 1.03, 0))
+JUMP = ((0.92, 1.1, 6),)
+FALL = ((1.0, 1.02, -8),)
+JETPACK = ((0.96, 1.04, -14), (0.98, 1.02, -12))
+LAND = ((1.25, 0.75, 0), (1.12, 0.88, 0), (1.04, 0.96, 0))
+
+# Canvas size relative to the base frame, room for the widest squash and tilt
+CANVAS_SCALE = (1.4, 1.3)
+RESPAWN_ALPHA = 80
+
+# Game frames each jetpack and landing pose is held
+JETPACK_FRAME_TICKS = 4
+LAND_FRAME_TICKS = 3
+
+def pose(frame, canvas_size, anchor, scale_x, scale_y, angle):
+    """frame scaled and rotated on a transparent canvas, its bottom centre at anchor"""
+    width, height = frame.get_size()
+    image = frame
+    if (scale_x, scale_y) != (1.0, 1.0):
+        # smoothscale only takes 24 and 32 bit surfaces
+        scale = pygame.transform.smoothscale if frame.get_bitsize() >= 24 else pygame.transform.scale
+        image = scale(image, (round(width * scale_x), round(height * scale_y)))
+    if angle:
+        image = pygame.transform.rotate(image, angle)
+    canvas = pygame.Surface(canvas_size, pygame.SRCALPHA)
+    canvas.blit(image, image.get_rect(midbottom=anchor))
+    return canvas
+
+class RunnerAnimation:
+    """Baked runner poses: frames and faded are indexed by the lists in sequences"""
+    def __init__(self, base_frames):
+        width, height = base_frames[0].get_size()
+        self.size = (width, height)                 # The runner's hitbox
+        canvas_size = (round(width * CANVAS_SCALE[0]), round(height * CANVAS_SCALE[1]))
+        left, top = (canvas_size[0] - width) // 2, canvas_size[1] - height - (canvas_size[1] - height) // 4
+        self.offset = (-left, -top)
+        anchor = (left + width // 2, top + height)
+        self.frames = []
+        self.sequences = {}
+
+        def add(name, poses):
+            self.sequences[name] = []
+            for frame, (scale_x, scale_y, angle) in poses:
+                self.sequences[name].append(len(self.frames))
+                self.frames.append(pose(frame, canvas_size, anchor, scale_x, scale_y, angle))
+
+        base = base_frames[0]
+        if len(base_frames) > 1:
+            add("run", [(frame, (1.0, 1.0, 0)) for frame in base_frames])
+        else:
+            add("run", [(base, step) for step in RUN_FROM_IMAGE])
+        add("jump", [(base, step) for step in JUMP])
+        add("fall", [(base, step) for step in FALL])
+        add("jetpack", [(base, step) for step in JETPACK])
+        add("land", [(base, step) for step in LAND])
+        self.run = self.sequences["run"]
+        self.jump = self.sequences["jump"]
+        self.fall = self.sequences["fall"]
+        self.jetpack = self.sequences["jetpack"]
+        self.land = self.sequences["land"]
+
+        self.faded = []
+        for frame in self.frames:
+            faded = frame.copy()
+            faded.set_alpha(RESPAWN_ALPHA)
+            self.faded.append(faded)
+
+def build_runner_animation(base_frames):
+    return RunnerAnimation(base_frames)
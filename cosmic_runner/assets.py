@@ -0,0 +1,173 @@
+"""Biome asset banks: shared scenery surfaces, warmed up and released per biome.
+
+Ground tiles, decorations and background elements are scenery: nothing
+collides with them, so entities of one biome can share a bank of
+pre-drawn variants instead of drawing a surface each. Variant i of a bank
+is always drawn from its own random stream, seeded by kind, biome and i.
+Entities pick a variant with exactly one draw from the game's stream. So a
+seeded course plays out the same whether a variant was warmed up ahead of
+time, drawn on the spot, or evicted and drawn again.
+
+BiomeAssets.step() warms up the current and next biome's banks a few
+variants per frame. It releases the banks of biomes no game has been in
+for RELEASE_STEPS frames, which covers the 3 second biome transition. Banks are
+kept under a memory budget. footprint() reports bank and on-screen surface
+memory per biome.
+"""
+import random
+
+from .constants import biome_names
+from .sprites import surface_bytes
+
+# Variants per bank
+BANK_SIZES = {"tile": 32, "decoration": 16, "background": 12}
+DEFAULT_BUDGET_BYTES = 16 * 1024 * 1024
+WARM_VARIANTS_PER_STEP = 1
+RELEASE_STEPS = 240         # Counted over every Game in the process
+
+# Game lists whose entities have a biome, for the on-screen footprint
+ENTITY_LISTS = ("tiles", "decorations", "background_elements", "obstacles")
+
+class BiomeAssets:
+    """Scenery banks per (biome, kind), with warm-up, release and a memory budget"""
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.generators = {}        # kind -> draw(biome) returning (surface, y offset from the ground)
+        self.banks = {}             # (biome, kind) -> {variant: (surface, y offset)}, oldest first
+        self.bytes = 0
+        self.steps = 0
+        self.wanted = {}            # biome -> step when a game was last in it or about to enter it
+        self.current = None         # Biome of the last step()
+        # Statistics
+        self.drawn = 0              # Variants drawn, warm-up included
+        self.misses = 0             # Picks that had to draw their variant on the spot
+        self.evicted = 0
+        self.released = 0
+
+    def register(self, kind, draw):
+        """draw(biome) draws one variant with the random module and returns (surface, y offset)"""
+        self.generators[kind] = draw
+
+    def pick(self, biome, kind):
+        """(variant, surface, y offset) for a new entity; one draw from the game's random stream"""
+        variant = int(random.random() * BANK_SIZES[kind])
+        bank = self.banks.get((biome, kind))
+        if bank is None or variant not in bank:
+            self.misses += 1
+        surface, offset = self.variant(biome, kind, variant)
+        return variant, surface, offset
+
+    def variant(self, biome, kind, variant):
+        """(surface, y offset) of a variant, drawing it if the bank doesn't hold it"""
+        bank = self.banks.setdefault((biome, kind), {})
+        entry = bank.get(variant)
+        if entry is None:
+            entry = bank[variant] = self.draw(biome, kind, variant)
+            self.bytes += surface_bytes(entry[0])
+            self.enforce_budget(keep=(biome, kind, variant))
+        return entry
+
+    def draw(self, biome, kind, variant):
+        """Draw a variant from its own random stream, leaving the game's stream as it was"""
+        saved = random.getstate()
+        random.seed(f"{kind}:{biome}:{variant}")
+        try:
+            entry = self.generators[kind](biome)
+        finally:
+            random.setstate(saved)
+        self.drawn += 1
+        return entry
+
+    def step(self, biome):
+        """Once per frame: keep this biome and the next warm, release the ones left behind"""
+        self.steps += 1
+        self.current = biome
+        following = (biome + 1) % len(biome_names)
+        self.wanted[biome] = self.wanted[following] = self.steps
+        for old in [b for b, seen in self.wanted.items() if self.steps - seen > RELEASE_STEPS]:
+            del self.wanted[old]
+            self.release(old)
+        count = WARM_VARIANTS_PER_STEP
+        for warm_biome in (biome, following):
+            for kind in self.generators:
+                count = self.warm(warm_biome, kind, count)
+                if not count:
+                    return
+
+    def warm(self, biome, kind, count):
+        """Draw up to count missing variants while the budget allows; returns how many are left to draw"""
+        bank = self.banks.setdefault((biome, kind), {})
+        for variant in range(BANK_SIZES[kind]):
+            if count <= 0:
+                break
+            if variant in bank:
+                continue
+            if self.bytes >= self.budget_bytes:
+                return 0
+            entry = bank[variant] = self.draw(biome, kind, variant)
+            self.bytes += surface_bytes(entry[0])
+            count -= 1
+        return count
+
+    def warm_up(self, biome):
+        """Fill every bank of a biome now (e.g. before a run starts there)"""
+        for kind in self.generators:
+            self.warm(biome, kind, BANK_SIZES[kind])
+        self.wanted[biome] = self.steps
+
+    def release(self, biome):
+        """Drop a biome's banks; entities still on screen keep their surfaces"""
+        for kind in list(self.generators):
+            bank = self.banks.pop((biome, kind), None)
+            if bank:
+                self.bytes -= sum(surface_bytes(surface) for surface, _ in bank.values())
+                self.released += len(bank)
+
+    def enforce_budget(self, keep):
+        """Evict variants until under budget: unwanted biomes, the next one, then the oldest drawn"""
+        if self.bytes <= self.budget_bytes:
+            return
+        banks = sorted(self.banks.items(), key=lambda item: (item[0][0] in self.wanted, item[0][0] == self.current))
+        for (biome, kind), bank in banks:
+            for variant in list(bank):
+                if self.bytes <= self.budget_bytes:
+                    return
+                if (biome, kind, variant) == keep:
+                    continue
+                self.bytes -= surface_bytes(bank.pop(variant)[0])
+                self.evicted += 1
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.enforce_budget(keep=(None, None, None))
+
+    def footprint(self, game=None):
+        """Memory per biome: bank variants and bytes, plus surfaces only the game's entities hold
+
+        Entities showing a bank variant are counted in bank_bytes; live_bytes
+        is obstacles and variants that were released or evicted while on screen.
+        """
+        report = {}
+        seen = set()
+        for (biome, kind), bank in self.banks.items():
+            entry = report.setdefault(biome_names[biome], {"bank_variants": 0, "bank_bytes": 0, "live_bytes": 0})
+            entry["bank_variants"] += len(bank)
+            entry["bank_bytes"] += sum(surface_bytes(surface) for surface, _ in bank.values())
+            seen.update(id(surface) for surface, _ in bank.values())
+        if game is not None:
+            for attribute in ENTITY_LISTS:
+                for entity in getattr(game, attribute):
+                    if id(entity.image) in seen:
+                        continue
+                    seen.add(id(entity.image))
+                    entry = report.setdefault(biome_names[entity.biome],
+                                              {"bank_variants": 0, "bank_bytes": 0, "live_bytes": 0})
+                    entry["live_bytes"] += surface_bytes(entity.image)
+        return report
+
+    def stats(self):
+        return {"bank_bytes": self.bytes, "budget_bytes": self.budget_bytes, "drawn": self.drawn,
+                "misses": self.misses, "evicted": self.evicted, "released": self.released}
+
+# Shared by every Game in the process
+biome_assets = BiomeAssets()
@@ -0,0 +1,233 @@
+"""Autopilot: a scripted player for soak tests.
+
+Call Autopilot.control(game) before each Game.update(). When running on
+would take a hit, it plays the jump forward with Player's physics and
+collision rules against the obstacles as they scroll, and jumps on the
+first frame from which the whole arc, plus a short run after landing, is
+clear. In the air it holds the jetpack only when the arc needs it. The
+controller is deterministic, so a seeded course plays out the same way
+every time.
+
+AutopilotStats records survival (runs, deaths per biome, distance, biomes
+reached) and frame times per biome for the front end's --autopilot mode.
+"""
+from . import layout
+from .constants import biome_names, FPS, PLAYING, GAME_OVER
+
+LOOKAHEAD = 180             # Frames simulated at most (a jetpack arc is the longest)
+THREAT_FRAMES = 60          # Only plan for hits this close
+LANDING_MARGIN = 8          # Frames of clear running wanted after landing
+
+# Frame time histogram per biome
+FRAME_BUCKET_MS = 0.1
+FRAME_BUCKETS = 1000        # Up to 100 ms; slower frames land in the last bucket
+
+def _round(value):
+    """Round like a pygame Rect coordinate assignment (halves away from zero)"""
+    return int(value + 0.5) if value >= 0 else -int(0.5 - value)
+
+class Autopilot:
+    """Times Game.jump_input and the jetpack key to get past every obstacle"""
+    def __init__(self):
+        # Statistics
+        self.jumps = 0
+        self.plans = 0              # Frames that needed a simulation
+        self.doomed = 0             # Frames where nothing simulated was clear
+
+    def control(self, game):
+        player = game.player
+        if game.state != PLAYING:
+            return
+        tracks = self.tracks(game)
+        airborne = not player.on_ground or player.jumping
+        can_jet = player.has_jetpack and player.jetpack_fuel > 0
+        game.jetpack_held = False
+        if not tracks:
+            return
+        if airborne:
+            if can_jet:
+                self.plans += 1
+                coast = self.simulate(game, tracks, None, False)
+                if coast is not None:
+                    thrust = self.simulate(game, tracks, None, True, passed=self.passed(game, tracks, coast))
+                    game.jetpack_held = thrust is None or thrust[0] > coast[0]
+            return
+
+        threat = self.simulate(game, tracks, None, False, THREAT_FRAMES)
+        if threat is None:
+            return
+        self.plans += 1
+        passed = self.passed(game, tracks, threat)
+        options = [self.simulate(game, tracks, 0, False, passed=passed)]
+        if can_jet:
+            options.append(self.simulate(game, tracks, 0, True, passed=passed))
+        if None in options:
+            self.jump(game, options.index(None) == 1)
+            return
+        if threat[0] <= 1:
+            # Nothing clears it and waiting won't either; jump if that lasts longer
+            self.doomed += 1
+            best = max(options)
+            if best[0] > threat[0]:
+                self.jump(game, options.index(best) == 1)
+
+    def jump(self, game, hold):
+        game.jump_input()
+        game.jetpack_held = hold
+        self.jumps += 1
+
+    def tracks(self, game):
+        """Each obstacle's rect per future frame: (xs, y, width, height, centery)"""
+        player_x = game.player.rect.x
+        tracks = []
+        for obstacle in game.obstacles:
+            rect = obstacle.rect
+            if rect.right < player_x:
+                continue
+            x, speed, xs = rect.x, obstacle.speed, []
+            for _ in range(LOOKAHEAD):
+                xs.append(x)
+                x = _round(x - speed)
+            tracks.append((xs, rect.y, rect.width, rect.height, rect.centery))
+        return tracks
+
+    def passed(self, game, tracks, hit):
+        """First frame the obstacle of a (frame, track) hit is behind the runner"""
+        xs, _, width = tracks[hit[1]][:3]
+        player_x = game.player.rect.x
+        return next((frame for frame, x in enumerate(xs) if x + width <= player_x), LOOKAHEAD)
+
+    def simulate(self, game, tracks, jump_at, hold, frames=LOOKAHEAD, passed=0):
+        """(frame, track) of the first hit if the runner jumps at jump_at (None: doesn't), else None
+
+        Follows Player.jump, the jetpack and gravity in Player.update, and its
+        collision test (a falling runner whose bottom is above an obstacle's
+        middle goes over it). Clear means no hit until LANDING_MARGIN frames
+        after landing, once frame `passed` is reached, or for all the frames.
+        """
+        player = game.player
+        rect = player.rect
+        px, width, height = rect.x, rect.width, rect.height
+        standing = layout.GROUND_LEVEL - height
+        y, vy = rect.y, player.velocity_y
+        jumping, on_ground = player.jumping, player.on_ground
+        gravity, thrust = player.gravity, player.jetpack_thrust
+        has_jetpack, fuel = player.has_jetpack, player.jetpack_fuel
+        jetpack_frames = game.powerup_timers.get("jetpack", LOOKAHEAD) + 1
+        safe_frames = 0
+        if game.respawn_state:
+            safe_frames = game.respawn_timer - 1     # Counted down before the player moves
+        if game.active_powerups.get("shield"):
+            safe_frames = max(safe_frames, game.powerup_timers.get("shield", 0) + 1)
+        landed_at = None
+
+        for frame in range(frames):
+            if frame == jump_at and on_ground and not jumping:
+                vy = player.jump_speed
+                jumping, on_ground = True, False
+                landed_at = None
+            if hold and has_jetpack and fuel > 0 and not on_ground and frame < jetpack_frames:
+                vy += thrust
+                fuel -= 2
+                if fuel <= 0:
+                    has_jetpack = False
+            if not on_ground or jumping:
+                vy += gravity
+                y = _round(y + vy)
+                if y >= standing:
+                    y, vy = standing, 0
+                    jumping, on_ground = False, True
+                    landed_at = frame
+            else:
+                y, vy = standing, 0
+
+            if frame >= safe_frames:
+                bottom = y + height
+                for index, (xs, top, w, h, centery) in enumerate(tracks):
+                    x = xs[frame]
+                    if px < x + w and x < px + width and y < top + h and top < bottom:
+                        if bottom < centery and vy > 0:
+                            continue
+                        return frame, index
+            if landed_at is not None and frame >= max(passed, landed_at + LANDING_MARGIN):
+                return None
+        return None
+
+class AutopilotStats:
+    """Survival and frame-time records for a soak run"""
+    def __init__(self):
+        self.frames = 0
+        self.runs = 0
+        self.distances = []                     # Final distance of every finished run
+        self.distance = 0.0                     # The current run's
+        self.deaths = [0] * len(biome_names)
+        self.frames_by_biome = [0] * len(biome_names)
+        self.histograms = [[0] * FRAME_BUCKETS for _ in biome_names]
+        self.frame_ms_total = [0.0] * len(biome_names)
+        self.frame_ms_max = [0.0] * len(biome_names)
+        self.biomes_reached = set()
+        self.last_lives = None
+        self.last_state = None
+
+    def frame(self, game, frame_ms):
+        """Record one frame after it was updated and drawn"""
+        if game.state == PLAYING:
+            biome = game.current_biome
+            self.frames += 1
+            self.frames_by_biome[biome] += 1
+            self.histograms[biome][min(FRAME_BUCKETS - 1, int(frame_ms / FRAME_BUCKET_MS))] += 1
+            self.frame_ms_total[biome] += frame_ms
+            self.frame_ms_max[biome] = max(self.frame_ms_max[biome], frame_ms)
+            self.biomes_reached.add(biome)
+            self.distance = game.distance
+        if self.last_lives is not None and game.lives < self.last_lives:
+            self.deaths[game.current_biome] += self.last_lives - game.lives
+        if game.state == GAME_OVER and self.last_state != GAME_OVER:
+            self.runs += 1
+            self.distances.append(round(game.distance, 1))
+        self.last_lives = game.lives
+        self.last_state = game.state
+
+    def percentile_ms(self, biome, fraction):
+        histogram = self.histograms[biome]
+        wanted = fraction * sum(histogram)
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if count and seen >= wanted:
+                return round((bucket + 1) * FRAME_BUCKET_MS, 1)
+        return None
+
+    def report(self, autopilot=None):
+        biomes = {}
+        for biome, name in enumerate(biome_names):
+            frames = self.frames_by_biome[biome]
+            if not frames and not self.deaths[biome]:
+                continue
+            biomes[name] = {
+                "frames": frames,
+                "deaths": self.deaths[biome],
+                "frame_ms_mean": round(self.frame_ms_total[biome] / frames, 3) if frames else None,
+                "frame_ms_p50": self.percentile_ms(biome, 0.50),
+                "frame_ms_p99": self.percentile_ms(biome, 0.99),
+                "frame_ms_max": round(self.frame_ms_max[biome], 3),
+            }
+        report = {
+            "game_minutes": round(self.frames / FPS / 60, 2),
+            "runs_finished": self.runs,
+            "deaths": sum(self.deaths),
+            "distance_best": max(self.distances + [round(self.distance, 1)]),
+            "distance_mean": round(sum(self.distances) / len(self.distances), 1) if self.distances else None,
+            "biomes_reached": [biome_names[b] for b in sorted(self.biomes_reached)],
+            "biomes": biomes,
+        }
+        if autopilot is not None:
+            report["autopilot"] = {"jumps": autopilot.jumps, "planned_frames": autopilot.plans,
+                                   "doomed_frames": autopilot.doomed}
+        return report
+
+    def log_line(self):
+        total = sum(self.frame_ms_total)
+        return (f"Autopilot: {self.frames / FPS / 60:.1f} game min, {self.runs} runs over, "
+                f"{sum(self.deaths)} deaths, biomes {len(self.biomes_reached)}/{len(biome_names)}, "
+                f"frame {total / max(1, self.frames):.2f} ms mean")
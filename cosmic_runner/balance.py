@@ -0,0 +1,67 @@
+"""Gameplay balance knobs: physics, obstacle spacing, spawn odds and pacing.
+
+Game, Player and VecEnv read these as balance.NAME at the point of use
+(like layout), so configure() takes effect for everything created or
+stepped afterwards. The defaults are the shipped game; balance sweeps
+(benchmarks/balance_sweep.py) try other values.
+
+Spawn odds are "1 in N" per frame, so a bigger number spawns less often.
+"""
+import copy
+
+# Player physics
+JUMP_SPEED = -15
+GRAVITY = 0.8
+
+# Pacing: speed goes up every SPEED_RAMP_INTERVAL frames, biomes change every BIOME_LENGTH
+SPEED_RAMP_INTERVAL = 900
+SPEED_RAMP_STEP = 0.1
+FIRST_BIOME_DISTANCE = 1000
+BIOME_LENGTH = 800
+
+# Obstacle spacing: no new obstacle until the last one is
+# OBSTACLE_MIN_GAP + speed * OBSTACLE_GAP_PER_SPEED px in from the right edge,
+# then 1 in min(OBSTACLE_ODDS_MAX, OBSTACLE_ODDS + gap // OBSTACLE_ODDS_DISTANCE)
+OBSTACLE_MIN_GAP = 250
+OBSTACLE_GAP_PER_SPEED = 10
+OBSTACLE_ODDS = 40
+OBSTACLE_ODDS_MAX = 80
+OBSTACLE_ODDS_DISTANCE = 20
+FIRST_OBSTACLE_ODDS = 60
+
+# Coins and power-ups
+COIN_ODDS = 80
+POWERUP_ODDS = 600
+POWERUP_WEIGHTS = {"shield": 0.25, "speed": 0.20, "coin_magnet": 0.25, "double_coins": 0.15, "jetpack": 0.15}
+LATE_POWERUP_WEIGHTS = {"shield": 0.2, "speed": 0.15, "coin_magnet": 0.2, "double_coins": 0.1, "jetpack": 0.35}
+LATE_POWERUP_BIOME = 4          # LATE_POWERUP_WEIGHTS from this biome (Volcano) on
+
+DEFAULTS = copy.deepcopy({name: value for name, value in globals().items() if name.isupper()})
+
+def configure(**values):
+    """Start from the defaults and override the given knobs
+
+    Dict knobs (power-up weights) are merged, so {"jetpack": 0.5} only
+    changes the jetpack weight. Unknown names raise KeyError.
+    """
+    unknown = sorted(set(values) - set(DEFAULTS))
+    if unknown:
+        raise KeyError(f"unknown balance knobs: {', '.join(unknown)}")
+    settings = copy.deepcopy(DEFAULTS)
+    for name, value in values.items():
+        if isinstance(settings[name], dict):
+            extra = sorted(set(value) - set(settings[name]))
+            if extra:
+                raise KeyError(f"unknown keys for {name}: {', '.join(extra)}")
+            settings[name].update(value)
+        else:
+            settings[name] = value
+    globals().update(settings)
+
+def reset():
+    """Back to the shipped values"""
+    configure()
+
+def current():
+    """Every knob's current value"""
+    return {name: copy.deepcopy(globals()[name]) for name in DEFAULTS}
@@ -0,0 +1,43 @@
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+SKY_BLUE = (135, 206, 235)
+FOREST_GREEN = (34, 139, 34)
+SEA_BLUE = (0, 105, 148)
+SNOW_WHITE = (240, 240, 255)
+SPACE_BLACK = (5, 5, 20)
+YELLOW = (255, 255, 0)
+ORANGE = (255, 165, 0)
+MOON_COLOR = (220, 220, 220)  # Light gray for moon
+SUN_COLOR = (255, 215, 0)  # Gold for sun
+
+# Game states
+MENU = 0
+PLAYING = 1
+GAME_OVER = 2
+INSTRUCTIONS = 3
+PAUSED = 4
+
+# Frame rate the simulation is tuned for
+FPS = 60
+
+# Biomes
+PLATEAU = 0 
+DARK_FOREST = 1
+DESERT = 2
+SEA = 3
+SNOW = 4
+VOLCANO =5
+SKY = 6
+SPACE = 7
+biome_names = ["Plateau", "Dark Forest", "Desert", "Sea","Snow","Volcano", "Sky", "Space"]
+
+# Time of day
+DAY = 0
+NIGHT = 1
+
+# Tile size
+TILE_SIZE = 32
@@ -0,0 +1,1361 @@
+import pygame
+import random
+import math
+
+from . import layout
+from . import balance
+from .constants import (
+    WHITE, SNOW_WHITE, MOON_COLOR, SUN_COLOR, GAME_OVER,
+    PLATEAU, DARK_FOREST, DESERT, SEA, SNOW, VOLCANO, SKY, SPACE, biome_names,
+    DAY, TILE_SIZE
+)
+from .sprites import get_runner_animation, get_coin_sprite, get_checkpoint_font
+from .animation import JETPACK_FRAME_TICKS, LAND_FRAME_TICKS
+from .assets import biome_assets
+from .missions import JUMP, OBSTACLE_AVOIDED, HIT
+from . import tracing
+
+# Player class
+class Player(pygame.sprite.Sprite):
+    def __init__(self):
+        super().__init__()
+        self.animation = get_runner_animation()
+        self.frames = self.animation.frames
+        self.current_frame = self.animation.run[0]
+        self.image = self.frames[self.current_frame]
+        # The hitbox is the base frame; poses are drawn at rect.topleft + animation.offset
+        self.rect = pygame.Rect((0, 0), self.animation.size)
+        self.rect.x = 150
+        self.rect.y = layout.GROUND_LEVEL - self.rect.height
+        self.jumping = False
+        self.velocity_y = 0
+        self.is_alive = True
+        self.animation_frames = 8
+        self.animation_timer = 0
+        self.animation_cooldown = 5
+        self.run_step = 0
+        self.landing_timer = 0     # Frames of landing squash left
+        self.game = None  # Reference to game instance
+        
+        # Jump mechanics - More realistic
+        self.jump_speed = balance.JUMP_SPEED  # Reduced initial jump velocity
+        self.gravity = balance.GRAVITY        # Reduced gravity for more realistic feel
+        self.max_jump_height = 150  # Reduced maximum jump height
+        self.initial_y = 0     # Store initial Y position for jump height tracking
+        self.on_ground = True  # Track if player is on ground
+
+        # Jetpack system
+        self.has_jetpack = False
+        self.jetpack_fuel = 0
+        self.max_jetpack_fuel = 300
+        self.jetpack_thrust = -0.5
+
+    def play_sound(self, sound_name):
+        """Ask the game to play a sound effect (silent without a game/front end)"""
+        if self.game:
+            self.game.play_sound(sound_name)
+
+    def play_effect(self, effect_name, x, y):
+        if self.game:
+            self.game.play_effect(effect_name, x, y)
+
+    def update_animation(self):
+        """Pick this frame's pose from the baked animation"""
+        animation = self.animation
+        if self.jumping or not self.on_ground:
+            if self.has_jetpack and self.jetpack_fuel > 0 and self.game and self.game.jetpack_held:
+                self.animation_timer += 1
+                sequence = animation.jetpack
+                self.current_frame = sequence[self.animation_timer // JETPACK_FRAME_TICKS % len(sequence)]
+            elif self.velocity_y < 0:
+                self.current_frame = animation.jump[0]
+            else:
+                self.current_frame = animation.fall[0]
+        elif self.landing_timer > 0:
+            self.landing_timer -= 1
+            sequence = animation.land
+            self.current_frame = sequence[len(sequence) - 1 - self.landing_timer // LAND_FRAME_TICKS]
+        else:
+            # Running animation
+            self.animation_timer += 1
+            if self.animation_timer >= self.animation_cooldown:
+                self.run_step = (self.run_step + 1) % len(animation.run)
+                self.animation_timer = 0
+            self.current_frame = animation.run[self.run_step]
+        
+        self.image = self.frames[self.current_frame]
+    
+    def lose_life(self):
+        if self.game and self.game.active_powerups.get("shield", False):
+            # Shield protects from losing life
+            self.play_sound("shield")
+            return
+            
+        self.is_alive = False
+        if self.game:
+            self.game.lives -= 1
+            tracing.instant("lose_life", args={"lives": self.game.lives})
+            
+            # Play death sound
+            self.play_sound("death")
+            self.play_effect("death", *self.rect.center)
+                
+            if self.game.lives <= 0:
+                self.game.state = GAME_OVER
+            else:
+                # Reset player state for respawn
+                self.is_alive = True
+                self.jumping = False
+                self.velocity_y = 0
+                
+                # Find the most recent checkpoint
+                last_checkpoint = self.game.current_checkpoint
+                
+                if last_checkpoint:
+                    # Reset player position to checkpoint
+                    self.rect.x = last_checkpoint.rect.x + 100
+                    self.rect.y = layout.GROUND_LEVEL - self.rect.height
+                else:
+                    # No checkpoint found, return to start
+                    self.rect.x = 150
+                    self.rect.y = layout.GROUND_LEVEL - self.rect.height
+                
+                # Enter brief respawn invincibility
+                self.game.respawn_state = True
+                self.game.respawn_timer = 60  # 1 second invincibility
+    
+    def jump(self):
+        if self.on_ground and not self.jumping:
+            self.velocity_y = self.jump_speed
+            self.jumping = True
+            self.on_ground = False
+            self.initial_y = self.rect.y
+            self.play_sound("jump")
+            
+            # Track jump for missions
+            if self.game:
+                self.game.jumps_this_frame += 1
+                self.game.total_jumps += 1
+                self.game.notify_missions(JUMP)
+
+    def use_jetpack(self):
+        if self.has_jetpack and self.jetpack_fuel > 0:
+            self.velocity_y += self.jetpack_thrust
+            self.jetpack_fuel -= 2
+            if self.jetpack_fuel <= 0:
+                self.has_jetpack = False
+
+
+    def update(self, obstacles, coins):
+         # Update animation
+        self.update_animation()
+        
+        # Handle jetpack
+        if self.has_jetpack and self.jetpack_fuel > 0:
+            # The front end sets jetpack_held from the keyboard each frame
+            if self.game and self.game.jetpack_held and not self.on_ground:
+                self.use_jetpack()
+
+        # Gravity
+        if  not self.on_ground or self.jumping:
+            self.velocity_y += self.gravity
+            self.rect.y += self.velocity_y
+            
+            # Check if landed
+            if self.rect.y >= layout.GROUND_LEVEL - self.rect.height:
+                self.rect.y = layout.GROUND_LEVEL - self.rect.height
+                self.jumping = False
+                self.velocity_y = 0
+                self.on_ground = True
+                self.landing_timer = LAND_FRAME_TICKS * len(self.animation.land)
+
+        else:
+            self.rect.y = layout.GROUND_LEVEL - self.rect.height
+            self.velocity_y = 0
+
+        # Skip collision during respawn invincibility
+        if not (self.game and self.game.respawn_state):
+            # Collision with obstacles
+            for obstacle in obstacles:
+                if self.rect.colliderect(obstacle.rect):
+                    # Check if successfully jumping over
+                    jumping_over = (self.rect.bottom < obstacle.rect.centery and 
+                                  self.velocity_y > 0)
+                    
+                    if jumping_over:
+                        # Successfully jumped over
+                        if self.game:
+                            self.game.obstacles_avoided_this_frame += 1
+                            self.game.notify_missions(OBSTACLE_AVOIDED)
+                        continue
+                        
+                    if self.game and self.game.active_powerups.get("shield", False):
+                        # Shield blocks the hit
+                        self.play_sound("shield")
+                        if self.game:
+                            self.game.obstacles_avoided_this_frame += 1
+                            self.game.notify_missions(OBSTACLE_AVOIDED)
+                        continue
+                    
+                    # Player was hit
+                    if self.game:
+                        self.game.player_hit_this_frame = True
+                        self.game.notify_missions(HIT)
+                    self.lose_life()
+                    return 0
+        
+        # Collect coins with magnet powerup
+        coins_collected = 0
+        magnet_radius = 100 if self.game and self.game.active_powerups.get("coin_magnet", False) else 0
+        
+        for coin in list(coins):
+            # Calculate distance to coin
+            dx = coin.rect.centerx - self.rect.centerx
+            dy = coin.rect.centery - self.rect.centery
+            distance = math.sqrt(dx * dx + dy * dy)
+            
+            # Move coins towards player if magnet is active
+            if magnet_radius > 0 and distance < magnet_radius:
+                move_speed = 6
+                if distance > 0:
+                    coin.rect.x -= dx / distance * move_speed
+                    coin.rect.y -= dy / distance * move_speed
+            
+            # Collect on collision
+            if self.rect.colliderect(coin.rect):
+                coins.remove(coin)
+                coins_collected += 1
+                self.play_sound("coin")
+                self.play_effect("coin", *coin.rect.center)
+        
+        return coins_collected
+
+# Enhanced Obstacle class with more realistic appearances
+class Obstacle(pygame.sprite.Sprite):
+
+    def __init__(self, biome, speed):
+        super().__init__()
+        self.biome = biome
+        self.speed = speed
+        self.type = random.randint(0, 4)
+        self.avoided_counted = False
+        self.image = pygame.Surface((1, 1), pygame.SRCALPHA)  # Temporary surface
+        self.rect = self.image.get_rect()  # Initialize rect first
+        
+        
+        # Create obstacle based on biome
+        if biome == PLATEAU:
+            self.create_plateau_obstacle()
+        elif biome == DARK_FOREST:
+            self.create_dark_forest_obstacle()
+        elif biome == DESERT:
+            self.create_desert_obstacle()
+        elif biome == SEA:
+            self.create_sea_obstacle()
+        elif biome == VOLCANO:
+            self.create_volcano_obstacle()
+        elif biome == SKY:
+            self.create_sky_obstacle()
+        else:  # SPACE - Final biome
+            self.create_space_obstacle()
+            
+        self.rect.x = layout.SCREEN_WIDTH
+
+    def create_plateau_obstacle(self):
+        if self.type == 0:  # Rock formation
+            width, height = random.randint(40, 60), random.randint(50, 80)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (139, 128, 117), (0, 10, width, height-10))
+            for _ in range(8):
+                x, y = random.randint(5, width-5), random.randint(15, height-5)
+                pygame.draw.circle(self.image, (160, 150, 140), (x, y), random.randint(2, 4))
+        elif self.type == 1:  # Lava geyser
+            width, height = 25, random.randint(80, 120)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (139, 69, 19), (5, height-20, width-10, 20))
+            for i in range(height//10):
+                y = height - 20 - i*10
+                stream_width = max(3, width//2 - i)
+                pygame.draw.rect(self.image, (255, 69, 0), (width//2 - stream_width//2, y, stream_width, 8))
+        elif self.type == 2:  # Obsidian spike
+            width, height = 20, random.randint(60, 90)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            points = [(width//2, 0), (0, height), (width, height)]
+            pygame.draw.polygon(self.image, (40, 40, 60), points)
+            highlight_points = [(width//2, 0), (width//4, height//2), (3*width//4, height//2)]
+            pygame.draw.polygon(self.image, (80, 80, 100), highlight_points)
+        else:  # Fire crystal
+            size = 35
+            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
+            points = [(size//2, 0), (size, size//3), (3*size//4, size), (size//4, size), (0, size//3)]
+            pygame.draw.polygon(self.image, (255, 100, 0), points)
+            inner_points = [(size//2, size//6), (3*size//4, size//2), (size//4, size//2)]
+            pygame.draw.polygon(self.image, (255, 200, 0), inner_points)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - self.image.get_height()
+
+    def create_dark_forest_obstacle(self):
+        if self.type == 0:  # Dead tree
+            width, height = random.randint(30, 50), random.randint(80, 120)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (40, 20, 10), (width//2-5, height//2, 10, height//2))
+            for i in range(3):
+                branch_y = height//3 + i*15
+                pygame.draw.line(self.image, (60, 30, 15), (width//2, branch_y), (5, branch_y-10), 3)
+                pygame.draw.line(self.image, (60, 30, 15), (width//2, branch_y), (width-5, branch_y-10), 3)
+        elif self.type == 1:  # Thorny bush
+            width, height = random.randint(50, 70), random.randint(40, 60)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (20, 40, 20), (0, height//3, width, 2*height//3))
+            for _ in range(15):
+                x = random.randint(5, width-5)
+                y = random.randint(height//2, height-5)
+                pygame.draw.line(self.image, (139, 69, 19), (x, y), (x+random.randint(-8,8), y-10), 2)
+        else:  # Dark mushroom
+            width, height = 40, random.randint(50, 70)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (139, 69, 19), (width//2-3, height//2, 6, height//2))
+            pygame.draw.ellipse(self.image, (139, 0, 139), (0, 0, width, height//2))
+            for _ in range(5):
+                x = random.randint(5, width-5)
+                y = random.randint(5, height//3)
+                pygame.draw.circle(self.image, WHITE, (x, y), 2)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - self.image.get_height()
+
+    def create_desert_obstacle(self):
+        if self.type == 0:  # Cactus
+            width, height = random.randint(25, 40), random.randint(60, 100)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (34, 139, 34), (width//2-8, 20, 16, height-20))
+            if random.choice([True, False]):
+                pygame.draw.rect(self.image, (34, 139, 34), (5, height//2-5, width//2, 10))
+            if random.choice([True, False]):
+                pygame.draw.rect(self.image, (34, 139, 34), (width//2, height//3, width//2-5, 10))
+            for _ in range(12):
+                x = random.randint(width//2-8, width//2+8)
+                y = random.randint(25, height-5)
+                pygame.draw.line(self.image, (255, 255, 255), (x, y), (x+3, y), 1)
+        elif self.type == 1:  # Sand dune
+            width, height = random.randint(60, 100), random.randint(30, 50)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            points = [(0, height)]
+            for i in range(10):
+                x = i * width // 9
+                y = height - 10 - abs(math.sin(i * 0.8) * 20)
+                points.append((x, int(y)))
+            points.append((width, height))
+            pygame.draw.polygon(self.image, (238, 203, 173), points)
+        else:  # Rock formation
+            width, height = random.randint(40, 60), random.randint(40, 70)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (160, 82, 45), (0, height//3, width, 2*height//3))
+            pygame.draw.ellipse(self.image, (139, 69, 19), (width//4, 0, width//2, height//2))
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - self.image.get_height()
+
+    def create_sea_obstacle(self):
+        if self.type == 0:  # Coral reef
+            width, height = random.randint(50, 80), random.randint(60, 100)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            colors = [(255, 127, 80), (255, 99, 71), (255, 160, 122)]
+            for i in range(4):
+                color = random.choice(colors)
+                branch_width = random.randint(12, 20)
+                branch_height = random.randint(20, 40)
+                x = i * width // 4
+                y = height - branch_height
+                pygame.draw.ellipse(self.image, color, (x, y, branch_width, branch_height))
+        elif self.type == 1:  # Giant kelp
+            width, height = 30, random.randint(100, 150)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            for strand in range(2):
+                x_base = strand * 15 + 5
+                for y in range(0, height, 8):
+                    wave = math.sin((y + strand * 30) * 0.08) * 6
+                    pygame.draw.circle(self.image, (46, 125, 50), (x_base + int(wave), y), 3)
+        elif self.type == 2:  # Sea anemone
+            width, height = random.randint(40, 60), random.randint(50, 80)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (138, 43, 226), (0, height//2, width, height//2))
+            for i in range(8):
+                angle = i * math.pi / 4
+                tentacle_end_x = width//2 + math.cos(angle) * width//3
+                tentacle_end_y = height//2 + math.sin(angle) * height//4
+                pygame.draw.line(self.image, (75, 0, 130), 
+                               (width//2, height//2), 
+                               (int(tentacle_end_x), int(tentacle_end_y)), 3)
+        else:  # Underwater rock
+            width, height = random.randint(45, 70), random.randint(40, 65)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (105, 105, 105), (0, height//4, width, 3*height//4))
+            for _ in range(6):
+                x = random.randint(5, width-5)
+                y = random.randint(height//3, height-5)
+                pygame.draw.circle(self.image, (34, 139, 34), (x, y), random.randint(2, 5))
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - self.image.get_height()
+        
+    def create_snow_obstacle(self):
+        if self.type == 0:  # Snowman
+            self.image = pygame.Surface((40, 60), pygame.SRCALPHA)
+            # Snowman body (3 circles)
+            pygame.draw.circle(self.image, (255, 255, 255), (20, 50), 15)  # Bottom
+            pygame.draw.circle(self.image, (255, 255, 255), (20, 35), 12)  # Middle  
+            pygame.draw.circle(self.image, (255, 255, 255), (20, 22), 8)   # Head
+            # Face
+            pygame.draw.circle(self.image, (0, 0, 0), (17, 20), 1)  # Left eye
+            pygame.draw.circle(self.image, (0, 0, 0), (23, 20), 1)  # Right eye
+            pygame.draw.circle(self.image, (255, 165, 0), (20, 23), 1)  # Nose
+            self.rect = self.image.get_rect()
+            self.rect.y = layout.GROUND_LEVEL - 60
+        elif self.type == 1:  # Ice spike
+            height = random.randint(50, 80)
+            self.image = pygame.Surface((20, height), pygame.SRCALPHA)
+            # Create icicle shape
+            points = [(10, 0), (0, height), (20, height)]
+            pygame.draw.polygon(self.image, (173, 216, 230), points)
+            # Add ice shine
+            pygame.draw.polygon(self.image, (224, 255, 255), [(10, 0), (5, height//2), (15, height//2)], 2)
+            self.rect = self.image.get_rect()
+            self.rect.y = layout.GROUND_LEVEL - height
+        elif self.type == 2:  # Snow drift
+            self.image = pygame.Surface((60, 30), pygame.SRCALPHA)
+            # Create mounded snow shape
+            points = [(0, 30), (15, 10), (30, 5), (45, 10), (60, 30)]
+            pygame.draw.polygon(self.image, (255, 255, 255), points)
+            pygame.draw.polygon(self.image, (240, 248, 255), [(5, 25), (15, 15), (25, 12), (35, 15), (50, 25)], 0)
+            self.rect = self.image.get_rect()
+            self.rect.y = layout.GROUND_LEVEL - 30
+        else:  # Frozen tree
+            self.image = pygame.Surface((35, 70), pygame.SRCALPHA)
+            # Brown trunk
+            pygame.draw.rect(self.image, (101, 67, 33), (0, 0, 35, 70))
+            # Add ice coating
+            pygame.draw.rect(self.image, (173, 216, 230, 100), (0, 0, 35, 70))
+            # Frozen branches
+            for i in range(3):
+                y_pos = 15 + i * 20
+                pygame.draw.line(self.image, (173, 216, 230), (5, y_pos), (30, y_pos - 5), 3)
+            self.rect = self.image.get_rect()
+            self.rect.y = layout.GROUND_LEVEL - 70
+
+    def create_volcano_obstacle(self):
+        if self.type == 0:  # Lava rock
+            width, height = random.randint(50, 80), random.randint(60, 100)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (70, 35, 35), (0, height//3, width, 2*height//3))
+            for _ in range(8):
+                x = random.randint(5, width-5)
+                y = random.randint(height//2, height-5)
+                pygame.draw.circle(self.image, (255, 69, 0), (x, y), random.randint(2, 4))
+        elif self.type == 1:  # Lava fountain
+            width, height = 30, random.randint(100, 140)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (139, 69, 19), (width//3, height-15, width//3, 15))
+            for i in range(height//8):
+                y = height - 15 - i*8
+                fountain_width = max(2, width//2 - i//2)
+                color = (255, 69 + i*2, 0) if i < 8 else (255, 255, 0)
+                pygame.draw.rect(self.image, color, 
+                               (width//2 - fountain_width//2, y, fountain_width, 6))
+        elif self.type == 2:  # Volcanic crystal
+            width, height = 35, random.randint(70, 100)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            points = [(width//2, 0), (width, height//2), (3*width//4, height), (width//4, height), (0, height//2)]
+            pygame.draw.polygon(self.image, (255, 69, 0), points)
+            inner_points = [(width//2, height//6), (2*width//3, height//3), (width//3, height//3)]
+            pygame.draw.polygon(self.image, (255, 255, 0), inner_points)
+        else:  # Magma pool
+            width, height = random.randint(60, 90), 25
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (255, 69, 0), (0, 0, width, height))
+            pygame.draw.ellipse(self.image, (255, 255, 0), (width//4, height//4, width//2, height//2))
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - self.image.get_height()
+
+    def create_sky_obstacle(self):
+        if self.type == 0:  # Storm cloud
+            width, height = random.randint(80, 120), random.randint(40, 60)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (105, 105, 105), (0, 0, width, height))
+            pygame.draw.ellipse(self.image, (169, 169, 169), (10, 5, width-20, height-10))
+            if random.random() < 0.3:
+                pygame.draw.line(self.image, (255, 255, 0), 
+                               (width//2, height), (width//2 + 10, height + 20), 3)
+        elif self.type == 1:  # Wind turbine
+            self.image = pygame.Surface((30, 100), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (192, 192, 192), (13, 20, 4, 80))
+            pygame.draw.line(self.image, (255, 255, 255), (15, 20), (5, 10), 3)
+            pygame.draw.line(self.image, (255, 255, 255), (15, 20), (25, 10), 3)
+            pygame.draw.line(self.image, (255, 255, 255), (15, 20), (15, 5), 3)
+        elif self.type == 2:  # Hot air balloon
+            self.image = pygame.Surface((50, 80), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (255, 69, 0), (5, 0, 40, 50))
+            pygame.draw.ellipse(self.image, (255, 140, 0), (10, 5, 30, 40))
+            pygame.draw.rect(self.image, (139, 69, 19), (20, 50, 10, 10))
+            pygame.draw.line(self.image, (0, 0, 0), (15, 45), (22, 50), 1)
+            pygame.draw.line(self.image, (0, 0, 0), (35, 45), (28, 50), 1)
+        else:  # Bird flock
+            self.image = pygame.Surface((60, 30), pygame.SRCALPHA)
+            for i, (x, y) in enumerate([(10, 15), (20, 10), (30, 5), (40, 10), (50, 15)]):
+                pygame.draw.arc(self.image, (0, 0, 0), (x-3, y-2, 6, 4), 0, math.pi, 2)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - random.randint(80, 200)
+
+    def create_space_obstacle(self):
+        """Enhanced space obstacles for the final biome"""
+        if self.type == 0:  # Large asteroid
+            size = random.randint(50, 90)
+            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
+            points = []
+            for angle in range(0, 360, 30):
+                rad = math.radians(angle)
+                radius = size//2 + random.randint(-12, 12)
+                x = size//2 + radius * math.cos(rad)
+                y = size//2 + radius * math.sin(rad)
+                points.append((x, y))
+            pygame.draw.polygon(self.image, (105, 105, 105), points)
+            # Add craters
+            for _ in range(8):
+                cx, cy = random.randint(8, size-8), random.randint(8, size-8)
+                crater_size = random.randint(3, 8)
+                pygame.draw.circle(self.image, (70, 70, 70), (cx, cy), crater_size)
+                pygame.draw.circle(self.image, (50, 50, 50), (cx-1, cy-1), crater_size-2)
+        elif self.type == 1:  # Space station debris
+            self.image = pygame.Surface((60, 40), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (169, 169, 169), (0, 10, 60, 20))
+            pygame.draw.rect(self.image, (255, 255, 255), (5, 13, 50, 14))
+            pygame.draw.line(self.image, (255, 0, 0), (15, 10), (20, 30), 3)
+            pygame.draw.line(self.image, (255, 0, 0), (35, 10), (40, 30), 3)
+            # Sparking effect
+            for _ in range(5):
+                x = random.randint(10, 50)
+                y = random.randint(8, 32)
+                pygame.draw.circle(self.image, (255, 255, 0), (x, y), 1)
+        elif self.type == 2:  # Alien mothership
+            self.image = pygame.Surface((80, 50), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.image, (128, 128, 128), (10, 20, 60, 25))
+            pygame.draw.ellipse(self.image, (192, 192, 192), (20, 10, 40, 25))
+            # Alien lights
+            colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+            for i, x in enumerate([15, 30, 45, 60]):
+                color = colors[i % len(colors)]
+                pygame.draw.circle(self.image, color, (x, 32), 4)
+        else:  # Satellite wreckage
+            self.image = pygame.Surface((55, 45), pygame.SRCALPHA)
+            pygame.draw.rect(self.image, (105, 105, 105), (20, 15, 15, 25))
+            # Broken solar panels
+            pygame.draw.rect(self.image, (0, 0, 139), (0, 17, 15, 21))
+            pygame.draw.rect(self.image, (0, 0, 139), (40, 17, 15, 21))
+            # Damaged antenna
+            pygame.draw.line(self.image, (255, 255, 255), (27, 15), (35, 0), 2)
+            pygame.draw.circle(self.image, (255, 255, 255), (35, 0), 3)
+            # Damage effects
+            for _ in range(3):
+                x = random.randint(15, 40)
+                y = random.randint(12, 35)
+                pygame.draw.line(self.image, (255, 100, 0), (x, y), (x+5, y+5), 1)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - random.randint(60, 180)
+     
+    def update(self):
+        self.rect.x -= self.speed
+        if self.rect.right < 0:
+            return True
+        return False
+
+# Coin class
+class Coin(pygame.sprite.Sprite):
+    def __init__(self, speed):
+        super().__init__()
+        # Reuse precomputed coin sprite instead of creating new surface
+        self.image = get_coin_sprite().copy()
+        self.rect = self.image.get_rect()
+        self.rect.x = layout.SCREEN_WIDTH
+        self.rect.y = random.randint(layout.GROUND_LEVEL - 150, layout.GROUND_LEVEL - 30)
+        self.speed = speed
+        self.angle = 0
+
+    def update(self):
+        self.rect.x -= self.speed
+        
+        # Coin spinning animation
+        self.angle = (self.angle + 5) % 360
+        
+        if self.rect.right < 0:
+            return True
+        return False
+    
+# Checkpoint class
+class Checkpoint(pygame.sprite.Sprite):
+    def __init__(self, biome, speed, game=None):
+        super().__init__()
+        self.biome = biome
+        self.speed = speed
+        self.game = game
+        self.activated = False
+        
+        # Define checkpoint size and appearance
+        self.width = 30
+        self.height = 60
+        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        
+        # Different colors for each biome (Space is last)
+        biome_colors = [
+            (150, 111, 51),   # Plateau - brown
+            (20, 60, 20),     # Dark Forest - dark green
+            (238, 203, 173),  # Desert - sandy
+            (0, 100, 200),    # Sea - blue
+            (139, 69, 19),    # Volcano - orange/red
+            (100, 200, 255),  # Sky - light blue
+            (200, 100, 200)   # Space - purple (FINAL)
+        ]
+        
+        self.color = biome_colors[biome] if biome < len(biome_colors) else (100, 100, 100)
+        self.symbol = biome_names[biome][0] if biome < len(biome_names) else "?"
+        
+        pygame.draw.rect(self.image, self.color, (0, 0, self.width, self.height))
+        pygame.draw.rect(self.image, (255, 255, 255), (0, 0, self.width, self.height), 2)
+        pygame.draw.rect(self.image, (150, 75, 0), (0, 0, 5, self.height))
+        
+        font = get_checkpoint_font()
+        symbol_text = font.render(self.symbol, True, (0, 0, 0))
+        self.image.blit(symbol_text, (self.width//2 - symbol_text.get_width()//2, 
+                                     self.height//2 - symbol_text.get_height()//2))
+        
+        self.rect = self.image.get_rect()
+        self.rect.x = layout.SCREEN_WIDTH
+        self.rect.y = layout.GROUND_LEVEL - self.height
+        
+        self.animation_counter = 0
+        self.wave_amplitude = 1
+        
+    def update(self):
+        self.rect.x -= self.speed
+        
+        # Update checkpoint animation
+        self.animation_counter += 1
+        if self.animation_counter >= 3:
+            self.animation_counter = 0
+            self.wave_amplitude = random.randint(2, 5)
+        
+        # Check if player has reached this checkpoint
+        if self.game and self.rect.x < 200 and not self.activated:  # Player is near checkpoint
+            self.game.current_checkpoint = self  # Update current checkpoint
+            self.game.biome_checkpoints[self.biome] = self  # Store checkpoint for this biome
+            self.game.has_checkpoint = True
+            self.activated = True
+            
+            # Play checkpoint activation sound
+            self.game.play_sound("checkpoint")
+        
+        # Return True if off-screen
+        if self.rect.right < 0:
+            return True
+        return False
+
+# Enhanced Background elements for each biome with more realistic appearances
+class BackgroundElement(pygame.sprite.Sprite):
+    def __init__(self, biome, speed):
+        super().__init__()
+        self.biome = biome
+        self.speed = speed * 0.3  # Background moves slower for parallax effect
+        
+        # Shared look from the biome's bank (see assets.py)
+        self.variant, self.image, ground_offset = biome_assets.pick(biome, "background")
+        self.rect = self.image.get_rect()
+        self.rect.x = layout.SCREEN_WIDTH
+        self.rect.y = layout.GROUND_LEVEL + ground_offset
+    
+    def create_appearance(self):
+        if self.biome == PLATEAU:
+            self.create_plateau_background()
+        elif self.biome == DARK_FOREST:
+            self.create_dark_forest_background()
+        elif self.biome == DESERT:
+            self.create_desert_background()
+        elif self.biome == SEA:
+            self.create_sea_background()
+        elif self.biome == VOLCANO:
+            self.create_volcano_background()
+        elif self.biome == SKY:
+            self.create_sky_background()
+        else:  # SPACE - Enhanced final biome
+            self.create_space_background()
+    
+    def create_space_background(self):
+        """Enhanced space background for final biome"""
+        choice = random.choice(['stars', 'nebula', 'planet', 'galaxy', 'comet'])
+        
+        if choice == 'stars':
+            width, height = 150, 150
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            for _ in range(random.randint(30, 80)):
+                x = random.randint(0, width)
+                y = random.randint(0, height)
+                brightness = random.randint(150, 255)
+                size = random.choices([1, 2, 3], weights=[0.7, 0.25, 0.05])[0]
+                color = random.choice([(brightness, brightness, brightness),
+                                     (brightness, brightness//2, brightness//2),
+                                     (brightness//2, brightness//2, brightness),
+                                     (brightness//2, brightness, brightness//2)])
+                pygame.draw.circle(self.image, color, (x, y), size)
+                
+        elif choice == 'nebula':
+            width, height = random.randint(200, 400), random.randint(150, 250)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            colors = [(128, 0, 128, 60), (0, 100, 200, 50), (200, 0, 100, 70), (100, 200, 50, 40)]
+            for color in colors:
+                for _ in range(15):
+                    x = random.randint(0, width)
+                    y = random.randint(0, height)
+                    radius = random.randint(30, 80)
+                    pygame.draw.circle(self.image, color[:3], (x, y), radius)
+                    
+        elif choice == 'planet':
+            size = random.randint(100, 200)
+            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
+            planet_colors = [(255, 100, 100), (100, 255, 100), (100, 100, 255), 
+                           (255, 255, 100), (255, 100, 255), (100, 255, 255)]
+            color = random.choice(planet_colors)
+            pygame.draw.circle(self.image, color, (size//2, size//2), size//2)
+            
+            # Add planet features
+            for _ in range(5):
+                feature_color = tuple(max(0, c - 80) for c in color)
+                x = random.randint(size//6, 5*size//6)
+                y = random.randint(size//6, 5*size//6)
+                feature_size = random.randint(8, 25)
+                pygame.draw.circle(self.image, feature_color, (x, y), feature_size)
+                
+            # Add rings for some planets
+            if random.random() < 0.3:
+                ring_color = (200, 200, 200, 100)
+                pygame.draw.ellipse(self.image, ring_color[:3], 
+                                  (size//6, size//2-5, 2*size//3, 10))
+                                  
+        elif choice == 'galaxy':
+            width, height = random.randint(250, 350), random.randint(150, 200)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            center_x, center_y = width//2, height//2
+            
+            # Galaxy spiral
+            for arm in range(2):
+                for i in range(100):
+                    angle = arm * math.pi + i * 0.1
+                    radius = i * 0.8
+                    x = center_x + radius * math.cos(angle)
+                    y = center_y + radius * math.sin(angle) * 0.5
+                    if 0 <= x < width and 0 <= y < height:
+                        brightness = max(50, 200 - i * 2)
+                        size = max(1, 3 - i//30)
+                        pygame.draw.circle(self.image, (brightness, brightness//2, brightness//4), 
+                                         (int(x), int(y)), size)
+                                         
+        else:  # comet
+            width, height = 100, 30
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            # Comet head
+            pygame.draw.circle(self.image, (200, 200, 255), (width-15, height//2), 8)
+            pygame.draw.circle(self.image, (255, 255, 255), (width-15, height//2), 5)
+            
+            # Comet tail
+            for i in range(width-20):
+                tail_width = max(1, 8 - i//10)
+                alpha = max(50, 255 - i*3)
+                tail_color = (150, 150, 255) if i < 30 else (100, 100, 200)
+                pygame.draw.circle(self.image, tail_color, (width-20-i, height//2), tail_width)
+        
+        self.rect = self.image.get_rect()
+        if choice in ['stars', 'galaxy']:
+            self.rect.y = random.randint(10, layout.GROUND_LEVEL - 100)
+        else:
+            self.rect.y = random.randint(30, layout.GROUND_LEVEL//2)
+
+    def create_plateau_background(self):
+        width, height = random.randint(200, 400), random.randint(100, 200)
+        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+        top_width = random.randint(width//2, 3*width//4)
+        pygame.draw.rect(self.image, (160, 130, 100), (width//2 - top_width//2, 0, top_width, height//2))
+        pygame.draw.polygon(self.image, (140, 110, 80), 
+                           [(0, height), (width//2 - top_width//2, height//2), 
+                            (width//2 + top_width//2, height//2), (width, height)])
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - height
+
+    def create_dark_forest_background(self):
+        width, height = random.randint(80, 150), random.randint(200, 350)
+        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+        for i in range(3):
+            tree_x = i * width // 3
+            tree_width = width // 4
+            pygame.draw.rect(self.image, (20, 20, 20), (tree_x, height//2, tree_width, height//2))
+            pygame.draw.ellipse(self.image, (10, 20, 10), (tree_x - tree_width, 0, tree_width*3, height//2))
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - height
+
+    def create_desert_background(self):
+        choice = random.choice(['dunes', 'mountains'])
+        if choice == 'dunes':
+            width, height = random.randint(300, 500), random.randint(50, 120)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            for layer in range(3):
+                layer_height = height // (layer + 1)
+                points = [(0, height)]
+                for i in range(15):
+                    x = i * width // 14
+                    y = height - layer_height * (1 + 0.3 * math.sin(i * 0.8))
+                    points.append((x, int(y)))
+                points.append((width, height))
+                dune_color = (238 - layer*20, 203 - layer*15, 173 - layer*10)
+                pygame.draw.polygon(self.image, dune_color, points)
+        else:
+            width, height = random.randint(400, 600), random.randint(150, 300)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            points = [(0, height)]
+            for i in range(8):
+                x = i * width // 7
+                y = random.randint(0, height//3)
+                points.append((x, y))
+            points.append((width, height))
+            pygame.draw.polygon(self.image, (160, 82, 45), points)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - height
+
+    def create_sea_background(self):
+        if random.choice([True, False]):
+            width, height = 30, random.randint(200, 400)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            for strand in range(3):
+                x_offset = strand * 10
+                for y in range(0, height, 10):
+                    wave = math.sin((y + strand * 50) * 0.05) * 8
+                    pygame.draw.circle(self.image, (46, 125, 50), (x_offset + int(wave), y), 4)
+        else:
+            width, height = random.randint(60, 100), random.randint(80, 150)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            colors = [(255, 127, 80), (255, 99, 71), (255, 160, 122)]
+            for i in range(5):
+                color = random.choice(colors)
+                x = random.randint(0, width-20)
+                y = random.randint(height//2, height-10)
+                branch_height = random.randint(30, 60)
+                pygame.draw.ellipse(self.image, color, (x, y-branch_height, 20, branch_height))
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - height
+
+    def create_volcano_background(self):
+        width, height = random.randint(300, 500), random.randint(200, 400)
+        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+        points = [(0, height)]
+        peak_x = width // 2
+        points.append((peak_x, 0))
+        for i in range(1, 5):
+            x = peak_x + i * width // 8
+            y = random.randint(height//4, height//2)
+            points.append((x, y))
+        points.append((width, height))
+        pygame.draw.polygon(self.image, (80, 40, 40), points)
+        
+        pygame.draw.circle(self.image, (255, 100, 0), (peak_x, 0), 15)
+        
+        flow_points = [(peak_x, 0)]
+        for i in range(10):
+            x = peak_x + random.randint(-20, 20)
+            y = i * height // 10
+            flow_points.append((x, y))
+        if len(flow_points) > 2:
+            pygame.draw.lines(self.image, (255, 69, 0), False, flow_points, 5)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - height
+
+    def create_sky_background(self):
+        choice = random.choice(['clouds', 'city'])
+        if choice == 'clouds':
+            width = random.randint(100, 200)
+            height = random.randint(40, 80)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            for i in range(3):
+                cloud_color = (255, 255, 255, 120 - i*20)
+                cloud_rect = (i*5, i*3, width - i*10, height - i*6)
+                pygame.draw.ellipse(self.image, cloud_color[:3], cloud_rect)
+            self.rect = self.image.get_rect()
+            self.rect.y = random.randint(50, layout.GROUND_LEVEL//2)
+        else:
+            width = random.randint(200, 400)
+            height = random.randint(80, 150)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            building_width = width // 8
+            for i in range(8):
+                building_height = random.randint(height//3, height)
+                x = i * building_width
+                pygame.draw.rect(self.image, (50, 50, 80), (x, height - building_height, building_width-2, building_height))
+                for row in range(building_height//15):
+                    for col in range(building_width//8):
+                        if random.random() < 0.3:
+                            wx = x + col * 8 + 2
+                            wy = height - building_height + row * 15 + 3
+                            window_color = (255, 255, 0) if random.random() < 0.7 else (100, 200, 255)
+                            pygame.draw.rect(self.image, window_color, (wx, wy, 4, 6))
+            self.rect = self.image.get_rect()
+            self.rect.y = layout.GROUND_LEVEL - height
+
+    def create_snow_background(self):
+        # Snow-covered mountains or pine trees
+        if random.choice([True, False]):  # Mountain
+            width, height = random.randint(200, 400), random.randint(150, 250)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            
+            # Mountain silhouette
+            points = [(0, height)]
+            for i in range(5):
+                x = i * width // 4
+                y = random.randint(0, height//3)
+                points.append((x, y))
+            points.append((width, height))
+            
+            pygame.draw.polygon(self.image, (105, 105, 105), points)  # Mountain
+            # Snow caps
+            snow_points = points[1:-1]  # Remove base points
+            snow_points.append((width, height//3))
+            snow_points.append((0, height//3))
+            pygame.draw.polygon(self.image, (255, 255, 255), snow_points)
+        else:  # Pine tree
+            width, height = 60, random.randint(120, 200)
+            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            
+            # Tree trunk
+            pygame.draw.rect(self.image, (101, 67, 33), (width//2-5, height*2//3, 10, height//3))
+            
+            # Pine layers (triangle sections)
+            for layer in range(3):
+                y_offset = layer * height//4
+                layer_height = height//3
+                points = [(width//2, y_offset), (0, y_offset + layer_height), (width, y_offset + layer_height)]
+                pygame.draw.polygon(self.image, (34, 100, 34), points)
+                # Snow on branches
+                pygame.draw.polygon(self.image, (255, 255, 255), 
+                                  [(width//2, y_offset), (5, y_offset + layer_height), (width-5, y_offset + layer_height)], 3)
+        
+        self.rect = self.image.get_rect()
+        self.rect.y = layout.GROUND_LEVEL - height
+    
+    
+    def update(self):
+        self.rect.x -= self.speed
+        if self.rect.right < 0:
+            return True
+        return False
+
+# Sun/Moon class for day/night cycle
+class CelestialBody(pygame.sprite.Sprite):
+    def __init__(self, time_of_day, biome):
+        super().__init__()
+        self.time_of_day = time_of_day
+        self.biome = biome
+        
+        self.size = 30 if biome == SPACE else 50
+        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        
+        if time_of_day == DAY:
+            if biome == SPACE:
+                # Distant star in space
+                pygame.draw.circle(self.image, (255, 255, 200), (self.size // 2, self.size // 2), self.size // 2)
+                pygame.draw.circle(self.image, (255, 255, 255), (self.size // 2, self.size // 2), self.size // 3)
+            else:
+                pygame.draw.circle(self.image, SUN_COLOR, (self.size // 2, self.size // 2), self.size // 2)
+                for i in range(8):
+                    angle = math.radians(i * 45)
+                    start_x = self.size // 2 + (self.size // 2) * math.cos(angle)
+                    start_y = self.size // 2 + (self.size // 2) * math.sin(angle)
+                    end_x = self.size // 2 + (self.size // 1.2) * math.cos(angle)
+                    end_y = self.size // 2 + (self.size // 1.2) * math.sin(angle)
+                    pygame.draw.line(self.image, SUN_COLOR, (start_x, start_y), (end_x, end_y), 3)
+        else:
+            if biome == SPACE:
+                # Alien moon/planet
+                colors = [(150, 150, 255), (255, 150, 150), (150, 255, 150)]
+                moon_color = random.choice(colors)
+                pygame.draw.circle(self.image, moon_color, (self.size // 2, self.size // 2), self.size // 2)
+                for _ in range(3):
+                    crater_size = random.randint(2, 5)
+                    crater_x = random.randint(crater_size, self.size - crater_size)
+                    crater_y = random.randint(crater_size, self.size - crater_size)
+                    crater_color = tuple(max(0, c - 50) for c in moon_color)
+                    pygame.draw.circle(self.image, crater_color, (crater_x, crater_y), crater_size)
+            else:
+                pygame.draw.circle(self.image, MOON_COLOR, (self.size // 2, self.size // 2), self.size // 2)
+                for _ in range(5):
+                    crater_size = random.randint(3, 7)
+                    crater_x = random.randint(10, self.size - 10)
+                    crater_y = random.randint(10, self.size - 10)
+                    pygame.draw.circle(self.image, (180, 180, 180), (crater_x, crater_y), crater_size)
+        
+        self.rect = self.image.get_rect()
+        
+        if biome == SPACE:
+            self.rect.x = random.randint(100, layout.SCREEN_WIDTH - 100)
+            self.rect.y = random.randint(50, layout.GROUND_LEVEL - 100)
+        else:
+            self.rect.x = layout.SCREEN_WIDTH - 100
+            self.rect.y = 80
+        
+        self.angle = 0
+        self.radius = 0
+        self.center_x = self.rect.x
+        self.center_y = self.rect.y
+        
+        if biome == SPACE:
+            self.speed_x = random.uniform(-0.3, 0.3)
+            self.speed_y = random.uniform(-0.3, 0.3)
+        else:
+            self.speed_x = -0.2
+            self.speed_y = 0
+
+    def update(self):
+        if self.biome == SPACE:
+            # In space, slight random movement
+            self.rect.x += self.speed_x
+            self.rect.y += self.speed_y
+            
+            # Change direction occasionally
+            if random.random() < 0.005:
+                self.speed_x = random.uniform(-0.3, 0.3)
+                self.speed_y = random.uniform(-0.3, 0.3)
+                
+            # Keep within screen bounds
+            if self.rect.left < 0 or self.rect.right > layout.SCREEN_WIDTH:
+                self.speed_x *= -1
+            if self.rect.top < 0 or self.rect.bottom > layout.GROUND_LEVEL:
+                self.speed_y *= -1
+        else:
+            # For other biomes, arc movement across the sky
+            self.rect.x += self.speed_x
+            
+            # When off-screen, reset position
+            if self.rect.right < 0:
+                self.rect.x = layout.SCREEN_WIDTH
+            
+            # Adjust height based on x position to create arc
+            # Create a slight arc effect
+            relative_x = (self.rect.x % layout.SCREEN_WIDTH) / layout.SCREEN_WIDTH
+            arc_height = 40  # Maximum height variation
+            self.rect.y = 80 + math.sin(relative_x * math.pi) * arc_height
+
+# Decoration class - visual elements that don't cause collisions
+class Decoration(pygame.sprite.Sprite):
+    """Non-hazardous decorative elements that don't cause player death"""
+    def __init__(self, x, y, decoration_type, biome):
+        super().__init__()
+        self.variant, self.image, _ = biome_assets.pick(biome, "decoration")
+        self.rect = self.image.get_rect()
+        self.rect.x = x
+        self.rect.y = y
+        self.type = decoration_type
+        self.biome = biome
+        self.speed = 0
+        self.is_decoration = True  # Flag to distinguish from obstacles
+    
+    def set_appearance(self):
+        """Create decorative visual for this biome"""
+        if self.biome == PLATEAU:
+            # Small rocks and crystals
+            rock_color = random.choice([(160, 140, 120), (180, 160, 140), (200, 180, 160)])
+            size = random.randint(8, 20)
+            pygame.draw.ellipse(self.image, rock_color, (TILE_SIZE//2-size//2, TILE_SIZE-size, size, size))
+            
+        elif self.biome == DARK_FOREST:
+            # Small mushrooms and twigs
+            if random.choice([True, False]):
+                pygame.draw.circle(self.image, (139, 69, 19), (TILE_SIZE//2, TILE_SIZE-5), 2)
+                pygame.draw.ellipse(self.image, (100, 0, 100), (TILE_SIZE//2-6, TILE_SIZE-15, 12, 8))
+            else:
+                pygame.draw.line(self.image, (101, 67, 33), (5, TILE_SIZE-2), (TILE_SIZE-5, TILE_SIZE-8), 2)
+        
+        elif self.biome == DESERT:
+            # Desert plants
+            pygame.draw.line(self.image, (34, 139, 34), (TILE_SIZE//2, TILE_SIZE), (TILE_SIZE//2, TILE_SIZE-15), 2)
+            pygame.draw.circle(self.image, (34, 139, 34), (TILE_SIZE//2-5, TILE_SIZE-12), 3)
+            pygame.draw.circle(self.image, (34, 139, 34), (TILE_SIZE//2+5, TILE_SIZE-12), 3)
+        
+        elif self.biome == SEA:
+            # Seaweed
+            for i in range(3):
+                y_pos = TILE_SIZE - i * 6
+                width = max(2, 8 - i)
+                pygame.draw.rect(self.image, (46, 125, 50), (TILE_SIZE//2-width//2, y_pos-6, width, 6))
+        
+        elif self.biome == SNOW:
+            # Snow formations
+            pygame.draw.circle(self.image, (240, 248, 255), (TILE_SIZE//2, TILE_SIZE-10), random.randint(3, 7))
+        
+        elif self.biome == VOLCANO:
+            # Volcanic rocks
+            pygame.draw.circle(self.image, (139, 69, 19), (TILE_SIZE//2, TILE_SIZE-8), random.randint(4, 8))
+        
+        elif self.biome == SKY:
+            # Floating particles
+            pygame.draw.circle(self.image, (255, 255, 255), (TILE_SIZE//2, TILE_SIZE//2), random.randint(2, 4))
+        
+        else:  # SPACE
+            # Decorative space crystals
+            crystal_color = random.choice([(150, 100, 255), (100, 255, 150), (255, 100, 150)])
+            pygame.draw.polygon(self.image, crystal_color, [(TILE_SIZE//2, TILE_SIZE//4), 
+                                                             (TILE_SIZE//4, 3*TILE_SIZE//4), 
+                                                             (3*TILE_SIZE//4, 3*TILE_SIZE//4)])
+    
+    def update(self, speed):
+        """Move decoration with game speed"""
+        self.rect.x -= speed
+    
+    def is_off_screen(self):
+        """Check if decoration has left the screen"""
+        return self.rect.x + self.rect.width < 0
+
+# Fixed Tile class - removes black boxes
+class Tile(pygame.sprite.Sprite):
+    def __init__(self, x, y, tile_type, biome):
+        super().__init__()
+        self.type = tile_type
+        self.biome = biome
+        if tile_type == "ground":
+            self.variant, self.image, _ = biome_assets.pick(biome, "tile")
+        else:
+            self.variant = None
+            self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)  # Use SRCALPHA for transparency
+            self.set_appearance()
+        self.rect = self.image.get_rect()
+        self.rect.x = x
+        self.rect.y = y
+        self.speed = 0
+        self.is_decoration = False  # Not a decoration, this is ground
+    
+    def set_appearance(self):
+        if self.type == "ground":
+            if self.biome == PLATEAU:
+                self.image.fill((139, 128, 117))
+                # Add texture details
+                for _ in range(8):
+                    x = random.randint(2, TILE_SIZE-3)
+                    y = random.randint(2, TILE_SIZE-3)
+                    pygame.draw.circle(self.image, (160, 150, 140), (x, y), random.randint(1, 3))
+                # Add subtle border for better definition
+                pygame.draw.rect(self.image, (120, 110, 100), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            elif self.biome == DARK_FOREST:
+                self.image.fill((40, 30, 20))
+                # Add leaf litter texture
+                for _ in range(6):
+                    x = random.randint(2, TILE_SIZE-3)
+                    y = random.randint(2, TILE_SIZE-3)
+                    pygame.draw.circle(self.image, (60, 50, 40), (x, y), random.randint(1, 2))
+                # Add moss spots
+                for _ in range(3):
+                    x = random.randint(0, TILE_SIZE-5)
+                    y = random.randint(0, TILE_SIZE-5)
+                    pygame.draw.circle(self.image, (20, 60, 20), (x, y), random.randint(1, 3))
+                pygame.draw.rect(self.image, (30, 20, 10), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            elif self.biome == DESERT:
+                self.image.fill((238, 203, 173))
+                # Add sand grain texture
+                for _ in range(12):
+                    x = random.randint(0, TILE_SIZE-1)
+                    y = random.randint(0, TILE_SIZE-1)
+                    brightness = random.randint(240, 255)
+                    pygame.draw.circle(self.image, (brightness, brightness-30, brightness-60), (x, y), 1)
+                # Add subtle dune pattern
+                for i in range(0, TILE_SIZE, 4):
+                    wave_y = int(2 + math.sin(i * 0.3) * 1)
+                    pygame.draw.line(self.image, (228, 193, 163), (i, wave_y), (i+2, wave_y), 1)
+                pygame.draw.rect(self.image, (218, 183, 153), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            elif self.biome == SEA:
+                self.image.fill((194, 178, 128))  # Sandy ocean floor
+                # Add water effects
+                for _ in range(10):
+                    x = random.randint(0, TILE_SIZE-1)
+                    y = random.randint(0, TILE_SIZE-1)
+                    pygame.draw.circle(self.image, (135, 206, 250, 120), (x, y), random.randint(1, 3))
+                # Add seaweed spots
+                for _ in range(4):
+                    x = random.randint(2, TILE_SIZE-3)
+                    y = random.randint(2, TILE_SIZE-3)
+                    pygame.draw.circle(self.image, (46, 125, 50), (x, y), random.randint(1, 2))
+                pygame.draw.rect(self.image, (174, 158, 108), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            elif self.biome == SNOW:
+                self.image.fill(SNOW_WHITE)
+                # Add snow texture with depth
+                for _ in range(8):
+                    x = random.randint(0, TILE_SIZE-1)
+                    y = random.randint(0, TILE_SIZE-1)
+                    size = random.randint(1, 3)
+                    brightness = random.randint(230, 255)
+                    pygame.draw.circle(self.image, (brightness, brightness, brightness), (x, y), size)
+                # Add subtle snow drifts
+                for i in range(0, TILE_SIZE, 6):
+                    drift_y = int(1 + math.sin(i * 0.4) * 1)
+                    pygame.draw.line(self.image, (250, 250, 255), (i, drift_y), (i+3, drift_y), 1)
+                pygame.draw.rect(self.image, (220, 220, 240), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            elif self.biome == VOLCANO:
+                self.image.fill((70, 35, 35))  # Dark volcanic rock
+                # Add lava veins
+                for _ in range(6):
+                    x = random.randint(2, TILE_SIZE-3)
+                    y = random.randint(2, TILE_SIZE-3)
+                    pygame.draw.circle(self.image, (255, 69, 0), (x, y), 1)
+                # Add ember effects
+                for _ in range(3):
+                    x = random.randint(0, TILE_SIZE-1)
+                    y = random.randint(0, TILE_SIZE-1)
+                    pygame.draw.circle(self.image, (255, 140, 0), (x, y), random.randint(1, 2))
+                pygame.draw.rect(self.image, (50, 25, 25), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            elif self.biome == SKY:
+                # Cloud platform
+                self.image.fill((200, 220, 255))
+                # Add cloud wisps
+                for _ in range(8):
+                    x = random.randint(0, TILE_SIZE-1)
+                    y = random.randint(0, TILE_SIZE-1)
+                    pygame.draw.circle(self.image, (255, 255, 255), (x, y), random.randint(2, 5))
+                # Add transparency effect
+                for _ in range(4):
+                    x = random.randint(5, TILE_SIZE-5)
+                    y = random.randint(5, TILE_SIZE-5)
+                    pygame.draw.circle(self.image, (220, 240, 255), (x, y), random.randint(3, 6))
+                pygame.draw.rect(self.image, (180, 200, 235), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+            
+            else:  # SPACE - Final biome
+                self.image.fill((30, 30, 50))  # Dark space metal
+                # Add alien crystal formations
+                for _ in range(5):
+                    x = random.randint(0, TILE_SIZE-1)
+                    y = random.randint(0, TILE_SIZE-1)
+                    crystal_color = random.choice([(150, 100, 255), (100, 255, 150), (255, 100, 150)])
+                    pygame.draw.circle(self.image, crystal_color, (x, y), random.randint(1, 2))
+                # Add energy veins
+                for _ in range(3):
+                    x = random.randint(2, TILE_SIZE-3)
+                    y = random.randint(2, TILE_SIZE-3)
+                    pygame.draw.circle(self.image, (100, 200, 255), (x, y), 1)
+                # Add metallic border
+                pygame.draw.rect(self.image, (80, 80, 120), (0, 0, TILE_SIZE, TILE_SIZE), 1)
+
+
+    def update(self, speed):
+        self.rect.x -= speed
+        if self.rect.right < 0:
+            return True
+        return False
+
+# Bank generators (assets.py): each draws one variant with the random module
+
+def draw_background(biome):
+    element = BackgroundElement.__new__(BackgroundElement)
+    element.biome = biome
+    element.create_appearance()
+    return element.image, element.rect.y - layout.GROUND_LEVEL
+
+def draw_decoration(biome):
+    decoration = Decoration.__new__(Decoration)
+    decoration.biome = biome
+    decoration.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    decoration.set_appearance()
+    return decoration.image, 0
+
+def draw_ground_tile(biome):
+    tile = Tile.__new__(Tile)
+    tile.type = "ground"
+    tile.biome = biome
+    tile.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    tile.set_appearance()
+    return tile.image, 0
+
+biome_assets.register("tile", draw_ground_tile)
+biome_assets.register("decoration", draw_decoration)
+biome_assets.register("background", draw_background)
+
+# PowerUp class for special abilities
+class PowerUp(pygame.sprite.Sprite):
+    def __init__(self, x, y, powerup_type, speed):
+        super().__init__()
+        self.type = powerup_type
+        self.speed = speed
+        # Realistic power-up durations (in seconds at 60 FPS)
+        if powerup_type == "shield":
+            self.duration = 240  # 4 seconds
+        elif powerup_type == "speed":
+            self.duration = 300  # 5 seconds  
+        elif powerup_type == "coin_magnet":
+            self.duration = 600  # 10 seconds
+        elif powerup_type == "double_coins":
+            self.duration = 420  # 7 seconds
+        else:
+            self.duration = 300  # Default 5 seconds
+        
+        # Create power-up appearance
+        self.image = pygame.Surface((25, 25), pygame.SRCALPHA)
+        
+        if powerup_type == "shield":
+            # Blue shield with sparkle effect
+            pygame.draw.circle(self.image, (0, 100, 255), (12, 12), 12)
+            pygame.draw.circle(self.image, (100, 150, 255), (12, 12), 8)
+            # Shield pattern
+            pygame.draw.circle(self.image, (200, 220, 255), (12, 12), 4)
+        
+        elif powerup_type == "speed":
+            # Yellow/orange speed boost with motion lines
+            pygame.draw.circle(self.image, (255, 215, 0), (12, 12), 12)
+            pygame.draw.circle(self.image, (255, 255, 0), (12, 12), 8)
+            # Motion lines
+            for i in range(3):
+                y_offset = 8 + i * 3
+                pygame.draw.line(self.image, (255, 255, 255), (2, y_offset), (8, y_offset), 2)
+        
+        elif powerup_type == "coin_magnet":
+            # Purple magnet effect
+            pygame.draw.circle(self.image, (128, 0, 128), (12, 12), 12)
+            pygame.draw.circle(self.image, (200, 100, 200), (12, 12), 8)
+            # Magnet symbol (simplified)
+            pygame.draw.arc(self.image, (255, 255, 255), (6, 6, 12, 12), 0, math.pi, 2)
+        
+        elif powerup_type == "double_coins":
+            # Green double coin effect
+            pygame.draw.circle(self.image, (0, 200, 0), (12, 12), 12)
+            pygame.draw.circle(self.image, (100, 255, 100), (12, 12), 8)
+            # Two coin symbols
+            pygame.draw.circle(self.image, (255, 215, 0), (8, 12), 3)
+            pygame.draw.circle(self.image, (255, 215, 0), (16, 12), 3)
+        
+        self.rect = self.image.get_rect()
+        self.rect.x = x
+        self.rect.y = y
+        
+        # Animation
+        self.float_offset = 0
+        self.original_y = y
+    
+    def update(self):
+        self.rect.x -= self.speed
+        
+        # Floating animation
+        self.float_offset += 0.2
+        self.rect.y = self.original_y + math.sin(self.float_offset) * 3
+        
+        if self.rect.right < 0:
+            return True
+        return False
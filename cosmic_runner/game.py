@@ -0,0 +1,653 @@
+import random
+
+from . import layout
+from . import balance
+from .constants import MENU, PLAYING, PLATEAU, SPACE, DAY, NIGHT, TILE_SIZE, biome_names
+from .entities import (
+    Player, Obstacle, Coin, Checkpoint, BackgroundElement, CelestialBody,
+    Decoration, Tile, PowerUp
+)
+from .missions import Mission, MissionBoard, COIN_COLLECTED, OBSTACLE_AVOIDED, TIME_TICK, mission_random
+from .spawner import ObstacleSpawner
+from .assets import biome_assets
+from . import tracing
+
+def biome_index(name):
+    """A biome by number or name, e.g. "7", "space" or "dark-forest" (for command lines)"""
+    if name.isdigit() and int(name) < len(biome_names):
+        return int(name)
+    names = [biome.lower().replace(" ", "-") for biome in biome_names]
+    wanted = name.lower().replace(" ", "-").replace("_", "-")
+    if wanted not in names:
+        raise ValueError(f"unknown biome {name!r} (one of {', '.join(names)})")
+    return names.index(wanted)
+
+# Game class - main game logic
+class Game:
+    def __init__(self):
+        self.state = MENU
+        self.score = 0
+        self.total_coins = 0
+        self.coins_at_start = 0
+        self.lives = 3
+        self.distance = 0
+        self.current_biome = PLATEAU
+        self.time_of_day = DAY
+        self.speed = 5
+        self.course_seed = None     # Seed of the current run's course, if it was seeded
+        self.next_course_seed = None
+        self.obstacles = []
+        self.coins = []
+        self.background_elements = []
+        self.tiles = []
+        self.powerups = []
+        self.celestial_body = None
+        self.checkpoints = []
+        self.decorations = []  # Separate list for decorative elements
+        
+        # Player
+        self.player = Player()
+        self.player.game = self
+
+        # Enhanced obstacle spawning
+        self.obstacle_spawner = ObstacleSpawner(self)
+        
+        # Mission system
+        self.missions = MissionBoard()  # Indexed by biome and event type
+        self.completed_missions = []
+        self.mission_completion_timer = 0
+        
+        # Generate initial missions (one per biome)
+        for biome in range(7):
+            self.missions.add(Mission(biome, 1.0))
+        
+        # Checkpoint system
+        self.current_checkpoint = None
+        self.biome_checkpoints = {}
+        self.has_checkpoint = False
+        
+        # Respawn system
+        self.respawn_state = False
+        self.respawn_timer = 0
+        
+        # Power-up system with realistic timers
+        self.active_powerups = {}
+        self.powerup_timers = {}
+        
+        # Animation and effects
+        self.camera_shake = 0
+        self.screen_flash = 0
+        
+        # Performance tracking
+        self.frame_count = 0
+        self.obstacles_avoided_this_frame = 0
+        self.player_hit_this_frame = False
+        self.coins_collected_this_frame = 0
+        self.jumps_this_frame = 0
+        self.total_jumps = 0
+        
+        # Biome transition
+        self.biome_transition_timer = 0
+        self.next_biome_distance = balance.FIRST_BIOME_DISTANCE  # Distance to next biome
+        
+        # Front-end hooks - the engine never touches audio or input devices itself
+        self.sound_player = None   # callable(sound_name), e.g. sound_bank.play
+        self.music_player = None   # callable(biome, fade_duration_ms), e.g. play_biome_music
+        self.effect_player = None  # callable(effect_name, x, y), e.g. particles.burst
+        self.jetpack_held = False  # Set by the front end while the jetpack key is down
+        self.jump_pressed = False  # Set by jump_input(); race clients read and clear it each tick
+        self.next_entity_id = 1    # Stable ids for obstacles, coins and power-ups (replication)
+
+        # Enhanced power-up spawning including jetpack
+        if random.randint(1, 1000) == 1:
+            powerup_types = ["shield", "speed", "coin_magnet", "double_coins", "jetpack"]
+            # Higher chance of jetpack in space biome
+            if self.current_biome == SPACE:
+                weights = [0.2, 0.15, 0.2, 0.1, 0.35]
+            else:
+                weights = [0.25, 0.20, 0.25, 0.15, 0.15]
+            powerup_type = random.choices(powerup_types, weights=weights)[0]
+            
+            y_pos = random.randint(layout.GROUND_LEVEL - 200, layout.GROUND_LEVEL - 100)
+            powerup = PowerUp(layout.SCREEN_WIDTH, y_pos, powerup_type, self.speed)
+            self.powerups.append(self.assign_entity_id(powerup))
+        
+        # Spawn checkpoints
+        checkpoint_distance = (self.current_biome + 1) * 400
+        if (not self.has_checkpoint and self.distance >= checkpoint_distance and 
+            self.current_biome not in self.biome_checkpoints):
+            checkpoint = Checkpoint(self.current_biome, self.speed, self)
+            self.checkpoints.append(checkpoint)
+        
+        # Spawn background elements
+        spawn_chance = 150 if self.current_biome == SPACE else 200
+        if random.randint(1, spawn_chance) == 1:
+            bg_element = BackgroundElement(self.current_biome, self.speed)
+            bg_element.rect.x = layout.SCREEN_WIDTH + random.randint(0, 200)
+            self.background_elements.append(bg_element)
+        
+        # Spawn ground tiles
+        rightmost_tile = 0
+        for tile in self.tiles:
+            if tile.rect.right > rightmost_tile:
+                rightmost_tile = tile.rect.right
+        
+        while rightmost_tile < layout.SCREEN_WIDTH + 200:
+            tile = Tile(rightmost_tile, layout.GROUND_LEVEL, "ground", self.current_biome)
+            self.tiles.append(tile)
+            # Randomly spawn decorations on top of tiles
+            if random.randint(1, 100) <= 20:  # 20% chance for decoration
+                decoration = Decoration(rightmost_tile, layout.GROUND_LEVEL - TILE_SIZE, "decoration", self.current_biome)
+                self.decorations.append(decoration)
+            rightmost_tile += TILE_SIZE
+
+    def play_sound(self, sound_name):
+        """Play a sound effect through the front end, if one is attached"""
+        if self.sound_player:
+            self.sound_player(sound_name)
+    
+    def play_effect(self, effect_name, x, y):
+        """Show a particle effect at (x, y) through the front end, if one is attached"""
+        if self.effect_player:
+            self.effect_player(effect_name, x, y)
+
+    def play_music(self, biome, fade_duration_ms=1000):
+        """Switch biome music through the front end, if one is attached"""
+        if self.music_player:
+            self.music_player(biome, fade_duration_ms=fade_duration_ms)
+
+    def setup_biome(self):
+        """Setup new biome with initial elements and environment"""
+        # Create celestial body for the biome
+        self.celestial_body = CelestialBody(self.time_of_day, self.current_biome)
+        
+        # Spawn initial background elements for biome
+        for _ in range(3):
+            bg_element = BackgroundElement(self.current_biome, self.speed)
+            bg_element.rect.x = layout.SCREEN_WIDTH + random.randint(0, 400)
+            self.background_elements.append(bg_element)
+        
+        # Refill ground tiles for new biome
+        for tile in list(self.tiles):
+            if tile.rect.x > layout.SCREEN_WIDTH:
+                self.tiles.remove(tile)
+        
+        # Clear old decorations
+        self.decorations = [d for d in self.decorations if d.rect.x <= layout.SCREEN_WIDTH]
+        
+        rightmost_tile = layout.SCREEN_WIDTH
+        while rightmost_tile < layout.SCREEN_WIDTH + 400:
+            tile = Tile(rightmost_tile, layout.GROUND_LEVEL, "ground", self.current_biome)
+            self.tiles.append(tile)
+            # Add decorative elements instead of decoration tiles
+            if random.random() < 0.3:
+                deco = Decoration(rightmost_tile, layout.GROUND_LEVEL - TILE_SIZE, "decoration", self.current_biome)
+                self.decorations.append(deco)
+            rightmost_tile += TILE_SIZE
+        
+        # Initial checkpoint for new biome
+        checkpoint_distance = (self.current_biome + 1) * 600
+        if self.distance >= checkpoint_distance and self.current_biome not in self.biome_checkpoints:
+            checkpoint = Checkpoint(self.current_biome, self.speed, self)
+            self.checkpoints.append(checkpoint)
+
+    def transition_biome(self):
+        """Enhanced biome transition - Space is final with smooth transition"""
+        # Pause spawning during transition for smooth experience
+        self.biome_transition_timer = 180  # 3 seconds pause for smooth transition
+        
+        self.current_biome = (self.current_biome + 1) % 8  # Changed to % 8 to include Space biome
+        tracing.instant("transition_biome", args={"biome": biome_names[self.current_biome]}, scope="g")
+        
+        # Toggle day/night cycle for each biome transition
+        self.time_of_day = NIGHT if self.time_of_day == DAY else DAY
+        
+        self.next_biome_distance += balance.BIOME_LENGTH
+        self.has_checkpoint = False
+        
+        # Clear existing obstacles for smooth transition
+        self.obstacles.clear()
+        
+        # CHANGE MUSIC FOR NEW BIOME with smooth fade
+        self.play_music(self.current_biome, fade_duration_ms=1500)
+        
+        with tracing.span("setup_biome", category="assets"):
+            self.setup_biome()
+        self.screen_flash = 80  # Enhanced flash for better visual feedback
+        self.camera_shake = 20
+        
+        # Play transition sound if available
+        self.play_sound("checkpoint")
+        
+        # Special message when reaching space
+        if self.current_biome == SPACE:
+            self.screen_flash = 120  # Extended flash for final biome
+            self.camera_shake = 30
+      
+    def generate_ground_tiles(self):
+        tile_x = 0
+        while tile_x < layout.SCREEN_WIDTH + 100:
+            # Ground tiles with proper transparency
+            tile = Tile(tile_x, layout.GROUND_LEVEL, "ground", self.current_biome)
+            self.tiles.append(tile)
+            
+            if random.random() < 0.3:
+                deco_tile = Tile(tile_x, layout.GROUND_LEVEL - TILE_SIZE, "decoration", self.current_biome)
+                self.tiles.append(deco_tile)
+            
+            tile_x += TILE_SIZE
+        
+    def update(self):
+        """Main game update loop"""
+        if self.state != PLAYING:
+            return
+        
+        # Reset frame tracking
+        self.obstacles_avoided_this_frame = 0
+        self.player_hit_this_frame = False
+        self.coins_collected_this_frame = 0
+        
+        # Handle respawn invincibility
+        if self.respawn_state:
+            self.respawn_timer -= 1
+            if self.respawn_timer <= 0:
+                self.respawn_state = False
+        
+        # Update camera shake
+        if self.camera_shake > 0:
+            self.camera_shake -= 1
+        
+        # Update screen flash
+        if self.screen_flash > 0:
+            self.screen_flash -= 2
+        
+        # Increase speed gradually - more realistic progression
+        if self.frame_count % balance.SPEED_RAMP_INTERVAL == 0:  # Every 15 seconds
+            self.speed += balance.SPEED_RAMP_STEP
+        
+        # Update player
+        coins_collected = self.player.update(self.obstacles, self.coins)
+        self.coins_collected_this_frame = coins_collected
+        if coins_collected:
+            self.notify_missions(COIN_COLLECTED, coins_collected)
+        self.score += coins_collected * 10
+        self.total_coins += coins_collected
+        
+        # If player collected coins with double_coins powerup
+        if coins_collected > 0 and self.active_powerups.get("double_coins", False):
+            self.score += coins_collected * 10  # Double the points
+            self.total_coins += coins_collected  # Double the coins
+        
+        # Update obstacles
+        for obstacle in list(self.obstacles):
+            if obstacle.update():
+                self.obstacles.remove(obstacle)
+            else:
+                # Check if player passed obstacle (for mission tracking)
+                if obstacle.rect.right < self.player.rect.left and not obstacle.avoided_counted:
+                    obstacle.avoided_counted = True
+                    self.obstacles_avoided_this_frame += 1
+                    self.notify_missions(OBSTACLE_AVOIDED)
+        
+        # Update coins
+        for coin in list(self.coins):
+            if coin.update():
+                self.coins.remove(coin)
+        
+        # Update power-ups
+        for powerup in list(self.powerups):
+            if powerup.update():
+                self.powerups.remove(powerup)
+            elif self.player.rect.colliderect(powerup.rect):
+                # Activate power-up
+                self.activate_powerup(powerup.type, powerup.duration)
+                self.powerups.remove(powerup)
+        
+        # Update active power-ups with realistic timers
+        for powerup_type, timer in list(self.powerup_timers.items()):
+            self.powerup_timers[powerup_type] = timer - 1
+            if timer <= 0:
+                self.deactivate_powerup(powerup_type)
+        
+        # Update background elements
+        for bg_element in list(self.background_elements):
+            if bg_element.update():
+                self.background_elements.remove(bg_element)
+        
+        # Update tiles
+        for tile in list(self.tiles):
+            if tile.update(self.speed):
+                self.tiles.remove(tile)
+        
+        # Update decorations (no collision checking - they're purely visual)
+        for decoration in list(self.decorations):
+            decoration.update(self.speed)
+            if decoration.is_off_screen():
+                self.decorations.remove(decoration)
+        
+        # Update celestial body
+        if self.celestial_body:
+            self.celestial_body.update()
+        
+        # Update checkpoints
+        for checkpoint in list(self.checkpoints):
+            if checkpoint.update():
+                self.checkpoints.remove(checkpoint)
+        
+        # Spawn new elements
+        self.spawn_elements()
+        
+        # Keep this biome's and the next one's scenery banks warm
+        biome_assets.step(self.current_biome)
+        
+        # Update distance and biome progression
+        self.distance += self.speed * 0.1
+        
+        # Update biome transition timer
+        if self.biome_transition_timer > 0:
+            self.biome_transition_timer -= 1
+            # Reduce speed during transition for smooth experience
+            current_speed_multiplier = 0.7 + (self.biome_transition_timer / 180 * 0.3)
+            display_speed = self.speed * current_speed_multiplier
+        
+        # Check for biome transition
+        if self.distance >= self.next_biome_distance:
+            self.transition_biome()
+        
+        # Update missions
+        self.update_missions()
+        
+        # Reset jump counter after mission update
+        self.jumps_this_frame = 0
+        
+        # Update frame counter
+        self.frame_count += 1
+    
+    def activate_powerup(self, powerup_type, duration):
+        """Activate a power-up with its specific duration"""
+        self.active_powerups[powerup_type] = True
+        self.powerup_timers[powerup_type] = duration
+        tracing.instant("activate_powerup", args={"type": powerup_type})
+        
+        if powerup_type == "shield":
+            self.camera_shake = 10
+        elif powerup_type == "speed":
+            self.speed += 2  # Reduced speed boost for more realistic feel
+            self.screen_flash = 15
+        elif powerup_type == "jetpack":
+            self.player.has_jetpack = True
+            self.player.jetpack_fuel = self.player.max_jetpack_fuel
+            self.screen_flash = 10
+        elif powerup_type == "coin_magnet":
+            pass  # Passive effect
+        elif powerup_type == "double_coins":
+            pass  # Passive effect
+        
+        # Safe sound playing
+        self.play_sound("shield")
+
+    def deactivate_powerup(self, powerup_type):
+        """Deactivate a power-up"""
+        if powerup_type in self.active_powerups:
+            del self.active_powerups[powerup_type]
+        
+        if powerup_type in self.powerup_timers:
+            del self.powerup_timers[powerup_type]
+        
+        if powerup_type == "speed":
+            self.speed = max(5, self.speed - 2)  # Remove speed boost
+        elif powerup_type == "jetpack":
+            self.player.has_jetpack = False
+            self.player.jetpack_fuel = 0
+
+    def spawn_elements(self):
+        """Spawn obstacles, coins, power-ups, etc. - Optimized with reduced random calls"""
+        # Don't spawn obstacles during biome transition for smooth gameplay
+        if len(self.obstacles) == 0:
+            # First obstacle - spawn far enough away
+            if random.randint(1, balance.FIRST_OBSTACLE_ODDS) == 1:
+                obstacle = Obstacle(self.current_biome, self.speed)
+                obstacle.rect.x = layout.SCREEN_WIDTH + 200  # Start further away
+                self.obstacles.append(self.assign_entity_id(obstacle))
+        else:
+            # Check distance from last obstacle
+            rightmost_obstacle = max(self.obstacles, key=lambda o: o.rect.x)
+            distance_from_last = layout.SCREEN_WIDTH - rightmost_obstacle.rect.x
+            
+            # Guaranteed minimum gap based on player jump capability
+            min_gap = balance.OBSTACLE_MIN_GAP + (self.speed * balance.OBSTACLE_GAP_PER_SPEED)  # Scales with speed
+            max_gap = 450 + (self.speed * 15)
+            
+            if distance_from_last >= min_gap:
+                # Only spawn with some probability to ensure gaps
+                spawn_chance = min(balance.OBSTACLE_ODDS_MAX,
+                                   balance.OBSTACLE_ODDS + int(distance_from_last / balance.OBSTACLE_ODDS_DISTANCE))
+                if random.randint(1, spawn_chance) == 1:
+                    obstacle = Obstacle(self.current_biome, self.speed)
+                    obstacle.rect.x = layout.SCREEN_WIDTH + random.randint(50, 150)
+                    self.obstacles.append(self.assign_entity_id(obstacle))
+            
+            # Spawn coins - balanced frequency
+            if random.randint(1, balance.COIN_ODDS) == 1:
+                coin = Coin(self.speed)
+                self.coins.append(self.assign_entity_id(coin))
+            
+            # Power-ups including jetpack with better spawn rate
+            if random.randint(1, balance.POWERUP_ODDS) == 1:  # More frequent power-up spawns
+                # Higher chance of jetpack in later biomes
+                if self.current_biome >= balance.LATE_POWERUP_BIOME:
+                    weights = balance.LATE_POWERUP_WEIGHTS
+                else:
+                    weights = balance.POWERUP_WEIGHTS
+                powerup_type = random.choices(list(weights), weights=list(weights.values()))[0]
+                
+                y_pos = random.randint(layout.GROUND_LEVEL - 200, layout.GROUND_LEVEL - 80)
+                powerup = PowerUp(layout.SCREEN_WIDTH, y_pos, powerup_type, self.speed)
+                self.powerups.append(self.assign_entity_id(powerup))
+        
+        # Checkpoint spawning
+        checkpoint_distance = (self.current_biome + 1) * 500
+        if (not self.has_checkpoint and 
+            self.distance >= checkpoint_distance and 
+            self.current_biome not in self.biome_checkpoints):
+            checkpoint = Checkpoint(self.current_biome, self.speed, self)
+            self.checkpoints.append(checkpoint)
+            self.has_checkpoint = True  # Mark as spawned
+        
+        # Spawn background elements - reduced spawn check frequency
+        if random.randint(1, 150) == 1:
+            bg_element = BackgroundElement(self.current_biome, self.speed)
+            bg_element.rect.x = layout.SCREEN_WIDTH + random.randint(0, 200)
+            self.background_elements.append(bg_element)
+        
+        # Spawn ground tiles to fill gaps - optimized
+        rightmost_tile = 0
+        for tile in self.tiles:
+            if tile.rect.right > rightmost_tile:
+                rightmost_tile = tile.rect.right
+        
+        # Only spawn tiles if there's a gap
+        if rightmost_tile < layout.SCREEN_WIDTH + 200:
+            while rightmost_tile < layout.SCREEN_WIDTH + 200:
+                tile = Tile(rightmost_tile, layout.GROUND_LEVEL, "ground", self.current_biome)
+                self.tiles.append(tile)
+                
+                # Spawn decorative elements separately (20% chance)
+                if random.random() < 0.2:
+                    deco = Decoration(rightmost_tile, layout.GROUND_LEVEL - TILE_SIZE, "decoration", self.current_biome)
+                    self.decorations.append(deco)
+                
+                rightmost_tile += TILE_SIZE
+    
+    def assign_entity_id(self, entity):
+        """Give a newly spawned entity the next id; ids are never reused within a Game"""
+        entity.entity_id = self.next_entity_id
+        self.next_entity_id += 1
+        return entity
+    
+    def update_missions(self):
+        """Advance time-based missions - other mission events fire as they happen"""
+        self.notify_missions(TIME_TICK, 1/60)  # Delta time
+    
+    def notify_missions(self, event_type, amount=1):
+        """Send a mission event to the current biome's subscribed missions"""
+        for mission in self.missions.emit(self.current_biome, event_type, amount):
+            self.complete_mission(mission)
+    
+    def complete_mission(self, mission):
+        """Reward a completed mission and replace it with a harder one"""
+        self.completed_missions.append(mission)
+        self.total_coins += mission.reward
+        self.score += mission.reward * 5
+        self.missions.remove(mission)
+        
+        # Generate new mission for this biome
+        difficulty = 1.0 + (len(self.completed_missions) * 0.2)  # Increasing difficulty
+        new_mission = Mission(mission.biome, difficulty)
+        self.missions.add(new_mission)
+        
+        self.mission_completion_timer = 180  # Show completion message for 3 seconds
+    
+    def seed_course(self, seed):
+        """Make the next reset_game() produce the same course for the same seed (race mode)"""
+        random.seed(seed)
+        mission_random.seed(seed)
+        self.next_course_seed = seed
+    
+    def jump_input(self):
+        """Handle jump input"""
+        self.jump_pressed = True
+        if self.player.on_ground:  # Only allow jumping when on ground
+            self.player.jump()
+    
+    def reset_game(self):
+        """Reset game state"""
+        self.state = PLAYING
+        self.score = 0
+        self.lives = 3
+        self.distance = 0
+        self.current_biome = PLATEAU
+        self.time_of_day = DAY
+        self.speed = 5
+        self.frame_count = 0
+        self.jump_pressed = False
+        self.course_seed, self.next_course_seed = self.next_course_seed, None
+        self.coins_at_start = self.total_coins     # Coins carry over between runs
+        
+        # Clear all game objects
+        self.obstacles.clear()
+        self.coins.clear()
+        self.background_elements.clear()
+        self.tiles.clear()
+        self.powerups.clear()
+        self.checkpoints.clear()
+        self.decorations.clear()
+        
+        # Reset player
+        self.player = Player()
+        self.player.game = self
+        self.player.rect.x = 150
+        self.player.rect.y = layout.GROUND_LEVEL - self.player.rect.height
+
+        # Reset obstacle spawner
+        self.obstacle_spawner = ObstacleSpawner(self)
+        
+        # START BIOME MUSIC for Plateau
+        self.play_music(self.current_biome, fade_duration_ms=1000)
+        
+        # Reset mission system
+        self.missions.clear()
+        self.completed_missions.clear()
+        for biome in range(5):
+            self.missions.add(Mission(biome, 1.0))
+        
+        # Reset checkpoint system
+        self.current_checkpoint = None
+        self.biome_checkpoints.clear()
+        self.has_checkpoint = False
+        
+        # Reset power-ups
+        self.active_powerups.clear()
+        self.powerup_timers.clear()
+        
+        # Reset biome
+        self.next_biome_distance = balance.FIRST_BIOME_DISTANCE
+    
+    def warp(self, biome, speed=None, distance=None, powerups=(), density=0):
+        """Start a run partway through: in biome, as if the runner had just got there
+
+        distance defaults to the start of the biome, and speed and the frame
+        count to what the speed ramp gives by then. powerups is a list of types
+        (each for a pickup's duration) or a {type: frames} dict. density
+        obstacles, coins and background elements are spread over the screen
+        ahead of the runner, as a crowded scene to measure. Follows
+        seed_course() like reset_game() does.
+        """
+        distance, end, powerups = self.check_warp(biome, speed, distance, powerups, density)
+        
+        self.reset_game()
+        ramp_speed, frames = self.paced(distance)
+        self.current_biome = biome
+        self.time_of_day = DAY if biome % 2 == 0 else NIGHT
+        self.distance = distance
+        self.speed = ramp_speed if speed is None else speed
+        self.frame_count = frames
+        self.next_biome_distance = end
+        self.play_music(biome, fade_duration_ms=1000)
+        
+        self.spawn_elements()   # Ground across the screen
+        self.setup_biome()
+        for kind, duration in powerups.items():
+            self.activate_powerup(kind, PowerUp(0, 0, kind, self.speed).duration if duration is None else duration)
+        self.populate(density)
+    
+    def populate(self, count):
+        """Spread count obstacles, coins and background elements over the screen ahead of the runner
+
+        A crowded scene to measure: warp() and the benchmarks use it.
+        """
+        ahead = self.player.rect.right + 100
+        width = max(1, layout.SCREEN_WIDTH - ahead)
+        step = max(1, width // max(1, count))
+        for i in range(count):
+            x = ahead + (i * step) % width
+            obstacle = Obstacle(self.current_biome, self.speed)
+            obstacle.rect.x = x
+            self.obstacles.append(self.assign_entity_id(obstacle))
+            coin = Coin(self.speed)
+            coin.rect.x = x
+            self.coins.append(self.assign_entity_id(coin))
+            bg_element = BackgroundElement(self.current_biome, self.speed)
+            bg_element.rect.x = x
+            self.background_elements.append(bg_element)
+    
+    @staticmethod
+    def check_warp(biome, speed=None, distance=None, powerups=(), density=0):
+        """Validate warp() arguments without building a game; returns (distance, biome end, {powerup: frames})
+
+        Raises ValueError for a biome, distance or power-up that doesn't exist.
+        """
+        if not 0 <= biome < len(biome_names):
+            raise ValueError(f"no biome {biome}")
+        start = balance.FIRST_BIOME_DISTANCE + (biome - 1) * balance.BIOME_LENGTH if biome else 0
+        end = balance.FIRST_BIOME_DISTANCE + biome * balance.BIOME_LENGTH
+        distance = start if distance is None else distance
+        if not start <= distance < end:
+            raise ValueError(f"{biome_names[biome]} runs from {start} to {end}, not {distance}")
+        if not isinstance(powerups, dict):
+            powerups = {kind: None for kind in powerups}
+        unknown = set(powerups) - set(balance.POWERUP_WEIGHTS)
+        if unknown:
+            raise ValueError(f"unknown power-ups: {', '.join(sorted(unknown))}")
+        return distance, end, powerups
+    
+    @staticmethod
+    def paced(distance):
+        """(speed, frames) of a run reaching distance on the speed ramp alone"""
+        speed, frames, travelled = 5, 0, 0.0
+        while travelled < distance:
+            if frames % balance.SPEED_RAMP_INTERVAL == 0:
+                speed += balance.SPEED_RAMP_STEP
+            travelled += speed * 0.1
+            frames += 1
+        return speed, frames
@@ -0,0 +1,156 @@
+"""Garbage collector policy: keep cyclic GC pauses out of gameplay frames.
+
+Each frame allocates plenty of short-lived objects, and a collection can
+land on any of those frames. The policy:
+
+- freeze_startup_heap() moves everything created during startup (sprites,
+  fonts, sound bank) into the permanent generation so later collections
+  never rescan it
+- while PLAYING the generation thresholds are raised so automatic
+  collections become rare
+- collections run explicitly at safe points instead: pausing, game over,
+  returning to the menu and the biome transition flash
+
+Call on_frame(game) once per frame. Every collection (automatic or
+explicit) is timed; overlay_lines() and summary() report the pauses and
+explicit collections show up in the tracer as gc.<reason> spans.
+"""
+import gc
+import time
+from collections import deque
+
+from .constants import PLAYING, PAUSED, GAME_OVER
+from . import tracing
+
+DEFAULT_THRESHOLDS = gc.get_threshold()
+GAMEPLAY_THRESHOLDS = (20000, 50, 1000)
+RECENT_PAUSES = 120
+
+# Policy state
+_enabled = False                # Collections are being timed
+_managed = False                # Thresholds and safe-point collections are applied
+_gameplay = False
+_last_state = None
+_last_biome = None
+_collect_reason = None          # Set while an explicit collection runs
+_gc_started_at = None
+_recent_pauses = deque(maxlen=RECENT_PAUSES)   # (reason, generation, ms)
+_pause_stats = {}               # "auto"/"explicit" -> [count, total_ms, max_ms]
+
+def _on_gc(phase, info):
+    """gc.callbacks hook timing every collection"""
+    global _gc_started_at
+    if phase == "start":
+        _gc_started_at = time.perf_counter()
+        return
+    if _gc_started_at is None:
+        return
+    pause_ms = (time.perf_counter() - _gc_started_at) * 1000
+    _gc_started_at = None
+
+    reason = _collect_reason or "auto"
+    _recent_pauses.append((reason, info["generation"], pause_ms))
+    stats = _pause_stats.setdefault("auto" if reason == "auto" else "explicit", [0, 0.0, 0.0])
+    stats[0] += 1
+    stats[1] += pause_ms
+    stats[2] = max(stats[2], pause_ms)
+
+def enable(manage=True):
+    """Start timing collections; manage=False only measures the default GC"""
+    global _enabled, _managed
+    _managed = manage
+    if _enabled:
+        return
+    _enabled = True
+    gc.callbacks.append(_on_gc)
+
+def disable():
+    """Restore the default thresholds and stop timing collections"""
+    global _enabled, _managed, _last_state, _last_biome
+    if not _enabled:
+        return
+    leave_gameplay()
+    if _on_gc in gc.callbacks:
+        gc.callbacks.remove(_on_gc)
+    _enabled = _managed = False
+    _last_state = _last_biome = None
+    _recent_pauses.clear()
+    _pause_stats.clear()
+
+def is_enabled():
+    return _enabled
+
+def is_managed():
+    return _managed
+
+def freeze_startup_heap():
+    """Collect once, then exclude every surviving object from future collections"""
+    collect("startup")
+    gc.freeze()
+    return gc.get_freeze_count()
+
+def enter_gameplay():
+    global _gameplay
+    gc.set_threshold(*GAMEPLAY_THRESHOLDS)
+    _gameplay = True
+
+def leave_gameplay():
+    global _gameplay
+    gc.set_threshold(*DEFAULT_THRESHOLDS)
+    _gameplay = False
+
+def collect(reason, generation=2):
+    """Run a collection now, at a point where a pause won't be noticed"""
+    global _collect_reason
+    _collect_reason = reason
+    try:
+        with tracing.span("gc." + reason, category="gc"):
+            gc.collect(generation)
+    finally:
+        _collect_reason = None
+
+def is_safe_point(game):
+    """True on frames where a pause won't be noticed: off gameplay or during the transition flash"""
+    return game.state != PLAYING or game.biome_transition_timer > 0
+
+def on_frame(game):
+    """Switch thresholds on state changes and collect at safe points"""
+    global _last_state, _last_biome
+    if not _managed:
+        return
+
+    state, biome = game.state, game.current_biome
+    if state != _last_state:
+        if state == PLAYING:
+            enter_gameplay()
+        else:
+            leave_gameplay()
+            if _last_state == PLAYING:
+                collect({PAUSED: "pause", GAME_OVER: "game_over"}.get(state, "menu"))
+    elif state == PLAYING and biome != _last_biome:
+        # The transition flash hides the pause
+        collect("biome_transition")
+    _last_state, _last_biome = state, biome
+
+def pause_stats():
+    """{"auto"|"explicit": (collections, total ms, max ms)}"""
+    return {kind: tuple(stats) for kind, stats in _pause_stats.items()}
+
+def overlay_lines():
+    if not _enabled:
+        return []
+    mode = ("gameplay" if _gameplay else "default") if _managed else "policy off"
+    lines = [f"GC thresholds {gc.get_threshold()} ({mode}), frozen {gc.get_freeze_count()}"]
+    for kind, (count, total_ms, max_ms) in sorted(_pause_stats.items()):
+        lines.append(f"GC {kind}: {count} pauses, max {max_ms:.2f}ms, total {total_ms:.0f}ms")
+    if _recent_pauses:
+        reason, generation, pause_ms = _recent_pauses[-1]
+        lines.append(f"Last GC: {reason} gen{generation} {pause_ms:.2f}ms")
+    return lines
+
+def summary():
+    """Compact pause report for log lines"""
+    return " ".join(
+        f"gc_{kind}={count}/max{max_ms:.2f}ms"
+        for kind, (count, total_ms, max_ms) in sorted(_pause_stats.items())
+    )
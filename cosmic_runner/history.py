@@ -0,0 +1,167 @@
+"""Run history: every finished run's stats and course seed, kept in SQLite.
+
+RunHistory.record(game) returns straight away. The run goes on a queue,
+and a writer thread that owns the database connection inserts it, so the
+game over transition never waits on the disk. After each write, and once
+at startup, the writer rebuilds the view: top scores, the best run that
+ended in each biome and the most recent runs. It then swaps the view in,
+so the menu can read RunHistory.view every frame without a query.
+
+Autopilot and warped runs are stored too, but left out of the view.
+"""
+import os
+import time
+import queue
+import sqlite3
+import threading
+
+from .constants import biome_names
+
+SCHEMA_VERSION = 1
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cosmic_runner", "history.sqlite3")
+TOP_RUNS = 5
+RECENT_RUNS = 5
+CLOSE_TIMEOUT = 2.0         # Seconds to wait for queued runs on exit
+UNRANKED_MODES = ("autopilot", "warp")
+
+SCHEMA = """
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    ranked INTEGER NOT NULL,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    distance REAL NOT NULL,
+    coins INTEGER NOT NULL,
+    biome INTEGER NOT NULL,
+    missions INTEGER NOT NULL,
+    frames INTEGER NOT NULL
+);
+CREATE INDEX runs_by_score ON runs (ranked, score DESC);
+CREATE INDEX runs_by_biome ON runs (ranked, biome, score DESC);
+"""
+
+INSERT_RUN = """
+INSERT INTO runs (ended_at, mode, ranked, seed, score, distance, coins, biome, missions, frames)
+VALUES (:ended_at, :mode, :ranked, :seed, :score, :distance, :coins, :biome, :missions, :frames)
+"""
+
+# Each stops after a few rows: the first two walk an index from the top,
+# the last walks the table back from the newest row (+ranked keeps SQLite
+# from using the score index and sorting every run by id instead)
+TOP_QUERY = "SELECT * FROM runs WHERE ranked = 1 ORDER BY score DESC LIMIT ?"
+BIOME_BEST_QUERY = "SELECT * FROM runs WHERE ranked = 1 AND biome = ? ORDER BY score DESC LIMIT 1"
+RECENT_QUERY = "SELECT * FROM runs WHERE +ranked = 1 ORDER BY id DESC LIMIT ?"
+COUNT_QUERY = "SELECT COUNT(*) FROM runs WHERE ranked = 1"
+
+EMPTY_VIEW = {"runs": 0, "top": [], "biome_best": {}, "recent": []}
+
+def run_stats(game, mode):
+    """The row stored for a finished run"""
+    return {
+        "ended_at": time.time(),
+        "mode": mode,
+        "ranked": int(mode not in UNRANKED_MODES),
+        "seed": game.course_seed,
+        "score": game.score,
+        "distance": round(game.distance, 1),
+        "coins": game.total_coins - game.coins_at_start,
+        "biome": game.current_biome,
+        "missions": len(game.completed_missions),
+        "frames": game.frame_count,
+    }
+
+class RunHistory:
+    """Run history database with a background writer and a cached view"""
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.view = EMPTY_VIEW          # Replaced whole by the writer, never mutated
+        self.available = True
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="run-history", daemon=True)
+        self._thread.start()
+
+    def record(self, game, mode="solo"):
+        """Queue a finished run; returns its stats and how they compare with the view
+
+        "new_best" and "new_biome_best" compare against the runs already in
+        the view, so they are right even before the writer gets to this one.
+        """
+        run = run_stats(game, mode)
+        self._queue.put(run)
+        view = self.view
+        best = view["top"][0]["score"] if view["top"] else None
+        biome_best = view["biome_best"].get(run["biome"])
+        run["previous_best"] = best
+        run["new_best"] = bool(run["ranked"] and run["score"] > (best or 0))
+        run["new_biome_best"] = bool(run["ranked"] and run["score"] > (biome_best["score"] if biome_best else 0))
+        return run
+
+    def flush(self):
+        """Wait until every queued run is written"""
+        self._queue.join()
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # Writer thread
+
+    def _run(self):
+        connection = None
+        try:
+            connection = self._connect()
+            self._ranked_runs = connection.execute(COUNT_QUERY).fetchone()[0]
+            self.view = self._load_view(connection)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Run history unavailable: {e}")
+            self.available = False
+
+        while True:
+            run = self._queue.get()
+            try:
+                if run is None:
+                    break
+                if connection is not None:
+                    with connection:
+                        connection.execute(INSERT_RUN, run)
+                    self._ranked_runs += run["ranked"]
+                    self.view = self._load_view(connection)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not save run: {e}")
+            finally:
+                self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            connection.close()
+            raise sqlite3.DatabaseError(f"{self.path} is from a newer version (schema {version})")
+        if version < 1:
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return connection
+
+    def _load_view(self, connection):
+        biome_best = {}
+        for biome in range(len(biome_names)):
+            row = connection.execute(BIOME_BEST_QUERY, (biome,)).fetchone()
+            if row:
+                biome_best[biome] = dict(row)
+        return {
+            "runs": self._ranked_runs,
+            "top": [dict(row) for row in connection.execute(TOP_QUERY, (TOP_RUNS,))],
+            "biome_best": biome_best,
+            "recent": [dict(row) for row in connection.execute(RECENT_QUERY, (RECENT_RUNS,))],
+        }
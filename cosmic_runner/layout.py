@@ -0,0 +1,40 @@
+"""Screen dimensions shared by the simulation and the front end.
+
+The engine never opens a window, so these start at a fixed default size.
+The front end calls set_reference_size() once it knows the display size
+and set_screen_size() whenever the window is resized. Always read them as
+layout.SCREEN_WIDTH etc. so that updates are seen everywhere.
+"""
+
+# Define reference initial dimensions for scaling calculations
+REF_SCREEN_WIDTH = 1180
+REF_SCREEN_HEIGHT = 620
+REF_GROUND_MARGIN = 100 # The designed margin for the ground area
+
+# Current, dynamic screen dimensions
+SCREEN_WIDTH = REF_SCREEN_WIDTH
+SCREEN_HEIGHT = REF_SCREEN_HEIGHT
+# Ground is now fixed at the bottom of the window
+GROUND_LEVEL = SCREEN_HEIGHT - REF_GROUND_MARGIN + 75 # Fixed
+
+def set_reference_size(width, height):
+    """Set the size the game was designed around (the initial window size)"""
+    global REF_SCREEN_WIDTH, REF_SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_LEVEL
+    REF_SCREEN_WIDTH = width
+    REF_SCREEN_HEIGHT = height
+    SCREEN_WIDTH = width
+    SCREEN_HEIGHT = height
+    GROUND_LEVEL = SCREEN_HEIGHT - REF_GROUND_MARGIN + 75
+
+def set_screen_size(width, height):
+    """Resize the play area, scaling the ground margin proportionally"""
+    global SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_LEVEL
+    SCREEN_WIDTH = width
+    SCREEN_HEIGHT = height
+
+    # Update ground level proportionally
+    if REF_SCREEN_HEIGHT > 0:
+        current_ground_margin = int(REF_GROUND_MARGIN * (SCREEN_HEIGHT / REF_SCREEN_HEIGHT))
+    else: # Fallback
+        current_ground_margin = REF_GROUND_MARGIN 
+    GROUND_LEVEL = SCREEN_HEIGHT - current_ground_margin
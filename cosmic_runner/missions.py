@@ -0,0 +1,184 @@
+import random
+import time
+
+from .constants import biome_names
+
+# Missions roll from their own generator: completing one replaces it with a
+# new mission, and that must not shift the course's random stream
+mission_random = random.Random()
+
+# Mission events - the game fires these as things happen, and each mission
+# only hears the events its type cares about
+COIN_COLLECTED = "coin_collected"
+OBSTACLE_AVOIDED = "obstacle_avoided"
+JUMP = "jump"
+HIT = "hit"
+TIME_TICK = "time_tick"
+
+MISSION_EVENTS = {
+    "collect": (COIN_COLLECTED,),
+    "avoid": (OBSTACLE_AVOIDED,),
+    "jump": (JUMP,),
+    "survive": (TIME_TICK,),
+    "perfect": (HIT, TIME_TICK)
+}
+
+# Counter each mission type advances
+MISSION_COUNTERS = {
+    "collect": "coins_collected",
+    "avoid": "obstacles_avoided",
+    "jump": "jumps_made",
+    "survive": "time_survived",
+    "perfect": "time_survived"
+}
+
+class Mission:
+    def __init__(self, biome, difficulty_multiplier=1.0):
+        self.completed = False
+        self.biome = biome
+        self.time_created = time.time()
+        self.coins_collected = 0
+        self.obstacles_avoided = 0
+        self.jumps_made = 0
+        self.time_survived = 0
+        self.perfect_run_broken = False
+        
+        # Apply difficulty scaling based on biome level and multiplier
+        self.difficulty = (biome + 1) * difficulty_multiplier
+        
+        # Generate random mission based on biome
+        # Higher biomes have chance for harder mission types
+        if biome >= 3:  # Sky or Space biomes
+            mission_types = ["collect", "avoid", "survive", "perfect", "jump"]
+        else:
+            mission_types = ["collect", "avoid", "survive", "jump"]
+        self.mission_type = mission_random.choice(mission_types)
+        
+        # Set mission parameters based on type and biome - harder with progression
+        if self.mission_type == "collect":
+            self.target_amount = int(mission_random.randint(5, 12) * self.difficulty)
+            self.description = f"Collect {self.target_amount} coins in {biome_names[biome]}"
+        elif self.mission_type == "avoid":
+            self.target_amount = int(mission_random.randint(8, 15) * self.difficulty)
+            self.description = f"Avoid {self.target_amount} obstacles in {biome_names[biome]}"
+        elif self.mission_type == "jump":
+            self.target_amount = int(mission_random.randint(5, 12) * max(1, self.difficulty * 0.8))
+            self.description = f"Make {self.target_amount} jumps in {biome_names[biome]}"
+        elif self.mission_type == "survive":
+            self.target_amount = int(mission_random.randint(20, 45) * self.difficulty)
+            self.description = f"Survive {self.target_amount} seconds in {biome_names[biome]}"
+        elif self.mission_type == "perfect":
+            # Perfect run - no hits for a certain distance/time
+            self.target_amount = int(mission_random.randint(15, 30) * self.difficulty)
+            self.description = f"Perfect run for {self.target_amount} seconds in {biome_names[biome]}"
+        
+        # Set reward based on difficulty (biome level and target amount)
+        base_reward = 75
+        biome_multiplier = biome + 2
+        target_factor = self.target_amount / 8
+        
+        # Higher rewards for harder mission types
+        if self.mission_type == "perfect":
+            base_reward = 200
+        elif self.mission_type == "jump":
+            base_reward = 100
+        
+        self.reward = int(base_reward * biome_multiplier * target_factor * difficulty_multiplier)
+        
+        # Cached progress, refreshed only when an event changes it
+        self._shown_progress = None
+        self._refresh_progress()
+    
+    @property
+    def events(self):
+        """Event types this mission subscribes to"""
+        return MISSION_EVENTS[self.mission_type]
+    
+    def handle_event(self, event_type, amount=1):
+        """Apply a subscribed event; returns True when the mission completes"""
+        if event_type == HIT:
+            # For perfect run: fail if player hit an obstacle
+            if not self.perfect_run_broken:
+                self.perfect_run_broken = True
+                self._refresh_progress()
+            return False
+        
+        if self.perfect_run_broken:
+            return False
+        
+        counter = MISSION_COUNTERS[self.mission_type]
+        value = getattr(self, counter) + amount
+        setattr(self, counter, value)
+        if value >= self.target_amount:
+            self.completed = True
+        self._refresh_progress()
+        return self.completed
+    
+    def _refresh_progress(self):
+        """Recompute the cached progress, rebuilding the text only when it changes"""
+        value = getattr(self, MISSION_COUNTERS[self.mission_type])
+        shown = (int(value), self.perfect_run_broken)
+        self.progress = min(100, int((value / self.target_amount) * 100))
+        if shown == self._shown_progress:
+            return
+        self._shown_progress = shown
+        
+        if self.mission_type == "collect":
+            self.progress_text = f"{self.coins_collected}/{self.target_amount} coins"
+        elif self.mission_type == "avoid":
+            self.progress_text = f"{self.obstacles_avoided}/{self.target_amount} avoided"
+        elif self.mission_type == "jump":
+            self.progress_text = f"{self.jumps_made}/{self.target_amount} jumps"
+        elif self.mission_type == "survive":
+            self.progress_text = f"{int(self.time_survived)}/{self.target_amount} seconds"
+        elif self.perfect_run_broken:
+            self.progress_text = "FAILED - Hit obstacle"
+        else:
+            self.progress_text = f"{int(self.time_survived)}/{self.target_amount} seconds perfect"
+    
+    def get_progress(self):
+        """Get current progress as a percentage"""
+        return self.progress
+    
+    def get_progress_text(self):
+        """Get progress text for display"""
+        return self.progress_text
+
+
+class MissionBoard:
+    """Active missions indexed by biome and by the events they subscribe to"""
+    def __init__(self):
+        self.by_biome = {}        # biome -> missions in creation order
+        self._subscribers = {}    # (biome, event type) -> missions
+    
+    def add(self, mission):
+        self.by_biome.setdefault(mission.biome, []).append(mission)
+        for event_type in mission.events:
+            self._subscribers.setdefault((mission.biome, event_type), []).append(mission)
+    
+    def remove(self, mission):
+        self.by_biome[mission.biome].remove(mission)
+        for event_type in mission.events:
+            self._subscribers[(mission.biome, event_type)].remove(mission)
+    
+    def for_biome(self, biome):
+        """Active missions for a biome (do not modify the returned list)"""
+        return self.by_biome.get(biome, [])
+    
+    def emit(self, biome, event_type, amount=1):
+        """Deliver an event to the biome's subscribers; returns completed missions"""
+        subscribers = self._subscribers.get((biome, event_type))
+        if not subscribers:
+            return []
+        return [mission for mission in list(subscribers) if mission.handle_event(event_type, amount)]
+    
+    def clear(self):
+        self.by_biome.clear()
+        self._subscribers.clear()
+    
+    def __iter__(self):
+        for missions in self.by_biome.values():
+            yield from missions
+    
+    def __len__(self):
+        return sum(len(missions) for missions in self.by_biome.values())
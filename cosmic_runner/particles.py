@@ -0,0 +1,242 @@
+"""Particles: jetpack flame, coin sparkles, death bursts and biome weather.
+
+ParticleSystem keeps every live particle in parallel arrays: position,
+velocity, gravity, life and style, one slot each up to the budget. step()
+emits this frame's particles and then moves them all at once, as
+whole-array operations with numpy or a loop over plain lists without it.
+Dead and off-screen particles are compacted out. draw() hands every
+particle to one Surface.blits call. Each style has SPRITE_STAGES
+pre-rendered sprites that shrink and fade, so a particle's look is its
+style plus how far it is through its life.
+
+Particles are cosmetic. They draw from their own random stream, never
+the game's, so seeded courses play out the same with or without them.
+When the budget is full, new particles are dropped.
+
+The front end sets Game.effect_player to burst(), calls step(game) after
+each Game.update, and draw_game calls draw().
+"""
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import pygame
+
+from . import layout
+from .constants import DARK_FOREST, DESERT, SNOW, VOLCANO
+
+DEFAULT_BUDGET = 600
+SPRITE_STAGES = 6
+
+# name: (colour at birth, colour at death, radius at birth, radius at death, lifetime range, gravity)
+STYLES = {
+    "flame": ((255, 255, 120), (255, 70, 0), 6, 2, (10, 16), -0.05),
+    "spark": ((255, 245, 150), (255, 170, 0), 3, 1, (14, 22), 0.15),
+    "debris": ((255, 255, 255), (200, 40, 40), 5, 2, (30, 45), 0.35),
+    "snow": ((255, 255, 255), (215, 230, 255), 3, 2, (200, 280), 0.0),
+    "ember": ((255, 210, 90), (190, 40, 0), 3, 1, (60, 100), -0.02),
+    "sand": ((235, 205, 145), (200, 170, 110), 2, 1, (50, 90), 0.0),
+    "firefly": ((225, 255, 130), (110, 190, 40), 3, 2, (90, 140), 0.0),
+}
+STYLE_NAMES = tuple(STYLES)
+
+# Bursts Game.play_effect() asks for: name -> (style, count, slowest, fastest)
+EFFECTS = {
+    "coin": ("spark", 10, 1.0, 3.0),
+    "death": ("debris", 30, 2.0, 6.0),
+}
+
+# Weather per biome: (style, particles per frame)
+WEATHER = {
+    DARK_FOREST: ("firefly", 0.15),
+    DESERT: ("sand", 1.0),
+    SNOW: ("snow", 1.5),
+    VOLCANO: ("ember", 0.8),
+}
+
+JETPACK_RATE = 3            # Flame particles per frame, more while thrusting
+JETPACK_THRUST_RATE = 5
+FIELDS = ("x", "y", "vx", "vy", "ay", "life", "lifetime", "style")
+
+def render_sprites(style):
+    """SPRITE_STAGES circles fading from birth to death, all on one canvas size"""
+    start, end, radius_start, radius_end, _, _ = STYLES[style]
+    size = radius_start * 2 + 1
+    sprites = []
+    for stage in range(SPRITE_STAGES):
+        t = stage / (SPRITE_STAGES - 1)
+        colour = [round(a + (b - a) * t) for a, b in zip(start, end)]
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*colour, round(255 - 190 * t)), (radius_start, radius_start),
+                           max(1, round(radius_start + (radius_end - radius_start) * t)))
+        sprites.append(sprite)
+    return sprites
+
+class ParticleSystem:
+    """Array-backed particles up to a budget, moved and drawn in batches"""
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.random = random.Random()
+        self.sprites = []           # Rendered on first draw: style * SPRITE_STAGES + stage
+        self.half_sizes = [STYLES[style][2] for style in STYLE_NAMES]
+        self.pending = []           # Rows emitted since the last step, in FIELDS order
+        self.weather_credit = 0.0   # Fractional weather particles carried to the next frame
+        # Statistics
+        self.emitted = 0
+        self.dropped = 0
+        self.set_budget(budget)
+
+    def set_budget(self, budget):
+        """Maximum live particles (0 turns particles off); drops the live ones"""
+        self.budget = max(0, budget)
+        self.count = 0
+        self.pending = []
+        for field in FIELDS:
+            if np is not None:
+                setattr(self, field, np.zeros(self.budget, np.int64 if field == "style" else np.float64))
+            else:
+                setattr(self, field, [0] * self.budget)
+
+    def clear(self):
+        self.count = 0
+        self.pending = []
+        self.weather_credit = 0.0
+
+    def emit(self, style, x, y, vx, vy):
+        """Queue one particle; it joins the arrays on the next step()"""
+        if self.count + len(self.pending) >= self.budget:
+            self.dropped += 1
+            return
+        _, _, _, _, (shortest, longest), gravity = STYLES[style]
+        lifetime = self.random.randint(shortest, longest)
+        self.pending.append((x, y, vx, vy, gravity, lifetime, lifetime, STYLE_NAMES.index(style)))
+        self.emitted += 1
+
+    def burst(self, name, x, y):
+        """Game.effect_player: a burst of particles flying out from (x, y)"""
+        style, count, slowest, fastest = EFFECTS[name]
+        for _ in range(count):
+            angle = self.random.uniform(0, 2 * math.pi)
+            speed = self.random.uniform(slowest, fastest)
+            self.emit(style, x, y, math.cos(angle) * speed, math.sin(angle) * speed - 1)
+
+    def emit_jetpack(self, player, thrusting):
+        x, y = player.rect.centerx, player.rect.bottom
+        for _ in range(JETPACK_THRUST_RATE if thrusting else JETPACK_RATE):
+            self.emit("flame", x + self.random.uniform(-6, 6), y, self.random.uniform(-1, 1),
+                      self.random.uniform(2, 4))
+
+    def emit_weather(self, biome):
+        weather = WEATHER.get(biome)
+        if weather is None:
+            self.weather_credit = 0.0
+            return
+        style, rate = weather
+        self.weather_credit += rate
+        width, ground = layout.SCREEN_WIDTH, layout.GROUND_LEVEL
+        uniform = self.random.uniform
+        while self.weather_credit >= 1:
+            self.weather_credit -= 1
+            if style == "snow":
+                self.emit(style, uniform(0, width + 200), -5, uniform(-0.5, 0.5), uniform(1, 2.5))
+            elif style == "ember":
+                self.emit(style, uniform(0, width + 200), ground, uniform(-0.5, 0.5), uniform(-1.5, -0.5))
+            elif style == "sand":
+                self.emit(style, width + 5, uniform(ground - 150, ground), uniform(-6, -3), uniform(-0.2, 0.2))
+            else:
+                self.emit(style, uniform(0, width + 200), uniform(ground - 200, ground - 40),
+                          uniform(-0.6, 0.6), uniform(-0.4, 0.4))
+
+    def step(self, game):
+        """Once per game update: emit for the jetpack and weather, then move everything"""
+        if not self.budget:
+            return
+        player = game.player
+        if player.has_jetpack and player.jetpack_fuel > 0:
+            self.emit_jetpack(player, game.jetpack_held and not player.on_ground)
+        if not game.biome_transition_timer:
+            self.emit_weather(game.current_biome)
+        self.add_pending()
+        if np is not None:
+            self.move_arrays(game.speed)
+        else:
+            self.move_lists(game.speed)
+
+    def add_pending(self):
+        start, end = self.count, self.count + len(self.pending)
+        if np is not None and self.pending:
+            rows = np.array(self.pending, np.float64)
+            for column, field in enumerate(FIELDS):
+                getattr(self, field)[start:end] = rows[:, column]
+        else:
+            for column, field in enumerate(FIELDS):
+                getattr(self, field)[start:end] = [row[column] for row in self.pending]
+        self.count = end
+        self.pending = []
+
+    def move_arrays(self, scroll):
+        n = self.count
+        x, y, vx, vy, life = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.life[:n]
+        vy += self.ay[:n]
+        x += vx - scroll        # Particles drift with the scenery
+        y += vy
+        life -= 1
+        alive = (life > 0) & (x > -20) & (y > -40) & (y < layout.SCREEN_HEIGHT + 20)
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            for field in FIELDS:
+                array = getattr(self, field)
+                array[:kept] = array[:n][alive]
+        self.count = kept
+
+    def move_lists(self, scroll):
+        x, y, vx, vy, ay, life = self.x, self.y, self.vx, self.vy, self.ay, self.life
+        bottom = layout.SCREEN_HEIGHT + 20
+        kept = 0
+        for i in range(self.count):
+            vy[i] += ay[i]
+            x[i] += vx[i] - scroll
+            y[i] += vy[i]
+            life[i] -= 1
+            if life[i] > 0 and x[i] > -20 and -40 < y[i] < bottom:
+                if kept != i:
+                    for field in FIELDS:
+                        array = getattr(self, field)
+                        array[kept] = array[i]
+                kept += 1
+        self.count = kept
+
+    def draw(self, screen, shake_x=0, shake_y=0):
+        """Blit every live particle in one batch"""
+        n = self.count
+        if not n:
+            return
+        if not self.sprites:
+            self.sprites = [sprite for style in STYLE_NAMES for sprite in render_sprites(style)]
+        if np is not None:
+            life, lifetime, style = self.life[:n], self.lifetime[:n], self.style[:n]
+            stage = np.minimum((lifetime - life) * SPRITE_STAGES // lifetime, SPRITE_STAGES - 1).astype(np.int64)
+            half = np.take(self.half_sizes, style)
+            px = (self.x[:n] - half + shake_x).astype(np.int64).tolist()
+            py = (self.y[:n] - half + shake_y).astype(np.int64).tolist()
+            sprites = [self.sprites[i] for i in (style * SPRITE_STAGES + stage).tolist()]
+            screen.blits(list(zip(sprites, zip(px, py))), False)
+            return
+        batch = []
+        for i in range(n):
+            style = self.style[i]
+            stage = min(int((self.lifetime[i] - self.life[i]) * SPRITE_STAGES // self.lifetime[i]), SPRITE_STAGES - 1)
+            half = self.half_sizes[style]
+            batch.append((self.sprites[style * SPRITE_STAGES + stage],
+                          (int(self.x[i]) - half + shake_x, int(self.y[i]) - half + shake_y)))
+        screen.blits(batch, False)
+
+    def overlay_lines(self):
+        backend = "numpy" if np is not None else "lists"
+        return [f"Particles {self.count}/{self.budget} ({backend}), dropped {self.dropped}"]
+
+# Shared by the front end and draw_game
+particles = ParticleSystem()
@@ -0,0 +1,891 @@
+"""Rendering front end: fonts, the in-game view and the menu screens.
+
+Nothing in the simulation package imports this module, so headless tools
+can use the engine without fonts or a display.
+"""
+import pygame
+import random
+import math
+
+from . import layout
+from .constants import (
+    WHITE, GREEN, YELLOW, ORANGE, MOON_COLOR, SUN_COLOR,
+    SPACE, DAY, TILE_SIZE, biome_names
+)
+from .sprites import get_runner_animation, get_ghost_frames
+from .particles import particles
+from .telemetry import track_font
+
+# Screen effects use their own generator so drawing never shifts the
+# game's random stream (a seeded race course plays out the same for everyone)
+effects_random = random.Random()
+
+# Font (created by init_fonts() at startup)
+font_small = None
+font_medium = None
+font_large = None
+font_huge = None
+
+def init_fonts():
+    global font_small, font_medium, font_large, font_huge
+    pygame.font.init()
+    # Wrapped so telemetry can count the text surfaces rendered each frame
+    font_small = track_font(pygame.font.SysFont("Arial", 20))
+    font_medium = track_font(pygame.font.SysFont("Arial", 30))
+    font_large = track_font(pygame.font.SysFont("Arial", 40))
+    font_huge = track_font(pygame.font.SysFont("Arial", 60, bold=True))
+
+def get_background_color(game):
+    """Enhanced background colors - Space has special deep space color"""
+    day_colors = [
+        (135, 206, 235),  # Plateau - sky blue
+        (50, 50, 70),     # Dark Forest - dark
+        (255, 218, 185),  # Desert - sandy
+        (0, 105, 148),    # Sea - sea blue
+        (139, 69, 19),    # Volcano - brown/orange
+        (135, 206, 250),  # Sky - light blue
+        (5, 5, 30)        # Space - deep space (FINAL)
+    ]
+    
+    night_colors = [
+        (25, 25, 60),     # Plateau night
+        (10, 10, 20),     # Dark Forest night
+        (139, 115, 85),   # Desert night
+        (0, 50, 100),     # Sea night
+        (80, 40, 40),     # Volcano night
+        (50, 50, 100),    # Sky night
+        (2, 2, 15)        # Space night - even darker
+    ]
+    
+    colors = day_colors if game.time_of_day == DAY else night_colors
+    return colors[game.current_biome] if game.current_biome < len(colors) else (50, 50, 50)
+
+
+def draw_game(screen, game):
+    """Draw all game elements"""
+    # Fill background
+    bg_color = get_background_color(game)
+    screen.fill(bg_color)
+    
+    # Apply camera shake
+    shake_x = effects_random.randint(-game.camera_shake, game.camera_shake) if game.camera_shake > 0 else 0
+    shake_y = effects_random.randint(-game.camera_shake, game.camera_shake) if game.camera_shake > 0 else 0
+    
+    # Draw background elements (with shake)
+    for bg_element in game.background_elements:
+        screen.blit(bg_element.image, (bg_element.rect.x + shake_x, bg_element.rect.y + shake_y))
+    
+    # Draw celestial body
+    if game.celestial_body:
+        screen.blit(game.celestial_body.image, (game.celestial_body.rect.x + shake_x, game.celestial_body.rect.y + shake_y))
+    
+    # Draw tiles
+    for tile in game.tiles:
+        screen.blit(tile.image, (tile.rect.x + shake_x, tile.rect.y + shake_y))
+    
+    # Draw decorations (visual-only, no collision)
+    for decoration in game.decorations:
+        screen.blit(decoration.image, (decoration.rect.x + shake_x, decoration.rect.y + shake_y))
+    
+    # Draw coins
+    for coin in game.coins:
+        screen.blit(coin.image, (coin.rect.x + shake_x, coin.rect.y + shake_y))
+    
+    # Draw power-ups
+    for powerup in game.powerups:
+        screen.blit(powerup.image, (powerup.rect.x + shake_x, powerup.rect.y + shake_y))
+    
+    # Draw obstacles
+    for obstacle in game.obstacles:
+        screen.blit(obstacle.image, (obstacle.rect.x + shake_x, obstacle.rect.y + shake_y))
+    
+    # Draw checkpoints
+    for checkpoint in game.checkpoints:
+        screen.blit(checkpoint.image, (checkpoint.rect.x + shake_x, checkpoint.rect.y + shake_y))
+    
+    # Draw player (with respawn flashing)
+    player = game.player
+    image = player.image
+    if game.respawn_state and not (game.respawn_timer // 5) % 2:  # Flash every 5 frames
+        image = player.animation.faded[player.current_frame]
+    offset_x, offset_y = player.animation.offset
+    screen.blit(image, (player.rect.x + offset_x + shake_x, player.rect.y + offset_y + shake_y))
+
+    # Draw particles: jetpack flame, sparkles, bursts and weather
+    particles.draw(screen, shake_x, shake_y)
+    
+    # Draw UI elements
+    draw_ui(screen, game)
+    
+    # Apply screen flash
+    if game.screen_flash > 0:
+        flash_surface = pygame.Surface((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+        if game.current_biome == SPACE:
+            flash_surface.fill((100, 100, 255))  # Blue flash for space
+        else:
+            flash_surface.fill((255, 255, 255))
+        flash_surface.set_alpha(game.screen_flash * 2)
+        screen.blit(flash_surface, (0, 0))
+
+def draw_ui(screen, game):
+    """Draw UI elements - Fixed powerup timer positioning"""
+    # Score and basic stats
+    score_text = font_medium.render(f"Score: {game.score}", True, WHITE)
+    screen.blit(score_text, (10, 10))
+    
+    lives_text = font_medium.render(f"Lives: {game.lives}", True, WHITE)
+    screen.blit(lives_text, (10, 50))
+    
+    distance_text = font_medium.render(f"Distance: {int(game.distance*10):,}px", True, WHITE)
+    screen.blit(distance_text, (10, 90))
+    
+    # Special indicator for final biome
+    biome_color = (255, 100, 255) if game.current_biome == SPACE else WHITE
+    biome_text = font_medium.render(f"Biome: {biome_names[game.current_biome]}", True, biome_color)
+    if game.current_biome == SPACE:
+        # Add special effect for space biome
+        for i in range(3):
+            glow_text = font_medium.render(f"Biome: {biome_names[game.current_biome]}", True, (100, 50, 255))
+            screen.blit(glow_text, (12 + i, 132 + i))
+    screen.blit(biome_text, (10, 130))
+    
+    # Coins displayed in top right
+    coins_text = font_medium.render(f"Coins: {game.total_coins:,}", True, WHITE)
+    screen.blit(coins_text, (layout.SCREEN_WIDTH - 220, 10))
+    
+    # Draw active power-ups with timers - positioned below coins
+    powerup_y = 50  # Start below coins
+    for powerup_type, timer in game.powerup_timers.items():
+        seconds_left = timer // 60
+        max_duration = 300
+        if powerup_type == "coin_magnet":
+            max_duration = 600
+        elif powerup_type == "speed":
+            max_duration = 360
+        elif powerup_type == "double_coins":
+            max_duration = 480
+        elif powerup_type == "shield":
+            max_duration = 240
+        
+        bar_width = 150
+        bar_height = 20
+        bar_x = layout.SCREEN_WIDTH - 200
+        
+        # Background bar
+        pygame.draw.rect(screen, (50, 50, 50), (bar_x, powerup_y, bar_width, bar_height))
+        
+        # Progress bar
+        progress = timer / max_duration
+        fill_width = int(bar_width * progress)
+        
+        colors = {
+            "shield": (0, 100, 255),
+            "speed": (255, 215, 0),
+            "coin_magnet": (128, 0, 128),
+            "double_coins": (0, 200, 0),
+            "jetpack": (255, 140, 0)
+        }
+        color = colors.get(powerup_type, WHITE)
+        pygame.draw.rect(screen, color, (bar_x, powerup_y, fill_width, bar_height))
+        
+        # Text label above bar
+        powerup_name = powerup_type.replace("_", " ").title()
+        powerup_text = font_small.render(f"{powerup_name}: {seconds_left:.1f}s", True, WHITE)
+        screen.blit(powerup_text, (bar_x, powerup_y - 25))
+        powerup_y += 45  # Move down for next powerup
+    
+    # Jetpack fuel display (if active)
+    if game.player.has_jetpack:
+        fuel_percent = (game.player.jetpack_fuel / game.player.max_jetpack_fuel) * 100
+        fuel_text = font_small.render(f"Jetpack Fuel: {fuel_percent:.0f}%", True, ORANGE)
+        screen.blit(fuel_text, (layout.SCREEN_WIDTH - 200, powerup_y))
+    
+    # Enhanced mission display
+    draw_missions(screen, game)
+    
+    # Show biome transition message
+    if game.biome_transition_timer > 0:
+        # Calculate fade in/out effect
+        alpha = min(255, (game.biome_transition_timer / 180) * 200)
+        
+        # Transition message
+        transition_text = font_huge.render(f"Welcome to {biome_names[game.current_biome].upper()}!", True, (255, 215, 0))
+        transition_rect = transition_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//3))
+        
+        # Render to temporary surface for alpha
+        transition_surface = pygame.Surface((layout.SCREEN_WIDTH, 150), pygame.SRCALPHA)
+        temp_text = pygame.transform.smoothscale(transition_text, transition_text.get_size())
+        transition_surface.blit(temp_text, (transition_rect.x - 100, transition_rect.y - 50))
+        transition_surface.set_alpha(int(alpha))
+        screen.blit(transition_surface, (0, 0))
+    
+    # Mission completion notification
+    if game.mission_completion_timer > 0:
+        game.mission_completion_timer -= 1
+        glow_alpha = min(255, game.mission_completion_timer * 2)
+        
+        completion_surface = pygame.Surface((400, 60))
+        completion_surface.fill((255, 215, 0))
+        completion_surface.set_alpha(glow_alpha // 4)
+        completion_rect = completion_surface.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//2 - 30))
+        screen.blit(completion_surface, completion_rect)
+        
+        completed_text = font_large.render("MISSION COMPLETED!", True, (255, 215, 0))
+        reward_text = font_medium.render(f"+{game.completed_missions[-1].reward if game.completed_missions else 0} Coins!", True, WHITE)
+        
+        text_rect = completed_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//2 - 50))
+        reward_rect = reward_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//2 - 10))
+        
+        screen.blit(completed_text, text_rect)
+        screen.blit(reward_text, reward_rect)
+
+def draw_missions(screen, game):
+    """Enhanced mission display"""
+    mission_y = 170
+    active_missions = game.missions.for_biome(game.current_biome)[:3]
+    
+    if active_missions:
+        header_surface = pygame.Surface((450, 35))
+        header_surface.fill((0, 0, 0))
+        header_surface.set_alpha(180)
+        screen.blit(header_surface, (10, mission_y - 5))
+        
+        mission_title = font_medium.render("Current Missions:", True, YELLOW)
+        screen.blit(mission_title, (15, mission_y))
+        mission_y += 40
+        
+        for mission in active_missions:
+            progress = mission.get_progress()
+            
+            mission_surface = pygame.Surface((450, 40))
+            mission_surface.fill((0, 0, 0))
+            mission_surface.set_alpha(150)
+            screen.blit(mission_surface, (10, mission_y - 2))
+            
+            bar_width = 420
+            bar_height = 30
+            progress_width = int((bar_width * progress) / 100)
+            
+            pygame.draw.rect(screen, (30, 30, 30), (15, mission_y, bar_width, bar_height))
+            
+            if progress == 100:
+                color = GREEN
+            elif progress > 75:
+                color = (255, 215, 0)
+            elif progress > 50:
+                color = (255, 165, 0)
+            else:
+                color = (100, 150, 255)
+            
+            pygame.draw.rect(screen, color, (15, mission_y, progress_width, bar_height))
+            pygame.draw.rect(screen, WHITE, (15, mission_y, bar_width, bar_height), 2)
+            
+            mission_desc = f"{mission.description}"
+            progress_info = f"({mission.get_progress_text()})"
+            
+            mission_text = font_small.render(mission_desc, True, WHITE)
+            progress_text = font_small.render(progress_info, True, YELLOW)
+            
+            screen.blit(mission_text, (20, mission_y + 3))
+            screen.blit(progress_text, (20, mission_y + 18))
+            
+            mission_y += 45
+
+# Enhanced Menu Runner Animation
+class MenuRunner:
+    def __init__(self):
+        self.current_frame = 0
+        self.x = -100
+        self.y = layout.SCREEN_HEIGHT - 200
+        self.speed = 3
+        self.animation_timer = 0
+        self.scale = 3.0  # Bigger runner for menu
+        self.bounce_offset = 0
+        self.direction = 1
+
+        # Scale the run cycle and its mirror image once, not every draw
+        animation = get_runner_animation()
+        factor = TILE_SIZE * self.scale / animation.size[0]
+        self.frames = []
+        for index in animation.run:
+            width, height = animation.frames[index].get_size()
+            self.frames.append(pygame.transform.scale(animation.frames[index],
+                                                      (int(width * factor), int(height * factor))))
+        self.flipped_frames = [pygame.transform.flip(frame, True, False) for frame in self.frames]
+        self.offset = (int(animation.offset[0] * factor), int(animation.offset[1] * factor))
+    
+    def update(self):
+        # Animate across screen
+        self.x += self.speed * self.direction
+        
+        # Bounce at edges
+        if self.x > layout.SCREEN_WIDTH + 100:
+            self.direction = -1
+            self.x = layout.SCREEN_WIDTH + 100
+        elif self.x < -100:
+            self.direction = 1
+            self.x = -100
+        
+        # Animate frames
+        self.animation_timer += 1
+        if self.animation_timer >= 10:
+            self.current_frame = (self.current_frame + 1) % len(self.frames)
+            self.animation_timer = 0
+        
+        # Bounce effect
+        self.bounce_offset += 0.15
+    
+    def draw(self, screen):
+        bounce_y = self.y + math.sin(self.bounce_offset) * 8
+        # Flipped sprite when moving left
+        frames = self.flipped_frames if self.direction == -1 else self.frames
+        screen.blit(frames[self.current_frame], (self.x + self.offset[0], bounce_y + self.offset[1]))
+
+# Menu runner (created by init_menu_runner() at startup)
+menu_runner = None
+
+def init_menu_runner():
+    global menu_runner
+    menu_runner = MenuRunner()
+
+# Enhanced menu functions
+def draw_menu(screen, volume_slider=None, history_view=None):
+    """Enhanced main menu with animated runner"""
+    bg_color = (15, 15, 40)
+    screen.fill(bg_color)
+    
+    current_time = pygame.time.get_ticks()
+    
+    # Enhanced animated background
+    for i in range(150):
+        star_speed = (i % 5) + 1
+        x = (current_time // (30 * star_speed) + i * 73) % layout.SCREEN_WIDTH
+        y = (math.sin(current_time / 1500 + i) * 20) + (i * 19) % layout.SCREEN_HEIGHT
+        brightness = abs(math.sin(current_time / 1200 + i)) * 180 + 75
+        size = 1 + int(brightness / 180)
+        color_variants = [
+            (int(brightness), int(brightness), int(brightness)),
+            (int(brightness), int(brightness * 0.7), int(brightness * 0.5)),
+            (int(brightness * 0.5), int(brightness * 0.7), int(brightness)),
+            (int(brightness * 0.7), int(brightness), int(brightness * 0.5))
+        ]
+        color = color_variants[i % len(color_variants)]
+        pygame.draw.circle(screen, color, (int(x), int(y)), size)
+    
+    # Animated title with multiple effects
+    title_glow = abs(math.sin(current_time / 800)) * 30 + 20
+    
+    # Multi-layered glow effect
+    for layer in range(8):
+        alpha = (8 - layer) * 20
+        offset = layer * 2
+        glow_color = (50 + layer * 10, 50 + layer * 5, 150 + layer * 10)
+        
+        title_surface = pygame.Surface((600, 100))
+        title_surface.fill(glow_color)
+        title_surface.set_alpha(alpha)
+        title_rect = title_surface.get_rect(center=(layout.SCREEN_WIDTH//2 + offset, layout.SCREEN_HEIGHT//4 + offset))
+        screen.blit(title_surface, title_rect)
+    
+    # Main title
+    title_text = font_huge.render("COSMIC RUNNER", True, WHITE)
+    title_shadow = font_huge.render("COSMIC RUNNER", True, (100, 100, 100))
+    
+    # Title shadow
+    title_shadow_rect = title_shadow.get_rect(center=(layout.SCREEN_WIDTH//2 + 3, layout.SCREEN_HEIGHT//4 + 3))
+    screen.blit(title_shadow, title_shadow_rect)
+    
+    # Main title
+    title_rect = title_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//4))
+    screen.blit(title_text, title_rect)
+    
+    # Animated subtitle with wave effect
+    wave_offset = math.sin(current_time / 600) * 15
+    subtitle_text = font_medium.render("Enhanced Edition - Journey Through 7 Cosmic Biomes", True, (150, 200, 255))
+    subtitle_rect = subtitle_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//4 + 80 + wave_offset))
+    screen.blit(subtitle_text, subtitle_rect)
+    
+    # Update and draw animated runner
+    if menu_runner is None:
+        init_menu_runner()
+    menu_runner.update()
+    menu_runner.draw(screen)
+    
+    # Enhanced menu options with better styling
+    options = [
+        ("SPACE - Start Adventure", "Begin your cosmic journey"),
+        ("I - Instructions & Controls", "Learn how to play"),
+        ("F11 - Toggle Fullscreen", "Switch display mode"),
+        ("M - Toggle Music", "Audio controls"),
+        ("ESC - Exit Game", "Quit the game")
+    ]
+    
+    mouse_pos = pygame.mouse.get_pos()
+    start_y = layout.SCREEN_HEIGHT//2 + 50
+    
+    for i, (option, description) in enumerate(options):
+        y_pos = start_y + i * 60
+        
+        # Enhanced hover detection with larger area
+        option_rect = pygame.Rect(layout.SCREEN_WIDTH//2 - 250, y_pos - 25, 500, 50)
+        is_hovering = option_rect.collidepoint(mouse_pos)
+        
+        # Animated background for options
+        if is_hovering:
+            # Pulsing glow effect
+            glow_intensity = abs(math.sin(current_time / 300)) * 100 + 50
+            
+            for glow_layer in range(3):
+                glow_surf = pygame.Surface((520, 60))
+                glow_color = (50 + glow_layer * 30, 100 + glow_layer * 20, 255 - glow_layer * 30)
+                glow_surf.fill(glow_color)
+                glow_surf.set_alpha(int(glow_intensity / (glow_layer + 1)))
+                glow_rect = glow_surf.get_rect(center=(layout.SCREEN_WIDTH//2, y_pos))
+                screen.blit(glow_surf, glow_rect)
+        
+        # Option background
+        option_bg = pygame.Surface((480, 45))
+        bg_color = (30, 50, 100) if is_hovering else (20, 20, 40)
+        option_bg.fill(bg_color)
+        option_bg.set_alpha(180)
+        bg_rect = option_bg.get_rect(center=(layout.SCREEN_WIDTH//2, y_pos))
+        screen.blit(option_bg, bg_rect)
+        
+        # Main option text
+        option_color = (255, 255, 100) if is_hovering else WHITE
+        option_text = font_medium.render(option, True, option_color)
+        option_text_rect = option_text.get_rect(center=(layout.SCREEN_WIDTH//2, y_pos - 8))
+        screen.blit(option_text, option_text_rect)
+        
+        # Description text
+        desc_color = (200, 200, 200) if is_hovering else (150, 150, 150)
+        desc_text = font_small.render(description, True, desc_color)
+        desc_text_rect = desc_text.get_rect(center=(layout.SCREEN_WIDTH//2, y_pos + 12))
+        screen.blit(desc_text, desc_text_rect)
+    
+    # Enhanced celestial decorations
+    # Animated moon
+    moon_glow = abs(math.sin(current_time / 1000)) * 25 + 15
+    for layer in range(4):
+        pygame.draw.circle(screen, (80 + layer * 20, 80 + layer * 20, 150 + layer * 20), 
+                          (100, 100), int(moon_glow + layer * 5))
+    pygame.draw.circle(screen, MOON_COLOR, (100, 100), 40)
+    # Moon craters
+    pygame.draw.circle(screen, (180, 180, 180), (90, 90), 8)
+    pygame.draw.circle(screen, (180, 180, 180), (110, 105), 6)
+    pygame.draw.circle(screen, (180, 180, 180), (105, 85), 4)
+    
+    # Animated sun
+    sun_glow = abs(math.cos(current_time / 900)) * 30 + 20
+    sun_x, sun_y = layout.SCREEN_WIDTH - 100, 100
+    for layer in range(5):
+        pygame.draw.circle(screen, (255, 200 - layer * 20, layer * 10), 
+                          (sun_x, sun_y), int(sun_glow + layer * 6))
+    pygame.draw.circle(screen, SUN_COLOR, (sun_x, sun_y), 45)
+    # Sun rays
+    for i in range(12):
+        angle = math.radians(i * 30 + current_time / 50)
+        ray_length = 25 + abs(math.sin(current_time / 300 + i)) * 10
+        start_x = sun_x + 50 * math.cos(angle)
+        start_y = sun_y + 50 * math.sin(angle)
+        end_x = sun_x + (50 + ray_length) * math.cos(angle)
+        end_y = sun_y + (50 + ray_length) * math.sin(angle)
+        pygame.draw.line(screen, SUN_COLOR, (start_x, start_y), (end_x, end_y), 4)
+    
+    # Enhanced shooting stars with trails
+    for i in range(3):
+        star_time = (current_time + i * 2000) % 8000
+        if star_time < 2000:
+            progress = star_time / 2000
+            start_x = layout.SCREEN_WIDTH * (0.1 + i * 0.3)
+            start_y = layout.SCREEN_HEIGHT * (0.1 + i * 0.15)
+            end_x = start_x + 200 + i * 50
+            end_y = start_y + 120 + i * 30
+            
+            x = start_x + (end_x - start_x) * progress
+            y = start_y + (end_y - start_y) * progress
+            
+            # Enhanced trail effect
+            trail_length = 40
+            for j in range(trail_length):
+                trail_progress = max(0, progress - j * 0.008)
+                if trail_progress > 0:
+                    trail_x = start_x + (end_x - start_x) * trail_progress
+                    trail_y = start_y + (end_y - start_y) * trail_progress
+                    trail_alpha = max(0, 255 - j * 6)
+                    trail_size = max(1, 5 - j//8)
+                    
+                    if trail_alpha > 0:
+                        trail_colors = [
+                            (255, 255, 255),
+                            (255, 255, 200),
+                            (255, 200, 100),
+                            (200, 150, 100)
+                        ]
+                        color_index = min(3, j // 10)
+                        pygame.draw.circle(screen, trail_colors[color_index], 
+                                         (int(trail_x), int(trail_y)), trail_size)
+    
+    if history_view:
+        draw_run_history(screen, history_view)
+    
+    # Enhanced volume slider
+    if volume_slider:
+        volume_slider.draw(screen, font_medium)
+
+def draw_game_over(screen, game):
+    """Draw game over screen"""
+    # Semi-transparent dark overlay
+    overlay = pygame.Surface((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+    overlay.fill((40, 0, 0))  # Dark red background
+    overlay.set_alpha(220)
+    screen.blit(overlay, (0, 0))
+    
+    current_time = pygame.time.get_ticks()
+    
+    # Enhanced game over text with pulsing effect
+    pulse = abs(math.sin(current_time / 600)) * 50 + 50
+    text_color = (255, int(pulse), int(pulse))
+    
+    for i in range(6):
+        glow_color = (100 - i*10, 0, 0)
+        glow_offset = i * 3
+        glow_text = font_huge.render("GAME OVER", True, glow_color)
+        glow_rect = glow_text.get_rect(center=(layout.SCREEN_WIDTH//2 + glow_offset, layout.SCREEN_HEIGHT//3 + glow_offset))
+        screen.blit(glow_text, glow_rect)
+    
+    game_over_text = font_huge.render("GAME OVER", True, text_color)
+    game_over_rect = game_over_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//3))
+    screen.blit(game_over_text, game_over_rect)
+    
+    # Special message for reaching space
+    if game.current_biome == SPACE:
+        space_text = font_large.render("You reached the final frontier!", True, (150, 100, 255))
+        space_rect = space_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//3 + 80))
+        screen.blit(space_text, space_rect)
+    
+    # Enhanced stats with better formatting
+    stats = [
+        f"Final Score: {game.score:,}",
+        f"Distance Traveled: {int(game.distance * 10):,} pixels",
+        f"Total Coins Collected: {game.total_coins:,}",
+        f"Biomes Explored: {game.current_biome + 1}/7",
+        f"Missions Completed: {len(game.completed_missions)}",
+        f"Highest Biome: {biome_names[game.current_biome]}"
+    ]
+    
+    if game.current_biome == SPACE:
+        stats.append("🚀 SPACE EXPLORER ACHIEVEMENT! 🚀")
+    
+    y_offset = layout.SCREEN_HEIGHT//2 - 20
+    for i, stat in enumerate(stats):
+        # Stat background
+        stat_bg = pygame.Surface((600, 40))
+        stat_bg.fill((0, 0, 0))
+        stat_bg.set_alpha(150)
+        stat_rect = stat_bg.get_rect(center=(layout.SCREEN_WIDTH//2, y_offset))
+        screen.blit(stat_bg, stat_rect)
+        
+        # Special color for achievement
+        text_color = (255, 215, 0) if "ACHIEVEMENT" in stat else WHITE
+        stat_text = font_medium.render(stat, True, text_color)
+        stat_text_rect = stat_text.get_rect(center=(layout.SCREEN_WIDTH//2, y_offset))
+        screen.blit(stat_text, stat_text_rect)
+        y_offset += 45
+    
+    # Enhanced options
+    y_offset += 20
+    options = [
+        "Press SPACE to Play Again",
+        "Press ESC for Main Menu"
+    ]
+    
+    for option in options:
+        option_bg = pygame.Surface((450, 40))
+        option_bg.fill((100, 50, 0))
+        option_bg.set_alpha(120)
+        option_rect = option_bg.get_rect(center=(layout.SCREEN_WIDTH//2, y_offset))
+        screen.blit(option_bg, option_rect)
+        
+        option_text = font_medium.render(option, True, YELLOW)
+        text_rect = option_text.get_rect(center=(layout.SCREEN_WIDTH//2, y_offset))
+        screen.blit(option_text, text_rect)
+        y_offset += 50
+
+def draw_instructions(screen, volume_slider=None):
+    """Fixed instructions screen - all content fits in window"""
+    screen.fill((20, 20, 50))
+    
+    current_time = pygame.time.get_ticks()
+    
+    # Animated background
+    for i in range(40):
+        x = (current_time // 60 + i * 120) % layout.SCREEN_WIDTH
+        y = (i * 30) % layout.SCREEN_HEIGHT
+        alpha = abs(math.sin(current_time / 1200 + i)) * 80 + 30
+        pygame.draw.circle(screen, (int(alpha//4), int(alpha//4), int(alpha)), (int(x), int(y)), 3)
+    
+    # Title with glow
+    for i in range(3):
+        title_glow = font_large.render("GAME INSTRUCTIONS", True, (50 + i*30, 50 + i*20, 100 + i*50))
+        title_glow_rect = title_glow.get_rect(center=(layout.SCREEN_WIDTH//2 + i, 50 + i))
+        screen.blit(title_glow, title_glow_rect)
+    
+    title_text = font_large.render("GAME INSTRUCTIONS", True, YELLOW)
+    title_rect = title_text.get_rect(center=(layout.SCREEN_WIDTH//2, 50))
+    screen.blit(title_text, title_rect)
+    
+    # Organized instructions - fits in window height
+    left_column = [
+        ("CONTROLS:", WHITE, True, 0),
+        ("SPACE - Jump / Use Jetpack", (150, 200, 255), False, 0),
+        ("P - Pause Game", (150, 200, 255), False, 0),
+        ("M - Toggle Music", (150, 200, 255), False, 0),
+        ("F11 - Toggle Fullscreen", (150, 200, 255), False, 0),
+        ("", WHITE, False, 0),
+        ("BIOMES:", WHITE, True, 0),
+        ("Plateau → Dark Forest → Desert", (255, 200, 100), False, 0),
+        ("Sea → Volcano → Sky → Space", (255, 100, 255), False, 0),
+        ("", WHITE, False, 0),
+        ("POWER-UPS:", WHITE, True, 0),
+        ("🛡️ Shield - Absorbs hits", (100, 150, 255), False, 0),
+        ("⚡ Speed - Temporary boost", (255, 215, 0), False, 0),
+        ("🧲 Magnet - Attracts coins", (200, 100, 200), False, 0),
+        ("🚀 Jetpack - Limited flight", (255, 140, 0), False, 0),
+    ]
+    
+    right_column = [
+        ("GAMEPLAY:", WHITE, True, 1),
+        ("• Navigate 7 cosmic biomes", (200, 200, 200), False, 1),
+        ("• Collect coins for score", (200, 200, 200), False, 1),
+        ("• Avoid obstacles or lose life", (200, 200, 200), False, 1),
+        ("• Complete biome missions", (200, 200, 200), False, 1),
+        ("• Find checkpoints to save", (200, 200, 200), False, 1),
+        ("", WHITE, False, 1),
+        ("FEATURES:", WHITE, True, 1),
+        ("• Smart obstacle spacing", (150, 255, 150), False, 1),
+        ("• Animated characters", (150, 255, 150), False, 1),
+        ("• Progressive difficulty", (150, 255, 150), False, 1),
+        ("• Mission system", (150, 255, 150), False, 1),
+        ("• Space as final challenge", (255, 150, 255), False, 1),
+        ("", WHITE, False, 1),
+        ("Press ESC to return", YELLOW, False, 1),
+    ]
+    
+    # Draw left column
+    y = 100
+    for text, color, is_header, column in left_column:
+        if text == "":
+            y += 8
+            continue
+            
+        if is_header:
+            # Header background
+            header_bg = pygame.Surface((layout.SCREEN_WIDTH//2 - 40, 25))
+            header_bg.fill((50, 50, 120))
+            header_bg.set_alpha(180)
+            screen.blit(header_bg, (20, y - 2))
+        
+        font_to_use = font_medium if is_header else font_small
+        rendered_text = font_to_use.render(text, True, color)
+        screen.blit(rendered_text, (25, y))
+        
+        y += 30 if is_header else 22
+    
+    # Draw right column
+    y = 100
+    for text, color, is_header, column in right_column:
+        if text == "":
+            y += 8
+            continue
+            
+        if is_header:
+            # Header background
+            header_bg = pygame.Surface((layout.SCREEN_WIDTH//2 - 40, 25))
+            header_bg.fill((50, 50, 120))
+            header_bg.set_alpha(180)
+            screen.blit(header_bg, (layout.SCREEN_WIDTH//2 + 20, y - 2))
+        
+        font_to_use = font_medium if is_header else font_small
+        rendered_text = font_to_use.render(text, True, color)
+        screen.blit(rendered_text, (layout.SCREEN_WIDTH//2 + 25, y))
+        
+        y += 30 if is_header else 22
+    
+    # Draw volume slider
+    if volume_slider:
+        volume_slider.draw(screen, font_medium)
+
+def draw_pause_screen(screen, volume_slider=None):
+    """Enhanced pause screen"""
+    overlay = pygame.Surface((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+    overlay.fill((30, 30, 80))
+    overlay.set_alpha(200)
+    screen.blit(overlay, (0, 0))
+    
+    current_time = pygame.time.get_ticks()
+    glow = abs(math.sin(current_time / 400)) * 80 + 100
+    
+    # Enhanced glow effect
+    for i in range(6):
+        alpha = (6-i) * 25
+        glow_text = font_huge.render("PAUSED", True, (int(glow), int(glow), 0))
+        glow_surf = pygame.Surface(glow_text.get_size())
+        glow_surf.fill((int(glow//3), int(glow//3), 0))
+        glow_surf.set_alpha(alpha)
+        glow_rect = glow_surf.get_rect(center=(layout.SCREEN_WIDTH//2 + i*2, layout.SCREEN_HEIGHT//2 - 80 + i*2))
+        screen.blit(glow_surf, glow_rect)
+
+    pause_text = font_huge.render("PAUSED", True, YELLOW)
+    pause_rect = pause_text.get_rect(center=(layout.SCREEN_WIDTH//2, layout.SCREEN_HEIGHT//2 - 80))
+    screen.blit(pause_text, pause_rect)
+
+    # Enhanced options with backgrounds
+    options = [
+        "Press P or SPACE to Resume",
+        "Press ESC to return to Menu"
+    ]
+    
+    y_offset = layout.SCREEN_HEIGHT//2
+    for i, option in enumerate(options):
+        option_bg = pygame.Surface((500, 50))
+        bg_color = (60, 60, 120) if i == 0 else (50, 50, 100)
+        option_bg.fill(bg_color)
+        option_bg.set_alpha(150)
+        option_rect = option_bg.get_rect(center=(layout.SCREEN_WIDTH//2, y_offset))
+        screen.blit(option_bg, option_rect)
+        
+        option_text = font_large.render(option, True, WHITE)
+        text_rect = option_text.get_rect(center=(layout.SCREEN_WIDTH//2, y_offset))
+        screen.blit(option_text, text_rect)
+        y_offset += 60
+    
+    # Draw volume slider
+    if volume_slider:
+        volume_slider.draw(screen, font_medium)
+
+# Race mode
+
+PIXELS_PER_DISTANCE = 10   # Distance grows by speed * 0.1 a frame while the world moves speed pixels
+
+def draw_text_panel(screen, lines, x, y, color=WHITE, center=False):
+    """Semi-transparent panel of text lines at (x, y), or centred on it"""
+    line_height = font_small.get_linesize()
+    width = max(font_small.size(line)[0] for line in lines) + 20
+    height = line_height * len(lines) + 10
+    if center:
+        x, y = x - width // 2, y - height // 2
+    panel = pygame.Surface((width, height))
+    panel.fill((0, 0, 0))
+    panel.set_alpha(180)
+    screen.blit(panel, (x, y))
+    for i, line in enumerate(lines):
+        text = font_small.render(line, True, color)
+        screen.blit(text, (x + 10, y + 5 + i * line_height))
+
+def render_text_panel(lines, color=WHITE):
+    """draw_text_panel's panel as a surface, to keep and blit every frame"""
+    line_height = font_small.get_linesize()
+    width = max(font_small.size(line)[0] for line in lines) + 20
+    panel = pygame.Surface((width, line_height * len(lines) + 10), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 180))
+    for i, line in enumerate(lines):
+        panel.blit(font_small.render(line, True, color), (10, 5 + i * line_height))
+    return panel
+
+# Menu history panels, rendered again only when the history view changes
+_history_panels = (None, None)
+
+def draw_run_history(screen, view):
+    """High scores on the left of the menu options, biome bests and recent runs on the right"""
+    global _history_panels
+    if not view["runs"]:
+        return
+    if _history_panels[0] is not view:
+        scores = ["HIGH SCORES"] + [
+            f"{place}. {run['score']:,}  {biome_names[run['biome']]}" for place, run in enumerate(view["top"], 1)
+        ]
+        bests = ["BEST BY BIOME"] + [
+            f"{biome_names[biome]}: {run['score']:,}" for biome, run in sorted(view["biome_best"].items())
+        ]
+        bests += ["", "RECENT RUNS"] + [
+            f"{run['score']:,}  {biome_names[run['biome']]}" + (f"  (seed {run['seed']})" if run["seed"] is not None else "")
+            for run in view["recent"]
+        ]
+        _history_panels = (view, (render_text_panel(scores, YELLOW), render_text_panel(bests)))
+    scores_panel, bests_panel = _history_panels[1]
+    top = layout.SCREEN_HEIGHT // 4 + 110
+    screen.blit(scores_panel, (30, top))
+    screen.blit(bests_panel, bests_panel.get_rect(topright=(layout.SCREEN_WIDTH - 30, top)))
+
+def draw_run_result(screen, run):
+    """How the run that just ended compares with the history, over the game over screen"""
+    lines = []
+    if run["new_best"]:
+        lines.append("NEW HIGH SCORE!")
+    elif run["previous_best"] is not None:
+        lines.append(f"High score: {run['previous_best']:,}")
+    if run["new_biome_best"] and not run["new_best"]:
+        lines.append(f"New best run ending in {biome_names[run['biome']]}!")
+    if run["seed"] is not None:
+        lines.append(f"Course seed: {run['seed']}")
+    if lines:
+        draw_text_panel(screen, lines, 20, 20, YELLOW)
+
+def draw_ghosts(screen, game, ghosts, goal):
+    """Draw the other racers relative to the local player, and the standings"""
+    frames = get_ghost_frames()
+    player = game.player
+    for ghost in ghosts:
+        x = player.rect.x + int((ghost.distance - game.distance) * PIXELS_PER_DISTANCE)
+        if -player.rect.width < x < layout.SCREEN_WIDTH:
+            frame = frames[int(ghost.distance) % len(frames)]
+            offset_x, offset_y = player.animation.offset
+            screen.blit(frame, (x + offset_x, ghost.y + offset_y))
+            label = font_small.render(ghost.name, True, WHITE)
+            screen.blit(label, label.get_rect(midbottom=(x + player.rect.width // 2, ghost.y - 4)))
+        else:
+            # Off screen: show which way and how far
+            gap = int((ghost.distance - game.distance) * PIXELS_PER_DISTANCE)
+            label = font_small.render(f"{ghost.name} {gap:+,}px", True, YELLOW)
+            if gap > 0:
+                screen.blit(label, label.get_rect(topright=(layout.SCREEN_WIDTH - 10, ghost.y)))
+            else:
+                screen.blit(label, label.get_rect(topleft=(10, ghost.y)))
+
+    runners = [("You", game.distance)] + [(ghost.name, ghost.distance) for ghost in ghosts]
+    runners.sort(key=lambda runner: -runner[1])
+    lines = [f"Race to {goal:,}"] + [
+        f"{place}. {name} {min(distance, goal):,.0f}" for place, (name, distance) in enumerate(runners, 1)
+    ]
+    draw_text_panel(screen, lines, layout.SCREEN_WIDTH - 220, 120)
+
+def draw_race_lobby(screen, lines):
+    """Race lobby status over the menu"""
+    draw_text_panel(screen, lines, layout.SCREEN_WIDTH // 2, layout.SCREEN_HEIGHT - 120, YELLOW, center=True)
+
+def draw_race_results(screen, standings, name):
+    """Final race standings over the game over screen"""
+    lines = ["Race results"] + [
+        f"{place}. {runner['name']}{' (you)' if runner['name'] == name else ''} - "
+        f"{runner['distance']:,.0f} in {runner['time']:.1f}s, score {runner['score']:,}"
+        for place, runner in enumerate(standings, 1)
+    ]
+    draw_text_panel(screen, lines, layout.SCREEN_WIDTH // 2, layout.SCREEN_HEIGHT // 6, YELLOW, center=True)
+
+def draw_debug_overlay(screen, lines):
+    """Semi-transparent panel of debug text in the bottom-right corner"""
+    line_height = font_small.get_linesize()
+    width = max(font_small.size(line)[0] for line in lines) + 20
+    height = line_height * len(lines) + 10
+    x = layout.SCREEN_WIDTH - width - 10
+    y = layout.SCREEN_HEIGHT - height - 10
+    
+    panel = pygame.Surface((width, height))
+    panel.fill((0, 0, 0))
+    panel.set_alpha(180)
+    screen.blit(panel, (x, y))
+    
+    for i, line in enumerate(lines):
+        text = font_small.render(line, True, GREEN)
+        screen.blit(text, (x + 10, y + 5 + i * line_height))
@@ -0,0 +1,198 @@
+"""Game snapshots: save a run to disk and resume it later.
+
+capture(game) turns a Game into plain data: numbers, strings, bytes,
+lists and dicts. restore(data) builds a Game from that data which carries
+on exactly where the original left off. Player physics, entities,
+missions, power-up timers, checkpoints, biome progress and both random
+streams all come back. dumps()/loads() and save()/load() add the file
+format: a magic line, then the plain data pickled and zlib-compressed.
+It is read back with an unpickler that refuses to build any object, so
+opening a snapshot can't run code.
+
+Obstacles and the sun or moon are random one-offs, and an obstacle's
+picture has to match its hitbox. Those keep their pixels in the snapshot
+and are never redrawn on load. Tiles, decorations and background elements
+get their variant back from the biome's asset bank. Coins, power-ups and
+checkpoints are rebuilt by their constructors. The random streams are
+restored last, so rebuilding doesn't shift them.
+
+SNAPSHOT_VERSION goes up whenever the data changes shape; other versions
+raise SnapshotError.
+"""
+import os
+import io
+import zlib
+import pickle
+import random
+
+import pygame
+
+from . import layout
+from .assets import biome_assets
+from .entities import Player, Obstacle, Coin, Checkpoint, BackgroundElement, CelestialBody, Decoration, Tile, PowerUp
+from .game import Game
+from .missions import Mission, mission_random
+
+SNAPSHOT_VERSION = 2
+MAGIC = b"Cosmic Runner snapshot\n"
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cosmic_runner", "resume.snapshot")
+
+# Entities stored with their pixels, showing an asset bank variant, or rebuilt from their attributes
+PIXEL_KINDS = {cls.__name__: cls for cls in (Obstacle, CelestialBody)}
+BANKED_KINDS = {"Tile": (Tile, "tile"), "Decoration": (Decoration, "decoration"),
+                "BackgroundElement": (BackgroundElement, "background")}
+REBUILT_KINDS = {
+    "Tile": lambda attrs, game: Tile(0, 0, attrs["type"], attrs["biome"]),
+    "Decoration": lambda attrs, game: Decoration(0, 0, attrs["type"], attrs["biome"]),
+    "Coin": lambda attrs, game: Coin(attrs["speed"]),
+    "PowerUp": lambda attrs, game: PowerUp(0, attrs["original_y"], attrs["type"], attrs["speed"]),
+    "Checkpoint": lambda attrs, game: Checkpoint(attrs["biome"], attrs["speed"], game),
+    "Player": lambda attrs, game: Player(),
+}
+ENTITY_LISTS = ("obstacles", "coins", "powerups", "tiles", "decorations", "background_elements")
+
+class SnapshotError(ValueError):
+    """Not a snapshot, a damaged one, or one from another version"""
+
+def is_plain(value):
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, (int, str)) and is_plain(item) for key, item in value.items())
+    return False
+
+def plain_attrs(obj):
+    """An object's attributes that are plain data (no surfaces, rects or references)"""
+    return {name: value for name, value in vars(obj).items() if is_plain(value)}
+
+def capture_entity(entity):
+    data = {"kind": type(entity).__name__, "rect": tuple(entity.rect), "attrs": plain_attrs(entity)}
+    if data["kind"] in PIXEL_KINDS:
+        data["size"] = entity.image.get_size()
+        data["pixels"] = pygame.image.tobytes(entity.image, "RGBA")
+    return data
+
+def restore_entity(data, game, dy=0):
+    kind, attrs = data["kind"], data["attrs"]
+    if kind in PIXEL_KINDS:
+        entity = PIXEL_KINDS[kind].__new__(PIXEL_KINDS[kind])
+        pygame.sprite.Sprite.__init__(entity)
+        entity.image = pygame.image.frombytes(data["pixels"], data["size"], "RGBA")
+    elif kind in BANKED_KINDS and attrs.get("variant") is not None:
+        cls, bank = BANKED_KINDS[kind]
+        entity = cls.__new__(cls)
+        pygame.sprite.Sprite.__init__(entity)
+        entity.image = biome_assets.variant(attrs["biome"], bank, attrs["variant"])[0]
+    elif kind in REBUILT_KINDS:
+        entity = REBUILT_KINDS[kind](attrs, game)
+    else:
+        raise SnapshotError(f"unknown entity kind {kind!r}")
+    entity.__dict__.update(attrs)
+    entity.rect = pygame.Rect(data["rect"])
+    if dy:
+        # Saved with the ground at another height (a different window size)
+        entity.rect.y += dy
+        if kind == "PowerUp":
+            entity.original_y += dy
+    return entity
+
+def restore_mission(attrs):
+    mission = Mission.__new__(Mission)
+    mission.__dict__.update(attrs)
+    return mission
+
+def capture(game):
+    """The whole game as plain data"""
+    # Checkpoints stay referenced (for respawning) after they scroll off
+    checkpoints = list(game.checkpoints)
+    for checkpoint in [game.current_checkpoint, *game.biome_checkpoints.values()]:
+        if checkpoint is not None and not any(checkpoint is c for c in checkpoints):
+            checkpoints.append(checkpoint)
+    index = {id(checkpoint): i for i, checkpoint in enumerate(checkpoints)}
+
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "ground_level": layout.GROUND_LEVEL,
+        "game": plain_attrs(game),
+        "player": capture_entity(game.player),
+        "celestial_body": capture_entity(game.celestial_body) if game.celestial_body else None,
+        "checkpoints": [capture_entity(checkpoint) for checkpoint in checkpoints],
+        "active_checkpoints": len(game.checkpoints),
+        "current_checkpoint": index[id(game.current_checkpoint)] if game.current_checkpoint else None,
+        "biome_checkpoints": {biome: index[id(c)] for biome, c in game.biome_checkpoints.items()},
+        "missions": [plain_attrs(mission) for mission in game.missions],
+        "completed_missions": [plain_attrs(mission) for mission in game.completed_missions],
+        "spawner": plain_attrs(game.obstacle_spawner),
+        "random": random.getstate(),
+        "mission_random": mission_random.getstate(),
+    }
+    for name in ENTITY_LISTS:
+        data[name] = [capture_entity(entity) for entity in getattr(game, name)]
+    return data
+
+def restore(data, game=None):
+    """Build a Game from capture() data, or load it into game (keeping its front end hooks)"""
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        version = data.get("version") if isinstance(data, dict) else None
+        raise SnapshotError(f"snapshot version {version}, this game reads version {SNAPSHOT_VERSION}")
+    try:
+        if game is None:
+            game = Game()
+        dy = layout.GROUND_LEVEL - data["ground_level"]
+        game.__dict__.update(data["game"])
+        game.player = restore_entity(data["player"], game, dy)
+        game.player.game = game
+        game.player.image = game.player.frames[game.player.current_frame]
+        for name in ENTITY_LISTS:
+            setattr(game, name, [restore_entity(entity, game, dy) for entity in data[name]])
+        game.celestial_body = restore_entity(data["celestial_body"], game) if data["celestial_body"] else None
+
+        checkpoints = [restore_entity(checkpoint, game, dy) for checkpoint in data["checkpoints"]]
+        game.checkpoints = checkpoints[:data["active_checkpoints"]]
+        current = data["current_checkpoint"]
+        game.current_checkpoint = checkpoints[current] if current is not None else None
+        game.biome_checkpoints = {biome: checkpoints[i] for biome, i in data["biome_checkpoints"].items()}
+
+        game.missions.clear()
+        for attrs in data["missions"]:
+            game.missions.add(restore_mission(attrs))
+        game.completed_missions = [restore_mission(attrs) for attrs in data["completed_missions"]]
+        game.obstacle_spawner.__dict__.update(data["spawner"])
+
+        random.setstate(data["random"])
+        mission_random.setstate(data["mission_random"])
+    except (KeyError, IndexError, TypeError, ValueError, pygame.error) as e:
+        raise SnapshotError(f"damaged snapshot: {e!r}") from e
+    return game
+
+class _PlainUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        raise SnapshotError(f"snapshot refers to {module}.{name}")
+
+def dumps(game):
+    return MAGIC + zlib.compress(pickle.dumps(capture(game), protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+def loads(blob, game=None):
+    if not blob.startswith(MAGIC):
+        raise SnapshotError("not a Cosmic Runner snapshot")
+    try:
+        data = _PlainUnpickler(io.BytesIO(zlib.decompress(blob[len(MAGIC):]))).load()
+    except (zlib.error, pickle.UnpicklingError, EOFError, ValueError) as e:
+        raise SnapshotError(f"damaged snapshot: {e!r}") from e
+    return restore(data, game)
+
+def save(game, path=DEFAULT_PATH):
+    """Write a snapshot atomically, so a crash mid-write keeps the previous one"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(dumps(game))
+    os.replace(temporary, path)
+
+def load(path=DEFAULT_PATH, game=None):
+    with open(path, "rb") as f:
+        return loads(f.read(), game)
@@ -0,0 +1,53 @@
+import random
+
+from . import layout
+
+# Enhanced Obstacle Spacing Algorithm
+class ObstacleSpawner:
+    def __init__(self, game_instance):
+        self.game = game_instance
+        self.last_obstacle_x = 0
+        self.min_gap = 350  # Minimum gap between obstacles - INCREASED for better spacing
+        self.max_gap = 700  # Maximum gap between obstacles - INCREASED for better spacing
+        self.landing_spot_guarantee = 250  # Minimum safe landing distance
+        self.difficulty_scaling = 1.0
+        
+    def should_spawn_obstacle(self):
+        """Enhanced obstacle spawning algorithm with guaranteed landing spots"""
+        if not self.game.obstacles:
+            return True
+            
+        # Get the rightmost obstacle position
+        rightmost_x = max([obs.rect.x for obs in self.game.obstacles])
+        
+        # Calculate distance from screen edge
+        distance_from_edge = layout.SCREEN_WIDTH - rightmost_x
+        
+        # Adjust gaps based on player speed and difficulty
+        speed_factor = self.game.speed / 5.0  # Normalize based on initial speed
+        difficulty_factor = (self.game.current_biome + 1) * 0.1
+        
+        # Dynamic gap calculation
+        adjusted_min_gap = self.min_gap * (1.2 - difficulty_factor)
+        adjusted_max_gap = self.max_gap * (1.1 - difficulty_factor * 0.5)
+        
+        # Ensure minimum landing spot
+        if distance_from_edge >= adjusted_min_gap:
+            # Add some randomness but guarantee safe passages
+            chance = random.random()
+            
+            # Higher chance of spawning after longer gaps
+            spawn_probability = max(0.1, min(0.8, distance_from_edge / adjusted_max_gap))
+            
+            # Guarantee landing spots periodically
+            obstacles_in_sequence = len([obs for obs in self.game.obstacles if obs.rect.x > rightmost_x - 600])
+            if obstacles_in_sequence >= 3:  # Force a gap after 3 consecutive obstacles
+                spawn_probability *= 0.3
+            
+            return chance < spawn_probability
+        
+        return False
+    
+    def get_spawn_position(self):
+        """Get optimal spawn position for new obstacle"""
+        return layout.SCREEN_WIDTH + random.randint(50, 150)
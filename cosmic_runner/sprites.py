@@ -0,0 +1,160 @@
+"""Procedurally generated sprites shared across the game.
+
+Everything here is created on first use and only needs pygame's surface
+and draw modules, so it works without a display.
+"""
+import pygame
+import math
+import os
+
+from .constants import WHITE, BLACK, YELLOW, TILE_SIZE
+from .animation import build_runner_animation
+
+#directories
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+image_path = os.path.join(current_dir, "assets", "images")
+
+# Enhanced runner image with better animation frames
+def create_runner_sprite(size=TILE_SIZE * 1.5):
+    """Create animated runner sprite with multiple frames"""
+    runner_frames = []
+    colors = [(0, 150, 255), (0, 180, 255), (0, 120, 255)]
+    
+    for i in range(4):  # 4 animation frames
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        
+        # Body
+        body_color = colors[i % len(colors)]
+        pygame.draw.ellipse(frame, body_color, (size//4, size//3, size//2, size//2))
+        
+        # Head
+        pygame.draw.circle(frame, WHITE, (size//2, size//4), size//6)
+        
+        # Simple eyes
+        eye_y = size//4 - 2
+        pygame.draw.circle(frame, BLACK, (size//2 - 4, eye_y), 2)
+        pygame.draw.circle(frame, BLACK, (size//2 + 4, eye_y), 2)
+        
+        # Running animation - legs
+        leg_offset = math.sin(i * math.pi / 2) * 5
+        pygame.draw.line(frame, body_color, 
+                        (size//2 - 8, size//2 + size//4), 
+                        (size//2 - 8 + leg_offset, size - 5), 3)
+        pygame.draw.line(frame, body_color, 
+                        (size//2 + 8, size//2 + size//4), 
+                        (size//2 + 8 - leg_offset, size - 5), 3)
+        
+        # Arms
+        arm_offset = math.sin(i * math.pi / 2 + math.pi) * 3
+        pygame.draw.line(frame, body_color,
+                        (size//4, size//2),
+                        (size//4 - 5 + arm_offset, size//2 + 8), 2)
+        pygame.draw.line(frame, body_color,
+                        (3*size//4, size//2),
+                        (3*size//4 + 5 - arm_offset, size//2 + 8), 2)
+        
+        runner_frames.append(frame)
+    
+    return runner_frames
+
+
+# Load or create runner frames - shared by every Player and the menu runner
+runner_frames = []
+
+def load_runner_frames():
+    """Load runner.png or fall back to the generated runner sprite"""
+    try:
+        runner_image_path = os.path.join(image_path, "runner.png")
+        if os.path.exists(runner_image_path):
+            base_image = pygame.image.load(runner_image_path)
+            # One pose; the animation builder bakes the run cycle from it
+            return [pygame.transform.scale(base_image, (TILE_SIZE * 1.5, TILE_SIZE * 1.5))]
+        return create_runner_sprite()
+    except pygame.error:
+        return create_runner_sprite()
+
+# Precomputed coin sprite for memory optimization
+def create_coin_sprite():
+    """Create reusable coin sprite"""
+    coin = pygame.Surface((15, 15), pygame.SRCALPHA)
+    pygame.draw.circle(coin, YELLOW, (7, 7), 7)
+    pygame.draw.circle(coin, (255, 215, 0), (7, 7), 5)  # Inner gold
+    return coin
+
+# Coins never appear on the menu, so the sprite is generated on first use
+precomputed_coin_sprite = None
+
+def get_coin_sprite():
+    """Return the shared coin sprite, creating it the first time"""
+    global precomputed_coin_sprite
+    if precomputed_coin_sprite is None:
+        precomputed_coin_sprite = create_coin_sprite()
+    return precomputed_coin_sprite
+
+def get_runner_frames():
+    """Return the shared runner frames, loading them the first time"""
+    global runner_frames
+    if not runner_frames:
+        runner_frames = load_runner_frames()
+    return runner_frames
+
+def surface_bytes(surface):
+    """Pixel memory of a surface"""
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+# Every runner pose, baked once from the runner frames
+runner_animation = None
+
+def get_runner_animation():
+    """Return the shared runner animation, baking it the first time"""
+    global runner_animation
+    if runner_animation is None:
+        runner_animation = build_runner_animation(get_runner_frames())
+    return runner_animation
+
+# Race mode draws other players as translucent copies of the runner's run cycle
+GHOST_ALPHA = 110
+ghost_frames = []
+
+def get_ghost_frames():
+    """Return the shared ghost runner frames, creating them the first time"""
+    if not ghost_frames:
+        animation = get_runner_animation()
+        for index in animation.run:
+            ghost = animation.frames[index].copy()
+            ghost.set_alpha(GHOST_ALPHA)
+            ghost_frames.append(ghost)
+    return ghost_frames
+
+# Checkpoint flags share one font instead of building one per checkpoint
+checkpoint_font = None
+
+def get_checkpoint_font():
+    """Return the font used for checkpoint symbols, creating it the first time"""
+    global checkpoint_font
+    if checkpoint_font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        checkpoint_font = pygame.font.SysFont("Arial", 18)
+    return checkpoint_font
+
+# Cache for texture generation to reduce memory allocation
+class TextureCache:
+    """Simple texture cache to avoid recreating surfaces repeatedly"""
+    def __init__(self, max_size=50):
+        self.cache = {}
+        self.max_size = max_size
+        self.access_count = 0
+    
+    def get(self, key):
+        return self.cache.get(key)
+    
+    def set(self, key, value):
+        if len(self.cache) >= self.max_size and key not in self.cache:
+            # Remove oldest entry when cache is full
+            oldest_key = next(iter(self.cache))
+            del self.cache[oldest_key]
+        self.cache[key] = value
+
+scene_texture_cache = TextureCache(100)
@@ -0,0 +1,239 @@
+"""Memory telemetry: live surfaces by owner, Python allocations and GC counts.
+
+Call enable() before init_fonts() so rendered text is counted, then
+sample(game) once per frame. The front end shows overlay_lines() in its
+debug overlay (F3) and prints log_line() every log interval, which is
+meant for long attract-mode sessions where RSS slowly creeps up. The log
+walks the whole heap (and collects first when tracing allocations), so
+a line that comes due mid-run waits for gc_policy's next safe point: a
+pause, game over, the menu or a biome transition.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from . import gc_policy
+from . import assets
+from .sprites import surface_bytes
+
+DEFAULT_LOG_INTERVAL_FRAMES = 3600  # Once a minute at 60 FPS
+SURFACE_SAMPLE_EVERY = 30           # Walking the entity lists every frame is wasted work
+TOP_GROWTH_SITES = 3
+
+# Owner class -> Game attribute holding those entities
+SURFACE_OWNERS = (
+    ("Obstacle", "obstacles"),
+    ("Tile", "tiles"),
+    ("Decoration", "decorations"),
+    ("BackgroundElement", "background_elements"),
+    ("Checkpoint", "checkpoints"),
+    ("Coin", "coins"),
+    ("PowerUp", "powerups"),
+)
+
+# Telemetry state
+_enabled = False
+_log_interval_frames = DEFAULT_LOG_INTERVAL_FRAMES
+_frame = 0
+_log_due = False               # The log interval passed; waiting for a safe point
+_surfaces = {}                 # owner -> (count, bytes)
+_text_frame = [0, 0]           # text surfaces rendered this frame: count, bytes
+_text_last_frame = (0, 0)
+_traced_last = 0
+_traced_delta = 0              # traced bytes allocated (net) during the last frame
+_last_snapshot = None
+_growth_sites = []             # (site, KB) from the last snapshot comparison
+
+def enable(trace_allocations=False, log_interval_frames=DEFAULT_LOG_INTERVAL_FRAMES):
+    """Start collecting; trace_allocations also starts tracemalloc"""
+    global _enabled, _log_interval_frames, _traced_last
+    _enabled = True
+    _log_interval_frames = log_interval_frames
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _traced_last = tracemalloc.get_traced_memory()[0]
+
+def is_enabled():
+    return _enabled
+
+class TrackedFont:
+    """Font wrapper that counts the text surfaces it renders"""
+    def __init__(self, font):
+        self.font = font
+
+    def render(self, *args, **kwargs):
+        surface = self.font.render(*args, **kwargs)
+        if _enabled:
+            _text_frame[0] += 1
+            _text_frame[1] += surface_bytes(surface)
+        return surface
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+def track_font(font):
+    return TrackedFont(font)
+
+def count_surfaces_by_owner(game):
+    """Distinct live Surfaces held by the game's entities, keyed by owner class"""
+    seen = set()
+    stats = {}
+
+    def add(owner, entity):
+        image = getattr(entity, "image", None)
+        if image is None or id(image) in seen:
+            return
+        seen.add(id(image))
+        count, total = stats.get(owner, (0, 0))
+        stats[owner] = (count + 1, total + surface_bytes(image))
+
+    for owner, attribute in SURFACE_OWNERS:
+        stats[owner] = (0, 0)
+        for entity in getattr(game, attribute):
+            add(owner, entity)
+    if game.celestial_body:
+        add("CelestialBody", game.celestial_body)
+    add("Player", game.player)
+    return stats
+
+def count_live_surfaces():
+    """Count every live Surface reachable from the heap (slow)
+
+    Walks the object graph from the collector's objects and sys.modules, so
+    objects moved out of its view by gc.freeze() are still found.
+    """
+    seen = set()
+    visited = set()
+    total = 0
+    pending = gc.get_objects() + [sys.modules]
+    visited.update(id(obj) for obj in pending)
+    while pending:
+        for referent in gc.get_referents(pending.pop()):
+            if gc.is_tracked(referent) or type(referent) is tuple:
+                # Tuples of untracked objects get untracked by the collector
+                if id(referent) not in visited:
+                    visited.add(id(referent))
+                    pending.append(referent)
+            elif isinstance(referent, pygame.Surface) and id(referent) not in seen:
+                seen.add(id(referent))
+                try:
+                    total += surface_bytes(referent)
+                except pygame.error:
+                    pass  # Display surface after pygame.quit()
+    return len(seen), total
+
+def current_rss_kb():
+    """Resident set size now (not the peak), or None where unsupported"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Peak is the best we have
+
+def _compare_snapshots():
+    global _last_snapshot, _growth_sites
+    # Collect first so cyclic garbage waiting for a gen-2 pass doesn't show
+    # up as growth at whatever line happened to trigger the last collection
+    gc_policy.collect("telemetry")
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ))
+    if _last_snapshot is not None:
+        _growth_sites = [
+            (f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size_diff / 1024)
+            for stat in snapshot.compare_to(_last_snapshot, "lineno")[:TOP_GROWTH_SITES]
+            if stat.size_diff > 0
+        ]
+    _last_snapshot = snapshot
+
+def sample(game):
+    """Record this frame's numbers; prints log_line() at the first safe point after each log interval"""
+    global _frame, _surfaces, _text_last_frame, _traced_last, _traced_delta, _log_due
+    if not _enabled:
+        return
+    _frame += 1
+
+    _text_last_frame = tuple(_text_frame)
+    _text_frame[0] = _text_frame[1] = 0
+
+    if tracemalloc.is_tracing():
+        current = tracemalloc.get_traced_memory()[0]
+        _traced_delta = current - _traced_last
+        _traced_last = current
+
+    if _frame % SURFACE_SAMPLE_EVERY == 1 or not _surfaces:
+        _surfaces = count_surfaces_by_owner(game)
+
+    if _log_interval_frames and _frame % _log_interval_frames == 0:
+        _log_due = True
+    if _log_due and gc_policy.is_safe_point(game):
+        _log_due = False
+        if tracemalloc.is_tracing():
+            _compare_snapshots()
+        print(log_line(include_all_surfaces=True))
+
+def _format_kb(kb):
+    return f"{kb / 1024:.1f}MB" if kb >= 1024 else f"{kb:.0f}KB"
+
+def overlay_lines():
+    """Short lines for the debug overlay"""
+    if not _enabled:
+        return ["Telemetry disabled"]
+    lines = []
+    rss = current_rss_kb()
+    if rss is not None:
+        lines.append(f"RSS {_format_kb(rss)}")
+    total_count = sum(count for count, _ in _surfaces.values())
+    total_bytes = sum(size for _, size in _surfaces.values())
+    lines.append(f"Entity surfaces {total_count} ({_format_kb(total_bytes / 1024)})")
+    for owner, (count, size) in _surfaces.items():
+        if count:
+            lines.append(f"  {owner}: {count} ({_format_kb(size / 1024)})")
+    stats = assets.biome_assets.stats()
+    lines.append(f"Asset banks {_format_kb(stats['bank_bytes'] / 1024)} of {_format_kb(stats['budget_bytes'] / 1024)}"
+                 f" (drawn {stats['drawn']}, misses {stats['misses']}, evicted {stats['evicted']})")
+    for biome, footprint in assets.biome_assets.footprint().items():
+        lines.append(f"  {biome}: {footprint['bank_variants']} ({_format_kb(footprint['bank_bytes'] / 1024)})")
+    lines.append(f"Text/frame {_text_last_frame[0]} ({_format_kb(_text_last_frame[1] / 1024)})")
+    if tracemalloc.is_tracing():
+        lines.append(f"Traced {_format_kb(_traced_last / 1024)} ({_traced_delta / 1024:+.1f}KB/frame)")
+    lines.append(f"GC counts {gc.get_count()}")
+    lines.append("GC collections " + str(tuple(stats["collections"] for stats in gc.get_stats())))
+    return lines
+
+def log_line(include_all_surfaces=False):
+    """One-line summary for the periodic log"""
+    parts = [f"[telemetry] t={time.strftime('%H:%M:%S')} frame={_frame}"]
+    rss = current_rss_kb()
+    if rss is not None:
+        parts.append(f"rss={_format_kb(rss)}")
+    if include_all_surfaces:
+        count, size = count_live_surfaces()
+        parts.append(f"surfaces={count}/{_format_kb(size / 1024)}")
+    parts.append("owners=" + ",".join(
+        f"{owner}:{count}/{_format_kb(size / 1024)}" for owner, (count, size) in _surfaces.items() if count
+    ))
+    parts.append("banks=" + ",".join(
+        f"{biome.replace(' ', '_')}:{footprint['bank_variants']}/{_format_kb(footprint['bank_bytes'] / 1024)}"
+        for biome, footprint in assets.biome_assets.footprint().items()
+    ))
+    parts.append(f"text/frame={_text_last_frame[0]}")
+    if tracemalloc.is_tracing():
+        parts.append(f"traced={_format_kb(_traced_last / 1024)}")
+        if _growth_sites:
+            parts.append("growth=" + ",".join(f"{site}+{kb:.0f}KB" for site, kb in _growth_sites))
+    parts.append(f"gc={gc.get_count()}")
+    parts.append("collections=" + str(tuple(stats["collections"] for stats in gc.get_stats())))
+    if gc_policy.is_enabled():
+        parts.append(gc_policy.summary())
+    return " ".join(parts)
@@ -0,0 +1,145 @@
+"""Optional frame tracer that exports Chrome trace / Perfetto JSON.
+
+Disabled by default, in which case span() and instant() cost one check.
+Once enable() is called, spans and instant events go into a ring buffer
+(the oldest events are dropped once it is full) and flush() writes the
+buffer out as Chrome trace JSON, which chrome://tracing and
+https://ui.perfetto.dev both open. Garbage collections are recorded as
+spans automatically while tracing is enabled.
+"""
+import gc
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+
+DEFAULT_TRACE_PATH = "cosmic_runner_trace.json"
+DEFAULT_CAPACITY = 200000  # Roughly 5 minutes of frames at 60 FPS
+
+# Tracer state
+_events = None          # deque of trace events, None while disabled
+_trace_path = DEFAULT_TRACE_PATH
+_thread_names = {}      # tid -> thread name, written as metadata on flush
+_gc_started_at = None
+
+def _timestamp_us(perf_seconds):
+    return perf_seconds * 1e6
+
+def _record(event):
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    event["pid"] = os.getpid()
+    event["tid"] = tid
+    _events.append(event)  # deque.append is safe from loader threads
+
+def _on_gc(phase, info):
+    """gc.callbacks hook: record each collection as a span"""
+    global _gc_started_at
+    if phase == "start":
+        _gc_started_at = time.perf_counter()
+    elif _gc_started_at is not None:
+        complete("gc", _gc_started_at, time.perf_counter(), category="gc", args={
+            "generation": info["generation"],
+            "collected": info["collected"],
+            "uncollectable": info["uncollectable"]
+        })
+        _gc_started_at = None
+
+def enable(path=DEFAULT_TRACE_PATH, capacity=DEFAULT_CAPACITY):
+    """Start recording; the trace is flushed to path on exit"""
+    global _events, _trace_path
+    if _events is not None:
+        return
+    _events = deque(maxlen=capacity)
+    _trace_path = path
+    gc.callbacks.append(_on_gc)
+    atexit.register(flush)
+
+def disable():
+    """Stop recording and drop the buffer (without flushing)"""
+    global _events
+    if _events is None:
+        return
+    _events = None
+    if _on_gc in gc.callbacks:
+        gc.callbacks.remove(_on_gc)
+    atexit.unregister(flush)
+
+def is_enabled():
+    return _events is not None
+
+class _Span:
+    __slots__ = ("name", "category", "args", "started_at")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        complete(self.name, self.started_at, time.perf_counter(), self.category, self.args)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name, category="frame", args=None):
+    """Context manager recording a begin/end span around its block"""
+    if _events is None:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+def complete(name, started_at, ended_at, category="frame", args=None):
+    """Record a span from two time.perf_counter() readings"""
+    if _events is None:
+        return
+    event = {
+        "name": name, "cat": category, "ph": "X",
+        "ts": _timestamp_us(started_at),
+        "dur": _timestamp_us(ended_at - started_at)
+    }
+    if args:
+        event["args"] = args
+    _record(event)
+
+def instant(name, category="game", args=None, scope="t"):
+    """Record a point-in-time event (scope "g" draws it across all threads)"""
+    if _events is None:
+        return
+    event = {
+        "name": name, "cat": category, "ph": "i", "s": scope,
+        "ts": _timestamp_us(time.perf_counter())
+    }
+    if args:
+        event["args"] = args
+    _record(event)
+
+def flush(path=None):
+    """Write the buffered events as Chrome trace JSON and return the path"""
+    if _events is None:
+        return None
+    path = path or _trace_path
+    events = list(_events)
+    metadata = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+                 "args": {"name": "Cosmic Runner"}}]
+    for tid, thread_name in list(_thread_names.items()):
+        metadata.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                         "args": {"name": thread_name}})
+    with open(path, "w") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+    return path
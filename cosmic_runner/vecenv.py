@@ -0,0 +1,621 @@
+"""Vectorized simulator: many independent runs stepped at once with numpy.
+
+VecEnv keeps N runs in arrays (player, obstacles, coins, power-ups,
+checkpoints and missions) and applies the rules of Player.update,
+Game.spawn_elements and Game.update to all of them in each step:
+
+    env = VecEnv(1024)
+    obs = env.reset(seeds=range(1024))
+    obs, rewards, dones, info = env.step(actions)   # JUMP | JETPACK bits per run
+
+Physics, spacing, odds and pacing come from the balance module as each
+step runs. Only gameplay is simulated: there are no surfaces, tiles, decorations or
+background elements. Obstacle shapes are sampled once per process from
+the real Obstacle class, and missions are rolled by the real Mission
+class. Each run draws from its own random stream seeded by reset(), so a
+run plays out the same whatever else is in the batch. These streams are
+not Python's random, so a seed gives a different course than
+Game.seed_course() gives for it.
+
+Finished runs restart by themselves. info describes how they ended.
+numpy is needed for this module only.
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import layout
+from . import balance
+from .entities import Player, Obstacle, Coin
+from .missions import Mission, MISSION_EVENTS, COIN_COLLECTED, OBSTACLE_AVOIDED, JUMP as JUMP_EVENT, HIT, TIME_TICK
+from . import missions
+
+# Action bits
+JUMP = 1
+JETPACK = 2
+
+# Player physics (Player.__init__; jump speed and gravity are balance knobs)
+JETPACK_THRUST = -0.5
+MAX_JETPACK_FUEL = 300
+
+POWERUP_TYPES = ("shield", "speed", "coin_magnet", "double_coins", "jetpack")
+POWERUP_DURATIONS = (240, 300, 600, 420, 300)
+POWERUP_SIZE = 25
+SHIELD, SPEED, COIN_MAGNET, DOUBLE_COINS, JETPACK_POWERUP = range(5)
+
+CHECKPOINT_WIDTH = 30
+MISSION_BIOMES = 5                 # reset_game() only gives missions to the first five biomes
+MISSION_KINDS = tuple(MISSION_EVENTS)
+
+# Slots per run; a spawn with no free slot is dropped and counted
+COIN_SLOTS = 24
+POWERUP_SLOTS = 6
+CHECKPOINT_SLOTS = 4
+
+UNIFORMS_PER_STEP = 8              # Spawn rolls: obstacle, x, shape, coin, coin y, power-up, type, y
+OBSTACLE_SAMPLES = 2048            # Shapes sampled per biome
+OBSTACLE_SAMPLE_SEED = 1180
+
+# Rewards
+SCORE_REWARD = 0.1                 # Per point of score, on top of one per unit of distance
+LIFE_PENALTY = 50.0
+
+NEAREST_OBSTACLES = 3
+OBSERVATION_FIELDS = (
+    "height", "velocity_y", "on_ground", "jetpack_fuel", "lives", "speed", "biome", "respawn",
+) + tuple(f"powerup_{name}" for name in POWERUP_TYPES) + tuple(
+    f"obstacle{i}_{field}" for i in range(NEAREST_OBSTACLES) for field in ("dx", "top", "bottom", "width")
+) + ("coin_dx", "coin_dy", "powerup_dx", "powerup_dy")
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+_obstacle_shapes = None
+
+def _splitmix(state):
+    """Advance a uint64 array of stream states in place; returns 64 random bits each"""
+    state += np.uint64(_GOLDEN)
+    z = state.copy()
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return z
+
+def _mix_seed(seed):
+    """Spread a small integer seed over 64 bits (one splitmix step)"""
+    z = (seed * _GOLDEN + _GOLDEN) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+def _round(values):
+    """Round like a pygame Rect coordinate assignment (halves away from zero)"""
+    return np.trunc(values + np.copysign(0.5, values))
+
+def obstacle_shapes():
+    """(type, width, height, y above ground) tables per biome, sampled from Obstacle
+
+    Obstacle draws its details from the global random module, so sampling
+    runs on a fixed seed and leaves the caller's random state untouched.
+    """
+    global _obstacle_shapes
+    if _obstacle_shapes is None:
+        state = random.getstate()
+        random.seed(OBSTACLE_SAMPLE_SEED)
+        try:
+            shapes = np.zeros((8, 4, OBSTACLE_SAMPLES))
+            for biome in range(8):
+                for i in range(OBSTACLE_SAMPLES):
+                    obstacle = Obstacle(biome, 5)
+                    rect = obstacle.rect
+                    shapes[biome, :, i] = obstacle.type, rect.width, rect.height, rect.y - layout.GROUND_LEVEL
+        finally:
+            random.setstate(state)
+        _obstacle_shapes = shapes
+    return _obstacle_shapes
+
+class VecEnv:
+    """N independent runs of the game, stepped together"""
+    def __init__(self, n, score_reward=SCORE_REWARD, life_penalty=LIFE_PENALTY):
+        if np is None:
+            raise ImportError("cosmic_runner.vecenv needs numpy (pip install numpy)")
+        self.n = n
+        self.score_reward = score_reward
+        self.life_penalty = life_penalty
+        self.width = layout.SCREEN_WIDTH
+        self.ground = layout.GROUND_LEVEL
+        player = Player()
+        self.player_w, self.player_h = player.rect.width, player.rect.height
+        coin = Coin(5)
+        self.coin_w, self.coin_h = coin.rect.width, coin.rect.height
+        self.shapes = obstacle_shapes()
+        # Obstacles are at least OBSTACLE_MIN_GAP px apart and spawn up to 200 px off screen
+        self.obstacle_slots = int((self.width + 400) // max(50, balance.OBSTACLE_MIN_GAP)) + 2
+        self.subscribed = {
+            event: np.array([event in MISSION_EVENTS[kind] for kind in MISSION_KINDS])
+            for event in (COIN_COLLECTED, OBSTACLE_AVOIDED, JUMP_EVENT, TIME_TICK)
+        }
+        self.perfect = MISSION_KINDS.index("perfect")
+        self.rows = np.arange(n)
+
+        # Statistics
+        self.steps = 0
+        self.episodes = 0
+        self.dropped = 0            # Spawns lost to full slots
+        self.allocate()
+
+    def allocate(self):
+        n, k = self.n, self.obstacle_slots
+        f, b, i = np.float64, np.bool_, np.int64
+        self.rng = np.zeros(n, np.uint64)
+
+        # Player
+        self.x = np.zeros(n, f)
+        self.y = np.zeros(n, f)
+        self.vy = np.zeros(n, f)
+        self.jumping = np.zeros(n, b)
+        self.on_ground = np.zeros(n, b)
+        self.has_jetpack = np.zeros(n, b)
+        self.fuel = np.zeros(n, f)
+
+        # Game
+        self.lives = np.zeros(n, i)
+        self.respawn = np.zeros(n, b)
+        self.respawn_timer = np.zeros(n, i)
+        self.speed = np.zeros(n, f)
+        self.frame = np.zeros(n, i)
+        self.distance = np.zeros(n, f)
+        self.score = np.zeros(n, i)
+        self.total_coins = np.zeros(n, i)
+        self.biome = np.zeros(n, i)
+        self.next_biome = np.zeros(n, i)
+        self.active = np.zeros((n, 5), b)
+        self.timers = np.zeros((n, 5), i)
+
+        # Checkpoints; biome_checkpoints is a bit per biome
+        self.has_checkpoint = np.zeros(n, b)
+        self.biome_checkpoints = np.zeros(n, i)
+        self.checkpoint_slot = np.full(n, -1, i)   # Current checkpoint while it is on screen
+        self.checkpoint_x = np.full(n, np.nan)     # Where the current checkpoint was last (nan: none yet)
+
+        # Entities
+        self.ob_alive = np.zeros((n, k), b)
+        self.ob_x = np.zeros((n, k), f)
+        self.ob_y = np.zeros((n, k), f)
+        self.ob_w = np.zeros((n, k), f)
+        self.ob_h = np.zeros((n, k), f)
+        self.ob_speed = np.zeros((n, k), f)
+        self.ob_type = np.zeros((n, k), i)
+        self.ob_counted = np.zeros((n, k), b)
+        self.coin_alive = np.zeros((n, COIN_SLOTS), b)
+        self.coin_x = np.zeros((n, COIN_SLOTS), f)
+        self.coin_y = np.zeros((n, COIN_SLOTS), f)
+        self.coin_speed = np.zeros((n, COIN_SLOTS), f)
+        self.pu_alive = np.zeros((n, POWERUP_SLOTS), b)
+        self.pu_x = np.zeros((n, POWERUP_SLOTS), f)
+        self.pu_y = np.zeros((n, POWERUP_SLOTS), f)
+        self.pu_origin_y = np.zeros((n, POWERUP_SLOTS), f)
+        self.pu_float = np.zeros((n, POWERUP_SLOTS), f)
+        self.pu_speed = np.zeros((n, POWERUP_SLOTS), f)
+        self.pu_type = np.zeros((n, POWERUP_SLOTS), i)
+        self.cp_alive = np.zeros((n, CHECKPOINT_SLOTS), b)
+        self.cp_x = np.zeros((n, CHECKPOINT_SLOTS), f)
+        self.cp_speed = np.zeros((n, CHECKPOINT_SLOTS), f)
+        self.cp_biome = np.zeros((n, CHECKPOINT_SLOTS), i)
+        self.cp_activated = np.zeros((n, CHECKPOINT_SLOTS), b)
+
+        # Missions, one per biome for the first MISSION_BIOMES biomes
+        self.mission_kind = np.zeros((n, MISSION_BIOMES), i)
+        self.mission_target = np.zeros((n, MISSION_BIOMES), f)
+        self.mission_reward = np.zeros((n, MISSION_BIOMES), i)
+        self.mission_value = np.zeros((n, MISSION_BIOMES), f)
+        self.mission_broken = np.zeros((n, MISSION_BIOMES), b)
+        self.missions_completed = np.zeros(n, i)
+
+        self.obs = np.zeros((n, len(OBSERVATION_FIELDS)), np.float32)
+
+    def reset(self, seeds=None):
+        """Start every run over; seeds is one int per run, a base int (run i gets seed + i) or None"""
+        if seeds is None:
+            seeds = [random.getrandbits(63) for _ in range(self.n)]
+        elif isinstance(seeds, int):
+            seeds = range(seeds, seeds + self.n)
+        seeds = list(seeds)
+        if len(seeds) != self.n:
+            raise ValueError(f"expected {self.n} seeds, got {len(seeds)}")
+        self.rng[:] = [_mix_seed(seed) for seed in seeds]
+        self.reset_rows(self.rows)
+        return self.observe()
+
+    def reset_rows(self, rows):
+        """Game.reset_game() for the given runs, continuing their random streams"""
+        self.x[rows] = 150
+        self.y[rows] = self.ground - self.player_h
+        self.vy[rows] = 0
+        self.jumping[rows] = False
+        self.on_ground[rows] = True
+        self.has_jetpack[rows] = False
+        self.fuel[rows] = 0
+        self.lives[rows] = 3
+        self.respawn[rows] = False
+        self.respawn_timer[rows] = 0
+        self.speed[rows] = 5
+        self.frame[rows] = 0
+        self.distance[rows] = 0
+        self.score[rows] = 0
+        self.total_coins[rows] = 0
+        self.biome[rows] = 0
+        self.next_biome[rows] = balance.FIRST_BIOME_DISTANCE
+        self.active[rows] = False
+        self.timers[rows] = 0
+        self.has_checkpoint[rows] = False
+        self.biome_checkpoints[rows] = 0
+        self.checkpoint_slot[rows] = -1
+        self.checkpoint_x[rows] = np.nan
+        self.ob_alive[rows] = False
+        self.coin_alive[rows] = False
+        self.pu_alive[rows] = False
+        self.cp_alive[rows] = False
+        self.missions_completed[rows] = 0
+        for row in rows:
+            self.roll_missions(row, range(MISSION_BIOMES), 1.0)
+
+    def roll_missions(self, row, biomes, difficulty):
+        """New missions from the real Mission class, seeded from the run's stream"""
+        state = int(self.rng[row])
+        self.rng[row] = (state + _GOLDEN) & _MASK
+        saved = missions.mission_random.getstate()
+        missions.mission_random.seed(_mix_seed(state))
+        try:
+            for biome in biomes:
+                mission = Mission(biome, difficulty)
+                self.mission_kind[row, biome] = MISSION_KINDS.index(mission.mission_type)
+                self.mission_target[row, biome] = mission.target_amount
+                self.mission_reward[row, biome] = mission.reward
+                self.mission_value[row, biome] = 0
+                self.mission_broken[row, biome] = False
+        finally:
+            missions.mission_random.setstate(saved)
+
+    def mission_event(self, event, mask, amount=1):
+        """Game.notify_missions() for the runs in mask"""
+        mask = mask & (self.biome < MISSION_BIOMES)
+        if not mask.any():
+            return
+        rows = np.flatnonzero(mask)
+        biomes = self.biome[rows]
+        kinds = self.mission_kind[rows, biomes]
+        if event == HIT:
+            perfect = kinds == self.perfect
+            self.mission_broken[rows[perfect], biomes[perfect]] = True
+            return
+        live = self.subscribed[event][kinds] & ~self.mission_broken[rows, biomes]
+        rows, biomes = rows[live], biomes[live]
+        if not isinstance(amount, (int, float)):
+            amount = amount[rows]
+        values = self.mission_value[rows, biomes] + amount
+        self.mission_value[rows, biomes] = values
+        done = values >= self.mission_target[rows, biomes]
+        for row, biome in zip(rows[done], biomes[done]):
+            self.complete_mission(row, biome)
+
+    def complete_mission(self, row, biome):
+        reward = int(self.mission_reward[row, biome])
+        self.missions_completed[row] += 1
+        self.total_coins[row] += reward
+        self.score[row] += reward * 5
+        self.roll_missions(row, (biome,), 1.0 + self.missions_completed[row] * 0.2)
+
+    def unit_events(self, event, counts):
+        """One event per count, like a loop of notify_missions(event) calls"""
+        pending = counts > 0
+        while pending.any():
+            self.mission_event(event, pending)
+            counts = counts - 1
+            pending = counts > 0
+
+    def free_slot(self, alive, wanted):
+        """First free slot per run where wanted, or -1; spawns without one are dropped"""
+        free = ~alive
+        slot = free.argmax(axis=1)
+        ok = wanted & free[self.rows, slot]
+        self.dropped += int(np.count_nonzero(wanted & ~ok))
+        return np.flatnonzero(ok), slot[ok]
+
+    def uniforms(self):
+        """Eight uniform draws per run for this step, whether or not they get used
+
+        A fixed number per step keeps each run's stream independent of the
+        others in the batch.
+        """
+        u = []
+        for _ in range(UNIFORMS_PER_STEP // 2):
+            bits = _splitmix(self.rng)
+            u.append((bits & np.uint64(0xFFFFFFFF)) * (1 / 4294967296.0))
+            u.append((bits >> np.uint64(32)) * (1 / 4294967296.0))
+        return u
+
+    def step(self, actions):
+        """Advance every run one frame; returns (observations, rewards, dones, info)"""
+        n, rows, ground = self.n, self.rows, self.ground
+        pw, ph = self.player_w, self.player_h
+        standing = ground - ph
+        actions = np.broadcast_to(np.asarray(actions), (n,))
+        held = (actions & JETPACK) != 0
+        start_distance = self.distance.copy()
+        start_score = self.score.copy()
+        start_lives = self.lives.copy()
+        u = self.uniforms()
+
+        # Game.jump_input -> Player.jump
+        jumps = ((actions & JUMP) != 0) & self.on_ground & ~self.jumping
+        self.vy[jumps] = balance.JUMP_SPEED
+        self.jumping |= jumps
+        self.on_ground &= ~jumps
+        self.mission_event(JUMP_EVENT, jumps)
+
+        # Respawn invincibility and the speed ramp
+        self.respawn_timer -= self.respawn
+        self.respawn &= self.respawn_timer > 0
+        self.speed = np.where(self.frame % balance.SPEED_RAMP_INTERVAL == 0,
+                              self.speed + balance.SPEED_RAMP_STEP, self.speed)
+
+        # Player.update: jetpack, gravity and landing
+        jet = self.has_jetpack & (self.fuel > 0) & held & ~self.on_ground
+        self.vy = np.where(jet, self.vy + JETPACK_THRUST, self.vy)
+        self.fuel -= 2 * jet
+        self.has_jetpack &= ~(jet & (self.fuel <= 0))
+        air = ~self.on_ground | self.jumping
+        self.vy = np.where(air, self.vy + balance.GRAVITY, 0.0)
+        self.y = np.where(air, _round(self.y + self.vy), standing)
+        landed = air & (self.y >= standing)
+        self.y[landed] = standing
+        self.vy[landed] = 0
+        self.jumping &= ~landed
+        self.on_ground |= landed
+
+        # Player.update: obstacle collisions, skipped while respawning
+        x, y = self.x[:, None], self.y[:, None]
+        ob_x, ob_y, ob_w, ob_h = self.ob_x, self.ob_y, self.ob_w, self.ob_h
+        overlap = (self.ob_alive & ~self.respawn[:, None] & (x < ob_x + ob_w) & (ob_x < x + pw)
+                   & (y < ob_y + ob_h) & (ob_y < y + ph))
+        over_top = (y + ph < ob_y + ob_h // 2) & (self.vy[:, None] > 0)
+        struck = overlap & ~over_top & ~self.active[:, SHIELD][:, None]
+        hit = struck.any(axis=1)
+        self.unit_events(OBSTACLE_AVOIDED, np.where(hit, 0, overlap.sum(axis=1)))
+        self.mission_event(HIT, hit)
+
+        # Player.lose_life
+        self.lives -= hit
+        over = hit & (self.lives <= 0)
+        respawned = hit & ~over
+        self.jumping &= ~respawned
+        self.vy[respawned] = 0
+        restart_x = np.where(np.isnan(self.checkpoint_x), 150, self.checkpoint_x + 100)
+        self.x = np.where(respawned, restart_x, self.x)
+        self.y[respawned] = standing
+        self.respawn |= respawned
+        self.respawn_timer[respawned] = 60
+
+        # Player.update: coins, pulled in by the magnet; none on a frame with a hit
+        x, y = self.x[:, None], self.y[:, None]
+        coin_x, coin_y, cw, ch = self.coin_x, self.coin_y, self.coin_w, self.coin_h
+        magnet = self.active[:, COIN_MAGNET] & ~hit
+        if magnet.any():
+            dx = (coin_x + cw // 2) - (x + pw // 2)
+            dy = (coin_y + ch // 2) - (y + ph // 2)
+            dist = np.sqrt(dx * dx + dy * dy)
+            pull = self.coin_alive & magnet[:, None] & (dist < 100) & (dist > 0)
+            dist[~pull] = 1
+            coin_x[:] = np.where(pull, _round(coin_x - dx / dist * 6), coin_x)
+            coin_y[:] = np.where(pull, _round(coin_y - dy / dist * 6), coin_y)
+        collected = (self.coin_alive & ~hit[:, None] & (x < coin_x + cw) & (coin_x < x + pw)
+                     & (y < coin_y + ch) & (coin_y < y + ph))
+        self.coin_alive &= ~collected
+        coins = collected.sum(axis=1)
+        self.mission_event(COIN_COLLECTED, coins > 0, coins)
+        coins += coins * self.active[:, DOUBLE_COINS]
+        self.score += coins * 10
+        self.total_coins += coins
+
+        # Obstacles scroll at the speed they spawned with; passing one counts as avoiding it
+        ob_x[:] = _round(ob_x - self.ob_speed)
+        self.ob_alive &= ob_x + ob_w >= 0
+        passed = self.ob_alive & ~self.ob_counted & (ob_x + ob_w < self.x[:, None])
+        self.ob_counted |= passed
+        self.unit_events(OBSTACLE_AVOIDED, passed.sum(axis=1))
+
+        coin_x[:] = _round(coin_x - self.coin_speed)
+        self.coin_alive &= coin_x + cw >= 0
+
+        # Power-ups float, scroll and activate on touch
+        self.pu_x[:] = _round(self.pu_x - self.pu_speed)
+        self.pu_float += 0.2
+        self.pu_y[:] = _round(self.pu_origin_y + np.sin(self.pu_float) * 3)
+        self.pu_alive &= self.pu_x + POWERUP_SIZE >= 0
+        touched = (self.pu_alive & (x < self.pu_x + POWERUP_SIZE) & (self.pu_x < x + pw)
+                   & (y < self.pu_y + POWERUP_SIZE) & (self.pu_y < y + ph))
+        if touched.any():
+            self.pu_alive &= ~touched
+            for slot in range(POWERUP_SLOTS):
+                for kind in range(5):
+                    self.activate(touched[:, slot] & (self.pu_type[:, slot] == kind), kind)
+
+        # Power-up timers run out one frame after reaching zero
+        expired = self.active & (self.timers <= 0)
+        self.timers -= self.active
+        self.active &= ~expired
+        self.speed = np.where(expired[:, SPEED], np.maximum(5, self.speed - 2), self.speed)
+        self.has_jetpack &= ~expired[:, JETPACK_POWERUP]
+        self.fuel[expired[:, JETPACK_POWERUP]] = 0
+
+        # Checkpoint.update: the one that passes x=200 becomes the respawn point
+        self.cp_x[:] = _round(self.cp_x - self.cp_speed)
+        reached = self.cp_alive & ~self.cp_activated & (self.cp_x < 200)
+        if reached.any():
+            hit_rows = np.flatnonzero(reached.any(axis=1))
+            slots = reached[hit_rows].argmax(axis=1)
+            self.cp_activated |= reached
+            self.checkpoint_slot[hit_rows] = slots
+            self.biome_checkpoints[hit_rows] |= 1 << self.cp_biome[hit_rows, slots]
+            self.has_checkpoint[hit_rows] = True
+        current = self.checkpoint_slot >= 0
+        slots = np.maximum(self.checkpoint_slot, 0)
+        self.checkpoint_x = np.where(current, self.cp_x[rows, slots], self.checkpoint_x)
+        self.cp_alive &= self.cp_x + CHECKPOINT_WIDTH >= 0
+        self.checkpoint_slot[current & ~self.cp_alive[rows, slots]] = -1
+
+        self.spawn(u)
+
+        # Distance, then the biome transition (which clears obstacles)
+        self.distance += self.speed * 0.1
+        transition = self.distance >= self.next_biome
+        if transition.any():
+            self.biome = np.where(transition, (self.biome + 1) % 8, self.biome)
+            self.next_biome += balance.BIOME_LENGTH * transition
+            self.has_checkpoint &= ~transition
+            self.ob_alive &= ~transition[:, None]
+            # Game.setup_biome's checkpoint
+            self.spawn_checkpoints(transition & (self.distance >= (self.biome + 1) * 600)
+                                   & ((self.biome_checkpoints >> self.biome) & 1 == 0))
+
+        self.mission_event(TIME_TICK, np.ones(n, bool), 1 / 60)
+        self.frame += 1
+        self.steps += n
+
+        rewards = (self.distance - start_distance + self.score_reward * (self.score - start_score)
+                   - self.life_penalty * (start_lives - self.lives))
+        info = {}
+        if over.any():
+            finished = np.flatnonzero(over)
+            info = {
+                'distance': self.distance[finished],
+                'score': self.score[finished],
+                'coins': self.total_coins[finished],
+                'frames': self.frame[finished],
+                'biome': self.biome[finished],
+                'missions': self.missions_completed[finished],
+            }
+            self.episodes += len(finished)
+            self.reset_rows(finished)
+        return self.observe(), rewards, over, info
+
+    def activate(self, mask, kind):
+        """Game.activate_powerup for the runs in mask"""
+        if not mask.any():
+            return
+        self.active[mask, kind] = True
+        self.timers[mask, kind] = POWERUP_DURATIONS[kind]
+        if kind == SPEED:
+            self.speed = np.where(mask, self.speed + 2, self.speed)
+        elif kind == JETPACK_POWERUP:
+            self.has_jetpack |= mask
+            self.fuel[mask] = MAX_JETPACK_FUEL
+
+    def spawn(self, u):
+        """Game.spawn_elements with the step's uniform draws"""
+        width, ground, speed = self.width, self.ground, self.speed
+        empty = ~self.ob_alive.any(axis=1)
+        last_x = np.where(self.ob_alive, self.ob_x, -np.inf).max(axis=1)
+        gap = width - last_x
+        spaced = ~empty & (gap >= balance.OBSTACLE_MIN_GAP + speed * balance.OBSTACLE_GAP_PER_SPEED)
+        odds = np.minimum(balance.OBSTACLE_ODDS_MAX,
+                          balance.OBSTACLE_ODDS + np.trunc(np.where(spaced, gap, 0) / balance.OBSTACLE_ODDS_DISTANCE))
+        first = empty & (u[0] * balance.FIRST_OBSTACLE_ODDS < 1)
+        wanted = first | (spaced & (u[0] * odds < 1))
+        spawn_rows, slots = self.free_slot(self.ob_alive, wanted)
+        if len(spawn_rows):
+            shapes = self.shapes[self.biome[spawn_rows], :, (u[2][spawn_rows] * OBSTACLE_SAMPLES).astype(np.int64)]
+            self.ob_alive[spawn_rows, slots] = True
+            self.ob_counted[spawn_rows, slots] = False
+            self.ob_x[spawn_rows, slots] = np.where(first[spawn_rows], width + 200,
+                                                    width + 50 + np.floor(u[1][spawn_rows] * 101))
+            self.ob_type[spawn_rows, slots] = shapes[:, 0]
+            self.ob_w[spawn_rows, slots] = shapes[:, 1]
+            self.ob_h[spawn_rows, slots] = shapes[:, 2]
+            self.ob_y[spawn_rows, slots] = ground + shapes[:, 3]
+            self.ob_speed[spawn_rows, slots] = speed[spawn_rows]
+
+        # Coins and power-ups only once the first obstacle is out
+        spawn_rows, slots = self.free_slot(self.coin_alive, ~empty & (u[3] * balance.COIN_ODDS < 1))
+        if len(spawn_rows):
+            self.coin_alive[spawn_rows, slots] = True
+            self.coin_x[spawn_rows, slots] = width
+            self.coin_y[spawn_rows, slots] = ground - 150 + np.floor(u[4][spawn_rows] * 121)
+            self.coin_speed[spawn_rows, slots] = speed[spawn_rows]
+
+        spawn_rows, slots = self.free_slot(self.pu_alive, ~empty & (u[5] * balance.POWERUP_ODDS < 1))
+        if len(spawn_rows):
+            weights = np.cumsum([[table[name] for name in POWERUP_TYPES]
+                                 for table in (balance.POWERUP_WEIGHTS, balance.LATE_POWERUP_WEIGHTS)], axis=1)
+            weights = weights[(self.biome[spawn_rows] >= balance.LATE_POWERUP_BIOME).astype(np.int64)]
+            kinds = (u[6][spawn_rows, None] * weights[:, -1:] >= weights).sum(axis=1)
+            origin = ground - 200 + np.floor(u[7][spawn_rows] * 121)
+            self.pu_alive[spawn_rows, slots] = True
+            self.pu_type[spawn_rows, slots] = np.minimum(kinds, 4)
+            self.pu_x[spawn_rows, slots] = width
+            self.pu_y[spawn_rows, slots] = origin
+            self.pu_origin_y[spawn_rows, slots] = origin
+            self.pu_float[spawn_rows, slots] = 0
+            self.pu_speed[spawn_rows, slots] = speed[spawn_rows]
+
+        biome = self.biome
+        self.spawn_checkpoints(~self.has_checkpoint & (self.distance >= (biome + 1) * 500)
+                               & ((self.biome_checkpoints >> biome) & 1 == 0), mark=True)
+
+    def spawn_checkpoints(self, wanted, mark=False):
+        if not wanted.any():
+            return
+        spawn_rows, slots = self.free_slot(self.cp_alive, wanted)
+        self.cp_alive[spawn_rows, slots] = True
+        self.cp_activated[spawn_rows, slots] = False
+        self.cp_x[spawn_rows, slots] = self.width
+        self.cp_speed[spawn_rows, slots] = self.speed[spawn_rows]
+        self.cp_biome[spawn_rows, slots] = self.biome[spawn_rows]
+        if mark:
+            self.has_checkpoint |= wanted
+
+    def observe(self):
+        """Observation rows (see OBSERVATION_FIELDS), scaled to roughly unit range"""
+        obs, width, ground = self.obs, self.width, self.ground
+        right = self.x + self.player_w
+        obs[:, 0] = (ground - self.player_h - self.y) / 100
+        obs[:, 1] = self.vy / 15
+        obs[:, 2] = self.on_ground
+        obs[:, 3] = self.fuel / MAX_JETPACK_FUEL
+        obs[:, 4] = self.lives
+        obs[:, 5] = self.speed / 10
+        obs[:, 6] = self.biome / 7
+        obs[:, 7] = self.respawn_timer * self.respawn / 60
+        obs[:, 8:13] = self.active
+
+        # Obstacles not yet behind the player, nearest first
+        ahead = self.ob_alive & (self.ob_x + self.ob_w >= self.x[:, None])
+        keys = np.where(ahead, self.ob_x, np.inf)
+        order = np.argsort(keys, axis=1)[:, :NEAREST_OBSTACLES]
+        present = np.take_along_axis(ahead, order, axis=1)
+        ob_x = np.take_along_axis(self.ob_x, order, axis=1)
+        ob_y = np.take_along_axis(self.ob_y, order, axis=1)
+        ob_h = np.take_along_axis(self.ob_h, order, axis=1)
+        ob_w = np.take_along_axis(self.ob_w, order, axis=1)
+        features = np.empty((self.n, NEAREST_OBSTACLES, 4), np.float32)
+        features[:, :, 0] = np.where(present, (ob_x - right[:, None]) / width, 1)
+        features[:, :, 1] = np.where(present, (ground - ob_y) / 100, 0)
+        features[:, :, 2] = np.where(present, (ground - ob_y - ob_h) / 100, 0)
+        features[:, :, 3] = np.where(present, ob_w / 100, 0)
+        obs[:, 13:13 + 4 * NEAREST_OBSTACLES] = features.reshape(self.n, -1)
+
+        column = 13 + 4 * NEAREST_OBSTACLES
+        for alive, xs, ys, size in ((self.coin_alive, self.coin_x, self.coin_y, self.coin_w),
+                                    (self.pu_alive, self.pu_x, self.pu_y, POWERUP_SIZE)):
+            ahead = alive & (xs + size >= self.x[:, None])
+            nearest = np.where(ahead, xs, np.inf).argmin(axis=1)
+            present = ahead[self.rows, nearest]
+            obs[:, column] = np.where(present, (xs[self.rows, nearest] - right) / width, 1)
+            obs[:, column + 1] = np.where(present, (ys[self.rows, nearest] - self.y) / 100, 0)
+            column += 2
+        return obs
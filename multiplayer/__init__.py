@@ -0,0 +1,17 @@
+"""Cosmic Runner multiplayer: asyncio game server and command-line client.
+
+    python multiplayer-game.py server [--host HOST] [--port PORT]
+    python multiplayer-game.py client
+    python -m multiplayer.loadtest --connections 2000
+    python -m multiplayer.protocol_fuzz
+    python -m multiplayer.race_check --players 3
+    python -m multiplayer.sim_bench --rooms 40 --workers 2
+    python -m multiplayer.spectate_loadtest --spectators 1000
+"""
+from .protocol import encode_message, FrameDecoder, MessageDecoder, ProtocolError
+from .codec import Schema, CodecError, state_message, input_message
+from .race import RaceRoom, RaceClient
+from .authority import SimulationPool, RoomSimulation, RunnerSim
+from .replication import Replicator, SpectatorView, SpectatorHub
+from .server import GameServer, ClientConnection, DEFAULT_HOST, DEFAULT_PORT
+from .client import GameClient, run_client
@@ -0,0 +1,424 @@
+# Authoritative race simulation
+#
+# During a race every client sends its buttons for each frame as a binary
+# INPUT message. The server replays them through its own headless Game per
+# runner, seeded with the same course, so the positions it relays and the
+# distance, score and time it ranks come from its simulation; a client's
+# race_finish report is only checked against it. A Game.update costs tens of
+# microseconds without a display, so one worker process steps many rooms at
+# TICK_RATE. SimulationPool shards rooms across worker processes, and each
+# worker reports tick timings per room (python -m multiplayer.sim_bench
+# measures how many rooms that leaves room for). Runners with spectators are
+# also replicated in the worker (see replication), so the server process only
+# forwards the encoded frames.
+import os
+import time
+import random
+import asyncio
+import threading
+import multiprocessing
+from collections import deque
+
+from . import codec
+from .replication import Replicator
+
+TICK_RATE = 60                  # Simulation ticks a second, the game's frame rate
+STATE_EVERY = 2                 # Ticks between position reports (30 a second)
+MAX_CATCH_UP = 4                # Buffered inputs a runner may replay in one tick
+TICKS_AHEAD = 30                # Inputs further ahead of the room clock wait
+MAX_BUFFERED_INPUTS = 600       # Inputs held per runner before more are rejected
+STALL_TIMEOUT = 30.0            # Seconds without input before a runner is retired
+METRICS_INTERVAL = 5.0
+TIMING_WINDOW = 600             # Tick timings kept per room for percentiles
+VALID_BUTTONS = codec.BUTTON_JUMP | codec.BUTTON_JETPACK
+
+def apply_screen(screen):
+    """Lay the engine out for one client's play area, (width, height, ground level)"""
+    from cosmic_runner import layout
+    layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT, layout.GROUND_LEVEL = screen
+
+class RunnerSim:
+    """One runner's Game, driven only by the inputs its client sent"""
+    def __init__(self, player_id, seed, goal, now, screen=None):
+        from cosmic_runner import Game, layout
+        from cosmic_runner.constants import PLAYING
+        from cosmic_runner.missions import mission_random
+        self.playing = PLAYING
+        self.player_id = player_id
+        self.goal = goal
+        # Spawn positions and the ground depend on the client's window size
+        self.screen = tuple(screen) if screen else (layout.REF_SCREEN_WIDTH, layout.REF_SCREEN_HEIGHT,
+                                                    layout.REF_SCREEN_HEIGHT - layout.REF_GROUND_MARGIN + 75)
+        apply_screen(self.screen)
+        self.game = Game()
+        self.game.seed_course(seed)
+        self.game.reset_game()
+        # Every runner has its own course stream and layout; they are swapped in around each step
+        self.mission_random = mission_random
+        self.random_state = random.getstate()
+        self.mission_state = mission_random.getstate()
+        self.inputs = deque()           # (tick, buttons) not yet simulated
+        self.last_input_tick = 0
+        self.last_input_at = now
+        self.tick = 0                   # Last simulated tick
+        self.finish_tick = None         # Tick the client says it stopped at
+        self.finished = False
+        self.rejected = 0               # Out-of-order, duplicate or excess inputs
+        self.replicator = None          # Set while the runner has spectators
+        self.frames = []                # Replicated frames not yet sent to the server
+
+    def add_input(self, tick, buttons, now):
+        if self.finished:
+            return
+        if tick != self.last_input_tick + 1 or len(self.inputs) >= MAX_BUFFERED_INPUTS:
+            self.rejected += 1
+            return
+        self.inputs.append((tick, buttons & VALID_BUTTONS))
+        self.last_input_tick = tick
+        self.last_input_at = now
+
+    def stop_at(self, tick):
+        """The client stopped racing after this tick (quit, or its own finish)"""
+        self.finish_tick = tick
+        self.check_finished()
+
+    def check_finished(self):
+        game = self.game
+        if (game.state != self.playing or game.distance >= self.goal
+                or (self.finish_tick is not None and self.tick >= self.finish_tick)):
+            self.finished = True
+        return self.finished
+
+    def step(self, allowed_tick):
+        """Replay buffered inputs up to allowed_tick; True if the runner finished"""
+        inputs = self.inputs
+        if not inputs or inputs[0][0] > allowed_tick:
+            return self.check_finished()
+        random.setstate(self.random_state)
+        self.mission_random.setstate(self.mission_state)
+        apply_screen(self.screen)
+        game = self.game
+        steps = 0
+        while inputs and steps < MAX_CATCH_UP and inputs[0][0] <= allowed_tick:
+            self.tick, buttons = inputs.popleft()
+            # Same order as the front end: key events, then held keys, then update
+            if buttons & codec.BUTTON_JUMP:
+                game.jump_input()
+            game.jetpack_held = bool(buttons & codec.BUTTON_JETPACK)
+            game.update()
+            steps += 1
+            if self.replicator is not None:
+                self.frames.extend(self.replicator.capture(game, self.tick))
+            if self.check_finished():
+                inputs.clear()
+                break
+        self.random_state = random.getstate()
+        self.mission_state = self.mission_random.getstate()
+        return self.finished
+
+    def retire(self):
+        """Stop waiting for a client that went quiet"""
+        self.inputs.clear()
+        self.finished = True
+
+    def row(self):
+        game = self.game
+        flags = codec.player_flags(game.player) | (codec.FLAG_FINISHED if self.finished else 0)
+        return (self.player_id, game.distance, game.player.rect.y, flags,
+                game.current_biome, min(game.score, 0xFFFFFFFF))
+
+    def result(self):
+        return (self.player_id, self.game.distance, self.game.score, self.tick, self.rejected)
+
+class RoomSimulation:
+    """Every runner of one race, stepped together"""
+    def __init__(self, room_id, seed, goal, screens, now):
+        self.room_id = room_id
+        self.runners = {player_id: RunnerSim(player_id, seed, goal, now, screen)
+                        for player_id, screen in screens.items()}
+        self.started_at = now
+        self.changed = True
+        self.state_tick = 0
+
+        # Tick timing
+        self.ticks = 0
+        self.timings = deque(maxlen=TIMING_WINDOW)   # Milliseconds per tick
+        self.max_ms = 0.0
+
+    def step(self, now):
+        """One room tick; returns runners that finished during it"""
+        started = time.perf_counter()
+        allowed_tick = int((now - self.started_at) * TICK_RATE) + TICKS_AHEAD
+        finished = []
+        for runner in self.runners.values():
+            if runner.finished:
+                continue
+            tick = runner.tick
+            if runner.step(allowed_tick):
+                finished.append(runner)
+            elif now - runner.last_input_at > STALL_TIMEOUT:
+                runner.retire()
+                finished.append(runner)
+            if runner.tick != tick or runner.finished:
+                self.changed = True
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.ticks += 1
+        self.timings.append(elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        return finished
+
+    def rows(self):
+        self.changed = False
+        self.state_tick += 1
+        return [runner.row() for runner in self.runners.values()]
+
+    def metrics(self):
+        timings = sorted(self.timings)
+        count = len(timings)
+        return {
+            'runners': len(self.runners),
+            'ticks': self.ticks,
+            'mean_ms': round(sum(timings) / count, 3) if count else 0.0,
+            'p99_ms': round(timings[min(count - 1, int(count * 0.99))], 3) if count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'rejected_inputs': sum(runner.rejected for runner in self.runners.values())
+        }
+
+def handle_command(rooms, command, now):
+    kind = command[0]
+    if kind == 'inputs':
+        for room_id, player_id, tick, buttons in command[1]:
+            room = rooms.get(room_id)
+            runner = room.runners.get(player_id) if room else None
+            if runner is not None:
+                runner.add_input(tick, buttons, now)
+    elif kind == 'create':
+        _, room_id, seed, goal, screens = command
+        rooms[room_id] = RoomSimulation(room_id, seed, goal, screens, now)
+    elif kind in ('watch', 'unwatch'):
+        _, room_id, player_id = command
+        room = rooms.get(room_id)
+        runner = room.runners.get(player_id) if room else None
+        if runner is not None:
+            runner.replicator = Replicator() if kind == 'watch' else None
+            runner.frames = []
+    elif kind == 'stop_at':
+        _, room_id, player_id, tick = command
+        room = rooms.get(room_id)
+        runner = room.runners.get(player_id) if room else None
+        if runner is not None and not runner.finished:
+            runner.stop_at(tick)
+    elif kind == 'leave':
+        _, room_id, player_id = command
+        room = rooms.get(room_id)
+        if room is not None:
+            room.runners.pop(player_id, None)
+    elif kind == 'close':
+        rooms.pop(command[1], None)
+
+def worker_main(worker_id, conn, metrics_interval=METRICS_INTERVAL):
+    """Worker process: step every room it hosts TICK_RATE times a second"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    rooms = {}
+    interval = 1 / TICK_RATE
+    tick = 0
+    next_tick = time.perf_counter()
+    next_metrics = next_tick + metrics_interval
+    busy = 0.0
+    late_ticks = 0
+    try:
+        while True:
+            # Commands are handled between ticks, never in the middle of one
+            if conn.poll(max(0.0, next_tick - time.perf_counter())):
+                while conn.poll():
+                    command = conn.recv()
+                    if command[0] == 'stop':
+                        return
+                    handle_command(rooms, command, time.perf_counter())
+                continue
+
+            started = time.perf_counter()
+            if started - next_tick > interval:
+                late_ticks += 1
+            events = []
+            for room in rooms.values():
+                for runner in room.step(started):
+                    events.append(('finished', room.room_id) + runner.result())
+            if tick % STATE_EVERY == 0:
+                states = [(room.room_id, room.state_tick + 1, room.rows()) for room in rooms.values() if room.changed]
+                if states:
+                    events.append(('states', states))
+                for room in rooms.values():
+                    for runner in room.runners.values():
+                        if runner.frames:
+                            events.append(('replica', room.room_id, runner.player_id, runner.frames))
+                            runner.frames = []
+            tick += 1
+            busy += time.perf_counter() - started
+
+            if started >= next_metrics:
+                events.append(('metrics', {
+                    'worker': worker_id,
+                    'rooms': len(rooms),
+                    'runners': sum(len(room.runners) for room in rooms.values()),
+                    'busy': round(busy / metrics_interval, 4),
+                    'late_ticks': late_ticks,
+                    'room_ticks': {room.room_id: room.metrics() for room in rooms.values()}
+                }))
+                busy = 0.0
+                late_ticks = 0
+                next_metrics = started + metrics_interval
+            if events:
+                conn.send(events)
+
+            next_tick += interval
+            if time.perf_counter() - next_tick > interval * MAX_CATCH_UP:
+                next_tick = time.perf_counter()   # Too far behind: skip ahead rather than spiral
+    except (EOFError, OSError, KeyboardInterrupt):
+        pass
+
+class SimulationWorker:
+    """The server's end of one worker process"""
+    def __init__(self, index, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.rooms = set()
+        self.pending_inputs = []
+        self.metrics = None
+
+class SimulationPool:
+    """Worker processes hosting room simulations, driven from the event loop
+
+    handler gets sim_states(room_id, tick, rows), sim_finished(room_id,
+    player_id, distance, score, tick, rejected), sim_replica(room_id,
+    player_id, frames) and sim_metrics(metrics) calls on the event loop
+    thread.
+    """
+    def __init__(self, workers, handler, metrics_interval=METRICS_INTERVAL):
+        self.worker_count = workers
+        self.handler = handler
+        self.metrics_interval = metrics_interval
+        self.workers = []
+        self.room_workers = {}      # {room_id: SimulationWorker}
+        self.loop = None
+        self.flush_scheduled = False
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.worker_count):
+            conn, child_conn = context.Pipe()
+            process = context.Process(target=worker_main, args=(index, child_conn, self.metrics_interval),
+                                      daemon=True)
+            process.start()
+            child_conn.close()
+            worker = SimulationWorker(index, process, conn)
+            self.workers.append(worker)
+            # Pipes can't be watched by every event loop, so a thread blocks on each
+            threading.Thread(target=self.read_loop, args=(worker,), daemon=True).start()
+        print(f"Simulating races in {self.worker_count} worker processes")
+
+    def read_loop(self, worker):
+        while True:
+            try:
+                events = worker.conn.recv()
+            except (EOFError, OSError):
+                return
+            self.loop.call_soon_threadsafe(self.dispatch, worker, events)
+
+    def dispatch(self, worker, events):
+        for event in events:
+            kind = event[0]
+            if kind == 'states':
+                for room_id, tick, rows in event[1]:
+                    self.handler.sim_states(room_id, tick, rows)
+            elif kind == 'finished':
+                self.handler.sim_finished(*event[1:])
+            elif kind == 'replica':
+                self.handler.sim_replica(*event[1:])
+            elif kind == 'metrics':
+                worker.metrics = event[1]
+                self.handler.sim_metrics(event[1])
+
+    def send(self, worker, command):
+        try:
+            worker.conn.send(command)
+        except (OSError, ValueError) as e:
+            print(f"Simulation worker {worker.index} is gone: {e}")
+
+    def create_room(self, room_id, seed, goal, screens):
+        """Start simulating a race; screens maps player ids to (width, height, ground) or None"""
+        worker = min(self.workers, key=lambda w: len(w.rooms))   # Least loaded
+        worker.rooms.add(room_id)
+        self.room_workers[room_id] = worker
+        self.send(worker, ('create', room_id, seed, goal, dict(screens)))
+
+    def input(self, room_id, player_id, tick, buttons):
+        """Queue one input; inputs go to the workers in one batch per loop pass"""
+        worker = self.room_workers.get(room_id)
+        if worker is None:
+            return
+        worker.pending_inputs.append((room_id, player_id, tick, buttons))
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.loop.call_soon(self.flush_inputs)
+
+    def flush_inputs(self):
+        self.flush_scheduled = False
+        for worker in self.workers:
+            if worker.pending_inputs:
+                inputs, worker.pending_inputs = worker.pending_inputs, []
+                self.send(worker, ('inputs', inputs))
+
+    def stop_at(self, room_id, player_id, tick):
+        worker = self.room_workers.get(room_id)
+        if worker is not None:
+            self.flush_inputs()     # The last inputs must arrive first
+            self.send(worker, ('stop_at', room_id, player_id, tick))
+
+    def watch(self, room_id, player_id):
+        """Start replicating a runner for spectators, beginning with a keyframe"""
+        worker = self.room_workers.get(room_id)
+        if worker is not None:
+            self.send(worker, ('watch', room_id, player_id))
+
+    def unwatch(self, room_id, player_id):
+        worker = self.room_workers.get(room_id)
+        if worker is not None:
+            self.send(worker, ('unwatch', room_id, player_id))
+
+    def leave(self, room_id, player_id):
+        worker = self.room_workers.get(room_id)
+        if worker is not None:
+            self.send(worker, ('leave', room_id, player_id))
+
+    def close_room(self, room_id):
+        worker = self.room_workers.pop(room_id, None)
+        if worker is not None:
+            worker.rooms.discard(room_id)
+            self.send(worker, ('close', room_id))
+
+    def stop(self):
+        for worker in self.workers:
+            self.send(worker, ('stop',))
+        for worker in self.workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+
+def metrics_lines(metrics, rooms=False):
+    """Log lines for one worker's metrics report"""
+    room_ticks = metrics['room_ticks'].values()
+    worst = max((room['p99_ms'] for room in room_ticks), default=0.0)
+    lines = [f"Sim worker {metrics['worker']}: {metrics['rooms']} rooms, {metrics['runners']} runners, "
+             f"busy {metrics['busy'] * 100:.1f}%, {metrics['late_ticks']} late ticks, "
+             f"worst room p99 {worst:.3f}ms"]
+    if rooms:
+        for room_id, room in metrics['room_ticks'].items():
+            lines.append(f"  room {room_id}: {room['runners']} runners, tick mean {room['mean_ms']:.3f}ms "
+                         f"p99 {room['p99_ms']:.3f}ms max {room['max_ms']:.3f}ms, "
+                         f"{room['rejected_inputs']} rejected inputs")
+    return lines
@@ -0,0 +1,241 @@
+# Multiplayer game client (command line)
+import socket
+import threading
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+from .protocol import encode_message, MessageDecoder
+
+RECV_SIZE = 64 * 1024
+
+class GameClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.username = None
+        self.connected = False
+        self.is_my_turn = False
+    
+    def connect(self, username):
+        """Connect to the game server"""
+        try:
+            self.socket.connect((self.host, self.port))
+            self.username = username
+            self.connected = True
+            
+            # Send username to the server
+            self.send_message({
+                'type': 'username',
+                'username': username
+            })
+            
+            # Start a thread to receive messages
+            receive_thread = threading.Thread(target=self.receive_messages)
+            receive_thread.daemon = True
+            receive_thread.start()
+            
+            return True
+        except ConnectionRefusedError:
+            print("Could not connect to the server. Is it running?")
+            return False
+        except Exception as e:
+            print(f"Error connecting to server: {e}")
+            return False
+    
+    def send_message(self, message):
+        """Send a message to the server"""
+        if not self.connected:
+            print("Not connected to server!")
+            return
+            
+        try:
+            self.socket.sendall(encode_message(message))
+        except:
+            print("Error sending message. Disconnecting...")
+            self.disconnect()
+    
+    def receive_messages(self):
+        """Continuously receive and process messages from the server"""
+        decoder = MessageDecoder()
+        try:
+            while self.connected:
+                data = self.socket.recv(RECV_SIZE)
+                if not data:
+                    break
+
+                # A read may hold part of a message or several of them
+                for message in decoder.feed(data):
+                    self.process_message(message)
+        except:
+            if self.connected:
+                print("Connection to server lost!")
+                self.disconnect()
+    
+    def process_message(self, message):
+        """Process received messages based on their type"""
+        message_type = message.get('type', '')
+        
+        if message_type == 'welcome':
+            print(message.get('message', ''))
+            print(f"There are {message.get('player_count', 0)} players connected.")
+            print("Type 'ready' when you're ready to play!")
+            
+        elif message_type == 'player_joined':
+            print(message.get('message', ''))
+            print(f"There are now {message.get('player_count', 0)} players connected.")
+            
+        elif message_type == 'player_left':
+            print(message.get('message', ''))
+            print(f"There are {message.get('player_count', 0)} players remaining.")
+            
+        elif message_type == 'waiting':
+            print(message.get('message', ''))
+            
+        elif message_type == 'game_started':
+            print("\n" + "="*50)
+            print(message.get('message', ''))
+            print("="*50)
+            current_player = message.get('current_player', '')
+            self.is_my_turn = (current_player == self.username)
+            
+            if self.is_my_turn:
+                print("It's your turn! Enter a number between 1 and 100:")
+            else:
+                print(f"Waiting for {current_player} to make a guess...")
+                
+        elif message_type == 'next_turn':
+            print(message.get('message', ''))
+            current_player = message.get('current_player', '')
+            self.is_my_turn = (current_player == self.username)
+            
+            if self.is_my_turn:
+                print("It's your turn! Enter a number between 1 and 100:")
+                
+        elif message_type == 'guess_result':
+            print(message.get('message', ''))
+            
+        elif message_type == 'error':
+            print(f"Error: {message.get('message', '')}")
+            
+        elif message_type == 'game_won':
+            print("\n" + "*"*50)
+            print(message.get('message', ''))
+            print("*"*50)
+            print("The game will restart shortly. Type 'ready' when you're ready for the next round.")
+            
+        elif message_type == 'game_reset':
+            print("\n" + "-"*50)
+            print(message.get('message', ''))
+            print("-"*50)
+            
+        elif message_type == 'chat':
+            username = message.get('username', 'Unknown')
+            chat_message = message.get('message', '')
+            print(f"[CHAT] {username}: {chat_message}")
+    
+    def ready(self):
+        """Send ready signal to the server"""
+        self.send_message({'type': 'ready'})
+        print("Waiting for other players to get ready...")
+    
+    def send_guess(self, guess):
+        """Send a guess to the server"""
+        if not self.is_my_turn:
+            print("It's not your turn!")
+            return
+            
+        try:
+            guess_value = int(guess)
+            self.send_message({
+                'type': 'guess',
+                'guess': guess_value
+            })
+        except ValueError:
+            print("Please enter a valid number!")
+    
+    def send_chat(self, message):
+        """Send a chat message to all players"""
+        self.send_message({
+            'type': 'chat',
+            'message': message
+        })
+    
+    def disconnect(self):
+        """Disconnect from the server"""
+        self.connected = False
+        try:
+            self.socket.close()
+        except:
+            pass
+        print("Disconnected from server.")
+
+# Command-line interface for the client
+def run_client():
+    client = None
+    
+    try:
+        print("="*50)
+        print("MULTIPLAYER NUMBER GUESSING GAME")
+        print("="*50)
+        print("\nEnter server details (press Enter for defaults):")
+        
+        host = input("Server hostname [localhost]: ").strip() or 'localhost'
+        
+        port_input = input("Server port [5555]: ").strip() or '5555'
+        try:
+            port = int(port_input)
+        except ValueError:
+            print("Invalid port number. Using default 5555.")
+            port = 5555
+        
+        username = input("Enter your username: ").strip()
+        while not username:
+            username = input("Username cannot be empty. Please enter your username: ").strip()
+        
+        print(f"\nConnecting to {host}:{port} as {username}...")
+        client = GameClient(host, port)
+        
+        if not client.connect(username):
+            print("Failed to connect. Exiting...")
+            return
+        
+        print("\nConnected to the server!")
+        print("Type 'ready' to start the game, or 'help' for commands.")
+        
+        # Main input loop
+        while client.connected:
+            user_input = input().strip()
+            
+            if user_input.lower() == 'quit' or user_input.lower() == 'exit':
+                client.disconnect()
+                break
+                
+            elif user_input.lower() == 'help':
+                print("\nAvailable commands:")
+                print("  ready    - Signal that you're ready to play")
+                print("  chat <message> - Send a chat message to all players")
+                print("  quit/exit - Disconnect and exit")
+                print("  <number> - Make a guess when it's your turn")
+                
+            elif user_input.lower() == 'ready':
+                client.ready()
+                
+            elif user_input.lower().startswith('chat '):
+                chat_message = user_input[5:].strip()
+                if chat_message:
+                    client.send_chat(chat_message)
+                    
+            elif user_input.isdigit():
+                client.send_guess(user_input)
+                
+            else:
+                print("Unknown command. Type 'help' for available commands.")
+    
+    except KeyboardInterrupt:
+        print("\nExiting...")
+    finally:
+        if client and client.connected:
+            client.disconnect()
+
+if __name__ == "__main__":
+    run_client()
@@ -0,0 +1,263 @@
+# Binary codec for per-tick game messages
+#
+# Chat and lobby messages stay JSON, but state snapshots and inputs are sent
+# every tick, so they use a compact binary layout instead. Each message type
+# has a Schema: a type byte, fixed-width fields packed with one precompiled
+# struct, unsigned/zigzag varints for counters that are usually small, and
+# lists of fixed-width rows (obstacles, coins...) packed back to back after a
+# varint count. Type bytes are below 0x20, so a binary payload can never be
+# mistaken for a JSON one (which starts with '{').
+import struct
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+VARINT = "varint"     # Unsigned LEB128
+SVARINT = "svarint"   # Zigzag-encoded signed LEB128
+
+class CodecError(ValueError):
+    """A binary payload does not match its schema"""
+
+def encode_varint(value):
+    if 0 <= value < 0x80:
+        return bytes((value,))   # Most counters fit in one byte
+    if value < 0:
+        raise CodecError(f"Negative value {value} for an unsigned varint")
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def decode_varint(data, offset):
+    """Returns (value, offset just past it)"""
+    value = shift = 0
+    while True:
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise CodecError("Truncated varint") from None
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+        if shift > 63:
+            raise CodecError("Varint longer than 64 bits")
+
+def encode_svarint(value):
+    return encode_varint(value * 2 if value >= 0 else -value * 2 - 1)
+
+def decode_svarint(data, offset):
+    value, offset = decode_varint(data, offset)
+    return (value >> 1) ^ -(value & 1), offset
+
+@lru_cache(maxsize=256)
+def rows_struct(row_format, count):
+    """Struct packing count rows back to back"""
+    return struct.Struct("<" + row_format[1:] * count)
+
+class Schema:
+    """Binary layout of one message type
+
+    fields: (name, code) pairs where code is a struct format character or
+    VARINT/SVARINT. lists: (name, row fields) pairs; every row field must be
+    fixed-width and rows are sent as tuples in that field order.
+    """
+    def __init__(self, name, type_id, fields, lists=()):
+        if not 0 < type_id < 0x20:
+            raise ValueError("type_id must be between 1 and 31")
+        self.name = name
+        self.type_id = type_id
+        self.fixed_names = [field for field, code in fields if code not in (VARINT, SVARINT)]
+        self.varint_fields = [(field, code == SVARINT) for field, code in fields if code in (VARINT, SVARINT)]
+        self.fixed = struct.Struct("<B" + "".join(code for _, code in fields if code not in (VARINT, SVARINT)))
+        names = self.fixed_names
+        if len(names) > 1:
+            self.get_fixed = itemgetter(*names)   # Returns a tuple only for 2+ names
+        else:
+            self.get_fixed = lambda message: tuple(message[field] for field in names)
+        self.lists = [(list_name, struct.Struct("<" + "".join(code for _, code in row))) for list_name, row in lists]
+
+    def encode(self, message):
+        """Pack a message dict; list entries are row tuples"""
+        try:
+            parts = [self.fixed.pack(self.type_id, *self.get_fixed(message))]
+            for field, signed in self.varint_fields:
+                parts.append(encode_svarint(message[field]) if signed else encode_varint(message[field]))
+            for list_name, row in self.lists:
+                rows = message[list_name]
+                parts.append(encode_varint(len(rows)))
+                if rows:
+                    # One pack call for the whole list
+                    parts.append(rows_struct(row.format, len(rows)).pack(*chain.from_iterable(rows)))
+        except (KeyError, struct.error) as e:
+            raise CodecError(f"Cannot encode {self.name}: {e}") from None
+        return b"".join(parts)
+
+    def decode(self, data):
+        """Unpack a payload into a message dict with 'type' set"""
+        try:
+            values = self.fixed.unpack_from(data, 0)
+        except struct.error as e:
+            raise CodecError(f"Truncated {self.name}: {e}") from None
+        message = {'type': self.name}
+        message.update(zip(self.fixed_names, values[1:]))
+        offset = self.fixed.size
+        for field, signed in self.varint_fields:
+            message[field], offset = (decode_svarint if signed else decode_varint)(data, offset)
+        for list_name, row in self.lists:
+            count, offset = decode_varint(data, offset)
+            end = offset + count * row.size
+            if end > len(data):
+                raise CodecError(f"Truncated {list_name} list in {self.name}")
+            message[list_name] = list(row.iter_unpack(memoryview(data)[offset:end]))
+            offset = end
+        if offset != len(data):
+            raise CodecError(f"{len(data) - offset} trailing bytes after {self.name}")
+        return message
+
+# Player flag bits
+FLAG_JUMPING = 1
+FLAG_ON_GROUND = 2
+FLAG_ALIVE = 4
+FLAG_JETPACK = 8
+FLAG_FINISHED = 16    # Race runner crossed the line or ran out of lives
+
+# Input button bits
+BUTTON_JUMP = 1
+BUTTON_JETPACK = 2
+
+POWERUP_KINDS = ("shield", "speed", "coin_magnet", "double_coins", "jetpack")
+
+STATE = Schema("state", 1, (
+    ("state", "B"),
+    ("biome", "B"),
+    ("lives", "B"),
+    ("active_powerups", "B"),   # Bit per POWERUP_KINDS entry
+    ("speed", "f"),
+    ("distance", "f"),
+    ("player_x", "h"),
+    ("player_y", "h"),
+    ("player_velocity_y", "f"),
+    ("player_flags", "B"),
+    ("jetpack_fuel", "H"),
+    ("tick", VARINT),
+    ("score", VARINT),
+    ("coins", VARINT),
+), lists=(
+    ("obstacles", (("x", "h"), ("y", "h"), ("width", "H"), ("height", "H"), ("kind", "B"))),
+    ("coin_positions", (("x", "h"), ("y", "h"))),
+    ("powerups", (("x", "h"), ("y", "h"), ("kind", "B"))),
+))
+
+INPUT = Schema("input", 2, (
+    ("buttons", "B"),
+    ("tick", VARINT),
+))
+
+# Race mode: each client's own runner, sent every frame
+RACE_UPDATE = Schema("race_update", 3, (
+    ("distance", "f"),
+    ("player_y", "h"),
+    ("player_flags", "B"),
+    ("biome", "B"),
+    ("tick", VARINT),
+    ("score", VARINT),
+))
+
+# Race mode: the server's latest row for every runner in the room
+RACE_STATE = Schema("race_state", 4, (
+    ("tick", VARINT),
+), lists=(
+    ("runners", (("player_id", "H"), ("distance", "f"), ("player_y", "h"),
+                 ("player_flags", "B"), ("biome", "B"), ("score", "I"))),
+))
+
+# Spectator replication (see replication): the watched runner, then entities
+# by stable id. A keyframe lists every entity; a delta only what changed since
+# the previous tick - spawns, despawns and positions the viewer's dead
+# reckoning (x += vx) would get wrong.
+SPECTATE_FIELDS = (
+    ("state", "B"),
+    ("biome", "B"),
+    ("lives", "B"),
+    ("active_powerups", "B"),
+    ("speed", "f"),
+    ("distance", "f"),
+    ("player_x", "h"),
+    ("player_y", "h"),
+    ("player_flags", "B"),
+    ("tick", VARINT),
+    ("score", VARINT),
+    ("coins", VARINT),
+)
+ENTITY_ROW = (("entity_id", "I"), ("kind", "B"), ("subtype", "B"), ("x", "h"), ("y", "h"),
+              ("width", "H"), ("height", "H"), ("vx", "b"))
+
+SPECTATE_KEYFRAME = Schema("spectate_keyframe", 5, SPECTATE_FIELDS, lists=(
+    ("entities", ENTITY_ROW),
+))
+
+SPECTATE_DELTA = Schema("spectate_delta", 6, SPECTATE_FIELDS, lists=(
+    ("spawned", ENTITY_ROW),
+    ("despawned", (("entity_id", "I"),)),
+    ("moved", (("entity_id", "I"), ("x", "h"), ("y", "h"))),
+))
+
+SCHEMAS = {schema.name: schema for schema in (STATE, INPUT, RACE_UPDATE, RACE_STATE, SPECTATE_KEYFRAME, SPECTATE_DELTA)}
+SCHEMAS_BY_ID = {schema.type_id: schema for schema in SCHEMAS.values()}
+
+def is_binary(payload):
+    return len(payload) > 0 and payload[0] in SCHEMAS_BY_ID
+
+def encode(message):
+    return SCHEMAS[message['type']].encode(message)
+
+def decode(payload):
+    schema = SCHEMAS_BY_ID.get(payload[0]) if payload else None
+    if schema is None:
+        raise CodecError("Unknown binary message type")
+    return schema.decode(payload)
+
+def player_flags(player):
+    return ((FLAG_JUMPING if player.jumping else 0) | (FLAG_ON_GROUND if player.on_ground else 0)
+            | (FLAG_ALIVE if player.is_alive else 0) | (FLAG_JETPACK if player.has_jetpack else 0))
+
+def state_message(game, tick):
+    """Snapshot of a cosmic_runner Game for the STATE schema"""
+    player = game.player
+    flags = player_flags(player)
+    active = 0
+    for bit, kind in enumerate(POWERUP_KINDS):
+        if game.active_powerups.get(kind):
+            active |= 1 << bit
+    return {
+        'type': 'state',
+        'tick': tick,
+        'state': game.state,
+        'biome': game.current_biome,
+        'lives': max(0, game.lives),
+        'active_powerups': active,
+        'speed': game.speed,
+        'distance': game.distance,
+        'score': game.score,
+        'coins': game.total_coins,
+        'player_x': player.rect.x,
+        'player_y': player.rect.y,
+        'player_velocity_y': player.velocity_y,
+        'player_flags': flags,
+        'jetpack_fuel': int(player.jetpack_fuel),
+        'obstacles': [(o.rect.x, o.rect.y, o.rect.width, o.rect.height, o.type) for o in game.obstacles],
+        'coin_positions': [(c.rect.x, c.rect.y) for c in game.coins],
+        'powerups': [(p.rect.x, p.rect.y, POWERUP_KINDS.index(p.type)) for p in game.powerups],
+    }
+
+def input_message(game, tick, jump):
+    """The local player's buttons for one tick"""
+    return {
+        'type': 'input',
+        'tick': tick,
+        'buttons': (BUTTON_JUMP if jump else 0) | (BUTTON_JETPACK if game.jetpack_held else 0)
+    }
@@ -0,0 +1,228 @@
+# Load test for the multiplayer server
+#
+# Starts the server in its own process (pinned to one CPU where the OS
+# allows it), opens thousands of client connections from this process, then
+# has one client send chat messages and measures how long each takes to
+# reach every other client. --slow clients connect but never read: the
+# server should drop them without delaying anyone else.
+#
+#   python -m multiplayer.loadtest --connections 2000 --messages 20 --slow 10
+import os
+import re
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+from .protocol import encode_message, FrameDecoder
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PING_PATTERN = re.compile(rb"ping-(\d+)-end")
+CONNECT_CONCURRENCY = 200
+
+class LoadClient:
+    """One simulated player that counts messages and timestamps pings"""
+    def __init__(self, index):
+        self.index = index
+        self.reader = None
+        self.writer = None
+        self.messages = 0
+        self.welcomed = asyncio.Event()
+        self.ping_arrivals = {}   # ping number -> perf_counter time
+
+    async def connect(self, host, port, slow=False):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        if slow:
+            # A tiny receive window so the server's writes back up quickly
+            sock = self.writer.get_extra_info("socket")
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        self.writer.write(encode_message({'type': 'username', 'username': f"load_{self.index}"}))
+        await self.writer.drain()
+
+    async def read_loop(self):
+        # Frames are counted and scanned without parsing the JSON, which would
+        # make this process the bottleneck instead of the server
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+                now = time.perf_counter()
+                for payload in decoder.feed(data):
+                    self.messages += 1
+                    if not self.welcomed.is_set() and b'"welcome"' in payload:
+                        self.welcomed.set()
+                    match = PING_PATTERN.search(payload)
+                    if match:
+                        self.ping_arrivals.setdefault(int(match.group(1)), now)
+        except ConnectionError:
+            pass
+
+    def send_chat(self, text):
+        self.writer.write(encode_message({'type': 'chat', 'message': text}))
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+def raise_file_limit(needed):
+    try:
+        import resource
+    except ImportError:
+        return  # Windows has no per-process descriptor limit to raise
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+def free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+def start_server(host, port, cpu, log_file, extra_args=()):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, "multiplayer-game.py"), "server", "--host", host, "--port", str(port),
+         *extra_args],
+        cwd=REPO_DIR, stdout=log_file, stderr=subprocess.STDOUT
+    )
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(process.pid, {cpu})
+
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Server did not start listening")
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+async def run_load(host, port, connections, messages, slow, interval, timeout):
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    readers = []
+
+    async def open_client(client, is_slow=False):
+        async with semaphore:
+            await client.connect(host, port, slow=is_slow)
+        if not is_slow:
+            # Read from the start: joins are broadcast to everyone already connected
+            readers.append(asyncio.ensure_future(client.read_loop()))
+
+    # Slow clients join first so every later join is broadcast at them
+    slow_clients = [LoadClient(f"slow_{i}") for i in range(slow)]
+    await asyncio.gather(*(open_client(c, True) for c in slow_clients))
+
+    clients = [LoadClient(i) for i in range(connections)]
+    started = time.perf_counter()
+    await asyncio.gather(*(open_client(c) for c in clients))
+    await asyncio.wait_for(asyncio.gather(*(c.welcomed.wait() for c in clients)), timeout)
+    connect_s = time.perf_counter() - started
+
+    # Fan-out latency: one client chats, every client should see it
+    sender = clients[0]
+    sent_at = {}
+    for ping in range(messages):
+        sent_at[ping] = time.perf_counter()
+        sender.send_chat(f"ping-{ping}-end")
+        await asyncio.sleep(interval)
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if all(len(c.ping_arrivals) >= messages for c in clients):
+            break
+        await asyncio.sleep(0.05)
+
+    latencies_ms = sorted(
+        (arrival - sent_at[ping]) * 1000
+        for c in clients for ping, arrival in c.ping_arrivals.items()
+    )
+    fanout_ms = sorted(
+        (max(c.ping_arrivals.get(ping, float("inf")) for c in clients) - sent_at[ping]) * 1000
+        for ping in range(messages)
+    )
+    delivered = sum(len(c.ping_arrivals) for c in clients)
+
+    for client in clients + slow_clients:
+        client.close()
+    for reader in readers:
+        reader.cancel()
+
+    return {
+        "connections": connections,
+        "slow_clients": slow,
+        "connect_and_welcome_s": round(connect_s, 3),
+        "messages_received": sum(c.messages for c in clients),
+        "pings_sent": messages,
+        "pings_delivered": delivered,
+        "pings_expected": messages * connections,
+        "delivery_latency_p50_ms": round(percentile(latencies_ms, 0.50) or 0, 3),
+        "delivery_latency_p99_ms": round(percentile(latencies_ms, 0.99) or 0, 3),
+        "delivery_latency_max_ms": round(latencies_ms[-1], 3) if latencies_ms else None,
+        "fanout_p50_ms": round(percentile(fanout_ms, 0.50), 3) if fanout_ms else None,
+        "fanout_max_ms": round(fanout_ms[-1], 3) if fanout_ms else None,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Multiplayer server load test")
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20, help="Chat messages broadcast to everyone")
+    parser.add_argument("--slow", type=int, default=10, help="Extra clients that never read")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between chat messages")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Use a server already running on this port")
+    parser.add_argument("--cpu", type=int, default=0, help="CPU to pin the spawned server to")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    raise_file_limit(args.connections + args.slow + 256)
+
+    process = None
+    log_file = tempfile.TemporaryFile(mode="w+")
+    port = args.port
+    if port is None:
+        port = free_port(args.host)
+        process = start_server(args.host, port, args.cpu, log_file)
+
+    try:
+        result = asyncio.run(run_load(args.host, port, args.connections, args.messages,
+                                      args.slow, args.interval, args.timeout))
+    finally:
+        if process:
+            process.send_signal(signal.SIGINT)
+            process.wait(timeout=30)
+
+    if process:
+        # Children's usage is only available once the server has exited
+        try:
+            import resource
+            usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            result["server_cpu_s"] = round(usage.ru_utime + usage.ru_stime, 3)
+            result["server_peak_rss_mb"] = round(usage.ru_maxrss / 1024, 1)
+        except ImportError:
+            pass
+        log_file.seek(0)
+        summary = [line for line in log_file.read().splitlines() if line.startswith("Sent ")]
+        if summary:
+            result["server_summary"] = summary[-1]
+
+    print(json.dumps(result, indent=2))
+    return 0 if result["pings_delivered"] == result["pings_expected"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
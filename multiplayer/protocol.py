@@ -0,0 +1,95 @@
+# Multiplayer wire protocol
+#
+# Every message is a frame: a 4-byte big-endian payload length followed by
+# the payload. Chat and lobby messages are UTF-8 JSON; per-tick state and
+# input messages use the binary layouts in codec. TCP is a byte stream, so one
+# read can hold half a message or several of them; FrameDecoder buffers the
+# stream and hands back only whole payloads, in order.
+import json
+import struct
+
+from . import codec
+
+HEADER = struct.Struct("!I")
+HEADER_SIZE = HEADER.size
+# Largest payload a peer may send before the connection is treated as broken
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+class ProtocolError(Exception):
+    """The byte stream is not a valid sequence of frames"""
+
+def encode_frame(payload):
+    """Prefix a payload with its length"""
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message of {len(payload)} bytes exceeds {MAX_MESSAGE_SIZE}")
+    return HEADER.pack(len(payload)) + payload
+
+def encode_message(message):
+    """Encode a message dict as one frame, binary if its type has a schema"""
+    if message.get('type') in codec.SCHEMAS:
+        try:
+            return encode_frame(codec.encode(message))
+        except codec.CodecError as e:
+            raise ProtocolError(str(e)) from None
+    return encode_frame(json.dumps(message, separators=(',', ':')).encode('utf-8'))
+
+def decode_payload(payload):
+    if codec.is_binary(payload):
+        try:
+            return codec.decode(payload)
+        except codec.CodecError as e:
+            raise ProtocolError(str(e)) from None
+    try:
+        message = json.loads(payload)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ProtocolError(f"Invalid message: {e}") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("Message is not an object")
+    return message
+
+class FrameDecoder:
+    """Streaming decoder: feed() raw bytes, get back every completed payload"""
+    def __init__(self, max_size=MAX_MESSAGE_SIZE):
+        self.max_size = max_size
+        self.buffer = bytearray()
+        self.offset = 0           # Start of the first unconsumed byte in buffer
+
+    def feed(self, data):
+        """Add received bytes; returns the payloads they completed (maybe none)"""
+        self.buffer += data
+        payloads = []
+        buffer = self.buffer
+        end = len(buffer)
+        offset = self.offset
+        while end - offset >= HEADER_SIZE:
+            (length,) = HEADER.unpack_from(buffer, offset)
+            if length > self.max_size:
+                raise ProtocolError(f"Frame of {length} bytes exceeds {self.max_size}")
+            if end - offset - HEADER_SIZE < length:
+                break
+            start = offset + HEADER_SIZE
+            payloads.append(bytes(buffer[start:start + length]))
+            offset = start + length
+
+        # Compact once per feed rather than once per frame
+        if offset == end:
+            buffer.clear()
+            offset = 0
+        elif offset > 65536 and offset * 2 > end:
+            del buffer[:offset]
+            offset = 0
+        self.offset = offset
+        return payloads
+
+    def pending(self):
+        """Bytes received that don't yet make a whole frame"""
+        return len(self.buffer) - self.offset
+
+class MessageDecoder(FrameDecoder):
+    """FrameDecoder that decodes each payload into a message dict
+
+    Payloads the binary codec recognises are decoded with it; anything else
+    is parsed as JSON.
+    """
+    def feed(self, data):
+        return [decode_payload(payload) for payload in super().feed(data)]
@@ -0,0 +1,229 @@
+# Fuzz and throughput test for the multiplayer wire protocol
+#
+# Encodes a random mix of small commands and large game-state messages into
+# one stream, then feeds it to the decoder split at random points (single
+# bytes, mid-header, coalesced runs of many frames) and checks every message
+# comes back intact and in order. Malformed streams must raise ProtocolError.
+# Throughput is measured for the decoder alone and over a loopback socket
+# where the kernel chooses the segment boundaries.
+#
+#   python -m multiplayer.protocol_fuzz --rounds 200 --seed 1
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from .protocol import (
+    encode_frame, encode_message, FrameDecoder, MessageDecoder, ProtocolError, HEADER, HEADER_SIZE
+)
+
+SMALL_TYPES = ('chat', 'guess', 'ready', 'next_turn', 'player_joined')
+
+def random_message(rng, large=False):
+    """A chat-sized command, or a game-state snapshot of up to ~400 KB"""
+    if not large and rng.random() < 0.2:
+        # Binary frames (integer fields only, so they round-trip exactly)
+        return {'type': 'input', 'tick': rng.randrange(1 << 40), 'buttons': rng.randrange(4)}
+    if not large:
+        return {
+            'type': rng.choice(SMALL_TYPES),
+            'username': f"player_{rng.randrange(10000)}",
+            'message': "".join(rng.choice("abcdefghij ñ✓🚀") for _ in range(rng.randrange(0, 300)))
+        }
+    return {
+        'type': 'snapshot',   # Large JSON payload; per-tick 'state' messages are binary
+        'tick': rng.randrange(1 << 30),
+        'entities': [
+            {'id': i, 'kind': rng.choice(('obstacle', 'coin', 'tile')),
+             'x': rng.uniform(0, 800), 'y': rng.uniform(0, 600), 'w': rng.randrange(8, 64)}
+            for i in range(rng.randrange(100, 4000))
+        ]
+    }
+
+def random_messages(rng, count, large_fraction=0.02):
+    return [random_message(rng, rng.random() < large_fraction) for _ in range(count)]
+
+def split_points(rng, length, mode):
+    """Chunk boundaries over a stream of the given length"""
+    if mode == "bytes":
+        return range(1, length)
+    if mode == "coalesced":
+        return []
+    if mode == "tiny":
+        limit = 8        # Many splits land inside the 4-byte header
+    elif mode == "medium":
+        limit = 1500     # Roughly one Ethernet segment
+    else:
+        limit = 256 * 1024
+    points, position = [], 0
+    while True:
+        position += rng.randint(1, limit)
+        if position >= length:
+            return points
+        points.append(position)
+
+def chunks(stream, points):
+    start = 0
+    for point in points:
+        yield stream[start:point]
+        start = point
+    yield stream[start:]
+
+def check_round(rng, messages, mode):
+    """Decode one split stream; returns an error string or None"""
+    stream = b"".join(encode_message(m) for m in messages)
+    decoder = MessageDecoder()
+    decoded = []
+    for chunk in chunks(stream, split_points(rng, len(stream), mode)):
+        decoded.extend(decoder.feed(chunk))
+    if decoded != messages:
+        return f"{mode}: decoded {len(decoded)} of {len(messages)} messages, or contents differ"
+    if decoder.pending():
+        return f"{mode}: {decoder.pending()} bytes left over"
+    return None
+
+def check_malformed(rng):
+    """Streams that must be rejected or held back rather than misread"""
+    errors = []
+
+    def expect_error(label, data, max_size=1024):
+        try:
+            MessageDecoder(max_size).feed(data)
+        except ProtocolError:
+            return
+        errors.append(f"malformed: {label} was accepted")
+
+    expect_error("oversized length", HEADER.pack(1025) + b"x" * 1025)
+    expect_error("length split from oversized body", HEADER.pack(0xFFFFFFFF))
+    expect_error("invalid JSON", encode_frame(b"{not json"))
+    expect_error("invalid UTF-8", encode_frame(b'"\xff\xfe"'))
+    expect_error("non-object message", encode_frame(b"[1, 2, 3]"))
+    expect_error("truncated binary message", encode_frame(b"\x02\x01\x80"))
+    expect_error("unknown binary type", encode_frame(b"\x1f\x00"))
+
+    # A truncated stream yields every whole message and keeps the rest
+    messages = random_messages(rng, 20)
+    stream = b"".join(encode_message(m) for m in messages)
+    last_frame = len(encode_message(messages[-1]))
+    cut = len(stream) - rng.randint(1, last_frame - 1)
+    decoder = MessageDecoder()
+    if decoder.feed(stream[:cut]) != messages[:-1] or decoder.pending() != cut - (len(stream) - last_frame):
+        errors.append("malformed: truncated stream lost or invented messages")
+    if decoder.feed(stream[cut:]) != messages[-1:]:
+        errors.append("malformed: truncated stream did not resume")
+
+    # An empty payload is a valid frame
+    if FrameDecoder().feed(encode_frame(b"")) != [b""]:
+        errors.append("malformed: empty frame was not returned")
+    try:
+        encode_frame(bytes(FrameDecoder().max_size + 1))
+        errors.append("malformed: oversized payload was encoded")
+    except ProtocolError:
+        pass
+    return errors
+
+def fuzz(seed, rounds, messages_per_round):
+    rng = random.Random(seed)
+    errors = check_malformed(rng)
+    for round_index in range(rounds):
+        # Tiny and byte-at-a-time reads are slow, so they get small messages only
+        small = random_messages(rng, messages_per_round, large_fraction=0)
+        mixed = random_messages(rng, messages_per_round)
+        checks = [(small, "tiny"), (mixed, "medium"), (mixed, "large"), (mixed, "coalesced")]
+        if round_index % 20 == 0:
+            checks.append((small[:50], "bytes"))
+        for messages, mode in checks:
+            error = check_round(rng, messages, mode)
+            if error:
+                errors.append(f"round {round_index} {error}")
+    return errors
+
+def decode_throughput(rng, messages, chunk_size, repeats=3):
+    """Best-of decode rate for a stream fed in fixed-size reads"""
+    stream = b"".join(encode_message(m) for m in messages)
+    pieces = list(chunks(stream, range(chunk_size, len(stream), chunk_size)))
+    best = None
+    for _ in range(repeats):
+        decoder = FrameDecoder()
+        started = time.perf_counter()
+        count = 0
+        for piece in pieces:
+            count += len(decoder.feed(piece))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    assert count == len(messages)
+    return {
+        "messages": len(messages),
+        "mb": round(len(stream) / 1e6, 2),
+        "mb_per_s": round(len(stream) / 1e6 / best, 1),
+        "messages_per_s": round(len(messages) / best)
+    }
+
+async def socket_throughput(stream, frames, write_size):
+    """Send a stream over loopback in odd-sized writes and decode it as it arrives"""
+    done = asyncio.get_running_loop().create_future()
+
+    async def receive(reader, writer):
+        decoder = FrameDecoder()
+        count = 0
+        while count < frames:
+            data = await reader.read(64 * 1024)
+            if not data:
+                break
+            count += len(decoder.feed(data))
+        done.set_result((count, time.perf_counter()))
+        writer.close()
+
+    server = await asyncio.start_server(receive, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    started = time.perf_counter()
+    for start in range(0, len(stream), write_size):
+        writer.write(stream[start:start + write_size])
+        await writer.drain()
+    count, finished = await done
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    return count, finished - started
+
+def measure(seed):
+    rng = random.Random(seed)
+    small = random_messages(rng, 50000, large_fraction=0)
+    large = [random_message(rng, large=True) for _ in range(20)]
+    results = {
+        "decode_small_4kb_reads": decode_throughput(rng, small, 4096),
+        "decode_small_64kb_reads": decode_throughput(rng, small, 64 * 1024),
+        "decode_state_64kb_reads": decode_throughput(rng, large, 64 * 1024),
+    }
+    stream = b"".join(encode_message(m) for m in small + large)
+    count, elapsed = asyncio.run(socket_throughput(stream, len(small) + len(large), 7919))
+    results["loopback"] = {
+        "messages": count,
+        "mb": round(len(stream) / 1e6, 2),
+        "mb_per_s": round(len(stream) / 1e6 / elapsed, 1),
+        "messages_per_s": round(count / elapsed)
+    }
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz and benchmark the multiplayer wire protocol")
+    parser.add_argument("--rounds", type=int, default=25)
+    parser.add_argument("--messages", type=int, default=200, help="Messages per fuzz round")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-throughput", action="store_true")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    errors = fuzz(args.seed, args.rounds, args.messages)
+    result = {"seed": args.seed, "rounds": args.rounds, "header_bytes": HEADER_SIZE, "errors": errors[:20]}
+    if not args.skip_throughput:
+        result["throughput"] = measure(args.seed)
+    print(json.dumps(result, indent=2))
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,502 @@
+# Race mode: two or more players run the same seeded course
+#
+# The server keeps one open RaceRoom as the lobby. Players join and ready up;
+# once enough are ready the room hands everyone the same seed and the finish
+# distance, carries on as a race of its own and a fresh lobby opens. Clients
+# draw the other runners as ghosts from RACE_STATE messages, which carry the
+# latest row for every runner at RELAY_RATE - one encode and one message per
+# client per relay however much traffic came in.
+#
+# With a SimulationPool (see authority) the server is authoritative: clients
+# send their buttons every frame as INPUT messages, a worker process replays
+# them and the rows, distances and scores come from its simulation. Without
+# one, each client sends its own runner as one RACE_UPDATE a frame and the
+# room trusts what it reports.
+#
+# RaceClient is the client half. It never blocks: poll() runs once per frame
+# and reads/writes at most a fixed number of bytes, so a flood of traffic or
+# a stalled socket costs the frame a bounded amount of work.
+import time
+import errno
+import random
+import socket
+import asyncio
+
+from . import codec
+from .protocol import encode_message, FrameDecoder, decode_payload, ProtocolError
+
+RELAY_RATE = 30                 # RACE_STATE messages a second
+MAX_SCREEN_SIZE = 8192          # Largest play area a client may report
+DEFAULT_MIN_PLAYERS = 2
+DEFAULT_RACE_DISTANCE = 3000    # Three biomes
+TICK_RATE = 60                  # Client frames a second; race times count them
+
+# Per-frame network budget of a RaceClient
+FRAME_BUDGET_IN = 16 * 1024     # Bytes read per frame; the rest waits in the socket
+FRAME_BUDGET_OUT = 512          # Bytes written per frame; the rest waits in the outbox
+
+# Server side
+
+def screen_size(screen):
+    """A client's reported (width, height, ground level), or None if it isn't one"""
+    try:
+        width, height, ground = (int(value) for value in screen)
+    except (TypeError, ValueError):
+        return None
+    if 0 < width <= MAX_SCREEN_SIZE and 0 < ground <= height <= MAX_SCREEN_SIZE:
+        return (width, height, ground)
+    return None
+
+class RaceRunner:
+    """One player's entry in the room"""
+    def __init__(self, client_id, name):
+        self.client_id = client_id
+        self.name = name
+        self.ready = False
+        self.racing = False
+        self.screen = None      # Client's (width, height, ground level); the course depends on it
+        self.row = (client_id, 0.0, 0, 0, 0, 0)   # RACE_STATE runner row
+        self.result = None      # (distance, score, finish time) once finished
+        self.claim = None       # (distance, score, tick) the client reported
+        self.sim_tick = None    # Last tick the simulation replayed
+        self.rejected_inputs = 0
+
+    def verified(self):
+        """Whether the client's own report matches the simulation's"""
+        distance, score, _ = self.result
+        claimed_distance, claimed_score, claimed_tick = self.claim
+        return abs(claimed_distance - distance) < 0.01 and claimed_score == score and claimed_tick == self.sim_tick
+
+class RaceRoom:
+    """Lobby, then relay and referee, for one race"""
+    def __init__(self, server, room_id, min_players=DEFAULT_MIN_PLAYERS, distance=DEFAULT_RACE_DISTANCE):
+        self.server = server
+        self.room_id = room_id
+        self.min_players = min_players
+        self.distance = distance
+        self.sim = server.sim_pool  # None: trust the clients' own updates
+        self.runners = {}       # {client_id: RaceRunner}
+        self.started = False
+        self.started_at = None
+        self.seed = None
+        self.tick = 0
+        self.dirty = False
+        self.relay_handle = None
+
+    def racers(self):
+        return [runner for runner in self.runners.values() if runner.racing]
+
+    def send_lobby(self):
+        ready = sum(runner.ready for runner in self.runners.values())
+        self.server.broadcast({
+            'type': 'race_lobby',
+            'players': [runner.name for runner in self.runners.values()],
+            'ready': ready,
+            'needed': max(self.min_players, len(self.runners)),
+            'started': self.started
+        }, recipients=self.runners)
+
+    def join(self, client_id, name):
+        if client_id not in self.runners:
+            self.runners[client_id] = RaceRunner(client_id, name)
+        self.send_lobby()
+
+    def ready(self, client_id, message):
+        runner = self.runners.get(client_id)
+        if runner is None or runner.ready:
+            return
+        runner.ready = True
+        runner.screen = screen_size(message.get('screen'))
+        ready = [r for r in self.runners.values() if r.ready]
+        if not self.started and len(ready) >= self.min_players and len(ready) == len(self.runners):
+            self.start()
+        else:
+            self.send_lobby()
+
+    def start(self):
+        self.started = True
+        self.started_at = time.perf_counter()
+        self.seed = random.getrandbits(31)
+        self.tick = 0
+        for runner in self.runners.values():
+            runner.racing = True
+            runner.result = runner.claim = runner.sim_tick = None
+            runner.rejected_inputs = 0
+            runner.row = (runner.client_id, 0.0, 0, 0, 0, 0)
+        players = [{'id': r.client_id, 'name': r.name} for r in self.runners.values()]
+        print(f"Race {self.room_id} started with {len(players)} players, seed {self.seed}")
+        if self.sim is not None:
+            self.sim.create_room(self.room_id, self.seed, self.distance,
+                                 {r.client_id: r.screen for r in self.runners.values()})
+        self.server.race_started(self)
+        for runner in self.runners.values():
+            self.server.send_message(runner.client_id, {
+                'type': 'race_start',
+                'seed': self.seed,
+                'distance': self.distance,
+                'players': players,
+                'you': runner.client_id,
+                'authoritative': self.sim is not None
+            })
+        if self.sim is None:
+            self.schedule_relay()
+
+    def schedule_relay(self):
+        self.relay_handle = asyncio.get_running_loop().call_later(1 / RELAY_RATE, self.relay)
+
+    def update(self, client_id, message):
+        runner = self.runners.get(client_id)
+        if runner is None or not runner.racing or self.sim is not None:
+            return
+        self.server.race_updates_received += 1
+        # The server stamps the id, so clients can't move each other's runners
+        runner.row = (client_id, message['distance'], message['player_y'], message['player_flags'],
+                      message['biome'], min(message['score'], 0xFFFFFFFF))
+        self.dirty = True
+
+    def relay(self):
+        """Send every runner's latest row to the whole room, once per relay tick"""
+        self.relay_handle = None
+        if not self.started:
+            return
+        self.tick += 1
+        if self.dirty:
+            self.dirty = False
+            racers = self.racers()
+            self.server.broadcast({
+                'type': 'race_state',
+                'tick': self.tick,
+                'runners': [runner.row for runner in racers]
+            }, recipients=[runner.client_id for runner in racers])
+            self.server.race_states_relayed += 1
+        self.schedule_relay()
+
+    def input(self, client_id, message):
+        """Pass one frame's buttons on to the simulation"""
+        runner = self.runners.get(client_id)
+        if runner is None or not runner.racing or self.sim is None:
+            return
+        self.server.race_updates_received += 1
+        self.sim.input(self.room_id, client_id, message['tick'], message['buttons'])
+
+    def sim_states(self, tick, rows):
+        """Relay the simulation's rows for the runners still in the room"""
+        racers = [runner.client_id for runner in self.racers()]
+        self.server.broadcast({
+            'type': 'race_state',
+            'tick': tick,
+            'runners': [row for row in rows if row[0] in self.runners]
+        }, recipients=racers)
+        self.server.race_states_relayed += 1
+
+    def sim_finished(self, client_id, distance, score, tick, rejected):
+        runner = self.runners.get(client_id)
+        if runner is None or not runner.racing:
+            return
+        runner.result = (distance, score, tick / TICK_RATE)
+        runner.sim_tick = tick
+        runner.rejected_inputs = rejected
+        self.server.spectators.runner_finished(self.room_id, client_id)
+        self.check_finished()
+
+    def finish(self, client_id, message):
+        runner = self.runners.get(client_id)
+        if runner is None or not runner.racing or runner.claim is not None:
+            return
+        try:
+            runner.claim = (float(message.get('distance', 0)), int(message.get('score', 0)),
+                            int(message.get('tick', 0)))
+        except (TypeError, ValueError):
+            runner.claim = (0.0, 0, 0)
+        if self.sim is not None:
+            # The simulation stops this runner once it has replayed that tick
+            self.sim.stop_at(self.room_id, client_id, runner.claim[2])
+        else:
+            runner.result = (runner.claim[0], runner.claim[1], time.perf_counter() - self.started_at)
+        self.check_finished()
+
+    def leave(self, client_id):
+        if self.runners.pop(client_id, None) is None:
+            return
+        if self.started:
+            if self.sim is not None:
+                self.sim.leave(self.room_id, client_id)
+                self.server.spectators.runner_finished(self.room_id, client_id)
+            self.check_finished()
+        else:
+            self.send_lobby()
+
+    def check_finished(self):
+        """Send the standings once every racer has a result (and, if simulated, a report)"""
+        racers = self.racers()
+        if any(runner.result is None or runner.claim is None for runner in racers):
+            return
+        standings = sorted(racers, key=lambda r: (-min(r.result[0], self.distance), r.result[2]))
+        entries = []
+        for r in standings:
+            entry = {'name': r.name, 'distance': round(r.result[0], 1), 'score': r.result[1],
+                     'time': round(r.result[2], 2)}
+            if self.sim is not None:
+                entry['verified'] = r.verified()
+                if not entry['verified']:
+                    print(f"Race {self.room_id}: {r.name} reported {r.claim}, simulation has "
+                          f"{r.result} ({r.rejected_inputs} rejected inputs)")
+            entries.append(entry)
+        self.server.broadcast({'type': 'race_results', 'standings': entries}, recipients=self.runners)
+        print(f"Race {self.room_id} finished: {', '.join(r.name for r in standings)}")
+        self.reset()
+        self.server.race_finished(self)
+
+    def reset(self):
+        self.started = False
+        if self.relay_handle is not None:
+            self.relay_handle.cancel()
+            self.relay_handle = None
+        if self.sim is not None:
+            self.sim.close_room(self.room_id)
+        for runner in self.runners.values():
+            runner.ready = runner.racing = False
+
+# Client side
+
+def race_update_message(game, tick, finished=False):
+    """This client's runner for the RACE_UPDATE schema"""
+    flags = codec.player_flags(game.player) | (codec.FLAG_FINISHED if finished else 0)
+    return {
+        'type': 'race_update',
+        'tick': tick,
+        'distance': game.distance,
+        'player_y': game.player.rect.y,
+        'player_flags': flags,
+        'biome': game.current_biome,
+        'score': game.score
+    }
+
+class Ghost:
+    """Another runner as last relayed by the server"""
+    __slots__ = ("player_id", "name", "distance", "y", "flags", "biome", "score")
+
+    def __init__(self, player_id, name):
+        self.player_id = player_id
+        self.name = name
+        self.distance = 0.0
+        self.y = 0
+        self.flags = 0
+        self.biome = 0
+        self.score = 0
+
+    @property
+    def finished(self):
+        return bool(self.flags & codec.FLAG_FINISHED)
+
+class RaceClient:
+    """Non-blocking race connection polled once per frame"""
+    def __init__(self, host, port, name="Runner",
+                 budget_in=FRAME_BUDGET_IN, budget_out=FRAME_BUDGET_OUT):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.budget_in = budget_in
+        self.budget_out = budget_out
+        self.socket = None
+        self.connected = False
+        self.decoder = FrameDecoder()
+        self.outbox = bytearray()       # Control messages waiting to be written
+        self.pending_update = None      # Latest RACE_UPDATE frame; older ones are replaced
+        self.authoritative = False      # The server simulates this race from our inputs
+
+        # Race state
+        self.lobby = None               # Last race_lobby message
+        self.is_ready = False
+        self.seed = None
+        self.distance_goal = DEFAULT_RACE_DISTANCE
+        self.player_id = None
+        self.ghosts = {}                # {player_id: Ghost}
+        self.state_tick = 0
+        self.started = False            # race_start arrived and hasn't been consumed
+        self.racing = False
+        self.finished = False
+        self.results = None
+
+        # Budget statistics
+        self.frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.frame_bytes_in = 0
+        self.frame_bytes_out = 0
+        self.peak_bytes_in = 0
+        self.peak_bytes_out = 0
+        self.frames_in_capped = 0       # Frames that stopped reading at the budget
+        self.frames_out_capped = 0      # Frames that left data in the outbox
+        self.poll_ms = 0.0
+        self.peak_poll_ms = 0.0
+
+    def connect(self, timeout=5.0):
+        """Connect and join the race lobby; False if the server isn't there"""
+        try:
+            self.socket = socket.create_connection((self.host, self.port), timeout=timeout)
+        except OSError as e:
+            print(f"Could not connect to race server {self.host}:{self.port}: {e}")
+            return False
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.setblocking(False)
+        self.connected = True
+        self.queue({'type': 'username', 'username': self.name})
+        self.queue({'type': 'race_join'})
+        return True
+
+    def queue(self, message):
+        self.outbox += encode_message(message)
+
+    def ready(self):
+        """Ready up, telling the server the play area the course will be laid out in"""
+        from cosmic_runner import layout
+        if not self.is_ready:
+            self.is_ready = True
+            self.queue({'type': 'race_ready',
+                        'screen': [layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT, layout.GROUND_LEVEL]})
+
+    def send_input(self, game, tick):
+        """Send the buttons behind this frame's update; every one is needed to replay it"""
+        jump, game.jump_pressed = game.jump_pressed, False
+        if self.racing and self.authoritative:
+            self.queue(codec.input_message(game, tick, jump))
+
+    def send_update(self, game, tick):
+        """Replace any unsent position update with this frame's"""
+        if self.racing and not self.authoritative:
+            self.pending_update = encode_message(race_update_message(game, tick, self.finished))
+
+    def finish(self, game, tick):
+        """Report the final distance, score and tick once"""
+        if not self.racing or self.finished:
+            return
+        self.finished = True
+        if not self.authoritative:
+            self.pending_update = encode_message(race_update_message(game, tick, finished=True))
+        self.queue({'type': 'race_finish', 'distance': game.distance, 'score': game.score, 'tick': tick})
+
+    def consume_start(self):
+        """True once when a race_start has arrived"""
+        started, self.started = self.started, False
+        return started
+
+    def poll(self):
+        """Read and write within this frame's budget, then apply what arrived"""
+        if not self.connected:
+            return
+        started = time.perf_counter()
+        self.frames += 1
+        self.frame_bytes_in = self.frame_bytes_out = 0
+        latest_state = None
+        try:
+            for payload in self.read_within_budget():
+                if codec.is_binary(payload) and payload[0] == codec.RACE_STATE.type_id:
+                    latest_state = payload      # Only the newest one matters
+                else:
+                    self.handle_message(decode_payload(payload))
+            if latest_state is not None:
+                self.apply_state(codec.decode(latest_state))
+            self.write_within_budget()
+        except (OSError, ProtocolError, codec.CodecError) as e:
+            print(f"Race connection lost: {e}")
+            self.close()
+
+        self.bytes_in += self.frame_bytes_in
+        self.bytes_out += self.frame_bytes_out
+        self.peak_bytes_in = max(self.peak_bytes_in, self.frame_bytes_in)
+        self.peak_bytes_out = max(self.peak_bytes_out, self.frame_bytes_out)
+        self.poll_ms = (time.perf_counter() - started) * 1000
+        self.peak_poll_ms = max(self.peak_poll_ms, self.poll_ms)
+
+    def read_within_budget(self):
+        payloads = []
+        while self.frame_bytes_in < self.budget_in:
+            try:
+                data = self.socket.recv(self.budget_in - self.frame_bytes_in)
+            except BlockingIOError:
+                return payloads
+            if not data:
+                raise ConnectionResetError(errno.ECONNRESET, "server closed the connection")
+            self.frame_bytes_in += len(data)
+            payloads.extend(self.decoder.feed(data))
+        self.frames_in_capped += 1
+        return payloads
+
+    def write_within_budget(self):
+        if self.pending_update is not None:
+            self.outbox += self.pending_update
+            self.pending_update = None
+        if not self.outbox:
+            return
+        allowed = min(len(self.outbox), self.budget_out)
+        try:
+            sent = self.socket.send(memoryview(self.outbox)[:allowed])
+        except BlockingIOError:
+            sent = 0
+        del self.outbox[:sent]
+        self.frame_bytes_out += sent
+        if self.outbox:
+            self.frames_out_capped += 1
+
+    def handle_message(self, message):
+        message_type = message.get('type')
+        if message_type == 'race_lobby':
+            self.lobby = message
+        elif message_type == 'race_start':
+            self.seed = message['seed']
+            self.distance_goal = message['distance']
+            self.player_id = message['you']
+            self.authoritative = message.get('authoritative', False)
+            self.ghosts = {
+                player['id']: Ghost(player['id'], player['name'])
+                for player in message['players'] if player['id'] != self.player_id
+            }
+            self.state_tick = 0
+            self.started = self.racing = True
+            self.finished = False
+            self.results = None
+        elif message_type == 'race_results':
+            self.results = message['standings']
+            self.racing = self.is_ready = False
+
+    def apply_state(self, message):
+        if message['tick'] <= self.state_tick:
+            return
+        self.state_tick = message['tick']
+        for player_id, distance, y, flags, biome, score in message['runners']:
+            ghost = self.ghosts.get(player_id)
+            if ghost is not None:
+                ghost.distance, ghost.y, ghost.flags, ghost.biome, ghost.score = distance, y, flags, biome, score
+
+    def lobby_lines(self):
+        """What the menu shows while waiting for a race"""
+        if not self.connected:
+            return [f"Race server {self.host}:{self.port} disconnected"]
+        if self.lobby is None:
+            return [f"Joining race on {self.host}:{self.port}..."]
+        lines = [f"Racers: {', '.join(self.lobby['players'])}"]
+        if self.lobby['started']:
+            lines.append("A race is under way - you'll join the next one")
+        if self.is_ready:
+            lines.append(f"Ready! Waiting for racers ({self.lobby['ready']}/{self.lobby['needed']})")
+        else:
+            lines.append("Press SPACE when you're ready to race")
+        return lines
+
+    def status_lines(self):
+        """Lobby / budget lines for the debug overlay"""
+        lines = [f"Race {self.host}:{self.port} as {self.name}" + ("" if self.connected else " (disconnected)")]
+        lines.append(f"Net in {self.frame_bytes_in}B/frame (peak {self.peak_bytes_in}/{self.budget_in}), "
+                     f"out {self.frame_bytes_out}B/frame (peak {self.peak_bytes_out}/{self.budget_out})")
+        lines.append(f"Net poll {self.poll_ms:.2f}ms (peak {self.peak_poll_ms:.2f}ms), "
+                     f"capped frames in/out {self.frames_in_capped}/{self.frames_out_capped}")
+        return lines
+
+    def close(self):
+        self.connected = False
+        if self.socket is not None:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
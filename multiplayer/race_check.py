@@ -0,0 +1,207 @@
+# Localhost race check
+#
+# Starts a server and several headless racers, each in its own process (the
+# course comes from the process-wide random module, as in the real game),
+# lets simple jump bots race to a short finish line and checks that:
+#
+# - every racer got the same seed and generated the same course
+# - every racer saw every other one as a ghost
+# - every racer stayed inside its per-frame network budget
+# - everyone received the same final standings
+# - with server simulation (the default), the server's distance and score for
+#   every racer match what the racer itself ended the race with
+#
+#   python -m multiplayer.race_check --players 3 --distance 300 [--sim-workers 0]
+import os
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+import tempfile
+import multiprocessing
+
+from .loadtest import free_port, start_server
+from .race import RaceClient, FRAME_BUDGET_IN, FRAME_BUDGET_OUT
+
+FPS = 60
+COURSE_OBSTACLES = 12      # Obstacles compared across racers
+
+def bot_input(game, rng):
+    """Jump when the next obstacle is close, with per-racer timing jitter"""
+    player = game.player
+    for obstacle in game.obstacles:
+        gap = obstacle.rect.left - player.rect.right
+        if 0 <= gap < game.speed * 8 + rng.randint(-12, 12):
+            game.jump_input()
+            break
+
+def run_racer(host, port, name, timeout, results):
+    """Child process: play one race headlessly and report what happened"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import pygame
+    from cosmic_runner import layout, Game
+    from cosmic_runner.constants import PLAYING
+
+    pygame.display.init()
+    pygame.display.set_mode((layout.SCREEN_WIDTH, layout.SCREEN_HEIGHT))
+    game = Game()
+    bot_rng = random.Random(name)   # Separate from the course's random stream
+    race = RaceClient(host, port, name)
+    report = {"name": name, "error": None}
+    if not race.connect():
+        report["error"] = "could not connect"
+        results.put(report)
+        return
+    race.ready()
+
+    course = []
+    seen_obstacles = set()
+    speed_boosted = False
+    ghosts_seen = set()
+    tick = 0
+    deadline = time.perf_counter() + timeout
+    next_frame = time.perf_counter()
+    while race.connected and race.results is None and time.perf_counter() < deadline:
+        race.poll()
+        if race.consume_start():
+            game.seed_course(race.seed)
+            game.reset_game()
+            game.state = PLAYING
+
+        if race.racing and not race.finished:
+            bot_input(game, bot_rng)
+            game.update()
+            tick += 1
+            race.send_input(game, tick)
+            # A speed boost changes spawn timing, so the shared course ends there
+            speed_boosted = speed_boosted or "speed" in game.active_powerups
+            for obstacle in game.obstacles:
+                if id(obstacle) not in seen_obstacles and not speed_boosted and len(course) < COURSE_OBSTACLES:
+                    seen_obstacles.add(id(obstacle))
+                    course.append((obstacle.type, obstacle.rect.width, obstacle.rect.height))
+            if game.state != PLAYING or game.distance >= race.distance_goal:
+                race.finish(game, tick)
+            else:
+                race.send_update(game, tick)
+            ghosts_seen.update(g.name for g in race.ghosts.values() if g.distance > 0)
+
+        next_frame += 1 / FPS
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+    race.close()
+    report.update({
+        "seed": race.seed,
+        "course": course,
+        "distance": round(game.distance, 1),
+        "frames": race.frames,
+        "ghosts_seen": sorted(ghosts_seen),
+        "opponents": sorted(g.name for g in race.ghosts.values()),
+        "states_received": race.state_tick,
+        "peak_bytes_in": race.peak_bytes_in,
+        "peak_bytes_out": race.peak_bytes_out,
+        "mean_bytes_in": round(race.bytes_in / max(1, race.frames), 1),
+        "mean_bytes_out": round(race.bytes_out / max(1, race.frames), 1),
+        "frames_in_capped": race.frames_in_capped,
+        "frames_out_capped": race.frames_out_capped,
+        "peak_poll_ms": round(race.peak_poll_ms, 3),
+        "standings": [runner['name'] for runner in race.results] if race.results else None,
+        "authoritative": race.authoritative,
+        "score": game.score,
+        "server_result": next((runner for runner in race.results or () if runner['name'] == name), None),
+    })
+    if race.results is None:
+        report["error"] = "no race results"
+    results.put(report)
+
+def check(reports, players):
+    """Problems found across the racers' reports"""
+    problems = [f"{r['name']}: {r['error']}" for r in reports if r.get("error")]
+    if len(reports) != players:
+        problems.append(f"only {len(reports)} of {players} racers reported")
+    reports = [r for r in reports if not r.get("error")]
+    if not reports:
+        return problems
+    if len({r["seed"] for r in reports}) != 1:
+        problems.append("racers got different seeds")
+    shortest = min(len(r["course"]) for r in reports)
+    if shortest and len({tuple(map(tuple, r["course"][:shortest])) for r in reports}) != 1:
+        problems.append(f"courses differ within the first {shortest} obstacles")
+    for r in reports:
+        if set(r["ghosts_seen"]) != set(r["opponents"]):
+            problems.append(f"{r['name']} never saw {sorted(set(r['opponents']) - set(r['ghosts_seen']))}")
+        if r["peak_bytes_in"] > FRAME_BUDGET_IN or r["peak_bytes_out"] > FRAME_BUDGET_OUT:
+            problems.append(f"{r['name']} went over its network budget")
+        server_result = r["server_result"] or {}
+        if r["authoritative"] and (not server_result.get("verified") or server_result.get("score") != r["score"]
+                                   or abs(server_result.get("distance", -1) - r["distance"]) > 0.1):
+            problems.append(f"{r['name']}: server simulation disagrees: {server_result}")
+    if len({tuple(r["standings"]) for r in reports}) != 1:
+        problems.append("racers disagree on the standings")
+    return problems
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless race on localhost and check it")
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--distance", type=int, default=300, help="Race finish distance")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds before a racer gives up")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--sim-workers", type=int, default=1, help="Server simulation processes (0 trusts clients)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    port = free_port(args.host)
+    log_file = tempfile.TemporaryFile(mode="w+")
+    server = start_server(args.host, port, None, log_file, (
+        "--race-players", str(args.players), "--race-distance", str(args.distance),
+        "--sim-workers", str(args.sim_workers), "--sim-metrics-interval", "1"
+    ))
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    racers = [
+        context.Process(target=run_racer, args=(args.host, port, f"bot{i}", args.timeout, results))
+        for i in range(args.players)
+    ]
+    try:
+        for racer in racers:
+            racer.start()
+        reports = []
+        for _ in racers:
+            try:
+                reports.append(results.get(timeout=args.timeout + 30))
+            except Exception:
+                break
+        for racer in racers:
+            racer.join(timeout=5)
+    finally:
+        server.send_signal(signal.SIGINT)
+        server.wait(timeout=30)
+
+    log_file.seek(0)
+    log = log_file.read().splitlines()
+    summary = [line for line in log if line.startswith("Sent ")]
+    if args.sim_workers and not any(line.startswith("Sim worker ") for line in log):
+        problems_log = ["server reported no simulation tick timings"]
+    else:
+        problems_log = []
+    problems = check(reports, args.players) + problems_log
+    for report in reports:
+        report["course_obstacles"] = len(report.pop("course", ()))
+    print(json.dumps({
+        "players": args.players,
+        "distance": args.distance,
+        "budget_in": FRAME_BUDGET_IN,
+        "budget_out": FRAME_BUDGET_OUT,
+        "racers": sorted(reports, key=lambda r: r["name"]),
+        "server_summary": summary[-1] if summary else None,
+        "sim_timings": [line for line in log if line.startswith("Sim worker ")][-args.sim_workers:] if args.sim_workers else [],
+        "problems": problems
+    }, indent=2))
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# Spectator replication
+#
+# Spectators watch one runner of a race under way. The race simulation (see
+# authority) feeds that runner's Game to a Replicator after every tick, which
+# encodes it once for everybody: a SPECTATE_KEYFRAME with every obstacle,
+# coin and power-up every KEYFRAME_INTERVAL ticks, and a SPECTATE_DELTA
+# otherwise. Entities are keyed by the stable ids Game assigns when it spawns
+# them. A delta lists what was spawned and despawned, and a position only
+# when dead reckoning (x += vx, y unchanged) would get it wrong. Most
+# entities just scroll, so most ticks send no positions at all.
+#
+# SpectatorHub is the server half: it keeps each watched runner's frames
+# since its last keyframe, so a late spectator can catch up, and sends every
+# bundle of frames to all of that runner's spectators as one shared buffer.
+# SpectatorView is the viewer half, rebuilding the entities from the frames.
+from . import codec
+from .protocol import encode_frame
+
+KEYFRAME_INTERVAL = 60          # Ticks between keyframes (one a second)
+
+# Entity kinds
+ENTITY_OBSTACLE = 0
+ENTITY_COIN = 1
+ENTITY_POWERUP = 2
+
+def clamp_vx(dx):
+    """Dead-reckoning velocity as sent (a signed byte); both ends clamp alike"""
+    return -128 if dx < -128 else 127 if dx > 127 else dx
+
+def header(game, tick):
+    """The watched runner's own fields, shared by keyframes and deltas"""
+    player = game.player
+    active = 0
+    for bit, kind in enumerate(codec.POWERUP_KINDS):
+        if game.active_powerups.get(kind):
+            active |= 1 << bit
+    return {
+        'tick': tick,
+        'state': game.state,
+        'biome': game.current_biome,
+        'lives': max(0, game.lives),
+        'active_powerups': active,
+        'speed': game.speed,
+        'distance': game.distance,
+        'score': game.score,
+        'coins': game.total_coins,
+        'player_x': player.rect.x,
+        'player_y': player.rect.y,
+        'player_flags': codec.player_flags(player),
+    }
+
+def entities(game):
+    """(entity_id, kind, subtype, entity) for everything replicated"""
+    for obstacle in game.obstacles:
+        yield obstacle.entity_id, ENTITY_OBSTACLE, obstacle.type, obstacle
+    for coin in game.coins:
+        yield coin.entity_id, ENTITY_COIN, 0, coin
+    for powerup in game.powerups:
+        yield powerup.entity_id, ENTITY_POWERUP, codec.POWERUP_KINDS.index(powerup.type), powerup
+
+class Replicator:
+    """Encodes one Game tick by tick as keyframes and deltas"""
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.known = {}             # {entity_id: [x, y, vx]} as every viewer predicts it
+        self.since_keyframe = None  # None: the next capture is a keyframe
+
+        # Statistics
+        self.keyframes = 0
+        self.deltas = 0
+        self.keyframe_bytes = 0
+        self.delta_bytes = 0
+
+    def request_keyframe(self):
+        self.since_keyframe = None
+
+    def capture(self, game, tick):
+        """Frames for this tick as (is_keyframe, framed bytes) pairs
+
+        A keyframe tick also gets its delta first, so viewers already in sync
+        can check that they rebuilt the tick exactly.
+        """
+        fields = header(game, tick)
+        frames = []
+        if self.since_keyframe is not None:
+            frames.append((False, self.delta(game, fields)))
+            self.since_keyframe += 1
+        if self.since_keyframe is None or self.since_keyframe >= self.keyframe_interval:
+            frames.append((True, self.keyframe(game, fields)))
+            self.since_keyframe = 0
+        return frames
+
+    def keyframe(self, game, fields):
+        known = self.known
+        rows = []
+        new_known = {}
+        for entity_id, kind, subtype, entity in entities(game):
+            rect = entity.rect
+            state = known.get(entity_id)
+            vx = state[2] if state is not None else clamp_vx(-round(entity.speed))
+            rows.append((entity_id, kind, subtype, rect.x, rect.y, rect.width, rect.height, vx))
+            new_known[entity_id] = [rect.x, rect.y, vx]
+        self.known = new_known
+        fields['type'] = 'spectate_keyframe'
+        fields['entities'] = rows
+        data = encode_frame(codec.SPECTATE_KEYFRAME.encode(fields))
+        self.keyframes += 1
+        self.keyframe_bytes += len(data)
+        return data
+
+    def delta(self, game, fields):
+        known = self.known
+        new_known = {}
+        spawned = []
+        moved = []
+        for entity_id, kind, subtype, entity in entities(game):
+            rect = entity.rect
+            state = known.pop(entity_id, None)
+            if state is None:
+                vx = clamp_vx(-round(entity.speed))
+                spawned.append((entity_id, kind, subtype, rect.x, rect.y, rect.width, rect.height, vx))
+                state = [rect.x, rect.y, vx]
+            else:
+                x, y, vx = state
+                if rect.x != x + vx or rect.y != y:
+                    moved.append((entity_id, rect.x, rect.y))
+                    state[:] = rect.x, rect.y, clamp_vx(rect.x - x)
+                else:
+                    state[0] = x + vx
+            new_known[entity_id] = state
+        despawned = [(entity_id,) for entity_id in known]   # Whatever wasn't seen this tick
+        self.known = new_known
+        fields['type'] = 'spectate_delta'
+        fields['spawned'] = spawned
+        fields['despawned'] = despawned
+        fields['moved'] = moved
+        data = encode_frame(codec.SPECTATE_DELTA.encode(fields))
+        self.deltas += 1
+        self.delta_bytes += len(data)
+        return data
+
+class SpectatorView:
+    """A spectator's copy of the watched runner, rebuilt from keyframes and deltas"""
+    def __init__(self):
+        self.entities = {}          # {entity_id: [kind, subtype, x, y, width, height, vx]}
+        self.header = None          # Latest runner fields
+        self.tick = None            # Tick the view is at; None until the first keyframe
+
+        # Statistics
+        self.keyframes = 0
+        self.deltas = 0
+        self.skipped = 0            # Deltas that arrived out of sync and were ignored
+        self.checked = 0            # Keyframes compared against the view rebuilt from deltas
+        self.mismatches = 0         # ...that didn't match it
+
+    def apply(self, message):
+        """Apply a decoded spectate_keyframe or spectate_delta"""
+        if message['type'] == 'spectate_keyframe':
+            self.apply_keyframe(message)
+        else:
+            self.apply_delta(message)
+
+    def apply_keyframe(self, message):
+        entities = {row[0]: list(row[1:]) for row in message['entities']}
+        if self.tick == message['tick']:
+            self.checked += 1
+            if entities != self.entities:
+                self.mismatches += 1
+        self.entities = entities
+        self.header = message
+        self.tick = message['tick']
+        self.keyframes += 1
+
+    def apply_delta(self, message):
+        if self.tick is None or message['tick'] != self.tick + 1:
+            self.skipped += 1
+            return
+        entities = self.entities
+        for entity in entities.values():
+            entity[2] += entity[6]
+        for (entity_id,) in message['despawned']:
+            entities.pop(entity_id, None)
+        for entity_id, x, y in message['moved']:
+            entity = entities.get(entity_id)
+            if entity is not None:
+                previous_x = entity[2] - entity[6]
+                entity[2], entity[3], entity[6] = x, y, clamp_vx(x - previous_x)
+        for row in message['spawned']:
+            entities[row[0]] = list(row[1:])
+        self.header = message
+        self.tick = message['tick']
+        self.deltas += 1
+
+    def entities_of(self, kind):
+        return [entity for entity in self.entities.values() if entity[0] == kind]
+
+# Server side
+
+class SpectatorFeed:
+    """One watched runner: its spectators and its frames since the last keyframe"""
+    def __init__(self, room_id, player_id, name):
+        self.room_id = room_id
+        self.player_id = player_id
+        self.name = name
+        self.spectators = set()     # client ids
+        self.history = []           # Framed bytes from the latest keyframe on
+
+class SpectatorHub:
+    """Spectators on the server, attached to runners of races under way"""
+    def __init__(self, server):
+        self.server = server
+        self.feeds = {}             # {(room_id, player_id): SpectatorFeed}
+        self.watching = {}          # {client_id: SpectatorFeed}
+        self.waiting = {}           # {client_id: runner name wanted, or None}
+
+        # Fan-out statistics
+        self.bundles = 0
+        self.frames = 0
+        self.bytes = 0
+        self.deliveries = 0
+
+    def join(self, client_id, name=None):
+        """Watch the named runner, or the first runner of the latest race"""
+        self.leave(client_id)
+        if self.server.sim_pool is None:
+            self.server.send_message(client_id, {
+                'type': 'error', 'message': "Spectating needs a server that simulates races (--sim-workers)"
+            })
+            return
+        self.waiting[client_id] = name
+        self.attach_waiting()
+        if client_id in self.waiting:
+            self.server.send_message(client_id, {'type': 'spectate_wait'})
+
+    def leave(self, client_id):
+        self.waiting.pop(client_id, None)
+        feed = self.watching.pop(client_id, None)
+        if feed is not None:
+            feed.spectators.discard(client_id)
+            if not feed.spectators:
+                self.close_feed(feed, unwatch=True)
+
+    def attach_waiting(self):
+        """Give waiting spectators a runner if any race is under way"""
+        if not self.waiting or not self.server.races:
+            return
+        for client_id, name in list(self.waiting.items()):
+            runner = self.pick_runner(name)
+            if runner is None:
+                continue
+            room, race_runner = runner
+            key = (room.room_id, race_runner.client_id)
+            feed = self.feeds.get(key)
+            if feed is None:
+                feed = self.feeds[key] = SpectatorFeed(room.room_id, race_runner.client_id, race_runner.name)
+                self.server.sim_pool.watch(room.room_id, race_runner.client_id)
+            del self.waiting[client_id]
+            feed.spectators.add(client_id)
+            self.watching[client_id] = feed
+            self.server.send_message(client_id, {
+                'type': 'spectate_start', 'room': room.room_id, 'name': feed.name, 'distance': room.distance
+            })
+            if feed.history:
+                self.server.send_data(b"".join(feed.history), (client_id,))
+
+    def pick_runner(self, name):
+        for room in reversed(list(self.server.races.values())):
+            for runner in room.racers():
+                if runner.result is None and (name is None or runner.name == name):
+                    return room, runner
+        return None
+
+    def publish(self, room_id, player_id, frames):
+        """Fan one bundle of a runner's frames out to its spectators"""
+        feed = self.feeds.get((room_id, player_id))
+        if feed is None:
+            return
+        for is_keyframe, data in frames:
+            if is_keyframe:
+                feed.history = [data]
+            elif feed.history:
+                feed.history.append(data)
+        data = b"".join(data for _, data in frames)    # One buffer for every spectator
+        self.bundles += 1
+        self.frames += len(frames)
+        self.bytes += len(data)
+        self.deliveries += len(feed.spectators)
+        self.server.send_data(data, feed.spectators)
+
+    def close_feed(self, feed, unwatch=False):
+        """Stop a feed; its spectators wait for another runner"""
+        if self.feeds.pop((feed.room_id, feed.player_id), None) is None:
+            return
+        if unwatch:
+            self.server.sim_pool.unwatch(feed.room_id, feed.player_id)
+        for client_id in feed.spectators:
+            self.watching.pop(client_id, None)
+            self.waiting[client_id] = None
+            self.server.send_message(client_id, {'type': 'spectate_end', 'name': feed.name})
+        feed.spectators = set()
+        self.attach_waiting()
+
+    def runner_finished(self, room_id, player_id):
+        feed = self.feeds.get((room_id, player_id))
+        if feed is not None:
+            self.close_feed(feed, unwatch=True)
+
+    def race_finished(self, room):
+        for feed in [feed for feed in self.feeds.values() if feed.room_id == room.room_id]:
+            self.close_feed(feed)
@@ -0,0 +1,498 @@
+# Multiplayer game server (asyncio)
+#
+# One event loop serves every client, so there is no lock and no thread per
+# connection. Each client gets its own bounded write queue drained by a
+# writer task: broadcast() encodes a message once and only enqueues it, so a
+# slow client can never stall the others. A client whose queue fills up is
+# disconnected instead of buffering without limit. Messages are framed by
+# the protocol module, so reads may split or coalesce them freely. Races are
+# simulated in worker processes (see authority), never on the event loop.
+import asyncio
+import argparse
+import random
+from collections import deque
+
+from .protocol import encode_message, MessageDecoder, ProtocolError
+from .race import RaceRoom, DEFAULT_MIN_PLAYERS, DEFAULT_RACE_DISTANCE
+from .authority import SimulationPool, METRICS_INTERVAL, metrics_lines
+from .replication import SpectatorHub
+
+DEFAULT_HOST = 'localhost'
+DEFAULT_PORT = 5555
+
+# Bytes a client may have waiting before it counts as too slow. Joins are
+# broadcast to everyone, so this must hold a burst of one message per player.
+MAX_QUEUED_BYTES = 1024 * 1024
+# Transport buffer above which the writer task waits for the socket to drain
+WRITE_BUFFER_HIGH_WATER = 64 * 1024
+READ_SIZE = 64 * 1024
+# Clients only send small commands; anything bigger is a broken peer
+MAX_CLIENT_MESSAGE_SIZE = 64 * 1024
+DEFAULT_SIM_WORKERS = 1
+
+class ClientConnection:
+    """A connected client and its outgoing message queue"""
+    def __init__(self, client_id, reader, writer, max_queued_bytes=MAX_QUEUED_BYTES):
+        self.client_id = client_id
+        self.reader = reader
+        self.writer = writer
+        self.username = f"Player_{client_id}"
+        self.guesses = 0
+        self.ready = False
+        self.queue = deque()
+        self.queued_bytes = 0
+        self.max_queued_bytes = max_queued_bytes
+        self.has_data = asyncio.Event()
+        self.closed = False
+        self.writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER)
+        self.writer_task = asyncio.get_running_loop().create_task(self.write_loop())
+
+    def send(self, data):
+        """Queue encoded bytes without blocking; False if the client is too far behind"""
+        if self.closed:
+            return True
+        if self.queued_bytes + len(data) > self.max_queued_bytes:
+            return False
+        self.queue.append(data)
+        self.queued_bytes += len(data)
+        self.has_data.set()
+        return True
+
+    async def write_loop(self):
+        """Drain the queue into the socket, batching whatever has piled up"""
+        try:
+            while True:
+                await self.has_data.wait()
+                self.has_data.clear()
+                chunks = list(self.queue)
+                self.queue.clear()
+                self.queued_bytes = 0
+                self.writer.writelines(chunks)
+                # Waits while the socket is backed up; send() keeps queueing
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.writer_task.cancel()
+        self.writer.close()
+
+class GameServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_queued_bytes=MAX_QUEUED_BYTES,
+                 race_players=DEFAULT_MIN_PLAYERS, race_distance=DEFAULT_RACE_DISTANCE,
+                 sim_workers=DEFAULT_SIM_WORKERS, sim_metrics_interval=METRICS_INTERVAL, sim_room_metrics=False):
+        self.host = host
+        self.port = port
+        self.max_queued_bytes = max_queued_bytes
+        self.clients = {}  # {client_id: ClientConnection}
+        self.client_counter = 0
+        self.target_number = random.randint(1, 100)
+        self.current_player = 0
+        self.game_started = False
+        self.players_ready = 0
+        self.server = None
+        self.reset_handle = None
+        self.pending_drops = []
+        self.dropping = False
+
+        # Races: one open lobby room, then a room per race under way
+        self.race_players = race_players
+        self.race_distance = race_distance
+        self.sim_workers = sim_workers
+        self.sim_metrics_interval = sim_metrics_interval
+        self.sim_room_metrics = sim_room_metrics
+        self.sim_pool = None        # Started with the event loop; None trusts clients
+        self.race_counter = 0
+        self.race = None
+        self.races = {}             # {room_id: RaceRoom} under way
+        self.race_rooms = {}        # {client_id: RaceRoom}
+        self.spectators = SpectatorHub(self)
+
+        # Load statistics
+        self.messages_sent = 0
+        self.slow_disconnects = 0
+        self.race_updates_received = 0
+        self.race_states_relayed = 0
+
+    async def serve(self, ready=None):
+        """Accept connections until cancelled; sets ready once listening"""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Server started on {self.host}:{self.port}")
+        print(f"The target number is: {self.target_number}")
+        if self.sim_workers > 0:
+            self.sim_pool = SimulationPool(self.sim_workers, self, self.sim_metrics_interval)
+            self.sim_pool.start()
+        self.race = self.new_race_room()
+        if ready is not None:
+            ready.set()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            for client in list(self.clients.values()):
+                client.close()
+            if self.sim_pool is not None:
+                self.sim_pool.stop()
+
+    def start(self):
+        """Start the server and listen for connections"""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("Server shutting down...")
+        finally:
+            print(f"Sent {self.messages_sent} messages, dropped {self.slow_disconnects} slow clients, "
+                  f"relayed {self.race_updates_received} race updates as {self.race_states_relayed} states "
+                  f"over {self.race_counter} race rooms, fanned out {self.spectators.bundles} spectator "
+                  f"bundles as {self.spectators.deliveries} deliveries")
+
+    async def handle_client(self, reader, writer):
+        """Handle communication with a client"""
+        client_id = self.client_counter
+        self.client_counter += 1
+        client = ClientConnection(client_id, reader, writer, self.max_queued_bytes)
+
+        decoder = MessageDecoder(MAX_CLIENT_MESSAGE_SIZE)
+        joined = False
+
+        try:
+            # Main client communication loop
+            while not client.closed:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                for message in decoder.feed(data):
+                    if client.closed:
+                        break  # Dropped as slow while handling an earlier message
+                    if joined:
+                        self.handle_message(client, message)
+                    else:
+                        # First message should be the username
+                        self.handle_join(client, message)
+                        joined = True
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ProtocolError as e:
+            print(f"Protocol error from client {client_id}: {e}")
+        except Exception as e:
+            print(f"Error handling client {client_id}: {e}")
+        finally:
+            # Clean up when client disconnects
+            self.handle_disconnect(client_id)
+            client.close()
+
+    def handle_join(self, client, message):
+        """Register a client once its username arrives"""
+        client.username = str(message.get('username', client.username))
+        self.clients[client.client_id] = client
+
+        # Notify all clients about the new player
+        self.broadcast({
+            'type': 'player_joined',
+            'username': client.username,
+            'message': f"{client.username} has joined the game!",
+            'player_count': len(self.clients)
+        })
+
+        # Tell this client about the game state
+        self.send_message(client.client_id, {
+            'type': 'welcome',
+            'message': f"Welcome {client.username}! Waiting for more players to join...",
+            'player_count': len(self.clients),
+            'game_started': self.game_started
+        })
+
+    def handle_message(self, client, message):
+        """Dispatch one message from a client"""
+        message_type = message.get('type', '')
+
+        if message_type == 'ready':
+            if not client.ready:
+                client.ready = True
+                self.players_ready += 1
+            if self.players_ready >= 2 and self.players_ready == len(self.clients):
+                self.start_game()
+            else:
+                self.broadcast({
+                    'type': 'waiting',
+                    'message': f"{client.username} is ready! ({self.players_ready}/{len(self.clients)})",
+                    'ready_count': self.players_ready,
+                    'total_players': len(self.clients)
+                })
+
+        elif message_type == 'guess' and self.game_started:
+            current_player_id = list(self.clients.keys())[self.current_player]
+
+            if client.client_id != current_player_id:
+                self.send_message(client.client_id, {
+                    'type': 'error',
+                    'message': "It's not your turn!"
+                })
+                return
+
+            try:
+                guess = int(message.get('guess'))
+            except (TypeError, ValueError):
+                self.send_message(client.client_id, {
+                    'type': 'error',
+                    'message': "Please enter a valid number!"
+                })
+                return
+            self.handle_guess(client.client_id, guess)
+
+        elif message_type == 'input':
+            room = self.race_rooms.get(client.client_id)
+            if room is not None:
+                room.input(client.client_id, message)
+
+        elif message_type == 'race_update':
+            room = self.race_rooms.get(client.client_id)
+            if room is not None:
+                room.update(client.client_id, message)
+
+        elif message_type == 'race_join':
+            if client.client_id not in self.race_rooms:
+                self.race_rooms[client.client_id] = self.race
+                self.race.join(client.client_id, client.username)
+
+        elif message_type == 'race_ready':
+            room = self.race_rooms.get(client.client_id)
+            if room is not None:
+                room.ready(client.client_id, message)
+
+        elif message_type == 'race_finish':
+            room = self.race_rooms.get(client.client_id)
+            if room is not None:
+                room.finish(client.client_id, message)
+
+        elif message_type == 'spectate':
+            name = message.get('name')
+            self.spectators.join(client.client_id, None if name is None else str(name))
+
+        elif message_type == 'chat':
+            self.broadcast({
+                'type': 'chat',
+                'username': client.username,
+                'message': message.get('message', '')
+            })
+
+    def handle_disconnect(self, client_id):
+        """Handle client disconnection"""
+        client = self.clients.pop(client_id, None)
+        if client is None:
+            return
+        client.close()
+        if client.ready:
+            self.players_ready -= 1
+        print(f"Client {client.username} (ID: {client_id}) disconnected")
+        room = self.race_rooms.pop(client_id, None)
+        if room is not None:
+            room.leave(client_id)
+        self.spectators.leave(client_id)
+
+        # Keep the turn pointing at a connected player
+        if self.clients:
+            self.current_player %= len(self.clients)
+
+        # Notify remaining clients
+        self.broadcast({
+            'type': 'player_left',
+            'username': client.username,
+            'message': f"{client.username} has left the game!",
+            'player_count': len(self.clients)
+        })
+
+        # If game was started and not enough players, reset the game
+        if self.game_started and len(self.clients) < 2:
+            self.reset_game()
+
+    def new_race_room(self):
+        self.race_counter += 1
+        return RaceRoom(self, self.race_counter, self.race_players, self.race_distance)
+
+    def race_started(self, room):
+        """A lobby became a race; open a new lobby for everyone else"""
+        self.races[room.room_id] = room
+        self.race = self.new_race_room()
+        self.spectators.attach_waiting()
+
+    def race_finished(self, room):
+        """Move a finished race's players back into the lobby"""
+        self.races.pop(room.room_id, None)
+        self.spectators.race_finished(room)
+        for client_id, runner in list(room.runners.items()):
+            if client_id in self.clients:
+                self.race_rooms[client_id] = self.race
+                self.race.join(client_id, runner.name)
+
+    def sim_states(self, room_id, tick, rows):
+        room = self.races.get(room_id)
+        if room is not None:
+            room.sim_states(tick, rows)
+
+    def sim_finished(self, room_id, client_id, distance, score, tick, rejected):
+        room = self.races.get(room_id)
+        if room is not None:
+            room.sim_finished(client_id, distance, score, tick, rejected)
+
+    def sim_replica(self, room_id, client_id, frames):
+        self.spectators.publish(room_id, client_id, frames)
+
+    def sim_metrics(self, metrics):
+        if metrics['rooms']:
+            for line in metrics_lines(metrics, self.sim_room_metrics):
+                print(line)
+
+    def start_game(self):
+        """Start the game when enough players are ready"""
+        self.game_started = True
+        self.target_number = random.randint(1, 100)
+        print(f"Game started! Target number: {self.target_number}")
+
+        # Reset player statistics
+        for client in self.clients.values():
+            client.guesses = 0
+
+        # Randomly choose first player
+        self.current_player = random.randint(0, len(self.clients) - 1)
+        current_player_id = list(self.clients.keys())[self.current_player]
+        current_player_name = self.clients[current_player_id].username
+
+        # Notify all clients that the game has started
+        self.broadcast({
+            'type': 'game_started',
+            'message': f"The game has started! {current_player_name} goes first.",
+            'current_player': current_player_name
+        })
+
+    def reset_game(self):
+        """Reset the game state"""
+        self.reset_handle = None
+        self.game_started = False
+        self.players_ready = 0
+        for client in self.clients.values():
+            client.ready = False
+        self.target_number = random.randint(1, 100)
+
+        self.broadcast({
+            'type': 'game_reset',
+            'message': "The game has been reset. Type 'ready' when you're ready to play again."
+        })
+
+    def handle_guess(self, client_id, guess):
+        """Handle a player's guess"""
+        client = self.clients[client_id]
+        client.guesses += 1
+
+        if guess == self.target_number:
+            # Player won
+            self.broadcast({
+                'type': 'game_won',
+                'message': f"{client.username} guessed the correct number {self.target_number} in {client.guesses} tries!",
+                'winner': client.username,
+                'target_number': self.target_number
+            })
+            # Reset the game after a short delay
+            if self.reset_handle is None:
+                self.reset_handle = asyncio.get_running_loop().call_later(5.0, self.reset_game)
+        else:
+            hint = "Too low!" if guess < self.target_number else "Too high!"
+            self.broadcast({
+                'type': 'guess_result',
+                'username': client.username,
+                'guess': guess,
+                'message': f"{client.username} guessed {guess} - {hint}"
+            })
+            self.next_player()
+
+    def next_player(self):
+        """Move to the next player's turn"""
+        self.current_player = (self.current_player + 1) % len(self.clients)
+        current_player_id = list(self.clients.keys())[self.current_player]
+        current_player_name = self.clients[current_player_id].username
+
+        self.broadcast({
+            'type': 'next_turn',
+            'message': f"It's {current_player_name}'s turn!",
+            'current_player': current_player_name
+        })
+
+    def send_message(self, client_id, message):
+        """Queue a message for a specific client"""
+        client = self.clients.get(client_id)
+        if client is None:
+            return
+        if client.send(encode_message(message)):
+            self.messages_sent += 1
+        else:
+            self.drop_slow_client(client_id)
+
+    def broadcast(self, message, recipients=None):
+        """Queue a message for all connected clients, or just recipients (never blocks)"""
+        self.send_data(encode_message(message), recipients)  # Encoded once for everyone
+
+    def send_data(self, data, recipients=None):
+        """Queue already framed bytes for all connected clients, or just recipients"""
+        slow = []
+
+        targets = self.clients.items() if recipients is None else (
+            (client_id, self.clients[client_id]) for client_id in recipients if client_id in self.clients
+        )
+        for client_id, client in targets:
+            if client.send(data):
+                self.messages_sent += 1
+            else:
+                slow.append(client_id)
+
+        # Handle any disconnections outside the loop to avoid modifying during iteration
+        for client_id in slow:
+            self.drop_slow_client(client_id)
+
+    def drop_slow_client(self, client_id):
+        """Disconnect a client that stopped reading instead of buffering for it"""
+        # The player_left broadcast can find more slow clients; queue those
+        # rather than recursing once per dropped client
+        self.pending_drops.append(client_id)
+        if self.dropping:
+            return
+        self.dropping = True
+        try:
+            while self.pending_drops:
+                client_id = self.pending_drops.pop()
+                if client_id in self.clients:
+                    self.slow_disconnects += 1
+                    self.handle_disconnect(client_id)
+        finally:
+            self.dropping = False
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cosmic Runner multiplayer server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-queued-kb", type=int, default=MAX_QUEUED_BYTES // 1024,
+                        help="KB a client may fall behind before it is disconnected")
+    parser.add_argument("--race-players", type=int, default=DEFAULT_MIN_PLAYERS,
+                        help="Ready players needed to start a race")
+    parser.add_argument("--race-distance", type=int, default=DEFAULT_RACE_DISTANCE,
+                        help="Distance to the race finish line")
+    parser.add_argument("--sim-workers", type=int, default=DEFAULT_SIM_WORKERS,
+                        help="Processes simulating races from player inputs (0 trusts what clients report)")
+    parser.add_argument("--sim-metrics-interval", type=float, default=METRICS_INTERVAL,
+                        help="Seconds between simulation tick timing reports")
+    parser.add_argument("--sim-room-metrics", action="store_true",
+                        help="Include tick timings for every room in the reports")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    GameServer(args.host, args.port, args.max_queued_kb * 1024,
+               args.race_players, args.race_distance,
+               args.sim_workers, args.sim_metrics_interval, args.sim_room_metrics).start()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Race simulation capacity benchmark
+#
+# Hosts many rooms of synthetic jump bots in a SimulationPool, feeds them
+# inputs at the game's frame rate and reports the per-room tick timings the
+# workers measured, with an estimate of how many rooms one worker can host.
+#
+#   python -m multiplayer.sim_bench --rooms 40 --runners 4 --workers 2
+import sys
+import json
+import random
+import asyncio
+import argparse
+
+from . import codec
+from .authority import SimulationPool, TICK_RATE
+
+class BenchHandler:
+    def __init__(self):
+        self.finished = 0
+        self.states = 0
+        self.metrics = {}
+
+    def sim_states(self, room_id, tick, rows):
+        self.states += 1
+
+    def sim_finished(self, room_id, player_id, distance, score, tick, rejected):
+        self.finished += 1
+
+    def sim_replica(self, room_id, player_id, frames):
+        pass
+
+    def sim_metrics(self, metrics):
+        self.metrics[metrics['worker']] = metrics
+
+async def bench(rooms, runners, workers, seconds, goal):
+    handler = BenchHandler()
+    pool = SimulationPool(workers, handler, metrics_interval=seconds / 2)
+    pool.start()
+    rng = random.Random(0)
+    players = [(room_id, room_id * runners + i) for room_id in range(rooms) for i in range(runners)]
+    for room_id in range(rooms):
+        pool.create_room(room_id, rng.getrandbits(31), goal,
+                         {player_id: None for player_id in range(room_id * runners, (room_id + 1) * runners)})
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    tick = 0
+    while loop.time() - started < seconds:
+        tick += 1
+        for room_id, player_id in players:
+            pool.input(room_id, player_id, tick, codec.BUTTON_JUMP if rng.random() < 0.03 else 0)
+        await asyncio.sleep(max(0.0, started + tick / TICK_RATE - loop.time()))
+    await asyncio.sleep(1.0)
+    pool.stop()
+    return handler, tick
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how many race rooms a simulation worker can host")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--runners", type=int, default=4, help="Runners per room")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--distance", type=int, default=100000, help="Finish distance (large keeps everyone running)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    handler, ticks = asyncio.run(bench(args.rooms, args.runners, args.workers, args.seconds, args.distance))
+    reports = [handler.metrics[index] for index in sorted(handler.metrics)]
+    room_ticks = [room for report in reports for room in report['room_ticks'].values()]
+    mean_ms = sum(room['mean_ms'] for room in room_ticks) / max(1, len(room_ticks))
+    busiest = max((report['busy'] for report in reports), default=0.0)
+    print(json.dumps({
+        "rooms": args.rooms,
+        "runners_per_room": args.runners,
+        "workers": args.workers,
+        "input_ticks_sent": ticks,
+        "runners_finished": handler.finished,
+        "state_reports": handler.states,
+        "room_tick_mean_ms": round(mean_ms, 3),
+        "room_tick_worst_p99_ms": max((room['p99_ms'] for room in room_ticks), default=0.0),
+        "busiest_worker": busiest,
+        # Rooms one worker could host at the measured cost, leaving half the tick spare
+        "rooms_per_worker_estimate": int(0.5 * 1000 / TICK_RATE / mean_ms) if mean_ms else None,
+        "workers_report": [{k: v for k, v in report.items() if k != 'room_ticks'} for report in reports]
+    }, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# Spectator load test
+#
+# Starts a server that simulates races, one headless bot runner (in its own
+# process, as in race_check) and, from this process, a thousand spectators
+# watching it. Most spectators only count the frames they receive; a sample
+# decodes everything into a SpectatorView and checks that the state it
+# rebuilt from deltas matches each keyframe exactly. Reports per-spectator
+# bandwidth, how much smaller deltas are than full snapshots, and the spread
+# in arrival time of the same frame across the sampled spectators.
+#
+#   python -m multiplayer.spectate_loadtest --spectators 1000 --duration 20
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+
+from . import codec
+from .protocol import encode_message, FrameDecoder, decode_payload
+from .replication import SpectatorView
+from .loadtest import free_port, start_server, raise_file_limit, percentile, CONNECT_CONCURRENCY
+from .race_check import run_racer
+
+class Spectator:
+    """One simulated viewer; sampled ones decode and rebuild the runner"""
+    def __init__(self, index, sample=False, measure_snapshots=False):
+        self.index = index
+        self.sample = sample
+        self.measure_snapshots = measure_snapshots
+        self.reader = None
+        self.writer = None
+        self.view = SpectatorView() if sample else None
+        self.frames = 0
+        self.bytes = 0
+        self.started = asyncio.Event()
+        self.first_frame_at = None
+        self.tick_arrivals = {}         # tick -> perf_counter time (sampled spectators)
+        self.snapshot_bytes = 0         # What a full keyframe every tick would have cost
+        self.delta_bytes = 0
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode_message({'type': 'username', 'username': f"spectator_{self.index}"}))
+        self.writer.write(encode_message({'type': 'spectate'}))
+        await self.writer.drain()
+
+    async def read_loop(self):
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+                now = time.perf_counter()
+                self.bytes += len(data)
+                for payload in decoder.feed(data):
+                    if codec.is_binary(payload):
+                        self.frames += 1
+                        if self.first_frame_at is None:
+                            self.first_frame_at = now
+                        if self.sample:
+                            self.apply(payload, now)
+                    elif b'"spectate_start"' in payload:
+                        self.started.set()
+        except ConnectionError:
+            pass
+
+    def apply(self, payload, now):
+        message = decode_payload(payload)
+        self.view.apply(message)
+        self.tick_arrivals.setdefault(message['tick'], now)
+        if self.measure_snapshots and message['type'] == 'spectate_delta' and self.view.tick == message['tick']:
+            self.delta_bytes += len(payload)
+            keyframe = dict(message, type='spectate_keyframe',
+                            entities=[(entity_id,) + tuple(entity) for entity_id, entity in self.view.entities.items()])
+            self.snapshot_bytes += len(codec.SPECTATE_KEYFRAME.encode(keyframe))
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+async def run_spectators(host, port, count, samples, duration, timeout):
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    sampled = set(range(0, count, max(1, count // max(1, samples)))[:samples])   # Spread over join order
+    spectators = [Spectator(i, sample=(i in sampled), measure_snapshots=(i == 0)) for i in range(count)]
+    readers = []
+
+    async def open_spectator(spectator):
+        async with semaphore:
+            await spectator.connect(host, port)
+        readers.append(asyncio.ensure_future(spectator.read_loop()))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(open_spectator(s) for s in spectators))
+    connect_s = time.perf_counter() - started
+    await asyncio.wait_for(asyncio.gather(*(s.started.wait() for s in spectators)), timeout)
+    watching_at = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - watching_at
+
+    for spectator in spectators:
+        spectator.close()
+    for reader in readers:
+        reader.cancel()
+
+    sampled = [s for s in spectators if s.sample]
+    views = [s.view for s in sampled]
+    # Same frame, different spectators: how far apart did it arrive?
+    spreads_ms = []
+    common_ticks = set.intersection(*(set(s.tick_arrivals) for s in sampled)) if sampled else set()
+    for tick in common_ticks:
+        arrivals = [s.tick_arrivals[tick] for s in sampled]
+        spreads_ms.append((max(arrivals) - min(arrivals)) * 1000)
+    spreads_ms.sort()
+    first_frame_s = sorted(s.first_frame_at - started for s in spectators if s.first_frame_at)
+    measured = spectators[0]
+    frames = [s.frames for s in spectators]
+    return {
+        "spectators": count,
+        "sampled": len(sampled),
+        "connect_s": round(connect_s, 3),
+        "first_frame_p99_s": round(percentile(first_frame_s, 0.99), 3) if first_frame_s else None,
+        "watched_s": round(elapsed, 2),
+        "spectators_without_frames": sum(1 for f in frames if f == 0),
+        "frames_per_spectator_min": min(frames),
+        "frames_per_spectator_max": max(frames),
+        "bytes_per_spectator_per_s": round(sum(s.bytes for s in spectators) / count / elapsed, 1),
+        "keyframes_checked": sum(v.checked for v in views),
+        "keyframe_mismatches": sum(v.mismatches for v in views),
+        "deltas_skipped": sum(v.skipped for v in views),
+        "entities_in_view": len(measured.view.entities) if measured.view else None,
+        "delta_bytes_mean": round(measured.delta_bytes / max(1, measured.view.deltas), 1),
+        "full_snapshot_bytes_mean": round(measured.snapshot_bytes / max(1, measured.view.deltas), 1),
+        "arrival_spread_p50_ms": round(percentile(spreads_ms, 0.50), 3) if spreads_ms else None,
+        "arrival_spread_p99_ms": round(percentile(spreads_ms, 0.99), 3) if spreads_ms else None,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Spectator replication load test")
+    parser.add_argument("--spectators", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=20, help="Spectators that decode and verify every frame")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to watch once everyone is attached")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--host", default="127.0.0.1")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    raise_file_limit(args.spectators + 256)
+    port = free_port(args.host)
+    log_file = tempfile.TemporaryFile(mode="w+")
+    server = start_server(args.host, port, None, log_file, (
+        "--race-players", "1", "--race-distance", "1000000", "--sim-workers", "1"
+    ))
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    runner = context.Process(target=run_racer,
+                             args=(args.host, port, "runner", args.duration + args.timeout, results))
+    try:
+        runner.start()
+        result = asyncio.run(run_spectators(args.host, port, args.spectators, args.samples,
+                                            args.duration, args.timeout))
+    finally:
+        runner.terminate()
+        runner.join(timeout=5)
+        server.send_signal(signal.SIGINT)
+        server.wait(timeout=30)
+
+    log_file.seek(0)
+    summary = [line for line in log_file.read().splitlines() if line.startswith("Sent ")]
+    if summary:
+        result["server_summary"] = summary[-1]
+    print(json.dumps(result, indent=2))
+    ok = (result["spectators_without_frames"] == 0 and result["keyframe_mismatches"] == 0
+          and result["deltas_skipped"] == 0 and result["keyframes_checked"] > 0)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
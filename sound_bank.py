@@ -0,0 +1,100 @@
+import pygame
+import os
+
+# Get current directory
+current_dir = os.path.dirname(__file__)
+
+# Sound effect files - resolved once per process, decoded on first use
+SOUND_FILES = {
+    "jump": "jump.mp3",
+    "coin": "coin.mp3",
+    "death": "death.wav",
+    "checkpoint": "checkpoint.wav",
+    "shield": "shield.wav"
+}
+
+# Reserved mixer channels per SFX category so that frequent sounds (coins)
+# can never steal the channel of an important one (death/checkpoint)
+SOUND_CATEGORIES = {
+    "death": "critical",
+    "checkpoint": "critical",
+    "shield": "powerup",
+    "jump": "movement",
+    "coin": "pickup"
+}
+CATEGORY_CHANNELS = {
+    "critical": [0],
+    "powerup": [1],
+    "movement": [2],
+    "pickup": [3, 4]   # Two channels so quick coin pickups overlap a little
+}
+RESERVED_CHANNEL_COUNT = 5
+
+# Bank state
+_sound_paths = {}     # name -> absolute path (None if the file is missing)
+_sounds = {}          # name -> decoded pygame.mixer.Sound (or None on failure)
+_channels = {}        # category -> list of pygame.mixer.Channel
+_next_channel = {}    # category -> round-robin index
+_initialized = False
+
+def init():
+    """Resolve sound paths and reserve mixer channels (runs once per process)"""
+    global _initialized
+
+    if _initialized:
+        return
+
+    for sound_name, sound_file in SOUND_FILES.items():
+        sound_path = os.path.join(current_dir, "assets", "sounds", sound_file)
+        _sound_paths[sound_name] = sound_path if os.path.exists(sound_path) else None
+
+    try:
+        if pygame.mixer.get_init():
+            if pygame.mixer.get_num_channels() < RESERVED_CHANNEL_COUNT + 3:
+                pygame.mixer.set_num_channels(RESERVED_CHANNEL_COUNT + 3)
+            pygame.mixer.set_reserved(RESERVED_CHANNEL_COUNT)
+            for category, channel_ids in CATEGORY_CHANNELS.items():
+                _channels[category] = [pygame.mixer.Channel(i) for i in channel_ids]
+                _next_channel[category] = 0
+    except pygame.error as e:
+        print(f"Warning: Could not reserve sound channels: {e}")
+
+    _initialized = True
+
+def get_sound(sound_name):
+    """Return the shared Sound for sound_name, decoding it on first use"""
+    if not _initialized:
+        init()
+
+    if sound_name in _sounds:
+        return _sounds[sound_name]
+
+    sound = None
+    sound_path = _sound_paths.get(sound_name)
+    if sound_path:
+        try:
+            sound = pygame.mixer.Sound(sound_path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: Could not load sound {SOUND_FILES[sound_name]}: {e}")
+    _sounds[sound_name] = sound
+    return sound
+
+def play(sound_name):
+    """Play a sound effect on the channel reserved for its category"""
+    sound = get_sound(sound_name)
+    if sound is None:
+        return
+
+    channels = _channels.get(SOUND_CATEGORIES.get(sound_name))
+    if not channels:
+        sound.play()
+        return
+
+    index = _next_channel[SOUND_CATEGORIES[sound_name]]
+    _next_channel[SOUND_CATEGORIES[sound_name]] = (index + 1) % len(channels)
+    channels[index].play(sound)
+
+def preload(sound_names=None):
+    """Decode sounds ahead of time (e.g. while a menu is showing)"""
+    for sound_name in sound_names or SOUND_FILES:
+        get_sound(sound_name)